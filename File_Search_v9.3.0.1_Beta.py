@@ -1,3 +1,6 @@
+import array
+import codecs
+import collections
 import concurrent.futures
 import csv
 import functools
@@ -6,8 +9,10 @@ import getpass
 import glob
 import hashlib
 import io
+import itertools
 import json
 import mimetypes
+import mmap
 import os
 import platform
 import queue
@@ -15,25 +20,34 @@ import re
 import shutil
 import signal
 import subprocess
+import sys
 import tarfile
 import tempfile
 import threading
 import time
-import tkinter as tk
 import traceback
 import uuid
 import webbrowser
 import zipfile
+import zlib
 from datetime import datetime
-from tkinter import filedialog, messagebox, BooleanVar, StringVar, IntVar
 
-# Third-party imports
-import psutil
-import pythoncom
-import rarfile
-import ttkbootstrap as ttk
-import win32com.client
-from ttkbootstrap.constants import *
+# Interfaccia grafica: facoltativa a livello di modulo, la ricerca da riga di comando
+# (--search) e SearchEngine non la usano; main() segnala le librerie mancanti
+try:
+    import tkinter as tk
+    from tkinter import filedialog, messagebox, BooleanVar, StringVar, IntVar
+    import ttkbootstrap as ttk
+    from ttkbootstrap.constants import *
+    GUI_AVAILABLE = True
+except ImportError:
+    GUI_AVAILABLE = False
+
+# Third-party imports (rarfile viene importato dove serve)
+try:
+    import psutil
+except ImportError:
+    psutil = None
 
 # Import necessari per Windows Search
 try:
@@ -96,15 +110,356 @@ def error_handler(func):
             return None
     return wrapper
 
+# DOCX, PPTX e OpenDocument sono letti dall'estrattore XML integrato (_iter_office_text)
 file_format_support = {
-    "docx": False, "pdf": False, "pptx": False, "excel": False,
-    "odt": False, "rtf": False, "xls": False, "doc": False,
-    "ods": False, "odp": False, "epub": False, "mobi": False, 
+    "docx": True, "pdf": False, "pptx": True, "excel": False,
+    "odt": True, "rtf": False, "xls": False, "doc": False,
+    "ods": True, "odp": True, "epub": False, "mobi": False, 
     "tex": True, "rst": True, "sqlite": True, "mdb": True,
     "odb": True, "tsv": True, "dbf": False, "dif": True,
     "executable": True, "code_files": True, "accdb": True  
 }
 
+# Livelli del log dell'applicazione
+LOG_DEBUG = 10
+LOG_INFO = 20
+LOG_WARNING = 30
+LOG_ERROR = 40
+
+class LogRecord:
+    """Messaggio di log non ancora formattato.
+    Il testo (message % args) e il timestamp leggibile vengono costruiti solo quando
+    il record viene letto (finestra di debug, console, file), mai nel thread che lo registra."""
+    __slots__ = ('created', 'level', 'message', 'args')
+
+    LABELS = {LOG_INFO: "INFO", LOG_WARNING: "AVVISO", LOG_ERROR: "ERRORE"}
+    # I messaggi di debug vengono classificati dal testo, alla lettura
+    BINARY_PHRASES = ("file binario ignorato per estrazione testo", "file rilevato come binario",
+                      "file ignorato per estrazione contenuto (binario)")
+    ERROR_WORDS = ("error", "exception", "failed", "errore", "eccezione", "fallito")
+    WARNING_WORDS = ("warning", "warn", "attenzione", "avviso")
+
+    def __init__(self, level, message, args=()):
+        self.created = time.time()
+        self.level = level
+        self.message = message
+        self.args = args
+
+    def text(self):
+        if not self.args:
+            return str(self.message)
+        try:
+            return self.message % self.args
+        except (TypeError, ValueError):
+            return f"{self.message} {self.args}"
+
+    def label(self, text):
+        if self.level != LOG_DEBUG:
+            return self.LABELS.get(self.level, "INFO")
+        lowered = text.lower()
+        if any(phrase in lowered for phrase in self.BINARY_PHRASES):
+            return "INFO"
+        if any(word in lowered for word in self.ERROR_WORDS):
+            return "ERRORE"
+        if any(word in lowered for word in self.WARNING_WORDS):
+            return "AVVISO"
+        return "INFO"
+
+    def format(self):
+        text = self.text()
+        timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.created))
+        return f"[{self.label(text)}] {timestamp}.{int(self.created % 1 * 1000):03d} - {text}"
+
+class LogRing:
+    """Buffer circolare a capacità fissa per la finestra di debug, senza lock.
+    Ogni record riceve un numero progressivo da itertools.count (atomico con il GIL)
+    e occupa la cella numero % capacità; i lettori chiedono i record successivi
+    all'ultimo numero letto. I record più vecchi vengono sovrascritti, senza copie.
+    clear() sposta la base della numerazione: i lettori con un numero precedente
+    ripartono dalla nuova base."""
+
+    def __init__(self, capacity=10000):
+        self.capacity = max(1, capacity)
+        self._cells = [None] * self.capacity
+        self._counter = itertools.count()
+        self.base_seq = 0    # Primo numero valido dopo l'ultimo clear()
+        self.last_seq = -1  # Indicativo: solo per il conteggio dei messaggi
+
+    def __len__(self):
+        return max(0, min(self.last_seq + 1 - self.base_seq, self.capacity))
+
+    def append(self, record):
+        seq = next(self._counter)
+        self._cells[seq % self.capacity] = (seq, record)
+        if seq > self.last_seq:
+            self.last_seq = seq
+
+    def since(self, seq=0):
+        """Restituisce (record con numero >= seq in ordine, numero da chiedere la volta successiva).
+        Si ferma al primo numero mancante: un record ancora in scrittura verrà letto dopo."""
+        seq = max(seq, self.base_seq)
+        cells = sorted(cell for cell in list(self._cells) if cell is not None and cell[0] >= seq)
+        records = []
+        next_seq = seq
+        for cell_seq, record in cells:
+            if records and cell_seq != next_seq:
+                break
+            records.append(record)
+            next_seq = cell_seq + 1
+        return records, next_seq
+
+    def clear(self):
+        """Svuota il buffer e restituisce la nuova base della numerazione.
+        Il numero riservato dal contatore separa i record precedenti (anche quelli
+        ancora in scrittura, che since() scarta) dai successivi."""
+        base = next(self._counter) + 1
+        self.base_seq = base
+        self._cells = [None] * self.capacity
+        return base
+
+class AppLogger:
+    """Logging a livelli dell'applicazione.
+    Il livello viene controllato prima di costruire qualsiasi stringa; i record vanno
+    nel LogRing della finestra di debug. Console ed eventuale file degli errori sono
+    scritti a blocchi da un thread in background, così i thread di ricerca non
+    eseguono print() né aperture di file."""
+
+    def __init__(self, level=LOG_DEBUG, capacity=10000, echo=False, error_log_dir=None):
+        self.level = level
+        self.ring = LogRing(capacity)
+        self.echo = echo                    # Copia dei messaggi sulla console
+        self.error_log_dir = error_log_dir  # Cartella dei file error_log_AAAAMMGG.txt
+        self._queue = queue.SimpleQueue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+
+    def is_enabled(self, level):
+        return level >= self.level
+
+    def log(self, level, message, args=()):
+        if level < self.level:
+            return
+        record = LogRecord(level, message, args)
+        self.ring.append(record)
+        if self.echo or (level >= LOG_ERROR and self.error_log_dir):
+            self._queue.put(record)
+            if self._writer is None:
+                self._start_writer()
+
+    def debug(self, message, *args):
+        self.log(LOG_DEBUG, message, args)
+
+    def info(self, message, *args):
+        self.log(LOG_INFO, message, args)
+
+    def warning(self, message, *args):
+        self.log(LOG_WARNING, message, args)
+
+    def error(self, message, *args):
+        self.log(LOG_ERROR, message, args)
+
+    def lines(self, since=0):
+        """Messaggi formattati presenti nel buffer"""
+        records, _ = self.ring.since(since)
+        return [record.format() for record in records]
+
+    def _start_writer(self):
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="LogWriter", daemon=True)
+                self._writer.start()
+
+    def _write_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            # Attesa breve per raccogliere i record arrivati nel frattempo: una scrittura per blocco
+            time.sleep(0.05)
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            self._write([record for record in batch if record is not None])
+            if stop:
+                return
+
+    def _write(self, records):
+        console = []
+        errors = []
+        for record in records:
+            line = record.format()
+            if self.echo:
+                console.append(line)
+            if record.level >= LOG_ERROR and self.error_log_dir:
+                errors.append(line)
+        if console and sys.stdout:
+            try:
+                sys.stdout.write("\n".join(console) + "\n")
+                sys.stdout.flush()
+            except (OSError, ValueError):
+                pass
+        if errors:
+            try:
+                os.makedirs(self.error_log_dir, exist_ok=True)
+                error_log_file = os.path.join(self.error_log_dir, f"error_log_{datetime.now().strftime('%Y%m%d')}.txt")
+                with open(error_log_file, "a", encoding="utf-8") as f:
+                    f.write("\n".join(errors) + "\n")
+            except OSError:
+                pass
+
+    def close(self, timeout=2.0):
+        """Scrive i record ancora in coda e ferma il thread di scrittura"""
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join(timeout)
+            self._writer = None
+
+class SkippedFilesLog:
+    """Log dei file esclusi dalla ricerca in formato CSV (separatore ';').
+    I thread di ricerca accodano soltanto i record; un thread di scrittura tiene
+    aperto un unico handle per ricerca, scrive a blocchi con flush periodico e
+    ruota il file (una copia .1) quando supera max_bytes."""
+
+    HEADER = ["Data e Ora", "Tipo", "Nome File", "Percorso Completo", "Motivo Esclusione"]
+    FIELDS = ["timestamp", "type", "name", "path", "reason"]
+
+    def __init__(self, path, max_bytes=20 * 1024 * 1024, flush_interval=1.0, logger=None):
+        self.path = path
+        self.backup_path = path + ".1"
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.logger = logger
+        self._queue = None                  # Coda del thread di scrittura attivo
+        self._writer = None
+        self._writer_lock = threading.Lock()
+
+    def log(self, message, level="info"):
+        if self.logger:
+            if level == "debug":
+                self.logger.debug(message)
+            elif level == "info":
+                self.logger.info(message)
+            elif level == "warning":
+                self.logger.warning(message)
+            elif level == "error":
+                self.logger.error(message)
+
+    def record(self, skiptype, filename, filepath, skipreason):
+        """Accoda un file escluso; non esegue I/O sul thread chiamante"""
+        if self._writer is None:
+            self._start_writer()
+        self._queue.put((time.time(), skiptype, filename, filepath, skipreason))
+
+    def flush(self, timeout=5.0):
+        """Attende che i record accodati fino ad ora siano scritti su disco"""
+        with self._writer_lock:
+            if self._writer is None:
+                return
+            done = threading.Event()
+            self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self, wait=False):
+        """Chiude l'handle a fine ricerca; i record ancora in coda vengono scritti"""
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+            if writer is not None:
+                self._queue.put(None)
+        if writer is not None and wait:
+            writer.join(5.0)
+
+    def clear(self):
+        """Svuota il log (file corrente e copia ruotata)"""
+        self.close(wait=True)
+        for file_path in (self.path, self.backup_path):
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+
+    def is_empty(self):
+        self.flush()
+        return not any(os.path.exists(p) and os.path.getsize(p) > 0
+                       for p in (self.backup_path, self.path))
+
+    def rows(self):
+        """Righe del log come liste [data e ora, tipo, nome, percorso, motivo],
+        dalla copia ruotata al file corrente"""
+        self.flush()
+        for file_path in (self.backup_path, self.path):
+            try:
+                with open(file_path, "r", newline="", encoding="utf-8") as f:
+                    for row in csv.reader(f, delimiter=";"):
+                        if len(row) == len(self.FIELDS):
+                            yield row
+            except FileNotFoundError:
+                continue
+
+    def records(self):
+        """Righe del log come dizionari, per l'esportazione JSONL"""
+        for row in self.rows():
+            yield dict(zip(self.FIELDS, row))
+
+    def _start_writer(self):
+        with self._writer_lock:
+            if self._writer is None:
+                self._queue = queue.SimpleQueue()
+                self._writer = threading.Thread(target=self._write_loop, args=(self._queue,),
+                                                name="SkippedFilesLogWriter", daemon=True)
+                self._writer.start()
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handle = open(self.path, "a", newline="", encoding="utf-8", buffering=256 * 1024)
+        return handle, csv.writer(handle, delimiter=";", quotechar='"', quoting=csv.QUOTE_MINIMAL)
+
+    def _rotate(self, handle):
+        handle.close()
+        os.replace(self.path, self.backup_path)
+        self.log(f"Log dei file esclusi ruotato in {self.backup_path}", "debug")
+        return self._open()
+
+    def _write_loop(self, pending):
+        try:
+            handle, writer = self._open()
+        except OSError as e:
+            self.log(f"Impossibile aprire il log dei file esclusi {self.path}: {str(e)}", "error")
+            handle = writer = None
+        last_flush = time.monotonic()
+        try:
+            while True:
+                try:
+                    item = pending.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    item = False
+                if isinstance(item, tuple):
+                    if writer is not None:
+                        timestamp = datetime.fromtimestamp(item[0]).strftime('%Y-%m-%d %H:%M:%S')
+                        writer.writerow((timestamp,) + item[1:])
+                    due = time.monotonic() - last_flush >= self.flush_interval
+                else:
+                    due = True
+                if handle is not None and due:
+                    handle.flush()
+                    last_flush = time.monotonic()
+                    if handle.tell() > self.max_bytes:
+                        handle, writer = self._rotate(handle)
+                if isinstance(item, threading.Event):
+                    item.set()
+                elif item is None:
+                    return
+        except OSError as e:
+            self.log(f"Errore durante la scrittura del log dei file esclusi: {str(e)}", "error")
+        finally:
+            if handle is not None:
+                try:
+                    handle.close()
+                except OSError:
+                    pass
+
 class PathUtils:
     """Classe di utilità per operazioni sui percorsi di file e cartelle.
     Contiene metodi relativi all'identificazione e gestione di percorsi di rete."""
@@ -431,6 +786,618 @@ class WindowsSearchHelper:
         self.cache_timeout = timeout_seconds
         self.log(f"Timeout della cache impostato a {timeout_seconds} secondi")
 
+class KeywordMatcher:
+    """Riconoscimento di più parole chiave nello stesso testo.
+    Il testo viene portato in minuscolo una sola volta e ogni keyword è cercata con
+    str.find (ricerca di sottostringa in C); in modalità parola intera ogni keyword ha
+    un pattern "keyword\\b" senza IGNORECASE sul testo già in minuscolo, che mantiene la
+    ricerca veloce del prefisso letterale, e il confine iniziale è verificato a parte. Se la conversione in minuscolo cambia la
+    lunghezza del testo (alcuni caratteri Unicode) si usa l'alternanza con
+    re.IGNORECASE, così le posizioni restano quelle del testo originale.
+    Con molte keyword (soglie misurate con benchmark_keywords) il testo in minuscolo
+    viene invece scandito una sola volta con un'unica alternanza, fattorizzata per
+    prefissi comuni, invece di una ricerca per keyword."""
+    
+    # Numero di keyword distinte da cui la scansione unica è più veloce delle
+    # ricerche separate: il costo di str.find cresce con le keyword, quello
+    # dell'alternanza quasi no, ma parte da un costo fisso per posizione più alto
+    WORD_ALTERNATION_THRESHOLD = 36
+    SUBSTRING_ALTERNATION_THRESHOLD = 128
+    
+    def __init__(self, keywords, whole_word=False, single_pass=None):
+        self.whole_word = bool(whole_word)
+        self.keywords = []
+        self._groups = {}  # nome gruppo -> keyword originali (stessa forma minuscola)
+        
+        variants = {}
+        for keyword in keywords:
+            if not keyword:
+                continue
+            self.keywords.append(keyword)
+            variants.setdefault(keyword.lower(), []).append(keyword)
+        
+        self.max_keyword_length = max((len(k) for k in variants), default=0)
+        self._key = (tuple(self.keywords), self.whole_word)
+        # (keyword minuscola, keyword originali, pattern parola intera o None), le più lunghe per prime
+        self._lowered = []
+        self._variants = variants
+        # Alternanza unica sul testo in minuscolo, o None per le ricerche separate
+        self._lowered_scan = None
+        
+        if not variants:
+            self._pattern = None
+            self._scan_pattern = None
+            return
+        
+        boundary = r'\b' if self.whole_word else ''
+        alternatives = []
+        for index, keyword_lower in enumerate(sorted(variants, key=len, reverse=True)):
+            name = f"k{index}"
+            self._groups[name] = variants[keyword_lower]
+            alternatives.append(f"(?P<{name}>{boundary}{re.escape(keyword_lower)}{boundary})")
+            # Un \b iniziale disattiverebbe la ricerca veloce del prefisso: vedi _first
+            word_pattern = re.compile(rf"{re.escape(keyword_lower)}\b") if self.whole_word else None
+            self._lowered.append((keyword_lower, variants[keyword_lower], word_pattern))
+        alternation = "|".join(alternatives)
+        
+        # Testi la cui forma minuscola ha lunghezza diversa: ricerca semplice e
+        # scansione completa con il lookahead, che trova anche keyword che
+        # iniziano all'interno di un'altra corrispondenza
+        self._pattern = re.compile(alternation, re.IGNORECASE)
+        self._scan_pattern = re.compile(f"(?=(?:{alternation}))", re.IGNORECASE)
+        
+        if single_pass is None:
+            threshold = (self.WORD_ALTERNATION_THRESHOLD if self.whole_word
+                         else self.SUBSTRING_ALTERNATION_THRESHOLD)
+            single_pass = len(variants) >= threshold
+        if single_pass:
+            # Il gruppo cattura la keyword più lunga che inizia in ogni posizione
+            trie = self._prefix_alternation(variants)
+            self._lowered_scan = re.compile(f"(?={boundary}({trie}){boundary})")
+        
+        # Keyword contenute in altre keyword: nella scansione con il lookahead
+        # possono essere nascoste da una corrispondenza più lunga nella stessa posizione
+        self._nested = {}
+        for keyword_lower, originals in variants.items():
+            if any(keyword_lower != other and keyword_lower in other for other in variants):
+                self._nested[keyword_lower] = (
+                    re.compile(f"{boundary}{re.escape(keyword_lower)}{boundary}", re.IGNORECASE),
+                    originals)
+    
+    def is_for(self, keywords, whole_word):
+        """Verifica se il matcher è stato costruito per queste keyword e modalità"""
+        return self._key == (tuple(k for k in keywords if k), bool(whole_word))
+    
+    @staticmethod
+    def _prefix_alternation(words):
+        """Alternanza delle parole fattorizzata per prefissi comuni (trie), così
+        in ogni posizione si confronta al più un ramo per carattere"""
+        trie = {}
+        for word in words:
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        
+        def build(node):
+            parts = []
+            # Le catene senza diramazioni diventano letterali consecutivi
+            while len(node) == 1 and '' not in node:
+                char, node = next(iter(node.items()))
+                parts.append(re.escape(char))
+            branches = [re.escape(char) + build(child) for char, child in node.items() if char]
+            if branches:
+                body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+                # La parola che termina qui è l'alternativa più corta: i rami più lunghi prima
+                parts.append(f"(?:{body})?" if '' in node else body)
+            return "".join(parts)
+        
+        return build(trie)
+    
+    @staticmethod
+    def _lower(text):
+        """Testo in minuscolo, oppure None se la conversione ne cambia la lunghezza"""
+        lowered = text.lower()
+        return lowered if len(lowered) == len(text) else None
+    
+    @staticmethod
+    def _at_boundary(text, index):
+        """Confine di parola come \\b: un solo lato è un carattere di parola (\\w)"""
+        before = index > 0 and (text[index - 1].isalnum() or text[index - 1] == '_')
+        after = index < len(text) and (text[index].isalnum() or text[index] == '_')
+        return before != after
+    
+    def _first(self, lowered, keyword_lower, word_pattern, pos=0, max_start=None):
+        """Posizione della prima occorrenza che inizia in [pos, max_start), o -1"""
+        if word_pattern is None:
+            end = len(lowered) if max_start is None else max_start + len(keyword_lower) - 1
+            return lowered.find(keyword_lower, pos, end)
+        while True:
+            match = word_pattern.search(lowered, pos)
+            if match is None or (max_start is not None and match.start() >= max_start):
+                return -1
+            if self._at_boundary(lowered, match.start()):
+                return match.start()
+            pos = match.start() + 1
+    
+    def search(self, text):
+        """True se almeno una keyword compare nel testo"""
+        if self._pattern is None or not text:
+            return False
+        lowered = self._lower(text)
+        if lowered is None:
+            return self._pattern.search(text) is not None
+        if self._lowered_scan is not None:
+            return self._lowered_scan.search(lowered) is not None
+        if self.whole_word:
+            return any(self._first(lowered, keyword_lower, pattern) != -1
+                       for keyword_lower, _, pattern in self._lowered)
+        return any(keyword_lower in lowered for keyword_lower, _, _ in self._lowered)
+    
+    def find_matches(self, text, limit=None):
+        """Restituisce le occorrenze come lista di (keyword, inizio, fine),
+        con la corrispondenza più lunga per ogni posizione di partenza"""
+        matches = []
+        if self._scan_pattern is None or not text:
+            return matches
+        
+        lowered = self._lower(text)
+        if lowered is None:
+            for match in self._scan_pattern.finditer(text):
+                name = match.lastgroup
+                start, end = match.span(name)
+                matches.append((self._groups[name][0], start, end))
+                if limit is not None and len(matches) >= limit:
+                    break
+            return matches
+        
+        if self._lowered_scan is not None:
+            for match in self._lowered_scan.finditer(lowered):
+                keyword_lower = match.group(1)
+                start = match.start()
+                matches.append((self._variants[keyword_lower][0], start, start + len(keyword_lower)))
+                if limit is not None and len(matches) >= limit:
+                    break
+            return matches
+        
+        # Le prime `limit` posizioni di partenza sono tra le prime `limit` occorrenze
+        # di ciascuna keyword; a parità di inizio vale la keyword più lunga (elencata prima)
+        by_start = {}
+        for keyword_lower, originals, word_pattern in self._lowered:
+            count = 0
+            start = self._first(lowered, keyword_lower, word_pattern)
+            while start != -1 and (limit is None or count < limit):
+                by_start.setdefault(start, (originals[0], start, start + len(keyword_lower)))
+                count += 1
+                start = self._first(lowered, keyword_lower, word_pattern, start + 1)
+        matches = [by_start[start] for start in sorted(by_start)]
+        return matches if limit is None else matches[:limit]
+    
+    def keyword_mask(self, text):
+        """Bitmask delle keyword presenti nel testo (bit i = self.keywords[i])"""
+        return self.mask_for(self.find_keywords(text))
+    
+    def mask_for(self, found):
+        """Bitmask di un insieme di keyword già trovate (ad esempio dalla ricerca in streaming)"""
+        mask = 0
+        for index, keyword in enumerate(self.keywords):
+            if keyword in found:
+                mask |= 1 << index
+        return mask
+    
+    def find_keywords(self, text, stop_when_all=True, pos=0, max_start=None):
+        """Restituisce l'insieme delle keyword originali presenti nel testo.
+        pos e max_start limitano le posizioni di inizio considerate; i caratteri
+        fuori dall'intervallo valgono comunque come contesto per i confini di parola.
+        stop_when_all vale solo per le scansioni con un'alternanza: con le ricerche
+        separate ogni keyword si ferma comunque alla prima occorrenza."""
+        found = set()
+        if self._scan_pattern is None or not text:
+            return found
+        
+        lowered = self._lower(text)
+        if lowered is not None and self._lowered_scan is not None:
+            return self._scan_lowered(lowered, stop_when_all, pos, max_start)
+        if lowered is not None:
+            for keyword_lower, originals, word_pattern in self._lowered:
+                if self._first(lowered, keyword_lower, word_pattern, pos, max_start) != -1:
+                    found.update(originals)
+            return found
+        
+        total = len(self.keywords)
+        for match in self._scan_pattern.finditer(text, pos):
+            if max_start is not None and match.start() >= max_start:
+                break
+            found.update(self._groups[match.lastgroup])
+            if stop_when_all and len(found) == total:
+                return found
+        
+        # Verifica le keyword annidate che la scansione potrebbe aver coperto
+        for pattern, originals in self._nested.values():
+            if originals[0] in found:
+                continue
+            match = pattern.search(text, pos)
+            if match and (max_start is None or match.start() < max_start):
+                found.update(originals)
+        return found
+    
+    def _scan_lowered(self, lowered, stop_when_all, pos, max_start):
+        """find_keywords con un'unica scansione del testo in minuscolo"""
+        found = set()
+        seen = set()
+        total = len(self._variants)
+        for match in self._lowered_scan.finditer(lowered, pos):
+            if max_start is not None and match.start() >= max_start:
+                break
+            keyword_lower = match.group(1)
+            if keyword_lower not in seen:
+                seen.add(keyword_lower)
+                found.update(self._variants[keyword_lower])
+                if stop_when_all and len(seen) == total:
+                    return found
+        
+        # Le keyword contenute in altre possono essere coperte da una corrispondenza
+        # più lunga nella stessa posizione
+        for keyword_lower, originals, word_pattern in self._lowered:
+            if (keyword_lower in self._nested and keyword_lower not in seen
+                    and self._first(lowered, keyword_lower, word_pattern, pos, max_start) != -1):
+                found.update(originals)
+        return found
+
+class PatternRegistry:
+    """Registro per-ricerca delle espressioni regolari già compilate.
+    Conserva i pattern parola intera per singola keyword e i KeywordMatcher
+    per ogni combinazione di keyword, così nessun pattern viene ricompilato
+    per file, membro di archivio o sezione di allegato."""
+    
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._word_patterns = {}
+        self._matchers = {}
+    
+    def word_pattern(self, keyword):
+        """Pattern case-insensitive che trova la keyword come parola intera"""
+        pattern = self._word_patterns.get(keyword)
+        if pattern is None:
+            pattern = re.compile(r'\b' + re.escape(keyword) + r'\b', re.IGNORECASE)
+            with self._lock:
+                if len(self._word_patterns) >= self.max_entries:
+                    self._word_patterns.clear()
+                self._word_patterns[keyword] = pattern
+        return pattern
+    
+    def matcher(self, keywords, whole_word=False):
+        """KeywordMatcher condiviso per questo insieme di keyword e modalità"""
+        key = (tuple(k for k in keywords if k), bool(whole_word))
+        matcher = self._matchers.get(key)
+        if matcher is None:
+            matcher = KeywordMatcher(key[0], whole_word)
+            with self._lock:
+                if len(self._matchers) >= self.max_entries:
+                    self._matchers.clear()
+                self._matchers[key] = matcher
+        return matcher
+
+class ExtensionPolicy:
+    """Tabella per-ricerca delle decisioni per estensione.
+    Viene costruita una volta in start_search dalle estensioni selezionate per il
+    livello di ricerca: per ogni file la scelta è una sola ricerca in dizionario,
+    senza ricostruire liste né rileggere le impostazioni."""
+
+    # Azioni per estensione
+    SKIP = "skip"            # File escluso dalla ricerca
+    NAME_ONLY = "name"       # Solo il nome del file, contenuto non analizzato
+    CONTENT = "content"      # Contenuto analizzato
+    PARTIAL = "partial"      # Contenuto analizzato, in modo parziale se il file è gigantesco
+    ARCHIVE = "archive"      # Contenuto analizzato come archivio
+    EMAIL = "email"          # Contenuto analizzato come email (con allegati)
+
+    DESELECTED = "Estensione deselezionata"
+    SYSTEM = "File di sistema"
+
+    # Estensioni di file non testuali ignorate se non selezionate esplicitamente
+    BINARY_EXTENSIONS = frozenset(['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.mp3', '.mp4',
+                                   '.avi', '.mov', '.wav', '.flac', '.exe', '.dll', '.so',
+                                   '.iso', '.img', '.msi', '.bin', '.dat', '.zip', '.rar', '.7z'])
+    OFFICE_EXTENSIONS = frozenset(['.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx'])
+    ARCHIVE_EXTENSIONS = frozenset(['.zip', '.rar', '.7z', '.tar', '.gz', '.bz2'])
+    EMAIL_EXTENSIONS = frozenset(['.eml', '.msg', '.emlx'])
+    # Database e log giganteschi: analisi parziale invece che completa
+    PARTIAL_EXTENSIONS = frozenset(['.db', '.sqlite', '.mdb', '.accdb', '.sql',
+                                    '.log', '.csv', '.tsv', '.txt'])
+    SCRIPT_EXTENSIONS = frozenset(['.bat', '.cmd', '.ps1', '.vbs'])
+    PROBLEMATIC_SUFFIXES = (".msoprotector.doc", ".msoprotector.ppt", ".msoprotector.xls")
+
+    # Liste predefinite per ciascun livello (usate quando l'estensione non è tra quelle selezionate)
+    BASE_EXTENSIONS = frozenset(['.txt', '.md', '.csv', '.html', '.htm', '.xml', '.log',
+                                 '.docx', '.doc', '.pdf', '.pptx', '.ppt', '.xlsx', '.xls', '.rtf',
+                                 '.odt', '.ods', '.odp', '.eml', '.msg', '.emlx'])
+    ADVANCED_EXTENSIONS = BASE_EXTENSIONS | frozenset(['.exe', '.dll', '.sys', '.bat', '.cmd', '.ps1',
+                                                       '.vbs', '.js', '.config', '.ini', '.json', '.reg'])
+    DEEP_EXTENSIONS = ADVANCED_EXTENSIONS | frozenset(['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.mp3',
+                                                       '.mp4', '.avi', '.mov', '.mkv', '.wav', '.flac',
+                                                       '.zip', '.rar', '.7z', '.tar', '.gz', '.iso',
+                                                       '.psd', '.ai', '.svg'])
+    LEVEL_EXTENSIONS = {"base": BASE_EXTENSIONS, "avanzata": ADVANCED_EXTENSIONS, "profonda": DEEP_EXTENSIONS}
+
+    # Oltre queste dimensioni i file giganteschi di questi tipi non vengono analizzati
+    GIGANTIC_LIMITS = dict(
+        [(ext, 5 * 1024 ** 3) for ext in ('.exe', '.dll', '.bin', '.iso', '.img', '.msi')] +
+        [(ext, 4 * 1024 ** 3) for ext in ('.zip', '.rar', '.7z', '.tar', '.gz', '.bz2')] +
+        [(ext, 3 * 1024 ** 3) for ext in ('.mp4', '.avi', '.mkv', '.mov', '.mpg', '.wmv',
+                                          '.mp3', '.wav', '.flac')])
+
+    def __init__(self, level="base", selected=(), search_content=True,
+                 exclude_system=True, system_extensions=()):
+        self.level = level
+        self.selected = frozenset(selected)
+        self.search_content = search_content
+        # Modalità profonda senza estensioni personalizzate: si analizza tutto
+        self.content_all = level == "profonda" and not self.selected
+        self.default_action = self.CONTENT if self.content_all else self.NAME_ONLY
+
+        level_extensions = self.LEVEL_EXTENSIONS.get(level, self.BASE_EXTENSIONS)
+        self.system_extensions = system_extensions = frozenset(system_extensions)
+
+        self.actions = {}
+        for ext in (self.selected | level_extensions | self.BINARY_EXTENSIONS | self.OFFICE_EXTENSIONS |
+                    self.ARCHIVE_EXTENSIONS | self.EMAIL_EXTENSIONS | self.PARTIAL_EXTENSIONS |
+                    system_extensions | frozenset(self.GIGANTIC_LIMITS)):
+            if ext in self.selected:
+                self.actions[ext] = self._content_action(ext)
+            elif ext in self.BINARY_EXTENSIONS:
+                # File non testuali: solo se selezionati esplicitamente
+                self.actions[ext] = self.NAME_ONLY
+            elif ext in self.OFFICE_EXTENSIONS or ext in level_extensions or self.content_all:
+                self.actions[ext] = self._content_action(ext)
+            else:
+                self.actions[ext] = self.NAME_ONLY
+
+        # File di sistema esclusi (should_skip_file); con estensioni selezionate
+        # ogni altra estensione non vuota è esclusa come deselezionata
+        self.system_skips = frozenset()
+        if exclude_system:
+            # Gli script restano cercabili in ricerca avanzata/profonda
+            self.system_skips = frozenset(
+                ext for ext in system_extensions
+                if not (ext in self.SCRIPT_EXTENSIONS and level in ("avanzata", "profonda")))
+
+    @classmethod
+    def from_settings(cls, settings):
+        """Politica per l'istantanea SearchSettings di una ricerca"""
+        return cls(level=settings.search_level,
+                   selected=settings.selected_extensions,
+                   search_content=settings.search_content,
+                   exclude_system=settings.exclude_system_files,
+                   system_extensions=settings.system_extensions)
+
+    def _content_action(self, ext):
+        if ext in self.ARCHIVE_EXTENSIONS:
+            return self.ARCHIVE
+        if ext in self.EMAIL_EXTENSIONS:
+            return self.EMAIL
+        if ext in self.PARTIAL_EXTENSIONS:
+            return self.PARTIAL
+        return self.CONTENT
+
+    def action(self, ext):
+        """Azione per l'estensione (minuscola, con il punto)"""
+        if self.skip_reason(ext):
+            return self.SKIP
+        return self.actions.get(ext, self.default_action)
+
+    def content_action(self, ext):
+        """Azione sul contenuto, ignorando l'esclusione (usata anche per i file negli archivi)"""
+        return self.actions.get(ext, self.default_action)
+
+    def skip_reason(self, ext):
+        """Motivo di esclusione dell'estensione, None se il file non va saltato"""
+        if ext and self.selected and ext not in self.selected:
+            return self.DESELECTED
+        if ext in self.system_skips:
+            return self.SYSTEM
+        return None
+
+    def file_skip_reason(self, file_path, ext=None):
+        """Motivo di esclusione del file (estensione, file protetti RMS, formati
+        problematici, file di sistema), None se il file va analizzato"""
+        if ext is None:
+            ext = os.path.splitext(file_path)[1].lower()
+        reason = self.skip_reason(ext)
+        if reason == self.DESELECTED:
+            return reason
+        if "Rights Management Services" in file_path or "IRMProtectors" in file_path:
+            return "Rights Management Services"
+        if any(suffix in file_path for suffix in self.PROBLEMATIC_SUFFIXES):
+            return "Formato problematico"
+        return reason
+
+class PathExclusionRules:
+    """Regole per-ricerca di esclusione delle cartelle.
+    I percorsi esclusi sono un trie di componenti normalizzati (separatori
+    uniformi, maiuscole/minuscole ignorate): la verifica costa quanto la
+    profondità del percorso, non quanto il numero di esclusioni. Le directory
+    problematiche (sottostringhe) sono un'unica espressione regolare compilata.
+    Conta quante cartelle ha escluso ciascuna regola."""
+
+    _RULE = object()  # Chiave del nodo finale del trie: contiene la regola originale
+
+    def __init__(self, excluded_paths=(), problematic_dirs=(), logger=None):
+        self.logger = logger
+        self._root = {}
+        self.rules = 0
+        for excluded in excluded_paths:
+            parts = self.components(excluded)
+            if not parts:
+                continue
+            node = self._root
+            for part in parts:
+                node = node.setdefault(part, {})
+            node.setdefault(self._RULE, excluded)
+            self.rules += 1
+        problematic_dirs = [p for p in problematic_dirs if p]
+        self._problematic = None
+        if problematic_dirs:
+            # Le alternative più lunghe prima, così viene riportata la regola più specifica
+            self._problematic = re.compile("|".join(
+                re.escape(p) for p in sorted(problematic_dirs, key=len, reverse=True)))
+        self._pruned = collections.Counter()
+        self._lock = threading.Lock()
+
+    def log(self, message, level="info"):
+        if self.logger:
+            if level == "debug":
+                self.logger.debug(message)
+            elif level == "info":
+                self.logger.info(message)
+            elif level == "warning":
+                self.logger.warning(message)
+            elif level == "error":
+                self.logger.error(message)
+
+    @staticmethod
+    def components(path):
+        """Componenti normalizzati del percorso ("C:\\Users\\X" e "c:/users/x/" coincidono)"""
+        normalized = path.replace("\\", "/").casefold()
+        parts = [part for part in normalized.split("/") if part and part != "."]
+        if normalized.startswith("//"):
+            # Percorso di rete: non deve coincidere con un percorso locale omonimo
+            parts.insert(0, "//")
+        return parts
+
+    def match(self, path):
+        """Regola che esclude il percorso (il percorso escluso o la directory
+        problematica), None se la cartella va esplorata"""
+        node = self._root
+        if node:
+            for part in self.components(path):
+                node = node.get(part)
+                if node is None:
+                    break
+                rule = node.get(self._RULE)
+                if rule is not None:
+                    return rule
+        if self._problematic is not None:
+            found = self._problematic.search(path)
+            if found:
+                return found.group(0)
+        return None
+
+    def prune(self, path):
+        """Come match, ma registra l'esclusione nelle statistiche per regola"""
+        rule = self.match(path)
+        if rule is not None:
+            with self._lock:
+                self._pruned[rule] += 1
+        return rule
+
+    def stats(self):
+        """[(regola, cartelle escluse)] in ordine decrescente"""
+        with self._lock:
+            return self._pruned.most_common()
+
+    def report(self):
+        """Registra nel log le cartelle escluse da ciascuna regola"""
+        pruned = self.stats()
+        if pruned:
+            self.log("Cartelle escluse per regola: " +
+                     ", ".join(f"{rule} ({count})" for rule, count in pruned))
+
+class StreamingTextSearcher:
+    """Ricerca in streaming nei file di testo semplice.
+    Legge il file a blocchi di dimensione fissa e conserva tra un blocco e il
+    successivo solo la coda necessaria a trovare le keyword spezzate, quindi
+    la memoria usata non dipende dalla dimensione del file."""
+    
+    TEXT_EXTENSIONS = frozenset([
+        '.txt', '.csv', '.tsv', '.log', '.ini', '.xml', '.json', '.md', '.html', '.htm',
+        '.py', '.js', '.java', '.cpp', '.c', '.cs', '.php', '.rb', '.go', '.swift',
+        '.sql', '.sh', '.bat', '.ps1', '.vbs', '.pl', '.ts', '.kt', '.scala',
+        '.h', '.hpp', '.vb', '.lua', '.rs', '.groovy', '.yml', '.yaml', '.toml',
+        '.properties', '.conf', '.config', '.cfg', '.reg'])
+    
+    def __init__(self, chunk_size=1024 * 1024, window_size=64 * 1024, logger=None):
+        self.chunk_size = chunk_size    # Caratteri letti per blocco
+        self.window_size = window_size  # Caratteri accumulati prima dell'esame (search_chunks)
+        self.logger = logger
+    
+    def log(self, message, level="info"):
+        if self.logger:
+            if level == "debug":
+                self.logger.debug(message)
+            elif level == "info":
+                self.logger.info(message)
+            elif level == "warning":
+                self.logger.warning(message)
+            elif level == "error":
+                self.logger.error(message)
+    
+    def handles(self, file_path):
+        """True se il file è un formato di testo semplice gestito in streaming"""
+        return os.path.splitext(file_path)[1].lower() in self.TEXT_EXTENSIONS
+    
+    def search_file(self, file_path, matcher, should_stop=None, encoding='utf-8-sig'):
+        """Cerca le keyword del matcher nell'intero file.
+        Restituisce l'insieme delle keyword trovate; si ferma appena le ha trovate tutte."""
+        found = set()
+        if not matcher.keywords:
+            return found
+        
+        chunk_size = max(self.chunk_size, matcher.max_keyword_length + 1)
+        try:
+            with open(file_path, 'r', encoding=encoding, errors='replace') as f:
+                found = self.search_chunks(iter(lambda: f.read(chunk_size), ""), matcher,
+                                           should_stop=should_stop, separator="")
+        except Exception as e:
+            self.log(f"Errore nella lettura in streaming di {file_path}: {str(e)}", "error")
+        
+        return found
+    
+    def search_chunks(self, pieces, matcher, should_stop=None, separator="\n"):
+        """Cerca le keyword in una sequenza di porzioni di testo (blocchi di un file,
+        righe di un foglio di calcolo...) unite da separator. Le porzioni vengono
+        accumulate fino a window_size caratteri ed esaminate con la coda del blocco
+        precedente; la sequenza non viene più consumata appena tutte le keyword
+        sono state trovate. Restituisce l'insieme delle keyword trovate."""
+        found = set()
+        if not matcher.keywords:
+            return found
+        
+        total = len(matcher.keywords)
+        # Coda conservata: keyword più lunga più un carattere di contesto
+        # per la verifica del confine di parola a sinistra
+        overlap = matcher.max_keyword_length + 1
+        window_size = max(self.window_size, overlap)
+        carry = ""
+        buffer = []
+        buffered = 0
+        
+        for piece in pieces:
+            buffer.append(piece)
+            buffered += len(piece) + len(separator)
+            if buffered < window_size:
+                continue
+            if should_stop and should_stop():
+                return found
+            
+            window = carry + separator.join(buffer) + separator
+            # Il primo carattere della coda è solo contesto, già esaminato; le occorrenze
+            # che iniziano nell'ultima parte della finestra vengono riesaminate nel
+            # blocco successivo con il contesto a destra
+            found |= matcher.find_keywords(window, pos=1 if carry else 0,
+                                           max_start=len(window) - matcher.max_keyword_length)
+            if len(found) == total:
+                return found
+            carry = window[-overlap:]
+            buffer.clear()
+            buffered = 0
+        
+        window = carry + separator.join(buffer)
+        if window and not (should_stop and should_stop()):
+            found |= matcher.find_keywords(window, pos=1 if carry else 0)
+        return found
+
 class NetworkSearchOptimizer:
     """Classe per ottimizzare la ricerca su percorsi di rete"""
     
@@ -441,6 +1408,7 @@ class NetworkSearchOptimizer:
         self.retry_count = 3  # Numero di tentativi per le operazioni di rete
         self.chunk_size = 8 * 1024 * 1024  # 8MB per trasferimento di rete
         self.timeout_multiplier = 2.5  # Moltiplicatore di timeout per percorsi di rete
+        self.pattern_registry = PatternRegistry()  # Sostituito da quello della ricerca corrente
     
     def log(self, message, level="info"):
         if self.logger:
@@ -571,10 +1539,12 @@ class NetworkSearchOptimizer:
             self.log(f"Errore durante l'enumerazione dei file di rete in {path}: {str(e)}", "error")
             return []
     
-    def read_network_file_in_chunks(self, file_path, keywords, chunk_size=None):
+    def read_network_file_in_chunks(self, file_path, keywords, chunk_size=None, matcher=None):
         """Legge un file di rete in blocchi per ridurre l'utilizzo della memoria"""
         if chunk_size is None:
             chunk_size = self.chunk_size
+        if matcher is None:
+            matcher = self.pattern_registry.matcher(keywords)
             
         try:
             found_keywords = set()
@@ -586,9 +1556,7 @@ class NetworkSearchOptimizer:
                     content = f.read()
                 try:
                     text = content.decode('utf-8', errors='ignore')
-                    for keyword in keywords:
-                        if keyword.lower() in text.lower():
-                            found_keywords.add(keyword)
+                    found_keywords = matcher.find_keywords(text)
                 except:
                     pass
                 return len(found_keywords) > 0, found_keywords
@@ -607,14 +1575,12 @@ class NetworkSearchOptimizer:
                     # Decodifica e cerca le parole chiave
                     try:
                         text = buffer.decode('utf-8', errors='ignore')
-                        for keyword in keywords:
-                            if keyword.lower() in text.lower():
-                                found_keywords.add(keyword)
+                        found_keywords |= matcher.find_keywords(text)
                     except:
                         pass
                     
                     # Se abbiamo trovato tutte le parole chiave, possiamo fermarci
-                    if len(found_keywords) == len(keywords):
+                    if len(found_keywords) == len(matcher.keywords):
                         return True, found_keywords
                     
                     # Mantieni l'ultima parte del buffer per gestire le parole chiave divise tra i chunk
@@ -634,11 +1600,16 @@ class LargeFileHandler:
     
     def __init__(self, logger=None):
         self.logger = logger
+        self.medium_file_threshold = 10 * 1024 * 1024  # 10 MB
         self.large_file_threshold = 50 * 1024 * 1024  # 50 MB
         self.huge_file_threshold = 500 * 1024 * 1024  # 500 MB
+        self.gigantic_file_threshold = 2 * 1024 * 1024 * 1024  # 2 GB
         self.read_chunk_size = 4 * 1024 * 1024  # 4 MB
+        self.mmap_window_size = 256 * 1024  # Byte esaminati per volta dal file mappato (restano in cache)
+        self.mmap_confirm_span = 16 * 1024  # Byte decodificati dopo ogni occorrenza candidata
         self.max_preview_size = 10 * 1024  # 10 KB per l'anteprima
         self.supported_parsers = {}
+        self.pattern_registry = PatternRegistry()  # Sostituito da quello della ricerca corrente
         
         # Inizializza i parser specifici per tipo di file
         self._initialize_file_parsers()
@@ -708,22 +1679,198 @@ class LargeFileHandler:
         """Determina se un file è considerato 'enorme'"""
         return self.get_file_size_category(file_path) in ["huge", "gigantic"]
     
-    def search_in_large_file(self, file_path, keywords, is_whole_word=False):
+    def _get_matcher(self, keywords, is_whole_word, matcher):
+        """Restituisce il matcher condiviso della ricerca o ne crea uno per queste keyword"""
+        if matcher is not None and matcher.is_for(keywords, is_whole_word):
+            return matcher
+        return self.pattern_registry.matcher(keywords, is_whole_word)
+    
+    def search_in_large_file(self, file_path, keywords, is_whole_word=False, matcher=None, should_stop=None):
         """Cerca keywords in un file di grandi dimensioni in modo ottimizzato"""
         extension = os.path.splitext(file_path)[1].lower()
+        matcher = self._get_matcher(keywords, is_whole_word, matcher)
+        
+        # Sopra la soglia dei file grandi, su disco locale, cerca direttamente nei byte mappati
+        if self.use_mmap_search(file_path):
+            try:
+                result = self._mmap_search(file_path, matcher, should_stop)
+                if result is not None:
+                    return result
+            except (OSError, ValueError) as e:
+                self.log(f"Ricerca mmap non disponibile per {file_path}, uso la lettura a blocchi: {str(e)}", "warning")
         
         # Usa un parser specifico se disponibile per questo tipo di file
         if extension in self.supported_parsers:
-            return self.supported_parsers[extension](file_path, keywords, is_whole_word)
+            return self.supported_parsers[extension](file_path, keywords, is_whole_word, matcher)
         
         # Altrimenti usa la ricerca generica a blocchi
-        return self._chunk_search(file_path, keywords, is_whole_word)
+        return self._chunk_search(file_path, keywords, is_whole_word, matcher)
+    
+    def use_mmap_search(self, file_path, file_size=None):
+        """True se il file va cercato con mmap: grande e su disco locale"""
+        if file_path.startswith('\\\\') or file_path.startswith('//'):
+            return False
+        try:
+            if file_size is None:
+                file_size = os.path.getsize(file_path)
+        except OSError:
+            return False
+        return file_size >= self.large_file_threshold
+    
+    @staticmethod
+    def _byte_anchors(keyword_lower, encoding):
+        """Sequenze di byte, con le lettere ASCII in minuscolo, di cui almeno una compare in
+        ogni occorrenza della keyword codificata in encoding (dopo bytes.lower()): la keyword
+        stessa se è ASCII, altrimenti la sua parte ASCII più lunga o, se troppo corta, le
+        varianti maiuscole/minuscole dei caratteri non ASCII. None se le varianti sono troppe."""
+        if keyword_lower.isascii():
+            anchors = [keyword_lower]
+        else:
+            run = max(re.findall(r'[\x00-\x7f]+', keyword_lower), key=len, default="")
+            if len(run) >= 3:
+                anchors = [run]
+            else:
+                anchors = [""]
+                for char in keyword_lower:
+                    options = {char} if char.isascii() else {char, char.upper(), char.title()}
+                    anchors = [anchor + option for anchor in anchors for option in options]
+                    if len(anchors) > 16:
+                        return None
+        encoded = set()
+        for anchor in anchors:
+            try:
+                encoded.add(anchor.encode(encoding).lower())
+            except UnicodeEncodeError:
+                continue  # Carattere non rappresentabile: la keyword non può comparire così
+        return encoded
+    
+    def _byte_needles(self, matcher, encodings):
+        """Dizionario sequenza di byte -> keyword originali che la contengono, o None"""
+        needles = {}
+        for keyword in matcher.keywords:
+            for encoding in encodings:
+                anchors = self._byte_anchors(keyword.lower(), encoding)
+                if anchors is None:
+                    return None
+                for needle in anchors:
+                    needles.setdefault(needle, set()).add(keyword)
+        return needles
+    
+    @staticmethod
+    def _decode_span(span, encoding):
+        """Decodifica un tratto del file attorno a un'occorrenza candidata. In UTF-8 i
+        caratteri spezzati ai bordi vengono scartati e un tratto non valido è letto come latin-1."""
+        if encoding != 'utf-8':
+            return span.decode(encoding, errors='replace')
+        start = 0
+        while start < 3 and start < len(span) and 0x80 <= span[start] < 0xC0:
+            start += 1
+        try:
+            return span[start:].decode('utf-8')
+        except UnicodeDecodeError as e:
+            if e.reason == 'unexpected end of data':
+                try:
+                    return span[start:start + e.start].decode('utf-8')
+                except UnicodeDecodeError:
+                    pass
+            return span.decode('latin-1')
+    
+    @staticmethod
+    def _looks_wide(window):
+        """True se il campione iniziale ha molti byte nulli, come il testo UTF-16"""
+        sample = window[:4096]
+        return sample.count(0) > len(sample) // 8
+    
+    def _byte_pass(self, data, needles, encoding, matcher, found, should_stop=None, seen=None):
+        """Cerca le sequenze di byte nelle finestre del file mappato portate in minuscolo
+        con bytes.lower() (solo le lettere ASCII, nessuna decodifica) e, per ogni occorrenza,
+        decodifica solo un tratto attorno per confermare la keyword con il KeywordMatcher
+        (parola intera, maiuscole non ASCII). Aggiorna found; False se interrotta."""
+        total = len(matcher.keywords)
+        pending = {needle: keywords for needle, keywords in needles.items() if not keywords <= found}
+        if not pending:
+            return True
+        overlap = max(len(needle) for needle in pending) - 1
+        # Byte che la keyword può occupare attorno alla sequenza, più il contesto ai bordi
+        reach = 4 * matcher.max_keyword_length + 16
+        wide = encoding == 'utf-16-le'
+        size = len(data)
+        
+        for start in range(0, size, self.mmap_window_size):
+            if should_stop and should_stop():
+                return False
+            window = data[start:start + self.mmap_window_size + overlap].lower()
+            if seen is not None and not seen["wide"] and self._looks_wide(window):
+                seen["wide"] = True
+            
+            for needle in list(pending):
+                pos = window.find(needle) if needle in pending else -1
+                while pos != -1:
+                    hit = start + pos
+                    if wide and hit % 2:
+                        # Fuori allineamento rispetto ai caratteri UTF-16
+                        pos = window.find(needle, pos + 1)
+                        continue
+                    span_start = max(0, hit - reach)
+                    span_end = min(size, hit + reach + self.mmap_confirm_span)
+                    text = self._decode_span(data[span_start:span_end], encoding)
+                    # Ai bordi interni del tratto possono esserci caratteri spezzati e manca il
+                    # contesto per il confine di parola: le occorrenze lì vengono verificate dal
+                    # tratto della loro occorrenza candidata
+                    found |= matcher.find_keywords(
+                        text, pos=2 if span_start else 0,
+                        max_start=None if span_end == size else len(text) - matcher.max_keyword_length - 2)
+                    if len(found) == total:
+                        return True
+                    pending = {n: keywords for n, keywords in pending.items() if not keywords <= found}
+                    if needle not in pending:
+                        break
+                    # Le occorrenze che iniziano prima di span_end - reach sono già state verificate
+                    pos = window.find(needle, max(pos + 1, span_end - reach - start))
+            if not pending:
+                return True
+        return True
+    
+    def _mmap_search(self, file_path, matcher, should_stop=None):
+        """Ricerca sui byte del file mappato in memoria, senza decodificarlo: ogni keyword
+        è codificata una volta (UTF-8 e latin-1, oppure UTF-16 LE se il file inizia con il
+        BOM) e cercata con bytes.find nelle finestre di mmap_window_size byte, portate in
+        minuscolo con bytes.lower() e sovrapposte della sequenza più lunga meno un byte.
+        Solo il tratto attorno a ogni occorrenza viene decodificato per la conferma.
+        should_stop viene controllato a ogni finestra. Se alcune finestre sembrano UTF-16
+        (testo senza BOM, stringhe nei file di dati) segue una seconda lettura in UTF-16 LE.
+        Restituisce None se le keyword non si prestano alla ricerca sui byte."""
+        found = set()
+        if not matcher.keywords:
+            return False, found
+        
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return False, found
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if data[:2] == codecs.BOM_UTF16_LE:
+                    needles = self._byte_needles(matcher, ('utf-16-le',))
+                    if needles is None:
+                        return None
+                    self._byte_pass(data, needles, 'utf-16-le', matcher, found, should_stop)
+                    return len(found) > 0, found
+                
+                needles = self._byte_needles(matcher, ('utf-8', 'latin-1'))
+                wide_needles = self._byte_needles(matcher, ('utf-16-le',))
+                if needles is None or wide_needles is None:
+                    return None
+                seen = {"wide": False}
+                if (self._byte_pass(data, needles, 'utf-8', matcher, found, should_stop, seen)
+                        and seen["wide"] and len(found) < len(matcher.keywords)):
+                    self._byte_pass(data, wide_needles, 'utf-16-le', matcher, found, should_stop)
+        
+        return len(found) > 0, found
     
-    def _chunk_search(self, file_path, keywords, is_whole_word=False):
+    def _chunk_search(self, file_path, keywords, is_whole_word=False, matcher=None):
         """Cerca keywords in un file leggendolo a blocchi"""
-        keywords_lower = [k.lower() for k in keywords]
+        matcher = self._get_matcher(keywords, is_whole_word, matcher)
         found_keywords = set()
-        overlap = max(len(max(keywords, key=len)) * 2, 200)  # Sovrapponi i blocchi per evitare di perdere keyword spezzate
+        overlap = max(matcher.max_keyword_length * 2, 200)  # Sovrapponi i blocchi per evitare di perdere keyword spezzate
         
         try:
             with open(file_path, 'rb') as f:
@@ -751,23 +1898,12 @@ class LargeFileHandler:
                     # Converti in testo e cerca
                     try:
                         text = data.decode('utf-8', errors='ignore')
-                        text_lower = text.lower()
-                        
-                        for i, keyword in enumerate(keywords_lower):
-                            if is_whole_word:
-                                # Cerca parole intere usando espressioni regolari
-                                import re
-                                pattern = r'\b' + re.escape(keyword) + r'\b'
-                                if re.search(pattern, text_lower, re.IGNORECASE):
-                                    found_keywords.add(keywords[i])
-                            else:
-                                if keyword in text_lower:
-                                    found_keywords.add(keywords[i])
+                        found_keywords |= matcher.find_keywords(text)
                     except Exception as e:
                         self.log(f"Errore nella decodifica del testo in {file_path}: {str(e)}", "error")
                     
                     # Se abbiamo trovato tutte le keywords, fermiamoci
-                    if len(found_keywords) == len(keywords):
+                    if len(found_keywords) == len(matcher.keywords):
                         return True, found_keywords
                     
                     # Salva gli ultimi overlap byte per la prossima iterazione
@@ -782,38 +1918,27 @@ class LargeFileHandler:
             self.log(f"Errore durante la ricerca a blocchi in {file_path}: {str(e)}", "error")
             return False, set()
     
-    def _parse_xml(self, file_path, keywords, is_whole_word=False):
+    def _parse_xml(self, file_path, keywords, is_whole_word=False, matcher=None):
         """Cerca in modo efficiente in file XML di grandi dimensioni"""
         import xml.sax
-        import re
+        matcher = self._get_matcher(keywords, is_whole_word, matcher)
         
         class XMLHandler(xml.sax.ContentHandler):
-            def __init__(self, keywords, is_whole_word):
-                self.keywords = [k.lower() for k in keywords]
-                self.original_keywords = keywords
+            def __init__(self, matcher):
+                self.matcher = matcher
                 self.found_keywords = set()
                 self.current_text = ""
-                self.is_whole_word = is_whole_word
             
             def characters(self, content):
                 self.current_text += content
             
             def endElement(self, name):
-                text_lower = self.current_text.lower()
-                
-                for i, keyword in enumerate(self.keywords):
-                    if self.is_whole_word:
-                        pattern = r'\b' + re.escape(keyword) + r'\b'
-                        if re.search(pattern, text_lower, re.IGNORECASE):
-                            self.found_keywords.add(self.original_keywords[i])
-                    else:
-                        if keyword in text_lower:
-                            self.found_keywords.add(self.original_keywords[i])
-                
+                if self.current_text:
+                    self.found_keywords |= self.matcher.find_keywords(self.current_text)
                 self.current_text = ""
         
         try:
-            handler = XMLHandler(keywords, is_whole_word)
+            handler = XMLHandler(matcher)
             parser = xml.sax.make_parser()
             parser.setContentHandler(handler)
             parser.parse(file_path)
@@ -821,15 +1946,14 @@ class LargeFileHandler:
         except Exception as e:
             self.log(f"Errore durante il parsing XML di {file_path}: {str(e)}", "warning")
             # Fallback alla ricerca a blocchi
-            return self._chunk_search(file_path, keywords, is_whole_word)
+            return self._chunk_search(file_path, keywords, is_whole_word, matcher)
     
-    def _parse_csv(self, file_path, keywords, is_whole_word=False):
+    def _parse_csv(self, file_path, keywords, is_whole_word=False, matcher=None):
         """Cerca in modo efficiente in file CSV di grandi dimensioni"""
         import csv
-        import re
         
+        matcher = self._get_matcher(keywords, is_whole_word, matcher)
         found_keywords = set()
-        keywords_lower = [k.lower() for k in keywords]
         
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore', newline='') as csvfile:
@@ -845,36 +1969,29 @@ class LargeFileHandler:
                     if i >= rows_to_read:
                         break
                     
-                    for cell in row:
-                        cell_lower = cell.lower()
-                        for i, keyword in enumerate(keywords_lower):
-                            if is_whole_word:
-                                pattern = r'\b' + re.escape(keyword) + r'\b'
-                                if re.search(pattern, cell_lower, re.IGNORECASE):
-                                    found_keywords.add(keywords[i])
-                            else:
-                                if keyword in cell_lower:
-                                    found_keywords.add(keywords[i])
+                    # Una sola scansione per riga: le celle sono separate da un
+                    # carattere di controllo che non può far parte di una keyword
+                    found_keywords |= matcher.find_keywords("\x1f".join(row))
                     
                     # Se abbiamo trovato tutte le keywords, fermiamoci
-                    if len(found_keywords) == len(keywords):
+                    if len(found_keywords) == len(matcher.keywords):
                         return True, found_keywords
             
             return len(found_keywords) > 0, found_keywords
         except Exception as e:
             self.log(f"Errore durante il parsing CSV di {file_path}: {str(e)}", "warning")
             # Fallback alla ricerca a blocchi
-            return self._chunk_search(file_path, keywords, is_whole_word)
+            return self._chunk_search(file_path, keywords, is_whole_word, matcher)
     
-    def _parse_json(self, file_path, keywords, is_whole_word=False):
+    def _parse_json(self, file_path, keywords, is_whole_word=False, matcher=None):
         """Cerca in modo efficiente in file JSON di grandi dimensioni"""
         import json
-        import re
         
+        matcher = self._get_matcher(keywords, is_whole_word, matcher)
         try:
             # Per file JSON enormi, usa una strategia di parsing a blocchi
             if self.is_huge_file(file_path):
-                return self._chunk_search(file_path, keywords, is_whole_word)
+                return self._chunk_search(file_path, keywords, is_whole_word, matcher)
             
             # Per file JSON di dimensioni gestibili, carica tutto
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
@@ -882,24 +1999,13 @@ class LargeFileHandler:
             
             # Converti in testo per cercare le keywords
             text = json.dumps(data, ensure_ascii=False)
-            text_lower = text.lower()
-            
-            found_keywords = set()
-            for i, keyword in enumerate(keywords):
-                keyword_lower = keyword.lower()
-                if is_whole_word:
-                    pattern = r'\b' + re.escape(keyword_lower) + r'\b'
-                    if re.search(pattern, text_lower, re.IGNORECASE):
-                        found_keywords.add(keyword)
-                else:
-                    if keyword_lower in text_lower:
-                        found_keywords.add(keyword)
+            found_keywords = matcher.find_keywords(text)
             
             return len(found_keywords) > 0, found_keywords
         except Exception as e:
             self.log(f"Errore durante il parsing JSON di {file_path}: {str(e)}", "warning")
             # Fallback alla ricerca a blocchi
-            return self._chunk_search(file_path, keywords, is_whole_word)
+            return self._chunk_search(file_path, keywords, is_whole_word, matcher)
     
     def get_file_preview(self, file_path):
         """Ottiene un'anteprima di un file di grandi dimensioni"""
@@ -913,79 +2019,3228 @@ class LargeFileHandler:
                     return f"[Anteprima non disponibile: contenuto binario]"
         except Exception as e:
             return f"[Errore nell'apertura del file: {str(e)}]"
-        
-class FileSearchApp:
-    @error_handler
-    def __init__(self, root):
-            self.root = root
-            self.root.title(APP_TITLE)
-            
-            # Reset monitoraggio memoria
-            self.search_in_progress = False
-            self.memory_monitor_id = None
-            
-            # Imposta subito il debug mode per poter loggare
-            self.debug_mode = True
-            self.debug_log = []
-            # Aggiungi questa riga per inizializzare current_user
-            self.current_user = getpass.getuser()
-            
-            # Imposta icona se disponibile
-            try:
-                icon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "search_icon.ico")
-                if os.path.exists(icon_path):
-                    self.root.iconbitmap(icon_path)
-            except:
-                pass
-        
-            # Assicurati che all'avvio non ci siano timer attivi da esecuzioni precedenti
-            for attr in dir(self):
-                if attr.startswith('_after_id_') or attr.endswith('_timer_id'):
-                    try:
-                        after_id = getattr(self, attr)
-                        if isinstance(after_id, int) and after_id > 0:
-                            self.root.after_cancel(after_id)
-                            self.debug_log.append(f"[DEBUG] Cancellato timer {attr}: {after_id}")
-                    except Exception:
-                        pass  # Ignora errori nel cleanup iniziale
-            
-            # Inizializza tutte le variabili in un passaggio
-            self._init_essential_variables()
-            self._init_remaining_variables()
-            
-            # Crea l'intera interfaccia in una volta sola
-            self.create_widgets()
-            
-            # Esegui attività di background dopo un breve ritardo
-            self.root.after(500, self._delayed_startup_tasks)
-            # Controlla gli aggiornamenti all'avvio (dopo l'inizializzazione completa)
-            self.root.after(5000, self.check_for_updates_on_startup)
-
-    @error_handler
-    def create_base_interface(self):
-        """Crea solo l'interfaccia essenziale per un avvio veloce"""
-        # Forza l'aggiornamento dell'interfaccia
-        self.root.update_idletasks()
 
-    @error_handler
-    def complete_initialization(self):
-        """Completa l'inizializzazione dell'applicazione"""
+class ExtractedTextCache:
+    """Cache persistente del testo estratto dai file (SQLite sotto ~/.file_search_tool).
+    La chiave è (percorso, dimensione, data modifica, versione estrattori): se il file
+    cambia o gli estrattori vengono aggiornati la voce non è più valida. Il testo è
+    salvato compresso con zlib; oltre max_bytes vengono eliminate le voci usate meno
+    di recente (LRU). I PDF sono memorizzati anche pagina per pagina (extracted_pages),
+    così una ricerca interrotta alla prima corrispondenza lascia in cache le pagine lette."""
+    
+    # Da incrementare quando cambia il testo prodotto da get_file_content
+    EXTRACTOR_VERSION = 2
+    
+    def __init__(self, db_path=None, max_bytes=512 * 1024 * 1024, logger=None):
+        self.logger = logger
+        self.db_path = db_path or os.path.join(os.path.expanduser("~"), ".file_search_tool", "extracted_text_cache.db")
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.total_bytes = 0
+        self.available = False
+        self._lock = threading.Lock()
+        self._conn = None
+        
         try:
-            # Rimuovi i componenti temporanei
-            if hasattr(self, 'status_label'):
-                self.status_label.destroy()
-            if hasattr(self, 'progress_bar'):
-                self.progress_bar.stop()
-                self.progress_bar.destroy()
-            
-            # Inizializza le variabili rimanenti
-            self._init_remaining_variables()
-            
-            # Crea l'interfaccia completa
-            self.create_widgets()
-            
-            # Esegui le altre operazioni iniziali
-            self._delayed_startup_tasks()
+            import sqlite3
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=10)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS extracted_text ("
+                " path TEXT PRIMARY KEY, size INTEGER, mtime REAL, version INTEGER,"
+                " kind TEXT, data BLOB, stored_size INTEGER, last_access REAL)")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_extracted_text_access ON extracted_text(last_access)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS extracted_pages ("
+                " path TEXT, page INTEGER, size INTEGER, mtime REAL, version INTEGER,"
+                " data BLOB, stored_size INTEGER, last_access REAL, page_count INTEGER,"
+                " PRIMARY KEY (path, page))")
+            self._conn.commit()
+            row = self._conn.execute(
+                "SELECT (SELECT COALESCE(SUM(stored_size), 0) FROM extracted_text) +"
+                " (SELECT COALESCE(SUM(stored_size), 0) FROM extracted_pages)").fetchone()
+            self.total_bytes = row[0]
+            self.available = True
+        except Exception as e:
+            self.log(f"Cache del testo estratto non disponibile: {str(e)}", "warning")
+            self._conn = None
+    
+    def log(self, message, level="info"):
+        if self.logger:
+            if level == "debug":
+                self.logger.debug(message)
+            elif level == "info":
+                self.logger.info(message)
+            elif level == "warning":
+                self.logger.warning(message)
+            elif level == "error":
+                self.logger.error(message)
+    
+    @staticmethod
+    def _key_path(file_path):
+        return os.path.normcase(os.path.abspath(file_path))
+    
+    def get(self, file_path, size, mtime):
+        """Restituisce il contenuto in cache (str o dict per gli archivi) o None"""
+        if not self.available:
+            return None
+        key = self._key_path(file_path)
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT size, mtime, version, kind, data FROM extracted_text WHERE path = ?",
+                    (key,)).fetchone()
+                if row is None or row[0] != size or row[1] != mtime or row[2] != self.EXTRACTOR_VERSION:
+                    self.misses += 1
+                    return None
+                self._conn.execute("UPDATE extracted_text SET last_access = ? WHERE path = ?",
+                                   (time.time(), key))
+                self.hits += 1
+            
+            text = zlib.decompress(row[4]).decode('utf-8')
+            return json.loads(text) if row[3] == "archive" else text
+        except Exception as e:
+            self.log(f"Errore nella lettura della cache per {file_path}: {str(e)}", "warning")
+            return None
+    
+    def put(self, file_path, size, mtime, content):
+        """Memorizza il testo estratto (str) o il contenuto di un archivio (dict)"""
+        if not self.available or not content:
+            return
+        try:
+            if isinstance(content, dict):
+                kind, text = "archive", json.dumps(content, ensure_ascii=False)
+            else:
+                kind, text = "text", content
+            data = zlib.compress(text.encode('utf-8', errors='replace'), 6)
+            
+            with self._lock:
+                key = self._key_path(file_path)
+                old = self._conn.execute("SELECT stored_size FROM extracted_text WHERE path = ?",
+                                         (key,)).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO extracted_text VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, size, mtime, self.EXTRACTOR_VERSION, kind, data, len(data), time.time()))
+                self.total_bytes += len(data) - (old[0] if old else 0)
+                self.stores += 1
+                if self.total_bytes > self.max_bytes:
+                    self._evict()
+                self._conn.commit()
+        except Exception as e:
+            self.log(f"Errore nella scrittura della cache per {file_path}: {str(e)}", "warning")
+    
+    def get_pages(self, file_path, size, mtime):
+        """Pagine in cache di un PDF: ({numero di pagina: testo}, numero di pagine del
+        documento o 0 se non noto)"""
+        if not self.available:
+            return {}, 0
+        key = self._key_path(file_path)
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT page, data, page_count FROM extracted_pages"
+                    " WHERE path = ? AND size = ? AND mtime = ? AND version = ?",
+                    (key, size, mtime, self.EXTRACTOR_VERSION)).fetchall()
+                if not rows:
+                    self.misses += 1
+                    return {}, 0
+                self._conn.execute("UPDATE extracted_pages SET last_access = ? WHERE path = ?",
+                                   (time.time(), key))
+                self.hits += 1
+            pages = {page: zlib.decompress(data).decode('utf-8') for page, data, _ in rows}
+            return pages, max(page_count or 0 for _, _, page_count in rows)
+        except Exception as e:
+            self.log(f"Errore nella lettura delle pagine in cache per {file_path}: {str(e)}", "warning")
+            return {}, 0
+    
+    def put_pages(self, file_path, size, mtime, pages, page_count=0):
+        """Memorizza le pagine di un PDF: [(numero di pagina, testo compresso con zlib)]
+        e il numero di pagine del documento. Le pagine di una versione precedente del
+        file vengono eliminate."""
+        if not self.available or not pages:
+            return
+        try:
+            with self._lock:
+                key = self._key_path(file_path)
+                stale = self._conn.execute(
+                    "SELECT COALESCE(SUM(stored_size), 0) FROM extracted_pages"
+                    " WHERE path = ? AND (size != ? OR mtime != ? OR version != ?)",
+                    (key, size, mtime, self.EXTRACTOR_VERSION)).fetchone()[0]
+                self._conn.execute(
+                    "DELETE FROM extracted_pages WHERE path = ? AND (size != ? OR mtime != ? OR version != ?)",
+                    (key, size, mtime, self.EXTRACTOR_VERSION))
+                self.total_bytes -= stale
+                now = time.time()
+                for page, data in pages:
+                    old = self._conn.execute(
+                        "SELECT stored_size FROM extracted_pages WHERE path = ? AND page = ?",
+                        (key, page)).fetchone()
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO extracted_pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (key, page, size, mtime, self.EXTRACTOR_VERSION, data, len(data), now, page_count))
+                    self.total_bytes += len(data) - (old[0] if old else 0)
+                if page_count:
+                    self._conn.execute("UPDATE extracted_pages SET page_count = ? WHERE path = ?",
+                                       (page_count, key))
+                self.stores += 1
+                if self.total_bytes > self.max_bytes:
+                    self._evict()
+                self._conn.commit()
+        except Exception as e:
+            self.log(f"Errore nella scrittura delle pagine in cache per {file_path}: {str(e)}", "warning")
+    
+    def _evict(self):
+        """Elimina le voci meno usate finché la cache scende al 90% del limite"""
+        target = self.max_bytes * 0.9
+        rows = self._conn.execute(
+            "SELECT path, NULL, stored_size, last_access FROM extracted_text"
+            " UNION ALL SELECT path, page, stored_size, last_access FROM extracted_pages"
+            " ORDER BY last_access").fetchall()
+        removed = []
+        removed_pages = []
+        for path, page, stored_size, _ in rows:
+            if self.total_bytes <= target:
+                break
+            if page is None:
+                removed.append((path,))
+            else:
+                removed_pages.append((path, page))
+            self.total_bytes -= stored_size
+        self._conn.executemany("DELETE FROM extracted_text WHERE path = ?", removed)
+        self._conn.executemany("DELETE FROM extracted_pages WHERE path = ? AND page = ?", removed_pages)
+        self.evictions += len(removed) + len(removed_pages)
+    
+    def remove(self, paths):
+        """Elimina dalla cache le voci dei file non più esistenti"""
+        if not self.available or not paths:
+            return
+        try:
+            with self._lock:
+                keys = [(self._key_path(p),) for p in paths]
+                for (key,) in keys:
+                    row = self._conn.execute(
+                        "SELECT (SELECT COALESCE(SUM(stored_size), 0) FROM extracted_text WHERE path = ?) +"
+                        " (SELECT COALESCE(SUM(stored_size), 0) FROM extracted_pages WHERE path = ?)",
+                        (key, key)).fetchone()
+                    self.total_bytes -= row[0]
+                self._conn.executemany("DELETE FROM extracted_text WHERE path = ?", keys)
+                self._conn.executemany("DELETE FROM extracted_pages WHERE path = ?", keys)
+                self._conn.commit()
+        except Exception as e:
+            self.log(f"Errore nella rimozione dalla cache: {str(e)}", "warning")
+    
+    def get_stats(self):
+        """Contatori di utilizzo della cache"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits / lookups * 100) if lookups else 0.0,
+            "size_bytes": self.total_bytes,
+        }
+    
+    def reset_stats(self):
+        self.hits = self.misses = self.stores = self.evictions = 0
+    
+    def clear(self):
+        """Svuota completamente la cache"""
+        if not self.available:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM extracted_text")
+            self._conn.execute("DELETE FROM extracted_pages")
+            self._conn.commit()
+            self.total_bytes = 0
+    
+    def close(self):
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+                self.available = False
+
+class LocalSearchIndex:
+    """Indice full-text locale (SQLite FTS5) costruito dal testo estratto dai file.
+    Non dipende dal servizio Windows Search: funziona anche su Linux e sui server.
+    Con il tokenizer trigram le keyword di almeno 3 caratteri vengono risolte come
+    sottostringhe direttamente dall'indice; i candidati sono poi verificati con il
+    KeywordMatcher della ricerca (parola intera, maiuscole/minuscole)."""
+    
+    def __init__(self, db_path=None, logger=None):
+        self.logger = logger
+        self.db_path = db_path or os.path.join(os.path.expanduser("~"), ".file_search_tool", "local_index.db")
+        self.available = False
+        self.tokenizer = None
+        self._lock = threading.Lock()
+        self._conn = None
+        
+        try:
+            import sqlite3
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=10)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS indexed_files ("
+                " id INTEGER PRIMARY KEY, path TEXT UNIQUE, size INTEGER, mtime REAL, has_content INTEGER)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS indexed_roots (root TEXT PRIMARY KEY, updated_at REAL)")
+            # Snapshot delle cartelle per l'aggiornamento incrementale (IncrementalCrawler)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS dir_snapshots ("
+                " path TEXT PRIMARY KEY, mtime REAL, scanned_at REAL, subdirs TEXT)")
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(indexed_files)")]
+            if "inode" not in columns:
+                self._conn.execute("ALTER TABLE indexed_files ADD COLUMN inode INTEGER DEFAULT 0")
+            
+            # trigram consente la ricerca per sottostringa; unicode61 solo per parole
+            for tokenizer in ("trigram", "unicode61"):
+                try:
+                    self._conn.execute(
+                        "CREATE VIRTUAL TABLE IF NOT EXISTS file_text USING fts5("
+                        f"name, body, tokenize='{tokenizer}')")
+                    self.tokenizer = tokenizer
+                    break
+                except sqlite3.OperationalError:
+                    continue
+            if self.tokenizer is None:
+                raise RuntimeError("SQLite senza supporto FTS5")
+            
+            # Se la tabella esisteva già, rileva il tokenizer con cui è stata creata
+            row = self._conn.execute(
+                "SELECT sql FROM sqlite_master WHERE name = 'file_text'").fetchone()
+            if row and "trigram" not in row[0]:
+                self.tokenizer = "unicode61"
+            self._conn.commit()
+            self.available = True
+        except Exception as e:
+            self.log(f"Indice locale non disponibile: {str(e)}", "warning")
+            self._conn = None
+    
+    def log(self, message, level="info"):
+        if self.logger:
+            if level == "debug":
+                self.logger.debug(message)
+            elif level == "info":
+                self.logger.info(message)
+            elif level == "warning":
+                self.logger.warning(message)
+            elif level == "error":
+                self.logger.error(message)
+    
+    @staticmethod
+    def normalize_root(root):
+        return os.path.normpath(os.path.abspath(root))
+    
+    def _path_range(self, root):
+        """Limiti (inclusivo, esclusivo) dei percorsi sotto root, per usare l'indice su path"""
+        prefix = root if root.endswith(os.sep) else root + os.sep
+        return prefix, prefix + "\U0010ffff"
+    
+    def is_indexed(self, root):
+        """True se root coincide o si trova sotto una radice già indicizzata"""
+        if not self.available:
+            return False
+        root = self.normalize_root(root)
+        with self._lock:
+            roots = [r[0] for r in self._conn.execute("SELECT root FROM indexed_roots")]
+        return any(root == r or root.startswith(r if r.endswith(os.sep) else r + os.sep) for r in roots)
+    
+    def mark_root(self, root):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO indexed_roots VALUES (?, ?)",
+                               (self.normalize_root(root), time.time()))
+            self._conn.commit()
+    
+    def get_file_states(self, root):
+        """Dizionario percorso -> (dimensione, data modifica, contenuto indicizzato, inode) dei file sotto root"""
+        low, high = self._path_range(self.normalize_root(root))
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, size, mtime, has_content, inode FROM indexed_files WHERE path >= ? AND path < ?",
+                (low, high)).fetchall()
+        return {path: (size, mtime, bool(has_content), inode or 0)
+                for path, size, mtime, has_content, inode in rows}
+    
+    def update_file(self, file_path, size, mtime, body="", has_content=False, inode=0):
+        """Inserisce o aggiorna un file nell'indice.
+        has_content indica se il contenuto è stato estratto o solo il nome è indicizzato."""
+        name = os.path.basename(file_path)
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM indexed_files WHERE path = ?", (file_path,)).fetchone()
+            if row:
+                file_id = row[0]
+                self._conn.execute(
+                    "UPDATE indexed_files SET size = ?, mtime = ?, has_content = ?, inode = ? WHERE id = ?",
+                    (size, mtime, int(has_content), inode, file_id))
+                self._conn.execute("DELETE FROM file_text WHERE rowid = ?", (file_id,))
+            else:
+                file_id = self._conn.execute(
+                    "INSERT INTO indexed_files (path, size, mtime, has_content, inode) VALUES (?, ?, ?, ?, ?)",
+                    (file_path, size, mtime, int(has_content), inode)).lastrowid
+            self._conn.execute("INSERT INTO file_text (rowid, name, body) VALUES (?, ?, ?)",
+                               (file_id, name, body or ""))
+    
+    def rename_file(self, old_path, new_path):
+        """Aggiorna il percorso di un file spostato o rinominato senza estrarlo di nuovo"""
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM indexed_files WHERE path = ?", (old_path,)).fetchone()
+            if row is None:
+                return False
+            self._conn.execute("DELETE FROM indexed_files WHERE path = ?", (new_path,))
+            self._conn.execute("UPDATE indexed_files SET path = ? WHERE id = ?", (new_path, row[0]))
+            body = self._conn.execute("SELECT body FROM file_text WHERE rowid = ?", (row[0],)).fetchone()
+            self._conn.execute("DELETE FROM file_text WHERE rowid = ?", (row[0],))
+            self._conn.execute("INSERT INTO file_text (rowid, name, body) VALUES (?, ?, ?)",
+                               (row[0], os.path.basename(new_path), body[0] if body else ""))
+            return True
+    
+    def get_dir_snapshots(self, root):
+        """Dizionario cartella -> (data modifica, istante scansione, nomi sottocartelle) sotto root"""
+        root = self.normalize_root(root)
+        low, high = self._path_range(root)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, mtime, scanned_at, subdirs FROM dir_snapshots"
+                " WHERE path = ? OR (path >= ? AND path < ?)", (root, low, high)).fetchall()
+        return {path: (mtime, scanned_at, json.loads(subdirs or "[]")) for path, mtime, scanned_at, subdirs in rows}
+    
+    def save_dir_snapshot(self, dir_path, mtime, subdir_names):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO dir_snapshots VALUES (?, ?, ?, ?)",
+                               (dir_path, mtime, time.time(), json.dumps(subdir_names, ensure_ascii=False)))
+    
+    def remove_dir_snapshots(self, dir_paths):
+        with self._lock:
+            self._conn.executemany("DELETE FROM dir_snapshots WHERE path = ?", [(p,) for p in dir_paths])
+    
+    def remove_files(self, paths):
+        """Rimuove dall'indice i file non più presenti"""
+        with self._lock:
+            for file_path in paths:
+                row = self._conn.execute("SELECT id FROM indexed_files WHERE path = ?", (file_path,)).fetchone()
+                if row:
+                    self._conn.execute("DELETE FROM file_text WHERE rowid = ?", (row[0],))
+                    self._conn.execute("DELETE FROM indexed_files WHERE id = ?", (row[0],))
+    
+    def commit(self):
+        with self._lock:
+            self._conn.commit()
+    
+    def _candidate_ids(self, keyword, include_content):
+        """Rowid dei documenti che possono contenere la keyword"""
+        columns = "{name body}" if include_content else "name"
+        if self.tokenizer == "trigram" and len(keyword) >= 3:
+            phrase = '"' + keyword.replace('"', '""') + '"'
+            sql = "SELECT rowid FROM file_text WHERE file_text MATCH ?"
+            params = (f"{columns} : {phrase}",)
+        else:
+            # Keyword troppo corte per i trigrammi o tokenizer a parole: LIKE sulle colonne
+            pattern = "%" + keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            if include_content:
+                sql = "SELECT rowid FROM file_text WHERE name LIKE ? ESCAPE '\\' OR body LIKE ? ESCAPE '\\'"
+                params = (pattern, pattern)
+            else:
+                sql = "SELECT rowid FROM file_text WHERE name LIKE ? ESCAPE '\\'"
+                params = (pattern,)
+        return {row[0] for row in self._conn.execute(sql, params)}
+    
+    def query(self, root, matcher, include_content=True):
+        """Restituisce [(percorso, dimensione, data modifica)] dei file sotto root
+        che corrispondono alle keyword del matcher (nel nome o nel contenuto)"""
+        if not self.available or not matcher.keywords:
+            return []
+        low, high = self._path_range(self.normalize_root(root))
+        results = []
+        with self._lock:
+            candidate_ids = set()
+            for keyword in matcher.keywords:
+                candidate_ids |= self._candidate_ids(keyword, include_content)
+            
+            for file_id in candidate_ids:
+                row = self._conn.execute(
+                    "SELECT f.path, f.size, f.mtime, t.name, t.body FROM indexed_files f"
+                    " JOIN file_text t ON t.rowid = f.id WHERE f.id = ? AND f.path >= ? AND f.path < ?",
+                    (file_id, low, high)).fetchone()
+                if row is None:
+                    continue
+                path, size, mtime, name, body = row
+                if matcher.search(name) or (include_content and matcher.search(body)):
+                    results.append((path, size, mtime))
+        return results
+    
+    def close(self):
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+                self.available = False
+
+class ScanEntry:
+    """Voce di una cartella con i metadati già letti durante la scansione.
+    Evita di ripetere stat/isdir/exists per ogni file nelle fasi successive."""
+    __slots__ = ('path', 'name', 'is_dir', 'size', 'mtime', 'ctime', 'is_link', 'inode')
+
+    def __init__(self, path, name, is_dir, size=None, mtime=None, ctime=None, is_link=False, inode=0):
+        self.path = path
+        self.name = name
+        self.is_dir = is_dir
+        self.size = size
+        self.mtime = mtime
+        self.ctime = ctime
+        self.is_link = is_link
+        self.inode = inode  # 0 se non disponibile senza chiamate aggiuntive (Windows)
+
+    @property
+    def stat_info(self):
+        """Restituisce (dimensione, data modifica, data creazione) o None se non disponibili"""
+        if self.mtime is None:
+            return None
+        return (self.size, self.mtime, self.ctime)
+
+class SearchResult:
+    """Risultato della ricerca (file o cartella) in forma compatta.
+    Dimensione in byte e date come timestamp: la formattazione avviene solo alla
+    visualizzazione, quindi ordinamento e totali non rileggono stringhe. kind ed
+    extension sono stringhe internate condivise tra i risultati; keyword_mask ha
+    il bit i acceso se è stata trovata KeywordMatcher.keywords[i] (0 = non determinato)."""
+    __slots__ = ('kind', 'name', 'path', 'extension', 'size', 'mtime', 'ctime',
+                 'from_attachment', 'keyword_mask')
+
+    def __init__(self, kind, name, path, extension="", size=None, mtime=None, ctime=None,
+                 from_attachment=False, keyword_mask=0):
+        self.kind = sys.intern(kind)
+        self.name = name
+        self.path = path
+        self.extension = sys.intern(extension)
+        self.size = size      # None per le cartelle o se non disponibile
+        self.mtime = mtime
+        self.ctime = ctime
+        self.from_attachment = from_attachment
+        self.keyword_mask = keyword_mask
+
+    @property
+    def is_dir(self):
+        return self.kind == "Directory"
+
+    def size_text(self):
+        if self.is_dir:
+            return ""  # Le cartelle non hanno dimensione
+        if self.size is None:
+            return "N/A"
+        if self.size < 1024:
+            return f"{self.size} B"
+        if self.size < 1024 * 1024:
+            return f"{self.size / 1024:.1f} KB"
+        return f"{self.size / (1024 * 1024):.1f} MB"
+
+    @staticmethod
+    def time_text(timestamp):
+        if timestamp is None:
+            return "N/A"
+        return datetime.fromtimestamp(timestamp).strftime('%d/%m/%Y %H:%M')
+
+    def display_values(self):
+        """Valori delle colonne della lista dei risultati"""
+        return (
+            self.kind,                               # Tipo
+            "📎" if self.from_attachment else "",    # Icona allegato
+            self.size_text(),                        # Dimensione
+            self.time_text(self.mtime),              # Data modifica
+            self.time_text(self.ctime),              # Data creazione
+            self.name,                               # Nome/Autore
+            self.path                                # Percorso
+        )
+
+    def matched_keywords(self, keywords):
+        """Keyword (dalla lista usata per il matcher) indicate da keyword_mask"""
+        return [keyword for index, keyword in enumerate(keywords) if self.keyword_mask >> index & 1]
+
+    def to_dict(self, keywords=None):
+        """Record serializzabile in JSON (date in formato ISO); con keywords
+        include le keyword trovate invece della sola bitmask"""
+        record = {
+            "kind": self.kind,
+            "name": self.name,
+            "path": self.path,
+            "extension": self.extension,
+            "size": self.size,
+            "mtime": datetime.fromtimestamp(self.mtime).isoformat(timespec="seconds") if self.mtime else None,
+            "ctime": datetime.fromtimestamp(self.ctime).isoformat(timespec="seconds") if self.ctime else None,
+            "from_attachment": self.from_attachment,
+        }
+        if keywords is not None:
+            record["keywords"] = self.matched_keywords(keywords)
+        else:
+            record["keyword_mask"] = self.keyword_mask
+        return record
+
+class DirectoryScanner:
+    """Motore di attraversamento basato su os.scandir.
+    Legge ogni cartella in una sola passata: tipo, dimensione, date e attributo nascosto
+    vengono presi dai dati in cache del DirEntry (su Windows senza alcuna chiamata di sistema aggiuntiva)."""
+
+    FILE_ATTRIBUTE_HIDDEN = 0x2
+    FILE_ATTRIBUTE_REPARSE_POINT = 0x400
+    IO_REPARSE_TAG_MOUNT_POINT = 0xA0000003  # Junction
+    IO_REPARSE_TAG_SYMLINK = 0xA000000C
+    LINK_REPARSE_TAGS = frozenset((IO_REPARSE_TAG_MOUNT_POINT, IO_REPARSE_TAG_SYMLINK))
+
+    def __init__(self):
+        self.is_windows = os.name == 'nt'
+
+    @classmethod
+    def is_link_stat(cls, lstat):
+        """True per symlink e junction (stat di Windows senza follow_symlinks).
+        Gli altri reparse point, come i segnaposto di OneDrive o i file deduplicati,
+        sono file e cartelle normali: dimensione e date sono quelle della voce stessa."""
+        return bool(lstat.st_file_attributes & cls.FILE_ATTRIBUTE_REPARSE_POINT and
+                    getattr(lstat, 'st_reparse_tag', 0) in cls.LINK_REPARSE_TAGS)
+
+    def scan(self, directory, ignore_hidden=True):
+        """Elenca una cartella e restituisce (sottocartelle, file) come liste di ScanEntry.
+        Le eccezioni di accesso (PermissionError, OSError) vengono propagate al chiamante."""
+        subdirs = []
+        files = []
+        with os.scandir(directory) as iterator:
+            for dir_entry in iterator:
+                name = dir_entry.name
+                if ignore_hidden and name.startswith('.'):
+                    continue
+
+                try:
+                    lstat = None
+                    if self.is_windows:
+                        # Su Windows lo stat senza follow_symlinks è già in cache da FindNextFile
+                        lstat = dir_entry.stat(follow_symlinks=False)
+                        attributes = lstat.st_file_attributes
+                        if ignore_hidden and attributes & self.FILE_ATTRIBUTE_HIDDEN:
+                            continue
+                        is_link = self.is_link_stat(lstat)
+                    else:
+                        is_link = dir_entry.is_symlink()
+
+                    if dir_entry.is_dir():
+                        entry = ScanEntry(dir_entry.path, name, True, is_link=is_link)
+                        if lstat is not None and not is_link:
+                            entry.mtime = lstat.st_mtime
+                            entry.ctime = lstat.st_ctime
+                        subdirs.append(entry)
+                    else:
+                        file_stat = lstat if lstat is not None and not is_link else dir_entry.stat()
+                        files.append(ScanEntry(dir_entry.path, name, False, file_stat.st_size,
+                                               file_stat.st_mtime, file_stat.st_ctime, is_link,
+                                               file_stat.st_ino))
+                except OSError:
+                    # Link interrotto o voce scomparsa durante la scansione: la tratta come file senza metadati
+                    files.append(ScanEntry(dir_entry.path, name, False))
+        return subdirs, files
+
+    @staticmethod
+    def visit_key(entry):
+        """Chiave per il rilevamento dei cicli: il percorso reale viene calcolato solo per link e junction"""
+        if entry.is_link:
+            try:
+                return os.path.normcase(os.path.realpath(entry.path))
+            except OSError:
+                pass
+        return os.path.normcase(entry.path)
+
+    @staticmethod
+    def link_target_key(path):
+        """Identità (dispositivo, inode) della cartella a cui porta un link o la radice;
+        il percorso reale dove l'inode non è disponibile. None se non raggiungibile."""
+        try:
+            st = os.stat(path)
+            if st.st_ino:
+                return (st.st_dev, st.st_ino)
+            return os.path.normcase(os.path.realpath(path))
+        except OSError:
+            return None
+
+    @staticmethod
+    def root_visit_key(path):
+        """Chiave per il rilevamento dei cicli della cartella di partenza"""
+        try:
+            return os.path.normcase(os.path.realpath(path))
+        except OSError:
+            return os.path.normcase(path)
+
+class CrawlReport:
+    """Differenze rilevate da un aggiornamento incrementale rispetto allo snapshot precedente"""
+    
+    def __init__(self, root):
+        self.root = root
+        self.added = 0
+        self.changed = 0
+        self.removed = 0
+        self.moved = 0
+        self.unchanged = 0
+        self.dirs_scanned = 0
+        self.dirs_skipped = 0
+        self.elapsed = 0.0
+        self.time_saved = 0.0  # Stima del tempo evitato rispetto a una scansione completa
+        self.interrupted = False
+    
+    @property
+    def files_seen(self):
+        return self.added + self.changed + self.moved + self.unchanged
+    
+    def summary(self):
+        return (f"Aggiornamento incrementale di {self.root}: {self.added} aggiunti, {self.changed} modificati, "
+                f"{self.removed} rimossi, {self.moved} spostati, {self.unchanged} invariati; "
+                f"cartelle lette {self.dirs_scanned}, saltate {self.dirs_skipped}; "
+                f"durata {self.elapsed:.1f}s, tempo risparmiato stimato {self.time_saved:.1f}s"
+                + (" (interrotto)" if self.interrupted else ""))
+
+class IncrementalCrawler:
+    """Aggiornamento incrementale dell'indice locale basato su snapshot.
+    Le cartelle con data di modifica invariata non vengono rilette (si riusa l'elenco
+    delle sottocartelle salvato); i file già noti vengono comunque verificati con
+    os.stat, perché la modifica di un file non aggiorna la data della cartella che lo
+    contiene, e vengono estratti solo quelli con dimensione o data di modifica cambiate.
+    I file spostati sono riconosciuti dall'inode, dove disponibile. Gli snapshot più
+    vecchi di max_snapshot_age vengono comunque riletti."""
+    
+    def __init__(self, index, scanner, text_cache=None, max_snapshot_age=6 * 3600):
+        self.index = index
+        self.scanner = scanner
+        self.text_cache = text_cache
+        self.max_snapshot_age = max_snapshot_age
+        # Tempi medi delle ultime letture/estrazioni, per stimare il tempo risparmiato
+        self.average_scan_time = 0.0
+        self.average_extract_time = 0.0
+    
+    def crawl(self, root, extract, needs_content=None, ignore_hidden=True,
+              should_stop=None, skip_dir=None, on_folder=None, executor_provider=None, max_pending=64):
+        """Aggiorna l'indice per root e restituisce un CrawlReport.
+        extract(entry) -> testo da indicizzare, o None se va indicizzato solo il nome
+        needs_content(path) -> True se per il file serve il contenuto
+        skip_dir(path) -> True per le cartelle escluse
+        on_folder(path, name, stat_info) viene chiamata per ogni sottocartella
+        executor_provider() -> executor del pool di analisi: se indicato, extract viene
+        eseguita in parallelo (FilePipeline, al massimo max_pending file in attesa).
+        Ogni file nuovo o modificato viene accodato appena classificato, senza attendere
+        la fine della scansione."""
+        report = CrawlReport(root)
+        start_time = time.time()
+        root = self.index.normalize_root(root)
+        known = self.index.get_file_states(root)
+        snapshots = self.index.get_dir_snapshots(root)
+        
+        known_by_dir = {}
+        for file_path in known:
+            known_by_dir.setdefault(os.path.dirname(file_path), []).append(file_path)
+        
+        # Spostamenti: un file "nuovo" con lo stesso inode, dimensione e data di un file
+        # noto che non esiste più viene rinominato nell'indice invece di essere estratto
+        known_by_signature = {}
+        for file_path, (size, mtime, _, inode) in known.items():
+            if inode:
+                known_by_signature[(inode, size, mtime)] = file_path
+        
+        seen_files = set()
+        seen_dirs = set()
+        pruned_dirs = set()  # Escluse da skip_dir: il loro contenuto resta nell'indice
+        new_snapshots = []
+        unchanged_with_content = 0
+        scan_time = 0.0
+        extract_time = 0.0
+        extracted = 0
+        visited = {DirectoryScanner.root_visit_key(root)}
+        stack = [(root, None)]
+        
+        # Le estrazioni nel pool di analisi consegnano il testo su finished: l'indice
+        # viene aggiornato solo da questo thread
+        finished = queue.Queue()
+        pipeline = (FilePipeline(executor_provider, finished.put, max_pending, should_stop)
+                    if executor_provider is not None else None)
+        
+        def run_extract(entry, kind):
+            extract_start = time.time()
+            return entry, kind, extract(entry), time.time() - extract_start
+        
+        def store(entry, kind, body, elapsed):
+            nonlocal extract_time, extracted
+            extract_time += elapsed
+            extracted += 1
+            self.index.update_file(os.path.normpath(entry.path), entry.size, entry.mtime, body or "",
+                                   has_content=body is not None, inode=entry.inode or 0)
+            if kind == "added":
+                report.added += 1
+            else:
+                report.changed += 1
+            if extracted % 200 == 0:
+                self.index.commit()
+        
+        def store_finished():
+            while True:
+                try:
+                    store(*finished.get_nowait())
+                except queue.Empty:
+                    return
+        
+        def dispatch(entry, kind):
+            """Accoda l'estrazione appena il file è classificato; False se interrotta"""
+            if kind == "added" and entry.inode:
+                old_path = known_by_signature.get((entry.inode, entry.size, entry.mtime))
+                if (old_path and old_path not in seen_files and not os.path.lexists(old_path)
+                        and self.index.rename_file(old_path, os.path.normpath(entry.path))):
+                    del known_by_signature[(entry.inode, entry.size, entry.mtime)]
+                    seen_files.add(old_path)  # Rinominato: non va tolto dall'indice
+                    report.moved += 1
+                    return True
+            
+            if pipeline is None or not pipeline.submit(run_extract, entry, kind):
+                if should_stop and should_stop():
+                    return False
+                store(*run_extract(entry, kind))
+            store_finished()
+            return True
+        
+        while stack:
+            if report.interrupted or (should_stop and should_stop()):
+                report.interrupted = True
+                break
+            
+            current, dir_mtime = stack.pop()
+            if skip_dir and skip_dir(current):
+                pruned_dirs.add(current)
+                continue
+            if dir_mtime is None:
+                try:
+                    dir_mtime = os.stat(current).st_mtime
+                except OSError:
+                    continue
+            seen_dirs.add(current)
+            
+            snapshot = snapshots.get(current)
+            if (snapshot and snapshot[0] == dir_mtime
+                    and start_time - snapshot[1] < self.max_snapshot_age):
+                # Elenco della cartella invariato: nessuna lettura, si riusa lo snapshot
+                report.dirs_skipped += 1
+                for name, is_link in snapshot[2]:
+                    sub_path = os.path.join(current, name)
+                    entry = ScanEntry(sub_path, name, True, is_link=is_link)
+                    visit_key = DirectoryScanner.visit_key(entry)
+                    if visit_key in visited:
+                        continue
+                    visited.add(visit_key)
+                    if on_folder:
+                        on_folder(sub_path, name, None)
+                    stack.append((sub_path, None))
+                
+                for file_path in known_by_dir.get(current, []):
+                    # Si evita solo l'elenco della cartella: le modifiche sul posto non ne
+                    # cambiano la data, quindi ogni file noto viene verificato
+                    try:
+                        st = os.stat(file_path)
+                    except OSError:
+                        continue  # Non più presente: viene rimosso dall'indice
+                    seen_files.add(file_path)
+                    state = known[file_path]
+                    if (state[0] != st.st_size or state[1] != st.st_mtime or
+                            (not state[2] and needs_content and needs_content(file_path))):
+                        entry = ScanEntry(file_path, os.path.basename(file_path), False, st.st_size,
+                                          st.st_mtime, st.st_ctime, inode=st.st_ino)
+                        if not dispatch(entry, "changed"):
+                            report.interrupted = True
+                            break
+                    else:
+                        report.unchanged += 1
+                        unchanged_with_content += state[2]
+                continue
+            
+            scan_start = time.time()
+            try:
+                subdir_entries, file_entries = self.scanner.scan(current, ignore_hidden)
+            except OSError:
+                continue
+            scan_time += time.time() - scan_start
+            report.dirs_scanned += 1
+            
+            subdir_names = []
+            for entry in subdir_entries:
+                visit_key = DirectoryScanner.visit_key(entry)
+                if visit_key in visited:
+                    continue
+                visited.add(visit_key)
+                subdir_names.append([entry.name, entry.is_link])
+                if on_folder:
+                    on_folder(entry.path, entry.name, entry.stat_info)
+                stack.append((entry.path, None if entry.is_link else entry.mtime))
+            
+            for entry in file_entries:
+                file_path = os.path.normpath(entry.path)
+                seen_files.add(file_path)
+                state = known.get(file_path)
+                if state is None:
+                    kind = "added"
+                elif (state[0] != entry.size or state[1] != entry.mtime or
+                        (not state[2] and needs_content and needs_content(file_path))):
+                    kind = "changed"
+                else:
+                    report.unchanged += 1
+                    unchanged_with_content += state[2]
+                    continue
+                if not dispatch(entry, kind):
+                    report.interrupted = True
+                    break
+            new_snapshots.append((current, dir_mtime, subdir_names))
+        
+        if pipeline is not None:
+            if not pipeline.drain():
+                report.interrupted = True
+            store_finished()
+        removed = [] if report.interrupted else self._removed_files(known, seen_files, seen_dirs, pruned_dirs)
+        
+        # Rimozioni e nuovi snapshot valgono solo per una scansione completa: se interrotta,
+        # la prossima rilegge le stesse cartelle
+        if not report.interrupted:
+            self.index.remove_files(removed)
+            if self.text_cache is not None:
+                # Il testo estratto resta in cache finché il file esiste ancora
+                self.text_cache.remove([p for p in removed if not os.path.exists(p)])
+            report.removed = len(removed)
+            # Le cartelle non visitate perché escluse o nascoste conservano lo snapshot
+            self.index.remove_dir_snapshots([p for p in snapshots if p not in seen_dirs
+                                             and not self._within(p, pruned_dirs)
+                                             and not os.path.isdir(p)])
+            for dir_path, dir_mtime, subdir_names in new_snapshots:
+                self.index.save_dir_snapshot(dir_path, dir_mtime, subdir_names)
+            self.index.mark_root(root)
+        self.index.commit()
+        
+        report.elapsed = time.time() - start_time
+        if report.dirs_scanned:
+            self.average_scan_time = scan_time / report.dirs_scanned
+        if extracted:
+            self.average_extract_time = extract_time / extracted
+        report.time_saved = (report.dirs_skipped * self.average_scan_time +
+                             unchanged_with_content * self.average_extract_time)
+        return report
+    
+    @staticmethod
+    def _within(path, dirs):
+        """True se path è una delle cartelle dirs o si trova al loro interno"""
+        while path not in dirs:
+            parent = os.path.dirname(path)
+            if parent == path:
+                return False
+            path = parent
+        return True
+    
+    def _removed_files(self, known, seen_files, seen_dirs, pruned_dirs):
+        """File noti da togliere dall'indice. Un file non visto è rimosso se la sua
+        cartella è stata letta (o verificata dallo snapshot) oppure non esiste più;
+        i file nelle cartelle escluse da skip_dir o nascoste restano indicizzati."""
+        removed = []
+        dir_exists = {}
+        for file_path in known:
+            if file_path in seen_files:
+                continue
+            parent = os.path.dirname(file_path)
+            if parent not in seen_dirs:
+                if self._within(parent, pruned_dirs):
+                    continue
+                if parent not in dir_exists:
+                    dir_exists[parent] = os.path.isdir(parent)
+                if dir_exists[parent]:
+                    continue
+            removed.append(file_path)
+        return removed
+
+def _extract_office_text_com(file_path, app_name):
+    """Estrae il testo di un documento DOC o PPT tramite automazione COM di Office.
+    Funzione di modulo per poter essere eseguita in un processo separato
+    (DeadlineScheduler.run_isolated): Word e PowerPoint possono bloccarsi su un
+    documento danneggiato o su una finestra di dialogo e non sono interrompibili."""
+    import win32com.client
+    import pythoncom
+    
+    pythoncom.CoInitialize()
+    application = None
+    document = None
+    try:
+        application = win32com.client.Dispatch(app_name)
+        if app_name == "Word.Application":
+            application.Visible = False
+            application.DisplayAlerts = False
+            document = application.Documents.Open(os.path.abspath(file_path), ReadOnly=True)
+            return document.Content.Text or ""
+        
+        document = application.Presentations.Open(os.path.abspath(file_path), WithWindow=False)
+        texts = []
+        for slide_idx in range(1, document.Slides.Count + 1):
+            slide = document.Slides.Item(slide_idx)
+            texts.append(f"--- Diapositiva {slide_idx} ---")
+            slide_text = []
+            for shape_idx in range(1, slide.Shapes.Count + 1):
+                shape = slide.Shapes.Item(shape_idx)
+                if shape.HasTextFrame and shape.TextFrame.HasText:
+                    slide_text.append(shape.TextFrame.TextRange.Text)
+            if slide_text:
+                texts.append("\n".join(slide_text))
+        return "\n".join(texts)
+    finally:
+        try:
+            if document is not None:
+                if app_name == "Word.Application":
+                    document.Close(SaveChanges=False)
+                else:
+                    document.Close()
+            if application is not None:
+                application.Quit()
+        except Exception:
+            pass
+        pythoncom.CoUninitialize()
+
+def _isolated_worker(connection, func, args):
+    """Punto di ingresso del processo figlio di DeadlineScheduler.run_isolated"""
+    try:
+        connection.send((True, func(*args)))
+    except BaseException as e:
+        connection.send((False, f"{type(e).__name__}: {e}"))
+    finally:
+        connection.close()
+
+# Formati estratti da parser in puro Python che trattengono il GIL: vengono
+# affidati ai processi di ExtractionProcessPool invece che ai thread di ricerca
+PROCESS_EXTRACTION_EXTENSIONS = frozenset(['.pdf', '.xlsx', '.docx', '.pptx', '.odt', '.ods', '.odp', '.msg'])
+DEFAULT_EXTRACTION_PROCESSES = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+def _iter_xlsx_text(file_path, should_stop=None):
+    """Testo di una cartella di lavoro XLSX una riga alla volta, per tutti i fogli e
+    tutte le celle: "--- Foglio: nome ---" prima della prima riga non vuota di ogni
+    foglio, poi una stringa per riga. La memoria usata non dipende dalla dimensione
+    dei fogli; chi smette di consumare le righe interrompe la lettura."""
+    try:
+        import openpyxl
+    except ImportError:
+        rows = _iter_xlsx_xml_rows(file_path)
+    else:
+        rows = _iter_openpyxl_rows(openpyxl.load_workbook(file_path, read_only=True, data_only=True))
+    
+    current_sheet = None
+    try:
+        for sheet_name, values in rows:
+            if should_stop and should_stop():
+                break
+            row_text = " ".join(str(value) for value in values if value)
+            if not row_text:
+                continue
+            if sheet_name != current_sheet:
+                current_sheet = sheet_name
+                yield f"--- Foglio: {sheet_name} ---"
+            yield row_text
+    finally:
+        rows.close()
+
+def _iter_openpyxl_rows(wb):
+    """(foglio, valori) per ogni riga di una cartella di lavoro openpyxl in sola lettura,
+    chiusa al termine. iter_rows legge l'XML del foglio in sequenza, mentre
+    sheet.cell() in sola lettura lo rianalizzerebbe a ogni accesso."""
+    try:
+        for sheet in wb.worksheets:
+            for values in sheet.iter_rows(values_only=True):
+                yield sheet.title, values
+    finally:
+        wb.close()
+
+XLSX_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+XLSX_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PACKAGE_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+def _xlsx_sheet_parts(package):
+    """[(nome del foglio, parte XML)] nell'ordine della cartella di lavoro"""
+    import xml.etree.ElementTree as ET
+    names = set(package.namelist())
+    try:
+        workbook = ET.fromstring(package.read('xl/workbook.xml'))
+        relations = ET.fromstring(package.read('xl/_rels/workbook.xml.rels'))
+    except (KeyError, ET.ParseError):
+        # Pacchetto senza relazioni: fogli nell'ordine dei nomi delle parti
+        return [(os.path.splitext(os.path.basename(name))[0], name) for name in sorted(names)
+                if name.startswith('xl/worksheets/') and name.endswith('.xml')]
+    
+    targets = {}
+    for relation in relations.iter(PACKAGE_REL_NS + 'Relationship'):
+        target = relation.get('Target', '')
+        targets[relation.get('Id')] = target.lstrip('/') if target.startswith('/') else 'xl/' + target
+    parts = []
+    for sheet in workbook.iter(XLSX_MAIN_NS + 'sheet'):
+        part = targets.get(sheet.get(XLSX_REL_NS + 'id'))
+        if part in names:
+            parts.append((sheet.get('name', part), part))
+    return parts
+
+def _iter_xlsx_xml_rows(file_path):
+    """(foglio, valori) per ogni riga, letti direttamente dall'XML del pacchetto quando
+    openpyxl non è installato. Le stringhe condivise vengono caricate una volta; i
+    fogli sono analizzati con iterparse e ogni riga viene scartata appena letta.
+    Restituisce i valori memorizzati nel file (date come numeri seriali)."""
+    import xml.etree.ElementTree as ET
+    cell_tag, row_tag = XLSX_MAIN_NS + 'c', XLSX_MAIN_NS + 'row'
+    text_tag, value_tag = XLSX_MAIN_NS + 't', XLSX_MAIN_NS + 'v'
+    
+    with zipfile.ZipFile(file_path) as package:
+        shared = []
+        if 'xl/sharedStrings.xml' in package.namelist():
+            with package.open('xl/sharedStrings.xml') as f:
+                for _, element in ET.iterparse(f):
+                    if element.tag == XLSX_MAIN_NS + 'si':
+                        shared.append("".join(t.text or "" for t in element.iter(text_tag)))
+                        element.clear()
+        
+        for sheet_name, part in _xlsx_sheet_parts(package):
+            with package.open(part) as f:
+                sheet_data = None
+                for event, element in ET.iterparse(f, events=('start', 'end')):
+                    if event == 'start':
+                        if element.tag == XLSX_MAIN_NS + 'sheetData':
+                            sheet_data = element
+                        continue
+                    if element.tag != row_tag:
+                        continue
+                    values = []
+                    for cell in element.iter(cell_tag):
+                        cell_type = cell.get('t')
+                        if cell_type == 'inlineStr':
+                            values.append("".join(t.text or "" for t in cell.iter(text_tag)))
+                            continue
+                        value = cell.findtext(value_tag)
+                        if value is not None and cell_type == 's':
+                            try:
+                                value = shared[int(value)]
+                            except (ValueError, IndexError):
+                                pass
+                        values.append(value)
+                    # Righe già lette rimosse dall'albero: memoria costante anche
+                    # per fogli con milioni di righe
+                    if sheet_data is not None:
+                        sheet_data.clear()
+                    else:
+                        element.clear()
+                    yield sheet_name, values
+
+def _extract_xlsx_text(file_path, should_stop=None):
+    """Testo di tutte le celle di una cartella di lavoro XLSX (vedi _iter_xlsx_text)"""
+    return "\n".join(_iter_xlsx_text(file_path, should_stop))
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+DRAWING_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+ODF_TEXT_NS = "{urn:oasis:names:tc:opendocument:xmlns:text:1.0}"
+ODF_TABLE_NS = "{urn:oasis:names:tc:opendocument:xmlns:table:1.0}"
+ODF_DRAW_NS = "{urn:oasis:names:tc:opendocument:xmlns:drawing:1.0}"
+
+def _iterparse_blocks(source, block_tags, start_tags=()):
+    """Analizza l'XML in streaming e restituisce (evento, elemento) all'apertura dei
+    tag start_tags e alla chiusura dei tag block_tags. Dopo l'uso ogni blocco viene
+    svuotato e staccato dal genitore, quindi l'albero non cresce con il documento."""
+    import xml.etree.ElementTree as ET
+    parents = []
+    for event, element in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            if element.tag in start_tags:
+                yield event, element
+            parents.append(element)
+            continue
+        parents.pop()
+        if element.tag in block_tags:
+            yield event, element
+            element.clear()
+            if parents:
+                parents[-1].remove(element)
+
+def _ooxml_text(element, text_tag, specials):
+    """Testo di un paragrafo OOXML: nodi text_tag più i caratteri dei tag specials
+    (tabulazioni, interruzioni di riga)"""
+    parts = []
+    for node in element.iter():
+        if node.tag == text_tag:
+            if node.text:
+                parts.append(node.text)
+        elif node.tag in specials:
+            parts.append(specials[node.tag])
+    return "".join(parts)
+
+def _odf_text(element):
+    """Testo di un paragrafo ODF, con gli spazi compressi (text:s) e le tabulazioni"""
+    parts = []
+    
+    def walk(node):
+        if node.tag == ODF_TEXT_NS + 's':
+            parts.append(" " * int(node.get(ODF_TEXT_NS + 'c') or 1))
+        elif node.tag == ODF_TEXT_NS + 'tab':
+            parts.append("\t")
+        elif node.tag == ODF_TEXT_NS + 'line-break':
+            parts.append("\n")
+        elif node.text:
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+    
+    walk(element)
+    return "".join(parts)
+
+def _iter_docx_blocks(package, should_stop):
+    specials = {WORD_NS + 'tab': "\t", WORD_NS + 'br': "\n", WORD_NS + 'cr': "\n"}
+    with package.open('word/document.xml') as f:
+        # Le tabelle sono blocchi solo per essere liberate: i paragrafi delle celle
+        # vengono restituiti uno per uno
+        for _, element in _iterparse_blocks(f, {WORD_NS + 'p', WORD_NS + 'tbl'}):
+            if should_stop and should_stop():
+                return
+            if element.tag == WORD_NS + 'p':
+                yield _ooxml_text(element, WORD_NS + 't', specials)
+
+def _iter_pptx_blocks(package, should_stop):
+    def slide_number(name):
+        digits = re.findall(r'\d+', os.path.basename(name))
+        return int(digits[-1]) if digits else 0
+    
+    slides = sorted((name for name in package.namelist()
+                     if name.startswith('ppt/slides/slide') and name.endswith('.xml')), key=slide_number)
+    for index, name in enumerate(slides, 1):
+        yield f"--- Diapositiva {index} ---"
+        with package.open(name) as f:
+            for _, element in _iterparse_blocks(f, {DRAWING_NS + 'p'}):
+                if should_stop and should_stop():
+                    return
+                yield _ooxml_text(element, DRAWING_NS + 't', {DRAWING_NS + 'br': "\n"})
+
+def _iter_odf_blocks(package, should_stop, spreadsheet=False):
+    paragraph_tags = {ODF_TEXT_NS + 'p', ODF_TEXT_NS + 'h'}
+    row_tag, table_tag, page_tag = ODF_TABLE_NS + 'table-row', ODF_TABLE_NS + 'table', ODF_DRAW_NS + 'page'
+    cell_tags = {ODF_TABLE_NS + 'table-cell', ODF_TABLE_NS + 'covered-table-cell'}
+    row = None  # Celle della riga di tabella aperta
+    with package.open('content.xml') as f:
+        for event, element in _iterparse_blocks(f, paragraph_tags | {row_tag},
+                                                {row_tag, table_tag, page_tag} | cell_tags):
+            if should_stop and should_stop():
+                return
+            tag = element.tag
+            if event == 'start':
+                if tag == row_tag:
+                    row = []
+                elif tag in cell_tags:
+                    if row is not None:
+                        row.append("")
+                elif tag == table_tag:
+                    if spreadsheet:
+                        yield f"--- Foglio: {element.get(ODF_TABLE_NS + 'name', '')} ---"
+                else:
+                    yield f"--- Diapositiva: {element.get(ODF_DRAW_NS + 'name', '')} ---"
+            elif tag == row_tag:
+                if row and any(row):
+                    yield " | ".join(row)
+                row = None
+            elif row:
+                # Paragrafo di una cella: fa parte della riga
+                row[-1] += _odf_text(element)
+            else:
+                yield _odf_text(element)
+
+def _iter_office_text(file_path, should_stop=None):
+    """Testo di un documento DOCX, PPTX, ODT, ODS o ODP un paragrafo (o una riga di
+    tabella) alla volta, letto direttamente dall'XML del pacchetto zip senza
+    costruire il modello del documento. Le intestazioni di diapositiva e di foglio
+    seguono il formato degli altri estrattori; chi smette di consumare le porzioni
+    interrompe la lettura."""
+    ext = os.path.splitext(file_path)[1].lower()
+    with zipfile.ZipFile(file_path) as package:
+        if ext == '.docx':
+            blocks = _iter_docx_blocks(package, should_stop)
+        elif ext == '.pptx':
+            blocks = _iter_pptx_blocks(package, should_stop)
+        else:
+            blocks = _iter_odf_blocks(package, should_stop, spreadsheet=ext == '.ods')
+        try:
+            for text in blocks:
+                if text.strip():
+                    yield text
+        finally:
+            blocks.close()
+
+def _extract_office_xml_text(file_path, should_stop=None):
+    """Testo completo di un documento DOCX, PPTX, ODT, ODS o ODP (vedi _iter_office_text)"""
+    return "\n".join(_iter_office_text(file_path, should_stop))
+
+def _iter_pdf_pages(file_path, should_stop=None, max_pages=0, page_timeout=None, skip_pages=(), info=None):
+    """(numero di pagina, testo) per le pagine di un PDF (PyPDF2), una alla volta.
+    max_pages limita le pagine lette (0 = tutte); le pagine in skip_pages (già in
+    cache) non vengono estratte. PyPDF2 non si interrompe durante l'estrazione di una
+    pagina: una pagina che supera page_timeout secondi chiude la lettura del documento.
+    Se indicato, info["pages"] riceve il numero di pagine del documento."""
+    import PyPDF2
+    with open(file_path, 'rb') as f:
+        reader = PyPDF2.PdfReader(f)
+        num_pages = len(reader.pages)
+        if info is not None:
+            info["pages"] = num_pages
+        if max_pages:
+            num_pages = min(num_pages, max_pages)
+        for index in range(num_pages):
+            number = index + 1
+            if number in skip_pages:
+                continue
+            if should_stop and should_stop():
+                return
+            started = time.monotonic()
+            try:
+                text = reader.pages[index].extract_text() or ""
+            except Exception:
+                text = ""
+            elapsed = time.monotonic() - started
+            yield number, text
+            if page_timeout and elapsed > page_timeout:
+                return
+
+def _extract_pdf_text(file_path, should_stop=None, max_pages=0, page_timeout=None):
+    """Testo delle pagine di un PDF con intestazione di pagina (vedi _iter_pdf_pages)"""
+    content = []
+    for number, page_text in _iter_pdf_pages(file_path, should_stop, max_pages, page_timeout):
+        if page_text.strip():
+            content.append(f"--- Pagina {number} ---")
+            content.append(page_text)
+    return "\n".join(content)
+
+def _search_pdf_pages(file_path, keywords, whole_word=False, skip_pages=(), max_pages=0,
+                      page_timeout=None, deadline=None, cancelled=None):
+    """Cerca le keyword nelle pagine di un PDF non ancora in cache, fermandosi alla
+    pagina in cui risultano trovate tutte. Eseguita in un processo di
+    ExtractionProcessPool (o nel thread chiamante se il pool non è disponibile).
+    Restituisce (keyword trovate, [(pagina, testo compresso con zlib)], numero di
+    pagine del documento) per la cache."""
+    def should_stop():
+        return (deadline is not None and time.time() >= deadline) or bool(cancelled and cancelled())
+    
+    matcher = KeywordMatcher(keywords, whole_word)
+    found = set()
+    pages = []
+    info = {"pages": 0}
+    for number, page_text in _iter_pdf_pages(file_path, should_stop, max_pages, page_timeout,
+                                             frozenset(skip_pages), info):
+        pages.append((number, zlib.compress(page_text.encode('utf-8', errors='replace'), 1)))
+        found |= matcher.find_keywords(page_text)
+        if len(found) == len(matcher.keywords):
+            break
+    return sorted(found), pages, info["pages"]
+
+def _attachment_name(attachment, index):
+    for attr in ('longFilename', 'shortFilename', 'filename', 'name'):
+        value = getattr(attachment, attr, None)
+        if value:
+            return value
+    return f"allegato_{index}"
+
+def _attachment_data(attachment):
+    """Dati binari di un allegato MSG con le diverse API delle versioni di extract_msg"""
+    if hasattr(attachment, 'data'):
+        return attachment.data
+    for method in ('getBytes', 'getData'):
+        if callable(getattr(attachment, method, None)):
+            return getattr(attachment, method)()
+    if getattr(attachment, 'content', None):
+        return attachment.content
+    return getattr(attachment, 'bytes', None)
+
+def _read_msg(file_path):
+    """Legge un messaggio Outlook MSG (extract_msg).
+    Restituisce (intestazioni e corpo, [(nome, tipo MIME, dati)] degli allegati)."""
+    import extract_msg
+    msg = extract_msg.Message(file_path)
+    try:
+        content_parts = [
+            f"Da: {getattr(msg, 'sender', 'N/A')}",
+            f"A: {getattr(msg, 'to', 'N/A')}",
+            f"Oggetto: {getattr(msg, 'subject', 'N/A')}",
+            f"Data: {getattr(msg, 'date', 'N/A')}",
+            "-" * 40,
+        ]
+        msg_body = getattr(msg, 'body', "")
+        if msg_body:
+            content_parts.append(msg_body)
+        
+        attachments = []
+        for attachment in msg.attachments:
+            if not attachment:
+                continue
+            content_type = getattr(attachment, 'mimetype', None) or getattr(attachment, 'contentType', None) or ""
+            try:
+                data = _attachment_data(attachment)
+            except Exception:
+                data = None
+            attachments.append((_attachment_name(attachment, len(attachments) + 1), content_type, data))
+        return "\n".join(content_parts), attachments
+    finally:
+        try:
+            msg.close()
+        except Exception:
+            pass
+
+# Formati con un estrattore che produce il testo a porzioni: senza cache dei testi
+# la ricerca li esamina in streaming e si ferma appena trova tutte le keyword
+STREAMING_EXTRACTORS = {
+    '.xlsx': _iter_xlsx_text,
+    '.docx': _iter_office_text,
+    '.pptx': _iter_office_text,
+    '.odt': _iter_office_text,
+    '.ods': _iter_office_text,
+    '.odp': _iter_office_text,
+}
+
+def _extraction_worker_init():
+    """Inizializzatore dei processi di estrazione: importa i parser una volta sola"""
+    for module_name in ('PyPDF2', 'openpyxl', 'extract_msg'):
+        try:
+            __import__(module_name)
+        except ImportError:
+            pass
+
+def _extract_in_worker(file_path, max_pages=0, page_timeout=None, deadline=None):
+    """Estrazione eseguita in un processo di ExtractionProcessPool.
+    Restituisce (testo compresso con zlib, allegati) per ridurre i dati scambiati;
+    gli allegati (solo MSG) vengono elaborati dal processo principale.
+    max_pages e page_timeout limitano le pagine lette dai PDF."""
+    def should_stop():
+        return deadline is not None and time.time() >= deadline
+    
+    ext = os.path.splitext(file_path)[1].lower()
+    attachments = []
+    if ext == '.pdf':
+        text = _extract_pdf_text(file_path, should_stop, max_pages, page_timeout)
+    elif ext == '.xlsx':
+        text = _extract_xlsx_text(file_path, should_stop)
+    elif ext in STREAMING_EXTRACTORS:
+        text = _extract_office_xml_text(file_path, should_stop)
+    elif ext == '.msg':
+        text, attachments = _read_msg(file_path)
+    else:
+        text = ""
+    return zlib.compress(text.encode('utf-8', errors='replace'), 1), attachments
+
+def _search_in_worker(file_path, keywords, whole_word=False, deadline=None):
+    """Ricerca in streaming eseguita in un processo di ExtractionProcessPool.
+    Restituisce la lista delle keyword trovate."""
+    def should_stop():
+        return deadline is not None and time.time() >= deadline
+    
+    matcher = KeywordMatcher(keywords, whole_word)
+    pieces = STREAMING_EXTRACTORS[os.path.splitext(file_path)[1].lower()](file_path, should_stop)
+    try:
+        return sorted(StreamingTextSearcher().search_chunks(pieces, matcher, should_stop=should_stop))
+    finally:
+        pieces.close()
+
+def _extraction_worker_main(connection):
+    """Ciclo di un processo di ExtractionProcessPool: esegue i compiti (funzione,
+    argomenti) ricevuti sulla connessione finché non riceve None"""
+    _extraction_worker_init()
+    try:
+        while True:
+            try:
+                task = connection.recv()
+            except (EOFError, OSError):
+                break
+            if task is None:
+                break
+            func, args = task
+            try:
+                result = (True, func(*args))
+            except Exception as e:
+                result = (False, f"{type(e).__name__}: {e}")
+            connection.send(result)
+    finally:
+        connection.close()
+
+class ExtractionProcessPool:
+    """Stadio di estrazione su processi per i parser CPU-bound (PDF, Office, OpenDocument, MSG).
+    I processi restano attivi tra una ricerca e l'altra con i parser già importati e
+    vengono avviati al primo utilizzo. Un processo ancora occupato alla scadenza del
+    file (parser che non si ferma da solo) o all'interruzione della ricerca viene
+    terminato e sostituito al compito successivo: restarts conta i processi terminati."""
+    
+    def __init__(self, max_workers=None, logger=None):
+        self.max_workers = max_workers or DEFAULT_EXTRACTION_PROCESSES
+        self.logger = logger
+        self._idle = []          # Processi liberi: (processo, connessione, generazione)
+        self._started = 0        # Processi della generazione corrente, liberi o occupati
+        self._generation = 0     # Incrementata da shutdown: i processi precedenti vengono chiusi al rilascio
+        self._condition = threading.Condition()
+        self.available = True
+        self.restarts = 0
+    
+    def log(self, message, level="info"):
+        if self.logger:
+            if level == "debug":
+                self.logger.debug(message)
+            elif level == "info":
+                self.logger.info(message)
+            elif level == "warning":
+                self.logger.warning(message)
+            elif level == "error":
+                self.logger.error(message)
+    
+    @staticmethod
+    def handles(file_path):
+        return os.path.splitext(file_path)[1].lower() in PROCESS_EXTRACTION_EXTENSIONS
+    
+    def resize(self, max_workers):
+        """Imposta il numero di processi; i processi vengono riavviati al prossimo utilizzo"""
+        max_workers = max(1, int(max_workers))
+        if max_workers != self.max_workers:
+            self.max_workers = max_workers
+            self.shutdown()
+    
+    def _acquire(self, limit, interrupted):
+        """Processo libero, avviandone uno nuovo se ne sono attivi meno di max_workers.
+        Restituisce None se il pool non è utilizzabile, False se limit è trascorso o la
+        ricerca è stata interrotta mentre tutti i processi erano occupati."""
+        import multiprocessing
+        
+        with self._condition:
+            while True:
+                if not self.available:
+                    return None
+                if self._idle:
+                    return self._idle.pop()
+                if self._started < self.max_workers:
+                    self._started += 1
+                    generation = self._generation
+                    break
+                if (limit is not None and time.time() >= limit) or (interrupted and interrupted()):
+                    return False
+                self._condition.wait(0.1)
+        try:
+            connection, child_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_extraction_worker_main, args=(child_connection,),
+                                              daemon=True)
+            process.start()
+            child_connection.close()
+        except Exception as e:
+            self.log(f"Pool di processi di estrazione non disponibile: {str(e)}", "warning")
+            with self._condition:
+                self.available = False
+                if generation == self._generation:
+                    self._started -= 1
+                self._condition.notify_all()
+            return None
+        return process, connection, generation
+    
+    def _release(self, worker, reuse=True):
+        """Rimette il processo tra quelli liberi, oppure lo chiude (terminandolo se
+        reuse è False) liberando il posto per un nuovo processo"""
+        with self._condition:
+            current = worker[2] == self._generation
+            if reuse and current:
+                self._idle.append(worker)
+                self._condition.notify()
+                return
+            if current:
+                self._started -= 1
+            self._condition.notify()
+        self._stop_worker(worker, kill=not reuse)
+    
+    @staticmethod
+    def _stop_worker(worker, kill=False):
+        process, connection, _ = worker
+        if kill:
+            process.terminate()
+        else:
+            try:
+                connection.send(None)
+            except (OSError, ValueError):
+                pass
+        process.join(1.0)
+        if process.is_alive():
+            process.kill()
+            process.join()
+        connection.close()
+    
+    def extract(self, file_path, timeout=None, interrupted=None, max_pages=0, page_timeout=None):
+        """Estrae il testo in un processo del pool.
+        Restituisce (testo, allegati), oppure None se il pool non è utilizzabile
+        (l'estrazione va allora eseguita nel thread chiamante)."""
+        result = self._run(file_path, timeout, (b"", []), _extract_in_worker, max_pages, page_timeout,
+                           interrupted=interrupted)
+        if result is None:
+            return None
+        compressed, attachments = result
+        return (zlib.decompress(compressed).decode('utf-8') if compressed else ""), attachments
+    
+    def search_pdf(self, file_path, keywords, whole_word=False, skip_pages=(), max_pages=0,
+                   page_timeout=None, timeout=None, interrupted=None):
+        """Ricerca pagina per pagina in un PDF (_search_pdf_pages) in un processo del pool.
+        Restituisce (keyword trovate, pagine estratte, numero di pagine), oppure None se
+        il pool non è utilizzabile. Il processo si ferma da solo alla scadenza e
+        restituisce le pagine già lette: l'attesa ha un secondo di margine per riceverle."""
+        result = self._run(file_path, timeout, ([], [], 0), _search_pdf_pages, list(keywords), whole_word,
+                           sorted(skip_pages), max_pages, page_timeout, wait_grace=1.0,
+                           interrupted=interrupted)
+        if result is None:
+            return None
+        found, pages, page_count = result
+        return set(found), pages, page_count
+    
+    def search(self, file_path, keywords, whole_word=False, timeout=None, interrupted=None):
+        """Cerca le keyword in un processo del pool con l'estrattore in streaming del
+        formato (STREAMING_EXTRACTORS), fermandosi appena le ha trovate tutte.
+        Restituisce l'insieme delle keyword trovate, oppure None se il pool non è
+        utilizzabile."""
+        result = self._run(file_path, timeout, [], _search_in_worker, list(keywords), whole_word,
+                           interrupted=interrupted)
+        return None if result is None else set(result)
+    
+    def _run(self, file_path, timeout, failed, func, *args, wait_grace=0.0, interrupted=None):
+        """Esegue func(file_path, *args, scadenza) in un processo del pool.
+        Restituisce None se il pool non è utilizzabile, failed se l'estrazione non
+        riesce o non termina in tempo. Il processo ancora occupato dopo la scadenza
+        (più wait_grace secondi) o quando interrupted() diventa vero viene terminato."""
+        deadline = time.time() + timeout if timeout else None
+        limit = deadline + wait_grace if deadline is not None else None
+        worker = self._acquire(limit, interrupted)
+        if worker is None:
+            return None
+        if worker is False:
+            return failed
+        process, connection, _ = worker
+        try:
+            connection.send((func, (file_path, *args, deadline)))
+            while True:
+                if connection.poll(0.1):
+                    success, value = connection.recv()
+                    self._release(worker)
+                    if success:
+                        return value
+                    # Libreria mancante o documento non leggibile, come per l'estrazione nel thread
+                    self.log(f"Errore nell'estrazione di {file_path}: {value}", "debug")
+                    return failed
+                if not process.is_alive():
+                    raise EOFError(f"codice di uscita {process.exitcode}")
+                if (limit is not None and time.time() >= limit) or (interrupted and interrupted()):
+                    # Il parser non si è fermato da solo: il processo viene terminato e sostituito
+                    self._release(worker, reuse=False)
+                    with self._condition:
+                        self.restarts += 1
+                    self.log(f"Processo di estrazione terminato alla scadenza: {file_path}", "debug")
+                    return failed
+        except (EOFError, OSError) as e:
+            self.log(f"Processo di estrazione terminato su {file_path}: {str(e)}", "warning")
+            self._release(worker, reuse=False)
+            return failed
+        except Exception as e:
+            # Compito o risultato non trasferibile: il processo non è più in uno stato noto
+            self.log(f"Errore nell'estrazione di {file_path}: {str(e)}", "debug")
+            self._release(worker, reuse=False)
+            return failed
+    
+    def shutdown(self):
+        """Chiude i processi liberi; quelli occupati vengono chiusi al termine del compito"""
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._generation += 1
+            self._started = 0
+            self._condition.notify_all()
+        for worker in idle:
+            self._stop_worker(worker)
+
+class PdfPageSearcher:
+    """Ricerca nei PDF pagina per pagina con le pagine già estratte in
+    ExtractedTextCache: le keyword vengono cercate prima nelle pagine in cache e solo
+    quelle mancanti vengono estratte (nel pool di processi), fermandosi alla prima
+    pagina che completa la corrispondenza. max_pages limita le pagine lette
+    (0 = tutte), page_timeout i secondi concessi a una singola pagina."""
+    
+    def __init__(self, extraction_pool, text_cache=None, max_pages=0, page_timeout=10.0, logger=None):
+        self.extraction_pool = extraction_pool
+        self.text_cache = text_cache
+        self.max_pages = max(0, int(max_pages or 0))
+        self.page_timeout = float(page_timeout) if page_timeout else None
+        self.logger = logger
+        self.cached_pages = 0
+        self.extracted_pages = 0
+    
+    def log(self, message, level="info"):
+        if self.logger:
+            if level == "debug":
+                self.logger.debug(message)
+            elif level == "info":
+                self.logger.info(message)
+            elif level == "warning":
+                self.logger.warning(message)
+            elif level == "error":
+                self.logger.error(message)
+    
+    def search(self, file_path, size, mtime, matcher, timeout=None, should_stop=None, interrupted=None):
+        """Insieme delle keyword di matcher trovate nel PDF.
+        should_stop interrompe la ricerca nel thread corrente (pool non disponibile),
+        interrupted l'attesa del processo di estrazione."""
+        if not matcher.keywords:
+            return set()
+        cache = self.text_cache
+        use_cache = cache is not None and cache.available and mtime is not None
+        cached, page_count = cache.get_pages(file_path, size, mtime) if use_cache else ({}, 0)
+        if self.max_pages:
+            cached = {page: text for page, text in cached.items() if page <= self.max_pages}
+        
+        found = set()
+        for page in sorted(cached):
+            self.cached_pages += 1
+            found |= matcher.find_keywords(cached[page])
+            if len(found) == len(matcher.keywords):
+                return found
+        last_page = min(page_count, self.max_pages) if self.max_pages else page_count
+        if page_count and len(cached) >= last_page:
+            # Tutte le pagine da leggere sono in cache: il PDF non viene aperto
+            return found
+        
+        remaining = [keyword for keyword in matcher.keywords if keyword not in found]
+        result = self.extraction_pool.search_pdf(file_path, remaining, matcher.whole_word, cached,
+                                                 self.max_pages, self.page_timeout, timeout, interrupted)
+        if result is None:
+            # Pool di processi non disponibile: ricerca nel thread corrente
+            try:
+                result = _search_pdf_pages(file_path, remaining, matcher.whole_word, cached,
+                                           self.max_pages, self.page_timeout,
+                                           time.time() + timeout if timeout else None, should_stop)
+            except Exception as e:
+                self.log(f"Errore nella ricerca nel PDF {file_path}: {str(e)}", "debug")
+                return found
+        new_found, pages, page_count = result
+        self.extracted_pages += len(pages)
+        if use_cache and pages:
+            cache.put_pages(file_path, size, mtime, pages, page_count)
+        return found | set(new_found)
+    
+    def get_stats(self):
+        return {"cached_pages": self.cached_pages, "extracted_pages": self.extracted_pages}
+
+class CancellationToken:
+    """Scadenza e annullamento dell'elaborazione di un singolo file.
+    Gli estrattori lo controllano ai confini di blocco, pagina o voce di archivio."""
+    __slots__ = ('deadline', 'parent', '_cancelled')
+    
+    def __init__(self, timeout=None, parent=None):
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.parent = parent  # Callable che segnala l'interruzione dell'intera ricerca
+        self._cancelled = False
+    
+    def cancel(self):
+        self._cancelled = True
+    
+    @property
+    def expired(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+    
+    @property
+    def cancelled(self):
+        if self._cancelled or self.expired:
+            return True
+        return bool(self.parent and self.parent())
+    
+    def remaining(self):
+        """Secondi rimasti prima della scadenza (None se senza scadenza)"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+class DeadlineScheduler:
+    """Esecuzione dei file con scadenza.
+    Ogni file viene elaborato direttamente nel thread del pool di ricerca, con un
+    CancellationToken associato al thread: gli estrattori interrogano should_stop()
+    e abbandonano il file allo scadere del tempo, senza creare thread aggiuntivi.
+    I parser che non controllano la scadenza a ogni passo (pagine PDF, XLSX, Office)
+    vengono eseguiti in ExtractionProcessPool, l'automazione COM in un processo
+    figlio (run_isolated): alla scadenza il processo viene terminato. max_isolated
+    limita i processi figli attivi."""
+    
+    def __init__(self, should_stop=None, max_isolated=2, logger=None):
+        self.should_stop_search = should_stop
+        self.logger = logger
+        self._local = threading.local()
+        self._isolated_slots = threading.BoundedSemaphore(max_isolated)
+        self._stats_lock = threading.Lock()
+        self.timeouts = 0
+        self.killed = 0
+    
+    def log(self, message, level="info"):
+        if self.logger:
+            if level == "debug":
+                self.logger.debug(message)
+            elif level == "info":
+                self.logger.info(message)
+            elif level == "warning":
+                self.logger.warning(message)
+            elif level == "error":
+                self.logger.error(message)
+    
+    def reset_stats(self):
+        with self._stats_lock:
+            self.timeouts = 0
+            self.killed = 0
+    
+    def current(self):
+        """Token del file in elaborazione nel thread corrente, se presente"""
+        return getattr(self._local, 'token', None)
+    
+    def should_stop(self):
+        """True se la ricerca è stata interrotta o il file corrente ha superato la scadenza"""
+        token = self.current()
+        if token is not None:
+            return token.cancelled
+        return bool(self.should_stop_search and self.should_stop_search())
+    
+    def expired(self):
+        """True se il file corrente è stato abbandonato per scadenza"""
+        token = self.current()
+        return token is not None and token.expired
+    
+    def run(self, timeout, func, *args, **kwargs):
+        """Esegue func nel thread corrente con la scadenza indicata.
+        Restituisce (risultato, scaduto)."""
+        token = CancellationToken(timeout, self.should_stop_search)
+        previous = self.current()
+        self._local.token = token
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            self._local.token = previous
+        if token.expired:
+            with self._stats_lock:
+                self.timeouts += 1
+            return None, True
+        return result, False
+    
+    def run_isolated(self, func, *args, default=""):
+        """Esegue func(*args) in un processo figlio entro la scadenza del file corrente.
+        func deve essere una funzione di modulo e restituire un valore serializzabile.
+        Alla scadenza o all'interruzione della ricerca il processo viene terminato."""
+        import multiprocessing
+        
+        token = self.current()
+        with self._isolated_slots:
+            if token is not None and token.cancelled:
+                return default
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(target=_isolated_worker, args=(sender, func, args), daemon=True)
+            process.start()
+            sender.close()
+            try:
+                while True:
+                    if receiver.poll(0.1):
+                        success, value = receiver.recv()
+                        if success:
+                            return value
+                        self.log(f"Errore nel processo di estrazione: {value}", "debug")
+                        return default
+                    if not process.is_alive():
+                        return default
+                    if token is not None and token.cancelled:
+                        process.terminate()
+                        with self._stats_lock:
+                            self.killed += 1
+                        self.log(f"Processo di estrazione terminato alla scadenza ({getattr(func, '__name__', func)})",
+                                 "debug")
+                        return default
+            except EOFError:
+                return default
+            finally:
+                receiver.close()
+                process.join(1.0)
+                if process.is_alive():
+                    process.kill()
+                    process.join()
+
+class FilePipeline:
+    """Pipeline a capacità limitata tra i walker e il pool di analisi dei file.
+    Le fasi sono: elenco cartelle e filtro (walker), estrazione e confronto
+    (thread del pool), emissione del risultato (on_result, chiamata appena un file
+    è concluso). Al massimo max_pending file sono in attesa o in elaborazione: oltre
+    questo limite submit blocca il walker finché l'analisi non recupera, quindi la
+    memoria usata non dipende dal numero di file dell'albero."""
+    
+    def __init__(self, executor_provider, on_result, max_pending=256, should_stop=None, logger=None):
+        self.executor_provider = executor_provider  # Callable: l'executor può essere sostituito dal watchdog
+        self.on_result = on_result
+        self.max_pending = max(1, max_pending)
+        self.should_stop = should_stop
+        self.logger = logger
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._idle = threading.Condition()
+        self._pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.peak_pending = 0
+        self.backpressure_time = 0.0  # Tempo totale di attesa dei walker per la coda piena
+    
+    def log(self, message, level="info"):
+        if self.logger:
+            if level == "debug":
+                self.logger.debug(message)
+            elif level == "info":
+                self.logger.info(message)
+            elif level == "warning":
+                self.logger.warning(message)
+            elif level == "error":
+                self.logger.error(message)
+    
+    @property
+    def pending(self):
+        return self._pending
+    
+    def _acquire_slot(self):
+        """Attende un posto libero; False se la ricerca viene interrotta nel frattempo"""
+        if self._slots.acquire(blocking=False):
+            return True
+        wait_start = time.time()
+        try:
+            while not self._slots.acquire(timeout=0.2):
+                if self.should_stop and self.should_stop():
+                    return False
+            return True
+        finally:
+            self.backpressure_time += time.time() - wait_start
+    
+    def submit(self, func, *args):
+        """Accoda func(*args) nel pool. Restituisce False se il file non è stato accodato
+        (ricerca interrotta o executor non disponibile): il chiamante può elaborarlo direttamente."""
+        executor = self.executor_provider()
+        if executor is None or executor._shutdown:
+            return False
+        if not self._acquire_slot():
+            return False
+        
+        with self._idle:
+            self._pending += 1
+            self.submitted += 1
+            self.peak_pending = max(self.peak_pending, self._pending)
+        try:
+            future = executor.submit(func, *args)
+        except Exception:
+            self._finish()
+            raise
+        future.add_done_callback(self._on_done)
+        return True
+    
+    def _on_done(self, future):
+        try:
+            if not future.cancelled():
+                result = future.result()
+                if result:
+                    self.on_result(result)
+        except Exception as e:
+            self.log(f"Errore nell'elaborazione di un risultato: {str(e)}", "debug")
+        finally:
+            self._finish()
+    
+    def _finish(self):
+        with self._idle:
+            self._pending -= 1
+            self.completed += 1
+            self._idle.notify_all()
+        self._slots.release()
+    
+    def drain(self, timeout=0.5, on_wait=None, deadline=None):
+        """Attende il completamento dei file accodati, al massimo fino a deadline
+        (time.time(), None = senza limite); on_wait(pipeline) viene chiamata a ogni
+        intervallo di attesa (aggiornamento dell'avanzamento). Restituisce False se la
+        ricerca è stata interrotta o la scadenza è trascorsa con file ancora in corso."""
+        while True:
+            with self._idle:
+                if self._pending == 0:
+                    return True
+                self._idle.wait(timeout if deadline is None else max(0.0, min(timeout, deadline - time.time())))
+                still_pending = self._pending > 0
+            if self.should_stop and self.should_stop():
+                return False
+            if still_pending and deadline is not None and time.time() >= deadline:
+                return False
+            if on_wait and still_pending:
+                on_wait(self)
+
+class SearchSettings:
+    """Istantanea immutabile dei parametri di una ricerca come valori semplici
+    (nessuna variabile Tk), quindi leggibile da qualsiasi thread. Le opzioni non
+    indicate prendono i valori predefiniti dell'applicazione; replace() restituisce
+    una copia modificata."""
+    
+    # Directory problematiche escluse automaticamente (sottostringhe del percorso)
+    PROBLEMATIC_DIRS = (
+        "Client Active Directory Rights Management Services",
+        "Windows Resource Protection",
+        "Windows Defender",
+        "Microsoft Office",
+        "System Volume Information",
+        "$Recycle.Bin",
+        "$WINDOWS.~BT",
+        "$Windows.~WS",
+    )
+    # Estensioni di file di sistema escluse dalla ricerca nei contenuti
+    SYSTEM_EXTENSIONS = (
+        # File eseguibili e librerie
+        '.exe', '.dll', '.sys', '.drv', '.ocx', '.vxd', '.com', '.bat', '.cmd', '.scr', '.app', '.dylib', '.exp', '.bpl',
+    )
+    
+    DEFAULTS = {
+        "whole_word": False,
+        "search_files": True,
+        "search_folders": True,
+        "search_content": True,
+        "max_depth": 0,                 # 0 = illimitata
+        "max_files": 100000,
+        "max_results": 50000,           # Risultati mostrati dalla ricerca con indice locale
+        "timeout": None,                # Secondi per l'intera ricerca, None = nessun limite
+        "file_timeout": 30.0,           # Scadenza per file dell'analisi predefinita
+        "pdf_max_pages": 0,             # Pagine lette per PDF, 0 = tutte
+        "pdf_page_timeout": 10.0,       # Secondi per singola pagina PDF
+        "worker_threads": min(8, os.cpu_count() or 4),
+        "extraction_processes": DEFAULT_EXTRACTION_PROCESSES,
+        "max_parallel_blocks": 4,
+        "ignore_hidden": True,
+        "skip_permission_errors": True,
+        "calculate_size": False,
+        "prioritize_user_folders": True,
+        "search_level": "base",
+        "selected_extensions": (),      # Vuoto = tutte le estensioni
+        "exclude_system_files": True,
+        "system_extensions": SYSTEM_EXTENSIONS,
+        "excluded_paths": (),
+        "problematic_dirs": PROBLEMATIC_DIRS,
+    }
+    __slots__ = ('root', 'keywords') + tuple(DEFAULTS)
+    
+    def __init__(self, root, keywords, **options):
+        unknown = set(options) - set(self.DEFAULTS)
+        if unknown:
+            raise TypeError(f"Opzioni di ricerca sconosciute: {', '.join(sorted(unknown))}")
+        object.__setattr__(self, 'root', root)
+        object.__setattr__(self, 'keywords', tuple(keyword for keyword in keywords if keyword))
+        for name, default in self.DEFAULTS.items():
+            value = options.get(name, default)
+            object.__setattr__(self, name, tuple(value) if isinstance(value, (list, set, frozenset)) else value)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"SearchSettings è immutabile: usare replace({name}=...)")
+    
+    def replace(self, **changes):
+        """Copia delle impostazioni con le opzioni indicate modificate"""
+        options = self.to_dict()
+        options.update(changes)
+        return SearchSettings(**options)
+    
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+class SearchEngine:
+    """Motore della ricerca a blocchi, indipendente dall'interfaccia grafica.
+    I walker (thread fs-walker-N) condividono una coda di priorità delle cartelle
+    elencate con DirectoryScanner; i file che superano i filtri (ExtensionPolicy,
+    PathExclusionRules) entrano nella FilePipeline verso il pool di analisi e i
+    risultati arrivano man mano a on_result, oppure all'iteratore results().
+    on_progress(tipo, valore) riceve gli stessi messaggi della coda di avanzamento
+    dell'interfaccia ("status", "progress", "update_dir_size", "timeout", "heartbeat").
+    skip_file(percorso), process_file(voce, matcher) e housekeeping() sostituiscono
+    i passi predefiniti: l'interfaccia li usa per i propri filtri ed estrattori."""
+    
+    SYSTEM_ROOTS = ("c:/", "c:\\", "d:/", "d:\\", "e:/", "e:\\")
+    # Cartelle esplorate per prime e per ultime nelle ricerche su un disco di sistema
+    HIGH_PRIORITY_FOLDERS = ("users", "documents", "documents and settings", "desktop", "downloads")
+    LOW_PRIORITY_FOLDERS = ("windows", "program files", "program files (x86)", "programdata",
+                            "$recycle.bin", "system volume information")
+    FILE_BATCH = 100                        # File accodati per volta da ogni cartella
+    MAX_ARCHIVE_MEMBER = 10 * 1024 * 1024   # Membri di archivio più grandi: solo il nome
+    
+    _file_types = {}  # estensione -> tipo visualizzato (stringa internata), condiviso
+    
+    def __init__(self, settings, on_result=None, on_progress=None, should_stop=None,
+                 skip_file=None, process_file=None, housekeeping=None, executor_provider=None,
+                 extraction_pool=None, text_cache=None, skipped_log=None, logger=None):
+        self.settings = settings
+        self.on_result = on_result
+        self.on_progress = on_progress
+        self.external_stop = should_stop
+        self.skip_file = skip_file or self.should_skip_file
+        self.process_file = process_file or self.process_file_with_deadline
+        self.housekeeping = housekeeping
+        self.executor_provider = executor_provider  # Callable; None = pool di thread proprio
+        self.text_cache = text_cache                # ExtractedTextCache opzionale
+        self.skipped_log = skipped_log              # SkippedFilesLog opzionale
+        self.logger = logger
+        
+        self._owns_extraction_pool = extraction_pool is None
+        self.extraction_pool = extraction_pool or ExtractionProcessPool(settings.extraction_processes,
+                                                                        logger=logger)
+        self.matcher = KeywordMatcher(settings.keywords, settings.whole_word)
+        self.policy = ExtensionPolicy.from_settings(settings)
+        self.path_exclusions = PathExclusionRules(settings.excluded_paths, settings.problematic_dirs,
+                                                  logger=logger)
+        self.scanner = DirectoryScanner()
+        self.streaming_searcher = StreamingTextSearcher(logger=logger)
+        self.pdf_searcher = PdfPageSearcher(self.extraction_pool, text_cache, settings.pdf_max_pages,
+                                            settings.pdf_page_timeout, logger=logger)
+        self.large_file_handler = LargeFileHandler(logger=logger)
+        self.deadline_scheduler = DeadlineScheduler(should_stop=self.should_stop, logger=logger)
+        self._restarts_at_start = self.extraction_pool.restarts  # Il pool può essere condiviso tra ricerche
+        
+        self._stop = threading.Event()
+        self._walk_done = threading.Event()  # Attraversamento concluso o limite di file raggiunto
+        self._lock = threading.Lock()
+        self._link_targets = set()  # Cartelle esterne alla radice raggiunte da link/junction
+        self._real_root = None
+        self._emit = None
+        self._start_time = None
+        self._last_status = 0.0
+        self._last_size_report = 0.0
+        
+        self.pipeline = None
+        self.walker_stats = []
+        self.files_checked = 0
+        self.dirs_checked = 0
+        self.total_size = 0
+        self.timed_out = False
+        self.limit_reached = False
+        self.walk_elapsed = 0.0
+        self.elapsed = 0.0
+    
+    def log(self, message, level="info"):
+        if self.logger:
+            if level == "debug":
+                self.logger.debug(message)
+            elif level == "info":
+                self.logger.info(message)
+            elif level == "warning":
+                self.logger.warning(message)
+            elif level == "error":
+                self.logger.error(message)
+    
+    def _debug(self, message, *args):
+        # Messaggi per cartella e per file: formattati solo se il livello debug è attivo
+        if self.logger:
+            self.logger.debug(message, *args)
+    
+    def report(self, kind, value):
+        if self.on_progress:
+            try:
+                self.on_progress(kind, value)
+            except Exception as e:
+                self.log(f"Errore nella notifica dell'avanzamento: {str(e)}", "debug")
+    
+    def should_stop(self):
+        """True se la ricerca è stata interrotta (stop() o should_stop del chiamante)"""
+        return self._stop.is_set() or bool(self.external_stop and self.external_stop())
+    
+    def stop(self):
+        self._stop.set()
+    
+    @staticmethod
+    def is_network_path(path):
+        return path.startswith('\\\\') or path.startswith('//')
+    
+    @classmethod
+    def is_system_root(cls, path):
+        """Radice di un disco di sistema (C:/ o simile): la ricerca è completa"""
+        return path.lower() in cls.SYSTEM_ROOTS or path in [os.path.abspath("/")]
+    
+    # ------------------------------------------------------------- esecuzione
+    
+    def run(self):
+        """Esegue la ricerca nel thread chiamante; i risultati vanno a on_result.
+        Ritorna al termine o all'interruzione con le statistiche (stats())."""
+        return self._run(self.on_result)
+    
+    def results(self):
+        """Iteratore sui risultati: la ricerca viene eseguita in un thread (fs-search)
+        e i SearchResult sono restituiti appena disponibili. Interrompere l'iterazione
+        ferma la ricerca; un errore della ricerca viene rilanciato al chiamante."""
+        pending = queue.SimpleQueue()
+        finished = object()
+        failure = []
+        
+        def search():
+            try:
+                self._run(pending.put)
+            except BaseException as e:
+                failure.append(e)
+            finally:
+                pending.put(finished)
+        
+        thread = threading.Thread(target=search, name="fs-search", daemon=True)
+        thread.start()
+        try:
+            while True:
+                try:
+                    # Attesa a intervalli: Ctrl+C resta gestibile nel thread chiamante
+                    item = pending.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                if item is finished:
+                    break
+                yield item
+        finally:
+            if thread.is_alive():
+                self.stop()
+                thread.join()
+        if failure:
+            raise failure[0]
+    
+    def _run(self, emit):
+        settings = self.settings
+        self._emit = emit or (lambda result: None)
+        self._start_time = start_time = time.time()
+        self._restarts_at_start = self.extraction_pool.restarts
+        
+        executor = None
+        executor_provider = self.executor_provider
+        if executor_provider is None:
+            executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max(1, min(32, settings.worker_threads)), thread_name_prefix="fs-analysis")
+            executor_provider = lambda: executor
+        current_executor = executor_provider()
+        workers = current_executor._max_workers if current_executor else max(1, settings.worker_threads)
+        self.pipeline = FilePipeline(executor_provider, self._emit, max_pending=workers * 32,
+                                     should_stop=self.should_stop, logger=self.logger)
+        try:
+            self.report("status", f"Inizio ricerca a blocchi in: {settings.root} "
+                                  f"(Profondità: {'illimitata' if not settings.max_depth else settings.max_depth})")
+            block_queue = queue.PriorityQueue()
+            if self._enqueue_root(block_queue):
+                self._walk(block_queue)
+            self.walk_elapsed = time.time() - start_time
+            
+            # Attende i file ancora in analisi (i risultati sono già stati consegnati man mano)
+            self.report("status", f"Elaborazione risultati... (analizzati {self.files_checked} file "
+                                  f"in {self.dirs_checked} cartelle)")
+            self._drain()
+            pipeline = self.pipeline
+            self.log(f"Pipeline file: {pipeline.submitted} accodati, {pipeline.completed} completati, "
+                     f"massimo {pipeline.peak_pending}/{pipeline.max_pending} in attesa, "
+                     f"walker in attesa per {pipeline.backpressure_time:.1f}s", "debug")
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=not self.should_stop(), cancel_futures=True)
+            if self._owns_extraction_pool:
+                self.extraction_pool.shutdown()
+            self.elapsed = time.time() - start_time
+        self.log_walker_throughput(self.elapsed)
+        return self.stats()
+    
+    def _enqueue_root(self, block_queue):
+        """Il percorso principale entra in coda con profondità 0: file e sottocartelle
+        vengono letti nella stessa passata dai walker"""
+        root = self.settings.root
+        if not os.path.isdir(root):
+            self.log(f"Percorso di ricerca non valido: {root}", "warning")
+            return False
+        self._real_root = DirectoryScanner.root_visit_key(root)
+        max_depth = self.settings.max_depth
+        self.log(f"Inizializzata ricerca in {root} con profondità {'illimitata' if not max_depth else max_depth}",
+                 "debug")
+        block_queue.put((self.block_priority(root), root, 0))
+        return True
+    
+    def _walk(self, block_queue):
+        """Avvia i walker e attende che tutte le cartelle in coda siano state elaborate
+        (ogni blocco chiama task_done dopo aver accodato le proprie sottocartelle)"""
+        settings = self.settings
+        start_time = self._start_time
+        max_parallel = max(1, settings.max_parallel_blocks)
+        if self.is_network_path(settings.root):
+            # Limita il parallelismo su percorsi di rete
+            max_parallel = min(max_parallel, 3)
+            self.log(f"Parallelismo limitato per percorso di rete: {max_parallel}", "debug")
+        
+        self.walker_stats = [{"walker": walker_id, "dirs": 0, "files": 0, "busy_time": 0.0}
+                             for walker_id in range(max_parallel)]
+        self.log(f"Avvio di {max_parallel} walker paralleli per l'attraversamento delle cartelle", "debug")
+        walkers = []
+        for walker_id in range(max_parallel):
+            walker = threading.Thread(target=self._block_walker, args=(walker_id, block_queue),
+                                      name=f"fs-walker-{walker_id}", daemon=True)
+            walkers.append(walker)
+            walker.start()
+        
+        last_heartbeat = time.time()
+        last_performance_check = time.time()
+        files_at_last_check = 0
+        while not self.should_stop() and not self._walk_done.is_set():
+            with block_queue.all_tasks_done:
+                if block_queue.unfinished_tasks == 0:
+                    break
+                block_queue.all_tasks_done.wait(0.2)
+            
+            current_time = time.time()
+            if settings.timeout and current_time - start_time > settings.timeout:
+                self.timed_out = True
+                break
+            
+            # Segnale periodico per il watchdog del chiamante
+            if current_time - last_heartbeat > 10:
+                last_heartbeat = current_time
+                self.report("heartbeat", current_time - start_time)
+                
+                if current_time - last_performance_check >= 30:
+                    elapsed = current_time - last_performance_check
+                    speed = (self.files_checked - files_at_last_check) / elapsed
+                    self.log(f"Velocità di elaborazione: {speed:.1f} file/sec", "debug")
+                    self.log_walker_throughput(current_time - start_time)
+                    last_performance_check = current_time
+                    files_at_last_check = self.files_checked
+        
+        # Ferma i walker e attendi che terminino il blocco in corso
+        self._walk_done.set()
+        for walker in walkers:
+            walker.join()
+        
+        if self.timed_out:
+            self.report("timeout", "Timeout raggiunto")
+    
+    def _block_walker(self, walker_id, block_queue):
+        """Walker di attraversamento: preleva cartelle dalla coda condivisa finché la visita non è completa"""
+        stats = self.walker_stats[walker_id]
+        blocks = 0
+        while not self._walk_done.is_set() and not self.should_stop():
+            try:
+                _, directory, depth = block_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            
+            block_start = time.time()
+            try:
+                if self._walk_block(directory, depth, block_queue, stats):
+                    blocks += 1
+                    # Manutenzione del chiamante (memoria) ogni 5 blocchi invece che per file
+                    if self.housekeeping and blocks % 5 == 0:
+                        self.housekeeping()
+            except Exception as e:
+                self._debug("Errore nel walker %s: %s", walker_id, str(e))
+            finally:
+                stats["busy_time"] += time.time() - block_start
+                block_queue.task_done()
+    
+    def _walk_block(self, directory, depth, block_queue, stats):
+        """Elenca una cartella, accoda le sottocartelle e invia i file all'analisi.
+        Restituisce True se la cartella è stata effettivamente elaborata."""
+        settings = self.settings
+        # La profondità viene verificata quando il blocco viene prelevato (radice = 0)
+        if settings.max_depth and depth >= settings.max_depth:
+            self._debug("Saltata directory %s per limite di profondità (profondità: %s, max: %s)",
+                        directory, depth, settings.max_depth)
+            return False
+        
+        self._report_walk_progress(directory)
+        
+        # Le sottocartelle sono già filtrate quando vengono accodate
+        rule = self.path_exclusions.prune(directory)
+        if rule is not None:
+            self._debug("Salto blocco %s (regola di esclusione: %s)", directory, rule)
+            return False
+        
+        with self._lock:
+            self.dirs_checked += 1
+        stats["dirs"] += 1
+        
+        # Una sola passata con os.scandir: tipo, dimensione, date e attributo nascosto dal DirEntry
+        try:
+            subdir_entries, file_entries = self.scanner.scan(directory, settings.ignore_hidden)
+        except PermissionError:
+            if settings.skip_permission_errors:
+                self._debug("Saltata directory con permesso negato: %s", directory)
+            else:
+                dir_name = os.path.basename(directory)
+                parent_dir = os.path.dirname(directory)
+                if (parent_dir.lower() in ["c:/users", "c:\\users"] and
+                        dir_name.lower() != getpass.getuser().lower()):
+                    self._debug("Cartella di un altro utente inaccessibile: %s", directory)
+                    self.report("status", f"Saltata cartella utente protetta: {directory}")
+                else:
+                    self._debug("Permesso negato per la directory %s", directory)
+                    self.report("status", f"Permesso negato: {directory}")
+            return False
+        except Exception as e:
+            self._debug("Errore nell'accesso alla directory %s: %s", directory, str(e))
+            return False
+        
+        subfolders = []
+        for entry in subdir_entries:
+            if self.should_stop():
+                return True
+            try:
+                # Una cartella normale viene elencata una sola volta dal suo genitore: solo
+                # link e junction possono riportare in una cartella già visitata. Quelli
+                # che puntano dentro la radice vengono saltati (la cartella è già nella
+                # visita), per gli altri si registra la destinazione
+                if entry.is_link and not self._follow_link(entry):
+                    continue
+                
+                if self.path_exclusions.prune(entry.path) is not None:
+                    continue
+                subfolders.append(entry.path)
+                
+                if settings.search_folders:
+                    keyword_mask = self.matcher.keyword_mask(entry.name)
+                    if keyword_mask:
+                        self._emit(self.folder_result(entry, keyword_mask))
+            except Exception as e:
+                self._debug("Errore nell'analisi della directory %s: %s", entry.path, str(e))
+        
+        if settings.prioritize_user_folders:
+            subfolders = self.disk_search_order(settings.root, subfolders)
+        for subfolder in subfolders:
+            block_queue.put((self.block_priority(subfolder), subfolder, depth + 1))
+        
+        # Le voci portano con sé dimensione e date già lette dallo scanner
+        if settings.search_files:
+            stats["files"] += len(file_entries)
+            for batch_start in range(0, len(file_entries), self.FILE_BATCH):
+                if self._walk_done.is_set() or self.should_stop():
+                    return True
+                self._submit_files(file_entries[batch_start:batch_start + self.FILE_BATCH])
+        return True
+    
+    def _follow_link(self, entry):
+        """True se la cartella a cui porta il link va visitata: esterna alla radice e
+        non ancora raggiunta da un altro link (cicli tra cartelle esterne)"""
+        real_path = DirectoryScanner.root_visit_key(entry.path)
+        real_root = self._real_root
+        if real_path == real_root or real_path.startswith(real_root.rstrip(os.sep) + os.sep):
+            return False
+        target = DirectoryScanner.link_target_key(entry.path)
+        with self._lock:
+            if target is None or target in self._link_targets:
+                return False
+            self._link_targets.add(target)
+        return True
+    
+    def _submit_files(self, entries):
+        """Filtra i file e li accoda nella pipeline (attende se l'analisi è in ritardo)"""
+        settings = self.settings
+        for entry in entries:
+            try:
+                if self.skip_file(entry.path):
+                    continue
+                
+                size = None
+                if settings.calculate_size and not entry.is_link:
+                    size = entry.size
+                    if size is None:
+                        try:
+                            size = os.path.getsize(entry.path)
+                        except OSError:
+                            pass
+                
+                # Il contatore è condiviso tra i walker
+                with self._lock:
+                    self.files_checked += 1
+                    files_count = self.files_checked
+                    if size:
+                        self.total_size += size
+                
+                if files_count > settings.max_files:
+                    self.limit_reached = True
+                    self._walk_done.set()
+                    self.report("status", f"Limite di {settings.max_files:,} file controllati raggiunto. "
+                                          f"Aumenta il limite nelle opzioni per cercare più file.")
+                    return
+                
+                if settings.calculate_size:
+                    current_time = time.time()
+                    if files_count % 1000 == 0 or current_time - self._last_size_report > 5:
+                        self._last_size_report = current_time
+                        self.report("update_dir_size", self.total_size)
+                
+                if not self.pipeline.submit(self._analyze_entry, entry):
+                    if self.should_stop():
+                        return
+                    # Elaborazione diretta se l'executor non è disponibile
+                    result = self._analyze_entry(entry)
+                    if result:
+                        self._emit(result)
+            except Exception as e:
+                self._debug("Errore nell'aggiunta del file %s alla coda: %s", entry.path, str(e))
+    
+    def _analyze_entry(self, entry):
+        return self.process_file(entry, self.matcher)
+    
+    def _report_walk_progress(self, directory):
+        current_time = time.time()
+        if current_time - self._last_status < 0.3:
+            return
+        self._last_status = current_time
+        self.report("status", f"Analisi blocco: {directory} (Cartelle: {self.dirs_checked}, "
+                              f"File: {self.files_checked}, Tempo: {int(current_time - self._start_time)}s)")
+        self.report("progress", min(90, int((self.files_checked / max(1, self.settings.max_files)) * 100)))
+    
+    def _drain(self):
+        """Attende i file in analisi. Con il limite di tempo della ricerca l'attesa
+        termina alla stessa scadenza dell'attraversamento, più una scadenza per file
+        per i file già accodati; i file ancora in corso vengono poi interrotti."""
+        settings = self.settings
+        deadline = (self._start_time + settings.timeout + settings.file_timeout
+                    if settings.timeout else None)
+        last_update = [time.time()]
+        
+        def report_drain(pipeline):
+            current_time = time.time()
+            if current_time - last_update[0] <= 2:
+                return
+            last_update[0] = current_time
+            self.report("progress", 90 + min(10, int((pipeline.completed / max(1, pipeline.submitted)) * 10)))
+            self.report("status", f"Elaborati {pipeline.completed}/{pipeline.submitted} file "
+                                  f"(tempo: {int(current_time - self._start_time)}s)")
+        
+        try:
+            if not self.pipeline.drain(on_wait=report_drain, deadline=deadline) and not self.should_stop():
+                self.log(f"Timeout: {self.pipeline.pending} file ancora in analisi vengono interrotti", "warning")
+                if not self.timed_out:
+                    self.timed_out = True
+                    self.report("timeout", "Timeout raggiunto")
+                self._stop.set()
+        except Exception as e:
+            self.log(f"Errore nella raccolta dei risultati: {str(e)}", "debug")
+    
+    def stats(self):
+        """Statistiche della ricerca (anche durante l'esecuzione)"""
+        pipeline = self.pipeline
+        return {
+            "files": self.files_checked,
+            "dirs": self.dirs_checked,
+            "size": self.total_size,
+            "submitted": pipeline.submitted if pipeline else 0,
+            "completed": pipeline.completed if pipeline else 0,
+            "peak_pending": pipeline.peak_pending if pipeline else 0,
+            "backpressure_s": round(pipeline.backpressure_time, 3) if pipeline else 0.0,
+            "walk_s": round(self.walk_elapsed, 3),
+            "elapsed_s": round(self.elapsed, 3),
+            "file_timeouts": self.deadline_scheduler.timeouts,
+            "extraction_restarts": self.extraction_pool.restarts - self._restarts_at_start,
+            "timed_out": self.timed_out,
+            "limit_reached": self.limit_reached,
+            "stopped": self.should_stop(),
+            "pruned": dict(self.path_exclusions.stats()),
+        }
+    
+    def log_walker_throughput(self, elapsed_time):
+        """Registra il throughput di ogni walker (cartelle e file al secondo di lavoro effettivo)"""
+        for stats in self.walker_stats:
+            busy_time = stats["busy_time"]
+            dirs_per_sec = stats["dirs"] / busy_time if busy_time > 0 else 0.0
+            files_per_sec = stats["files"] / busy_time if busy_time > 0 else 0.0
+            utilization = (busy_time / elapsed_time * 100) if elapsed_time > 0 else 0.0
+            self.log(f"Walker {stats['walker']}: {stats['dirs']} cartelle, {stats['files']} file, "
+                     f"{dirs_per_sec:.1f} cartelle/s, {files_per_sec:.1f} file/s, utilizzo {utilization:.0f}%",
+                     "debug")
+    
+    # ------------------------------------------------------- ordine di visita
+    
+    def block_priority(self, directory):
+        """Priorità del blocco (numerica, più bassa = più alta priorità)"""
+        if not self.settings.prioritize_user_folders:
+            return 1
+        directory = directory.lower()
+        # Dai priorità alle cartelle degli utenti
+        if "users" in directory or "documenti" in directory or "desktop" in directory:
+            return 0
+        # Priorità medio-alta alle cartelle di dati
+        if "data" in directory or "database" in directory or "downloads" in directory:
+            return 1
+        # Priorità bassa alle cartelle di sistema
+        if "windows" in directory or "program files" in directory:
+            return 3
+        return 2
+    
+    @classmethod
+    def disk_search_order(cls, root, directories):
+        """Ordine di esplorazione delle sottocartelle nella ricerca su un disco di sistema:
+        prima Users, Documents e simili, per ultime le cartelle di Windows e dei programmi"""
+        if root.lower() not in cls.SYSTEM_ROOTS:
+            return directories
+        prioritized = []
+        normal = []
+        for dir_path in directories:
+            dir_name = os.path.basename(dir_path).lower()
+            if any(priority in dir_name for priority in cls.HIGH_PRIORITY_FOLDERS):
+                prioritized.insert(0, dir_path)
+            elif any(low in dir_name for low in cls.LOW_PRIORITY_FOLDERS):
+                normal.append(dir_path)
+            else:
+                prioritized.append(dir_path)
+        return prioritized + normal
+    
+    # ------------------------------------------------------- filtri e analisi
+    
+    def should_skip_file(self, file_path):
+        """Filtro predefinito secondo l'ExtensionPolicy; i file esclusi vengono
+        registrati in skipped_log, se indicato"""
+        ext = os.path.splitext(file_path)[1].lower()
+        reason = self.policy.file_skip_reason(file_path, ext)
+        if reason is None:
+            return False
+        if self.skipped_log is not None:
+            skip_type = "File di sistema" if ext in self.policy.system_extensions else "File"
+            self.skipped_log.record(skip_type, os.path.basename(file_path), file_path, reason)
+        return True
+    
+    def should_search_content(self, entry):
+        """True se il contenuto del file va analizzato (estensione e limiti per tipo)"""
+        policy = self.policy
+        if not policy.search_content:
+            return False
+        ext = os.path.splitext(entry.name)[1].lower()
+        if ext in policy.selected:
+            return True
+        if policy.content_action(ext) == ExtensionPolicy.NAME_ONLY:
+            return False
+        # File giganteschi oltre il limite del loro tipo: solo il nome
+        limit = ExtensionPolicy.GIGANTIC_LIMITS.get(ext)
+        return limit is None or not entry.size or entry.size <= limit
+    
+    def process_file_with_deadline(self, entry, matcher):
+        """analyze_file con la scadenza per file delle impostazioni (DeadlineScheduler)"""
+        result, timed_out = self.deadline_scheduler.run(self.settings.file_timeout, self.analyze_file,
+                                                        entry, matcher)
+        if timed_out:
+            self._debug("Analisi interrotta per scadenza: %s", entry.path)
+            return None
+        return result
+    
+    def analyze_file(self, entry, matcher):
+        """Analisi predefinita di un file: nome, testo semplice in streaming o con mmap,
+        formati estratti nel pool di processi (con la cache del testo estratto, se
+        indicata), email EML e archivi ZIP/TAR. Restituisce un SearchResult o None."""
+        keyword_mask = matcher.keyword_mask(entry.name)
+        from_attachment = False
+        if not keyword_mask and self.should_search_content(entry):
+            keyword_mask, from_attachment = self.content_mask(entry, matcher)
+        if not keyword_mask:
+            return None
+        return self.file_result(entry, keyword_mask, from_attachment)
+    
+    def content_mask(self, entry, matcher):
+        """(bitmask delle keyword nel contenuto, trovate solo in un allegato)"""
+        file_path = entry.path
+        ext = os.path.splitext(entry.name)[1].lower()
+        should_stop = self.deadline_scheduler.should_stop
+        
+        if ext == '.pdf':
+            found = self.pdf_searcher.search(file_path, entry.size, entry.mtime, matcher,
+                                             self._extraction_timeout(), should_stop,
+                                             self.deadline_scheduler.should_stop_search)
+            return matcher.mask_for(found), False
+        if ext in STREAMING_EXTRACTORS and not self._caches_text(entry, ext):
+            return matcher.mask_for(self.streamed_keywords(entry, matcher)), False
+        if ext in PROCESS_EXTRACTION_EXTENSIONS:
+            text, attachments = self.extracted_text(entry)
+            keyword_mask = matcher.keyword_mask(text)
+            attachment_mask = 0
+            for name, content_type, data in attachments:
+                attachment_mask |= matcher.keyword_mask(name)
+                if isinstance(data, bytes) and (content_type or "").startswith("text/"):
+                    attachment_mask |= matcher.keyword_mask(data.decode('utf-8', errors='replace'))
+            return keyword_mask | attachment_mask, bool(attachment_mask and not keyword_mask)
+        if ext == '.eml':
+            return self._email_mask(file_path, matcher, should_stop)
+        if ext == '.zip':
+            return self._zip_mask(file_path, matcher, should_stop), False
+        if ext in ('.tar', '.gz', '.bz2', '.tgz'):
+            return self._tar_mask(file_path, matcher, should_stop), False
+        
+        # Testo semplice e dati (anche database e log giganteschi): byte mappati per i file
+        # grandi su disco locale, altrimenti lettura completa a blocchi
+        if self.large_file_handler.use_mmap_search(file_path, entry.size):
+            _, found = self.large_file_handler.search_in_large_file(
+                file_path, matcher.keywords, matcher.whole_word, matcher, should_stop=should_stop)
+            return matcher.mask_for(found), False
+        if ext not in StreamingTextSearcher.TEXT_EXTENSIONS and self._looks_binary(file_path):
+            return 0, False
+        return matcher.mask_for(self.streaming_searcher.search_file(file_path, matcher, should_stop=should_stop)), False
+    
+    @staticmethod
+    def _looks_binary(file_path):
+        try:
+            with open(file_path, 'rb') as f:
+                return b'\0' in f.read(8192)
+        except OSError:
+            return True
+    
+    def _caches_text(self, entry, ext):
+        """True se il testo estratto del file va letto e salvato nella cache dei testi.
+        Gli allegati MSG non vengono memorizzati: il messaggio viene sempre estratto"""
+        cache = self.text_cache
+        return cache is not None and cache.available and entry.mtime is not None and ext != '.msg'
+    
+    def _extraction_timeout(self):
+        token = self.deadline_scheduler.current()
+        return max(1.0, token.remaining()) if token is not None and token.deadline else self.settings.file_timeout
+    
+    def streamed_keywords(self, entry, matcher):
+        """Keyword trovate dall'estrattore in streaming del formato (STREAMING_EXTRACTORS),
+        nel pool di processi o nel thread corrente; la lettura si ferma appena sono
+        state trovate tutte"""
+        timeout = self._extraction_timeout()
+        found = self.extraction_pool.search(entry.path, matcher.keywords, matcher.whole_word, timeout,
+                                            self.deadline_scheduler.should_stop_search)
+        if found is not None:
+            return found
+        # Pool di processi non disponibile: ricerca nel thread corrente
+        should_stop = self.deadline_scheduler.should_stop
+        pieces = STREAMING_EXTRACTORS[os.path.splitext(entry.name)[1].lower()](entry.path, should_stop)
+        try:
+            return self.streaming_searcher.search_chunks(pieces, matcher, should_stop=should_stop)
+        except Exception as e:
+            self._debug("Errore nella ricerca in streaming di %s: %s", entry.path, str(e))
+            return set()
+        finally:
+            pieces.close()
+    
+    def extracted_text(self, entry):
+        """(testo, allegati) di un formato estratto nel pool di processi"""
+        cache = self.text_cache
+        ext = os.path.splitext(entry.name)[1].lower()
+        use_cache = self._caches_text(entry, ext)
+        if use_cache:
+            text = cache.get(entry.path, entry.size, entry.mtime)
+            if text is not None:
+                return text, []
+        
+        timeout = self._extraction_timeout()
+        extracted = self.extraction_pool.extract(entry.path, timeout, self.deadline_scheduler.should_stop_search)
+        if extracted is None:
+            # Pool di processi non disponibile: estrazione nel thread corrente
+            try:
+                compressed, attachments = _extract_in_worker(entry.path, deadline=time.time() + timeout)
+                extracted = (zlib.decompress(compressed).decode('utf-8'), attachments)
+            except Exception as e:
+                self._debug("Errore nell'estrazione di %s: %s", entry.path, str(e))
+                extracted = ("", [])
+        text, attachments = extracted
+        if use_cache and text and not self.deadline_scheduler.should_stop():
+            cache.put(entry.path, entry.size, entry.mtime, text)
+        return text, attachments
+    
+    @staticmethod
+    def _email_mask(file_path, matcher, should_stop):
+        import email
+        from email import policy as email_policy
+        with open(file_path, 'rb') as f:
+            msg = email.message_from_binary_file(f, policy=email_policy.default)
+        body_mask = matcher.keyword_mask(" ".join(str(msg.get(header, "")) for header in ("From", "To", "Subject")))
+        attachment_mask = 0
+        for part in msg.walk():
+            if should_stop():
+                break
+            if part.is_multipart():
+                continue
+            filename = part.get_filename()
+            part_mask = matcher.keyword_mask(filename) if filename else 0
+            if part.get_content_maintype() == 'text':
+                try:
+                    part_mask |= matcher.keyword_mask(part.get_content())
+                except (LookupError, UnicodeError):
+                    pass
+            if filename:
+                attachment_mask |= part_mask
+            else:
+                body_mask |= part_mask
+        return body_mask | attachment_mask, bool(attachment_mask and not body_mask)
+    
+    @classmethod
+    def _zip_mask(cls, file_path, matcher, should_stop):
+        keyword_mask = 0
+        with zipfile.ZipFile(file_path) as zf:
+            for info in zf.infolist():
+                if should_stop():
+                    break
+                keyword_mask |= matcher.keyword_mask(info.filename)
+                if (not info.is_dir() and info.file_size <= cls.MAX_ARCHIVE_MEMBER and
+                        os.path.splitext(info.filename)[1].lower() in StreamingTextSearcher.TEXT_EXTENSIONS):
+                    keyword_mask |= matcher.keyword_mask(zf.read(info).decode('utf-8', errors='replace'))
+        return keyword_mask
+    
+    @classmethod
+    def _tar_mask(cls, file_path, matcher, should_stop):
+        keyword_mask = 0
+        try:
+            with tarfile.open(file_path) as tf:
+                for member in tf:
+                    if should_stop():
+                        break
+                    keyword_mask |= matcher.keyword_mask(member.name)
+                    if (member.isfile() and member.size <= cls.MAX_ARCHIVE_MEMBER and
+                            os.path.splitext(member.name)[1].lower() in StreamingTextSearcher.TEXT_EXTENSIONS):
+                        data = tf.extractfile(member).read()
+                        keyword_mask |= matcher.keyword_mask(data.decode('utf-8', errors='replace'))
+        except tarfile.ReadError:
+            pass  # .gz/.bz2 che non contengono un archivio TAR
+        return keyword_mask
+    
+    # -------------------------------------------------------------- risultati
+    
+    @classmethod
+    def file_type(cls, file_path, file_extension):
+        """Tipo di file visualizzato, calcolato una volta per estensione"""
+        file_type = cls._file_types.get(file_extension)
+        if file_type is not None:
+            return file_type
+        
+        file_type = "File"  # Valore predefinito
+        # Usa mimetypes per determinare il tipo
+        mime_type, _ = mimetypes.guess_type(file_path)
+        if mime_type:
+            file_type = mime_type.split('/')[0].capitalize()
+            if file_type == "Application":
+                if "pdf" in mime_type:
+                    file_type = "PDF"
+                elif "word" in mime_type or file_extension == ".docx" or file_extension == ".doc":
+                    file_type = "Word"
+                elif "excel" in mime_type or file_extension in [".xlsx", ".xls"]:
+                    file_type = "Excel"
+                elif "powerpoint" in mime_type or file_extension in [".pptx", ".ppt"]:
+                    file_type = "PowerPoint"
+                else:
+                    file_type = "Documento"
+        else:
+            # Fallback basato sull'estensione
+            if file_extension in ['.txt', '.md', '.rtf']:
+                file_type = "Testo"
+            elif file_extension in ['.jpg', '.jpeg', '.png', '.gif', '.bmp']:
+                file_type = "Immagine"
+            elif file_extension in ['.mp3', '.wav', '.ogg', '.flac']:
+                file_type = "Audio"
+            elif file_extension in ['.mp4', '.avi', '.mkv', '.mov']:
+                file_type = "Video"
+            elif file_extension in ['.exe', '.dll', '.bat']:
+                file_type = "Eseguibile"
+            elif file_extension == '.eml':
+                file_type = "Email"
+        
+        file_type = sys.intern(file_type)
+        cls._file_types[file_extension] = file_type
+        return file_type
+    
+    def file_result(self, entry, keyword_mask, from_attachment=False):
+        """SearchResult di un file con i metadati letti dallo scanner (stat solo se mancanti)"""
+        ext = os.path.splitext(entry.name)[1].lower()
+        size, mtime, ctime = entry.size, entry.mtime, entry.ctime
+        if mtime is None:
+            try:
+                st = os.stat(entry.path)
+                size, mtime, ctime = st.st_size, st.st_mtime, st.st_ctime
+            except OSError:
+                pass
+        return SearchResult(self.file_type(entry.path, ext), entry.name, entry.path, ext,
+                            size, mtime, ctime, from_attachment, keyword_mask)
+    
+    @staticmethod
+    def folder_result(entry, keyword_mask):
+        """SearchResult di una cartella (stesso record dei file, senza dimensione)"""
+        mtime, ctime = entry.mtime, entry.ctime
+        if mtime is None:
+            try:
+                st = os.stat(entry.path)
+                mtime, ctime = st.st_mtime, st.st_ctime
+            except OSError:
+                pass
+        return SearchResult("Directory", entry.name, entry.path, "", None, mtime, ctime,
+                            keyword_mask=keyword_mask)
+
+class VirtualResultsView:
+    """Lista dei risultati virtualizzata su un ttk.Treeview.
+    I risultati restano nel modello Python (righe, ordine di visualizzazione come
+    array di indici, selezione come insieme di indici): nel widget esistono solo gli
+    elementi delle righe visibili, riusati durante lo scorrimento. Ordinamento, filtro
+    e selezione lavorano sul modello senza creare o spostare elementi Tk."""
+    
+    def __init__(self, tree, scrollbar, to_values, to_tags=None, on_select=None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.to_values = to_values  # riga del modello -> valori delle colonne
+        self.to_tags = to_tags
+        self.on_select = on_select
+        self.rows = []
+        self.order = array.array("l")  # Indici in rows nell'ordine visualizzato
+        self.selected = set()          # Indici in rows
+        self.top = 0                   # Prima posizione visibile in order
+        self.cursor = None             # Posizione dell'elemento attivo
+        self.anchor = None             # Posizione di partenza della selezione con Shift
+        self.sort_column = None
+        self.sort_reverse = False
+        self._sort_key = None
+        self._sort_keys = []           # Chiavi di ordinamento calcolate una sola volta per riga
+        self._filter = None
+        self._slots = []               # Elementi Tk riusati per le righe visibili
+        self._row_height = 20
+        self._header_height = 25
+        self._render_pending = False
+        self._resort_pending = False
+        
+        scrollbar.configure(command=self.yview)
+        tree.configure(yscrollcommand=lambda *args: None)
+        tree.bind("<Configure>", lambda e: self.schedule_render())
+        tree.bind("<Button-1>", self._on_click)
+        tree.bind("<Control-Button-1>", self._on_click)
+        tree.bind("<Shift-Button-1>", self._on_click)
+        tree.bind("<MouseWheel>", self._on_wheel)
+        tree.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        tree.bind("<Button-5>", lambda e: self._scroll_by(3))
+        for key, delta in (("Up", -1), ("Down", 1), ("Prior", "-page"), ("Next", "page"),
+                           ("Home", "start"), ("End", "end")):
+            tree.bind(f"<{key}>", lambda e, d=delta: self._on_key(d, extend=False))
+            tree.bind(f"<Shift-{key}>", lambda e, d=delta: self._on_key(d, extend=True))
+        tree.bind("<Control-a>", lambda e: (self.select_all(), "break")[1])
+    
+    def __len__(self):
+        return len(self.order)
+    
+    # ---------------------------------------------------------------- modello
+    
+    def clear(self):
+        """Svuota il modello e annulla l'ordinamento (il filtro resta attivo)"""
+        self.rows = []
+        self.order = array.array("l")
+        self.selected = set()
+        self.top = 0
+        self.cursor = self.anchor = None
+        self.sort_column = None
+        self._sort_key = None
+        self._sort_keys = []
+        self.schedule_render()
+    
+    def extend(self, records):
+        """Aggiunge righe al modello; con un ordinamento attivo vengono ricollocate
+        al prossimo riordino (raggruppato, non a ogni blocco)"""
+        start = len(self.rows)
+        self.rows.extend(records)
+        for index in range(start, len(self.rows)):
+            record = self.rows[index]
+            if self._sort_key is not None:
+                self._sort_keys.append(self._sort_key(record))
+            if self._filter is None or self._filter(record):
+                self.order.append(index)
+        if self._sort_key is not None and len(self.rows) > start:
+            self._schedule_resort()
+        self.schedule_render()
+    
+    def sort(self, column, key, reverse=False):
+        """Ordina le righe con key(riga); la chiave viene calcolata una volta per riga"""
+        self.sort_column = column
+        self.sort_reverse = reverse
+        self._sort_key = key
+        self._sort_keys = [key(record) for record in self.rows]
+        self._apply_order(self.order)
+    
+    def set_filter(self, predicate):
+        """Mostra solo le righe per cui predicate(riga) è vero (None = tutte).
+        La selezione viene limitata alle righe rimaste visibili."""
+        self._filter = predicate
+        if predicate is None:
+            indexes = range(len(self.rows))
+        else:
+            indexes = [i for i, record in enumerate(self.rows) if predicate(record)]
+        self._apply_order(indexes)
+        visible = set(self.order)
+        if not self.selected <= visible:
+            self.selected &= visible
+            self._notify_select()
+    
+    def _apply_order(self, indexes):
+        if self._sort_key is not None:
+            indexes = sorted(indexes, key=self._sort_keys.__getitem__, reverse=self.sort_reverse)
+        self.order = array.array("l", indexes)
+        self.cursor = self.anchor = None
+        self.top = 0
+        self.schedule_render()
+    
+    def _schedule_resort(self):
+        if self._resort_pending:
+            return
+        self._resort_pending = True
+        
+        def resort():
+            self._resort_pending = False
+            if self._sort_key is not None:
+                top = self.top
+                self._apply_order(self.order)
+                self.top = top
+        
+        self.tree.after(300, resort)
+    
+    # -------------------------------------------------------------- selezione
+    
+    def selected_rows(self):
+        """Righe selezionate nell'ordine di visualizzazione"""
+        if not self.selected:
+            return []
+        selected = self.selected
+        return [self.rows[i] for i in self.order if i in selected]
+    
+    def selected_values(self):
+        return [self.to_values(record) for record in self.selected_rows()]
+    
+    def current_row(self):
+        """Riga attiva (o la prima selezionata), None senza selezione"""
+        if self.cursor is not None and self.cursor < len(self.order) and self.order[self.cursor] in self.selected:
+            return self.rows[self.order[self.cursor]]
+        rows = self.selected_rows()
+        return rows[0] if rows else None
+    
+    def select(self, index):
+        """Seleziona la sola riga di indice index del modello e la rende visibile"""
+        try:
+            position = self.order.index(index)
+        except ValueError:
+            return
+        self.selected = {index}
+        self.cursor = self.anchor = position
+        self._ensure_visible(position)
+        self._notify_select()
+    
+    def select_all(self):
+        self.selected = set(self.order)
+        self._notify_select()
+    
+    def deselect_all(self):
+        self.selected = set()
+        self._notify_select()
+    
+    def invert_selection(self):
+        self.selected = set(self.order) - self.selected
+        self._notify_select()
+    
+    def _notify_select(self):
+        self.schedule_render()
+        if self.on_select:
+            self.on_select()
+    
+    def _select_position(self, position, extend=False, toggle=False):
+        index = self.order[position]
+        if extend and self.anchor is not None:
+            low, high = sorted((self.anchor, position))
+            if not toggle:
+                self.selected = set()
+            self.selected.update(self.order[low:high + 1])
+        elif toggle:
+            self.selected ^= {index}
+            self.anchor = position
+        else:
+            self.selected = {index}
+            self.anchor = position
+        self.cursor = position
+        self._ensure_visible(position)
+        self._notify_select()
+    
+    # ------------------------------------------------------------ scorrimento
+    
+    def visible_rows(self):
+        height = self.tree.winfo_height() - self._header_height
+        return max(1, height // max(1, self._row_height))
+    
+    def _ensure_visible(self, position):
+        visible = self.visible_rows()
+        if position < self.top:
+            self.top = position
+        elif position >= self.top + visible:
+            self.top = position - visible + 1
+    
+    def yview(self, *args):
+        """Comando della scrollbar verticale ("moveto" / "scroll")"""
+        count = len(self.order)
+        if not args or count == 0:
+            return
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * count)
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if len(args) > 2 and args[2] == "pages":
+                step *= self.visible_rows()
+            self.top += step
+        self.render()
+    
+    def _scroll_by(self, step):
+        self.top += step
+        self.render()
+        return "break"
+    
+    def _on_wheel(self, event):
+        if event.delta:
+            # Windows: multipli di 120; macOS: valori piccoli
+            step = -(event.delta // 120) if abs(event.delta) >= 120 else (-1 if event.delta > 0 else 1)
+            return self._scroll_by(step * 3)
+        return "break"
+    
+    def _on_key(self, delta, extend):
+        count = len(self.order)
+        if count == 0:
+            return "break"
+        current = self.cursor if self.cursor is not None else self.top
+        if delta == "page":
+            position = current + self.visible_rows()
+        elif delta == "-page":
+            position = current - self.visible_rows()
+        elif delta == "start":
+            position = 0
+        elif delta == "end":
+            position = count - 1
+        else:
+            position = current + delta if self.cursor is not None else self.top
+        self._select_position(max(0, min(count - 1, position)), extend=extend)
+        return "break"
+    
+    def _on_click(self, event):
+        # Intestazioni e separatori (ordinamento, ridimensionamento) restano al Treeview
+        if self.tree.identify_region(event.x, event.y) not in ("cell", "tree"):
+            return None
+        self.tree.focus_set()
+        item = self.tree.identify_row(event.y)
+        if item not in self._slots:
+            return "break"
+        position = self.top + self._slots.index(item)
+        if position < len(self.order):
+            self._select_position(position, extend=bool(event.state & 0x0001),
+                                  toggle=bool(event.state & 0x0004))
+        return "break"
+    
+    # ------------------------------------------------------------- disegno
+    
+    def schedule_render(self):
+        if self._render_pending:
+            return
+        self._render_pending = True
+        self.tree.after_idle(self.render)
+    
+    def render(self):
+        """Allinea gli elementi Tk alla finestra visibile del modello"""
+        self._render_pending = False
+        try:
+            if not self.tree.winfo_exists():
+                return
+        except tk.TclError:
+            return
+        count = len(self.order)
+        visible = self.visible_rows()
+        self.top = max(0, min(self.top, count - visible))
+        needed = min(visible, count - self.top)
+        
+        slots = self._slots
+        while len(slots) < needed:
+            slots.append(self.tree.insert("", "end"))
+        if len(slots) > needed:
+            self.tree.delete(*slots[needed:])
+            del slots[needed:]
+        
+        tk_selected = []
+        focus_item = ""
+        for offset, item in enumerate(slots):
+            position = self.top + offset
+            index = self.order[position]
+            record = self.rows[index]
+            self.tree.item(item, values=self.to_values(record),
+                           tags=self.to_tags(record) if self.to_tags else ())
+            if index in self.selected:
+                tk_selected.append(item)
+            if position == self.cursor:
+                focus_item = item
+        self.tree.selection_set(tk_selected)
+        if focus_item:
+            self.tree.focus(focus_item)
+        self.tree.yview_moveto(0)
+        
+        if slots:
+            # Misura altezza di riga e intestazione del tema corrente
+            bbox = self.tree.bbox(slots[0])
+            if bbox and bbox[3] > 0 and (bbox[1], bbox[3]) != (self._header_height, self._row_height):
+                self._header_height, self._row_height = bbox[1], bbox[3]
+                self.schedule_render()
+        
+        if count:
+            self.scrollbar.set(self.top / count, (self.top + needed) / count)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+class FileSearchApp:
+    @error_handler
+    def __init__(self, root):
+            self.root = root
+            self.root.title(APP_TITLE)
+            
+            # Reset monitoraggio memoria
+            self.search_in_progress = False
+            self.memory_monitor_id = None
+            
+            # Imposta subito il debug mode e il logger per poter loggare: la finestra di debug
+            # legge il buffer circolare, console e file degli errori sono scritti in background
+            self.debug_mode = True
+            self.logger = AppLogger(level=LOG_DEBUG, echo=self.debug_mode,
+                                    error_log_dir=os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs"))
+            # Aggiungi questa riga per inizializzare current_user
+            self.current_user = getpass.getuser()
+            
+            # Imposta icona se disponibile
+            try:
+                icon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "search_icon.ico")
+                if os.path.exists(icon_path):
+                    self.root.iconbitmap(icon_path)
+            except:
+                pass
+        
+            # Assicurati che all'avvio non ci siano timer attivi da esecuzioni precedenti
+            for attr in dir(self):
+                if attr.startswith('_after_id_') or attr.endswith('_timer_id'):
+                    try:
+                        after_id = getattr(self, attr)
+                        if isinstance(after_id, int) and after_id > 0:
+                            self.root.after_cancel(after_id)
+                            self.logger.debug("Cancellato timer %s: %s", attr, after_id)
+                    except Exception:
+                        pass  # Ignora errori nel cleanup iniziale
+            
+            # Inizializza tutte le variabili in un passaggio
+            self._init_essential_variables()
+            self._init_remaining_variables()
+            
+            # Crea l'intera interfaccia in una volta sola
+            self.create_widgets()
+            
+            # Esegui attività di background dopo un breve ritardo
+            self.root.after(500, self._delayed_startup_tasks)
+            # Controlla gli aggiornamenti all'avvio (dopo l'inizializzazione completa)
+            self.root.after(5000, self.check_for_updates_on_startup)
+
+    @error_handler
+    def create_base_interface(self):
+        """Crea solo l'interfaccia essenziale per un avvio veloce"""
+        # Forza l'aggiornamento dell'interfaccia
+        self.root.update_idletasks()
+
+    @error_handler
+    def complete_initialization(self):
+        """Completa l'inizializzazione dell'applicazione"""
+        try:
+            # Rimuovi i componenti temporanei
+            if hasattr(self, 'status_label'):
+                self.status_label.destroy()
+            if hasattr(self, 'progress_bar'):
+                self.progress_bar.stop()
+                self.progress_bar.destroy()
+            
+            # Inizializza le variabili rimanenti
+            self._init_remaining_variables()
+            
+            # Crea l'interfaccia completa
+            self.create_widgets()
+            
+            # Esegui le altre operazioni iniziali
+            self._delayed_startup_tasks()
             
             # Avvia il monitoraggio della memoria
             self.root.after(30000, self.monitor_memory_usage)  # Primo controllo dopo 30 secondi
@@ -1013,14 +5268,15 @@ class FileSearchApp:
         import concurrent.futures
         self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
 
-        # Tracciamento file già processati (per evitare duplicati)
-        self.processed_files = set()
-
         # Variabili principali per la ricerca
         self.search_content = BooleanVar(value=True)
         self.search_path = StringVar()
         self.keywords = StringVar()
         self.search_results = []
+        # Righe in attesa di essere inserite nella lista dei risultati (a blocchi temporizzati)
+        self._result_rows = collections.deque()
+        self._row_stats = {"shown": 0, "files": 0, "size": 0, "attachments": 0, "first_item": None}
+        self._row_flush_scheduled = False
         self.search_files = BooleanVar(value=True)
         self.search_folders = BooleanVar(value=True)
         self.is_searching = False
@@ -1047,9 +5303,13 @@ class FileSearchApp:
         self.max_files_to_check = tk.IntVar(value=100000)
         self.max_results = tk.IntVar(value=50000)
         self.worker_threads = tk.IntVar(value=4)
+        self.extraction_processes = tk.IntVar(value=DEFAULT_EXTRACTION_PROCESSES)
+        self.pdf_max_pages = tk.IntVar(value=0)
+        self.pdf_page_timeout = tk.IntVar(value=10)
         self.max_file_size_mb = tk.IntVar(value=100)
-        self.use_indexing = tk.BooleanVar(value=True)
+        self.use_indexing = tk.BooleanVar(value=False)
         self.skip_permission_errors = tk.BooleanVar(value=True)
+        self.debug_logging = tk.BooleanVar(value=True)
         
         # Variabili per data/ora e utente
         self.user_var = StringVar(value=getpass.getuser())
@@ -1092,8 +5352,18 @@ class FileSearchApp:
 
         # Inizializza le classi di ottimizzazione
         self.network_optimizer = NetworkSearchOptimizer(logger=self)
-        self.large_file_handler = LargeFileHandler(logger=None)
+        self.large_file_handler = LargeFileHandler(logger=self.logger)
         self.windows_search_helper = WindowsSearchHelper(logger=self)
+        self.directory_scanner = DirectoryScanner()
+        self.streaming_searcher = StreamingTextSearcher(logger=self.logger)
+        self.extracted_text_cache = ExtractedTextCache(logger=self.logger)
+        self.local_index = LocalSearchIndex(logger=self.logger)
+        self.incremental_crawler = IncrementalCrawler(self.local_index, self.directory_scanner,
+                                                      self.extracted_text_cache)
+        self.pattern_registry = PatternRegistry()
+        self.deadline_scheduler = DeadlineScheduler(should_stop=lambda: self.stop_search)
+        self.extraction_pool = ExtractionProcessPool(logger=self.logger)
+        self.pdf_searcher = PdfPageSearcher(self.extraction_pool, self.extracted_text_cache, logger=self.logger)
 
         # Configura le opzioni di rete
         self.network_retry_count = 3
@@ -1121,11 +5391,8 @@ class FileSearchApp:
         self.info_count = 0
         self.log_filter_text = ""
         
-        # Debug logs queue (rimuovo la duplicazione)
-        self.debug_logs_queue = queue.Queue(maxsize=5000)  # Limit to 5000 entries to avoid memory issues
-        
-        # Aggiungi questa riga: lista permanente per i log completi dalla creazione dell'app
-        self.complete_debug_log_history = []
+        # Numero del prossimo messaggio del buffer di log da mostrare nella finestra di debug
+        self.last_displayed_log_seq = 0
             
         # Altre variabili che potrebbero essere necessarie
         self.search_whole_words = False
@@ -1172,16 +5439,7 @@ class FileSearchApp:
         self.load_settings_from_file()
         
         # Directory problematiche da escludere automaticamente
-        self.problematic_dirs = [
-            "Client Active Directory Rights Management Services",
-            "Windows Resource Protection",
-            "Windows Defender",
-            "Microsoft Office",
-            "System Volume Information",
-            "$Recycle.Bin",
-            "$WINDOWS.~BT",
-            "$Windows.~WS"
-        ]
+        self.problematic_dirs = list(SearchSettings.PROBLEMATIC_DIRS)
 
         # Verifica dei privilegi di amministratore
         self.is_admin = False
@@ -1199,18 +5457,19 @@ class FileSearchApp:
         self.chunk_size = 8192
         self.max_file_size_mb = IntVar(value=100)
         self.worker_threads = IntVar(value=min(8, os.cpu_count() or 4))
-        self.use_indexing = BooleanVar(value=True)
+        self.extraction_processes = IntVar(value=DEFAULT_EXTRACTION_PROCESSES)
+        self.pdf_max_pages = IntVar(value=0)        # Pagine lette per PDF, 0 = tutte
+        self.pdf_page_timeout = IntVar(value=10)    # Secondi per singola pagina PDF
+        self.use_indexing = BooleanVar(value=False)
         self.search_index = {}
         
         # Lista di estensioni di file di sistema da escludere dalla ricerca nei contenuti
-        self.system_file_extensions = [
-            # File eseguibili e librerie
-            '.exe', '.dll', '.sys', '.drv', '.ocx', '.vxd', '.com', '.bat', '.cmd', '.scr', '.app', '.dylib', '.exp', '.bpl',
-            # ... resto delle estensioni ... 
-        ]
+        self.system_file_extensions = list(SearchSettings.SYSTEM_EXTENSIONS)
 
         # Percorso del log dei file saltati
-        self.skipped_files_log_path = os.path.join(os.path.expanduser("~"), "skipped_files_log.txt")
+        self.skipped_files_log_path = os.path.join(os.path.expanduser("~"), "skipped_files_log.csv")
+        if not hasattr(self, 'skipped_files_sink'):
+            self.skipped_files_sink = SkippedFilesLog(self.skipped_files_log_path, logger=self.logger)
         
         # Aggiorna l'orario
         self.update_datetime()
@@ -1231,7 +5490,6 @@ class FileSearchApp:
             
             # Controlla ogni libreria
             for module_name, format_key, import_name in [
-                ("docx", "docx", "python-docx"),
                 ("PyPDF2", "pdf", "PyPDF2"),
                 # ... e così via per le altre librerie
             ]:
@@ -1443,12 +5701,9 @@ class FileSearchApp:
                 self.log_debug(f"Supporto {format_key} non disponibile")
         
         # Controlla ogni libreria
-        check_module("docx", "docx", "python-docx")
         check_module("PyPDF2", "pdf", "PyPDF2")
-        check_module("pptx", "pptx", "python-pptx")
         check_module("openpyxl", "excel", "openpyxl")
         check_module("striprtf.striprtf", "rtf", "striprtf")
-        check_module("odf", "odt", "odfpy")
         check_module("ebooklib", "epub", "ebooklib")
         check_module("mobi", "mobi", "mobi")
         check_module("dbfread", "dbf", "dbfread")
@@ -1480,106 +5735,91 @@ class FileSearchApp:
                 missing_libraries.append("xlrd")
                 self.log_debug("Supporto XLS via xlrd non disponibile")
         
-        # Controlla supporto ODT con librerie alternative
-        try:
-            from odf import opendocument
-            file_format_support["odt"] = True
-            self.log_debug("Supporto ODT attivato (libreria odf)")
-        except ImportError:
-            missing_libraries.append("odf")
-            self.log_debug("Supporto ODT non disponibile")
-        
         # Mostra notifica dopo un ritardo
         if missing_libraries:
             self.root.after(2000, self.check_and_notify_missing_libraries)
 
     @error_handler
-    def process_file(self, file_path, keywords, search_content=True):
-        """Processa un singolo file per verificare corrispondenze"""
+    def process_file(self, file_path, keywords, search_content=True, file_stat=None):
+        """Processa un singolo file per verificare corrispondenze.
+        file_stat: (dimensione, data modifica, data creazione) già letti dallo scanner, se disponibili"""
         if self.stop_search:
             return None
         
-        # NUOVA LOGICA: Verifica se il file è già stato processato
-        # Normalizza il percorso per essere sicuri
-        normalized_path = os.path.normpath(os.path.abspath(file_path))
-        if normalized_path in self.processed_files:
-            self.log_debug(f"File già processato, saltato: {normalized_path}")
-            return None
-        
         try:
             # Verifica nome file
             file_name = os.path.basename(file_path)
-            matched = False
+            matcher = self.get_keyword_matcher(keywords)
             
             # Verifica corrispondenze nel nome
-            for keyword in keywords:
-                if self.whole_word_search.get():
-                    if self.is_whole_word_match(keyword, file_name):
-                        matched = True
-                        break
-                elif keyword.lower() in file_name.lower():
-                    matched = True
-                    break
+            matched = matcher.search(file_name)
             
             content = ""
+            streamed = set()  # Keyword trovate dalla ricerca in streaming dei formati estratti
             # Verifica contenuto se richiesto e se non c'è già una corrispondenza nel nome
             if not matched and search_content and self.should_search_content(file_path):
                 # NUOVA LOGICA: Controlla se il file è marcato per analisi parziale
                 is_partial_analysis = hasattr(self, '_partial_analysis_files') and file_path in self._partial_analysis_files
                 
-                if is_partial_analysis:
+                if ((is_partial_analysis or self.streaming_searcher.handles(file_path))
+                        and self.large_file_handler.use_mmap_search(file_path)):
+                    # File grande su disco locale: ricerca sui byte mappati in memoria
+                    matched, _ = self.large_file_handler.search_in_large_file(
+                        file_path, keywords, matcher.whole_word, matcher,
+                        should_stop=self.deadline_scheduler.should_stop)
+                elif self.streaming_searcher.handles(file_path):
+                    # File di testo semplice: lettura completa a blocchi, anche se gigantesco
+                    matched = self.search_text_file(file_path, matcher)
+                elif is_partial_analysis:
                     # Usa l'analisi parziale per file giganteschi
-                    self.log_debug(f"Applicando analisi parziale per file gigantesco: {os.path.basename(file_path)}")
-                    matched = self._partial_content_search(file_path, keywords)
+                    self.log_debug("Applicando analisi parziale per file gigantesco: %s", os.path.basename(file_path))
+                    matched = self._partial_content_search(file_path, keywords, matcher)
+                elif os.path.splitext(file_path)[1].lower() == '.pdf':
+                    # PDF: pagine in cache e poi solo quelle mancanti, fino alla prima
+                    # pagina che completa la corrispondenza
+                    streamed = self.search_pdf_file(file_path, matcher, file_stat)
+                    matched = bool(streamed)
+                elif (os.path.splitext(file_path)[1].lower() in STREAMING_EXTRACTORS
+                        and not self.extracted_text_cache.available):
+                    # Senza cache dei testi il testo completo non serve: ricerca in streaming
+                    # con arresto appena trovate tutte le keyword
+                    streamed = self.search_streamed_file(file_path, matcher)
+                    matched = bool(streamed)
                 else:
-                    # Continua con l'analisi normale
-                    content = self.get_file_content(file_path)
+                    # Continua con l'analisi normale (testo estratto in cache se il file non è cambiato)
+                    content = self.get_cached_file_content(file_path, file_stat)
                     
                     # NUOVA GESTIONE: verifica se content è un dizionario (archivi compressi)
                     if isinstance(content, dict):
                         for file_in_archive, file_content in content.items():
                             # Controlla match nel nome del file interno
-                            for keyword in keywords:
-                                if self.whole_word_search.get():
-                                    if self.is_whole_word_match(keyword, file_in_archive):
-                                        self.log_debug(f"Match trovato nel nome del file interno: {file_in_archive}")
-                                        matched = True
-                                        break
-                                elif keyword.lower() in file_in_archive.lower():
-                                    self.log_debug(f"Match trovato nel nome del file interno: {file_in_archive}")
-                                    matched = True
-                                    break
+                            if matcher.search(file_in_archive):
+                                self.log_debug("Match trovato nel nome del file interno: %s", file_in_archive)
+                                matched = True
                             
                             # Se non ha già trovato match nel nome, controlla nel contenuto
-                            if not matched and isinstance(file_content, str):
-                                for keyword in keywords:
-                                    if self.whole_word_search.get():
-                                        if self.is_whole_word_match(keyword, file_content):
-                                            self.log_debug(f"Match trovato nel contenuto del file interno: {file_in_archive}")
-                                            matched = True
-                                            break
-                                    elif keyword.lower() in file_content.lower():
-                                        self.log_debug(f"Match trovato nel contenuto del file interno: {file_in_archive}")
-                                        matched = True
-                                        break
+                            elif isinstance(file_content, str) and matcher.search(file_content):
+                                self.log_debug("Match trovato nel contenuto del file interno: %s", file_in_archive)
+                                matched = True
                             
                             # Interrompe il ciclo se ha già trovato una corrispondenza
                             if matched:
                                 break
                     # Contenuto standard (stringa)
                     elif isinstance(content, str):
-                        for keyword in keywords:
-                            if self.whole_word_search.get():
-                                if self.is_whole_word_match(keyword, content):
-                                    matched = True
-                                    break
-                            elif keyword.lower() in content.lower():
-                                matched = True
-                                break
+                        matched = matcher.search(content)
             
             if matched:
-                # NUOVA LOGICA: Aggiungi il file all'elenco dei processati
-                self.processed_files.add(normalized_path)
+                # Keyword trovate: nome e testo già in memoria (i file letti a blocchi
+                # o mappati in memoria non vengono riletti, vale solo il nome)
+                keyword_mask = matcher.keyword_mask(file_name) | matcher.mask_for(streamed)
+                if isinstance(content, str):
+                    keyword_mask |= matcher.keyword_mask(content)
+                elif isinstance(content, dict):
+                    for file_in_archive, file_content in content.items():
+                        keyword_mask |= matcher.keyword_mask(file_in_archive)
+                        if isinstance(file_content, str):
+                            keyword_mask |= matcher.keyword_mask(file_content)
                 
                 # Verifica se il match è in un allegato di un file EMAIL (EML o MSG)
                 _, ext = os.path.splitext(file_path)
@@ -1587,18 +5827,14 @@ class FileSearchApp:
                     # Cerca il match dopo un'intestazione di allegato
                     attachment_sections = content.split("--- ALLEGATO")
                     for section in attachment_sections[1:]:  # Salta il primo che è l'intestazione email
-                        for keyword in keywords:
-                            if (self.whole_word_search.get() and self.is_whole_word_match(keyword, section)) or \
-                            (not self.whole_word_search.get() and keyword.lower() in section.lower()):
-                                # Match trovato in un allegato
-                                self.log_debug(f"Match trovato in allegato di {file_path}")
-                                return self.create_file_info(file_path, from_attachment=True)
+                        if matcher.search(section):
+                            # Match trovato in un allegato
+                            self.log_debug("Match trovato in allegato di %s", file_path)
+                            return self.create_file_info(file_path, from_attachment=True, file_stat=file_stat,
+                                                         keyword_mask=keyword_mask)
                 
                 # Match normale (non in allegato o non in file EMAIL)
-                return self.create_file_info(file_path)
-                    
-            # NUOVA LOGICA: Se non è stato trovato match, aggiungi comunque il file all'elenco dei processati
-            self.processed_files.add(normalized_path)
+                return self.create_file_info(file_path, file_stat=file_stat, keyword_mask=keyword_mask)
                     
         except Exception as e:
             self.log_error(f"Errore nel processare il file {file_path}", exception=e)
@@ -1609,8 +5845,10 @@ class FileSearchApp:
         return None
     
     @error_handler
-    def process_file_with_timeout(self, file_path, keywords, search_content=True):
-        """Process a file with timeout to prevent hanging"""
+    def process_file_with_timeout(self, file_path, keywords, search_content=True, file_stat=None):
+        """Process a file with a deadline to prevent hanging (see DeadlineScheduler).
+        PDF, XLSX and Office documents are parsed in ExtractionProcessPool, whose
+        worker is terminated when the deadline passes"""
         # CORREZIONE: Rilevamento tipo file per ottimizzare timeout
         is_large_file = False
         is_binary_file = False
@@ -1623,8 +5861,9 @@ class FileSearchApp:
                 is_network_file = True
                 
             # Verifica la dimensione e imposta un flag per i file grandi
-            if os.path.exists(file_path):
-                file_size = os.path.getsize(file_path)
+            # (usa la dimensione già letta dallo scanner se disponibile)
+            file_size = file_stat[0] if file_stat else (os.path.getsize(file_path) if os.path.exists(file_path) else None)
+            if file_size is not None:
                 # File sopra 5MB sono considerati grandi
                 if file_size > 5 * 1024 * 1024:
                     is_large_file = True
@@ -1647,68 +5886,31 @@ class FileSearchApp:
             timeout = 10.0  # 10 secondi per file di rete
         if is_large_file:
             timeout += 5.0  # +5 secondi per file grandi
+            # Le ricerche a finestre leggono i file grandi per intero: un secondo
+            # in più ogni 50 MB anche su dischi lenti
+            timeout += file_size / (50 * 1024 * 1024)
         if is_binary_file:
             timeout = min(timeout, 3.0)  # Limita a 3 secondi per file binari
         if is_email_file:
             timeout += 15.0  # Incremento significativo per file email con allegati
         
-        # Manteniamo liste invece di code per compatibilità
-        result = [None]
-        exception = [None]
-        processing_completed = [False]
-        
-        # CORREZIONE: Utilizzo di una funzione wrapper per gestire correttamente gli argomenti
-        def process_wrapper():
-            try:
-                # Chiama process_file con i parametri corretti
-                res = self.process_file(file_path, keywords, search_content)
-                # Salva il risultato
-                result[0] = res
-            except Exception as e:
-                # Cattura eventuali eccezioni
-                exception[0] = e
-            finally:
-                # Segna il completamento
-                processing_completed[0] = True
-        
-        # Usa la funzione wrapper come target
-        thread = threading.Thread(
-            target=process_wrapper
-        )
-        thread.daemon = True
-        thread.start()
-        thread.join(timeout)
-        
-        # Se il thread è ancora in esecuzione ma abbiamo superato il timeout
-        if not processing_completed[0] and thread.is_alive():
-            self.log_debug(f"Processing timed out for file: {file_path}")
-            
-            # PARTE NUOVA: Gestione dei risultati tardivi per file email
-            if is_email_file:
-                def check_late_results():
-                    if processing_completed[0] or not thread.is_alive():
-                        # Il thread ha terminato, controlla se ci sono nuovi risultati
-                        if result[0] is not None:
-                            self.log_debug(f"Risultati tardivi trovati in: {file_path} - Aggiornamento UI")
-                            # Aggiungi i risultati tardivi alla UI
-                            self.add_search_result(result[0])  # Sostituisci con il tuo metodo
-                            self.update_results_list()  # Aggiorna la UI
-                    else:
-                        # Il thread sta ancora lavorando, ricontrolla più tardi
-                        self.root.after(1000, check_late_results)
-                
-                # Inizia a controllare i risultati tardivi
-                self.root.after(2000, check_late_results)
+        # Scadenza cooperativa: il file viene elaborato in questo thread del pool e gli
+        # estrattori lo abbandonano allo scadere del tempo, senza thread aggiuntivi
+        result, timed_out = self.deadline_scheduler.run(
+            timeout, self.process_file, file_path, keywords, search_content, file_stat)
         
-        if exception[0]:
-            raise exception[0]
+        if timed_out:
+            self.log_debug("Processing timed out for file: %s (%.0fs)", file_path, timeout)
+            return []
         
-        return result[0] if result[0] is not None else []
+        return result if result is not None else []
 
     @error_handler
-    def manage_memory(self):
+    def manage_memory(self, reschedule=True):
         """Gestisce la memoria dell'applicazione in base alle impostazioni configurate dall'utente.
-        Rilascia memoria quando necessario per mantenere le prestazioni ottimali."""
+        Rilascia memoria quando necessario per mantenere le prestazioni ottimali.
+        reschedule=False per le chiamate dai thread di ricerca, che non pianificano
+        il controllo successivo con root.after."""
         try:
             # Verifica se la gestione automatica è disattivata dall'utente
             if not getattr(self, 'auto_memory_management', True):
@@ -1803,7 +6005,7 @@ class FileSearchApp:
                 self.log_debug(f"Anche il fallback di garbage collection è fallito: {str(e2)}")
         
         # Pianifica il prossimo controllo della memoria
-        if hasattr(self, 'root') and self.root:
+        if reschedule and hasattr(self, 'root') and self.root:
             self.root.after(30000, self.manage_memory)  # Controlla ogni 30 secondi
     
     @error_handler
@@ -2074,140 +6276,23 @@ class FileSearchApp:
             )
         return True   # Se la ricerca nei contenuti non è attivata, procedi senza avviso   
     
-    @error_handler
-    def log_debug(self, message):
-        """Sistema di logging unificato che supporta sia la visualizzazione live che il logging storico
-        e filtra i messaggi non necessari e le ripetizioni sulla soglia di memoria.
-        """
-        # Inizializza il set di messaggi già loggati se non esiste
-        if not hasattr(self, 'already_logged_messages'):
-            self.already_logged_messages = set()
-        
-        # Inizializza il contatore dei messaggi se non esiste
-        if not hasattr(self, 'last_displayed_log_index'):
-            self.last_displayed_log_index = 0
-            
-        # Filtra messaggi specifici relativi alle estensioni
-        filter_prefixes = [
-            "Estensioni caricate per modalità base:",
-            "Estensioni caricate per modalità avanzata:",
-            "Estensioni caricate per modalità profonda:"
-        ]
-        
-        # Se il messaggio inizia con uno dei prefissi da filtrare, saltalo
-        if any(message.startswith(prefix) for prefix in filter_prefixes):
-            return
-        
-        # Verifica se è un messaggio sulla soglia di memoria
-        if message.startswith("Soglia memoria calcolata:"):
-            # Controlla se abbiamo già registrato un messaggio simile
-            if "soglia_memoria" in self.already_logged_messages:
-                return  # Salta questo messaggio perché è una ripetizione
-            else:
-                # Registra che abbiamo loggato un messaggio sulla soglia di memoria
-                self.already_logged_messages.add("soglia_memoria")
-        
-        # Inizializza gli attributi necessari se mancanti
-        if not hasattr(self, 'complete_debug_log_history'):
-            self.complete_debug_log_history = []
-        
-        if not hasattr(self, 'debug_logs_queue'):
-            self.debug_logs_queue = queue.Queue(maxsize=5000)
-        
-        if not hasattr(self, 'debug_log'):
-            self.debug_log = []
-        
-        # Creazione timestamp
-        timestamp_full = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]  # Con millisecondi
-        timestamp_short = timestamp_full.split(' ')[1]  # Solo l'ora per i log concisi
-        
-        # MODIFICA QUI: Eccezioni speciali per messaggi sui file binari
-        binary_file_messages = [
-            "file binario ignorato per estrazione testo",
-            "file rilevato come binario",
-            "file ignorato per estrazione contenuto (binario)"
-        ]
-        
-        # Verifica se è un messaggio riguardante file binari che non dovrebbe essere segnalato come errore
-        is_binary_file_info = any(phrase in message.lower() for phrase in binary_file_messages)
-        
-        # Rilevamento automatico dei messaggi di errore o warning
-        if is_binary_file_info:
-            # Formattazione per messaggi sui file binari (come INFO, non ERRORE)
-            log_message_full = f"[INFO] {timestamp_full} - {message}"
-            log_message_short = f"[{timestamp_short}] [INFO] {message}"
-        elif any(keyword in message.lower() for keyword in ["error", "exception", "failed", "errore", "eccezione", "fallito"]):
-            # Formattazione speciale per gli errori
-            log_message_full = f"[ERRORE] {timestamp_full} - {message}"
-            log_message_short = f"[{timestamp_short}] [ERRORE] {message}"
-        elif any(keyword in message.lower() for keyword in ["warning", "warn", "attenzione", "avviso"]):
-            # Formattazione per i warning
-            log_message_full = f"[AVVISO] {timestamp_full} - {message}"
-            log_message_short = f"[{timestamp_short}] [AVVISO] {message}"
-        else:
-            # Formattazione standard per i messaggi di info
-            log_message_full = f"[INFO] {timestamp_full} - {message}"
-            log_message_short = f"[{timestamp_short}] [INFO] {message}"
-        
-        try:
-            # Aggiungi al debug_log (prima implementazione)
-            self.debug_log.append(log_message_full)
-            
-            # Limita la dimensione del log per evitare problemi di memoria
-            if len(self.debug_log) > 5000:
-                self.debug_log = self.debug_log[-5000:]
-                # Se abbiamo dovuto ridurre il log, aggiorniamo l'indice dell'ultimo visualizzato
-                self.last_displayed_log_index = max(0, self.last_displayed_log_index - (len(self.debug_log) - 5000))
-            
-            # Aggiungi alla cronologia completa (seconda implementazione)
-            self.complete_debug_log_history.append(log_message_short)
-            
-            # Limita anche questa cronologia se diventa troppo grande
-            if len(self.complete_debug_log_history) > 10000:
-                self.complete_debug_log_history = self.complete_debug_log_history[-10000:]
-            
-            # Aggiungi alla coda per la visualizzazione live con thread-safety
-            with threading.Lock():
-                if self.debug_logs_queue.full():
-                    try:
-                        self.debug_logs_queue.get_nowait()
-                    except queue.Empty:
-                        pass
-                self.debug_logs_queue.put_nowait(log_message_short)
-                
-            # Verifica se la finestra di debug è aperta
-            if (hasattr(self, 'debug_window') and 
-                hasattr(self, 'debug_text') and
-                self.debug_window.winfo_exists()):
-                
-                # Usa try/except per verificare che siamo nel thread principale
-                try:
-                    # Verifica se siamo nel thread principale
-                    self.root.winfo_exists()  # Lancia eccezione se non siamo nel thread principale
+    def log_debug(self, message, *args):
+        """Messaggio di debug. Con args il testo viene composto (message % args) solo
+        quando il messaggio viene letto: con il log di debug disattivato la chiamata
+        si ferma al controllo del livello, senza costruire stringhe."""
+        logger = self.logger
+        if logger.level <= LOG_DEBUG:
+            logger.log(LOG_DEBUG, message, args)
 
-                    # Controlliamo se c'è già una chiamata di aggiornamento prevista
-                    if not hasattr(self, 'update_scheduled') or not self.update_scheduled:
-                        self.update_scheduled = True
-                        # Pianifica l'aggiornamento con un ritardo per ridurre la frequenza degli aggiornamenti
-                        self.root.after(100, self.add_new_logs_to_display)
+    def log_info(self, message, *args):
+        self.logger.log(LOG_INFO, message, args)
 
-                except:
-                    # Se non siamo nel thread principale, usa after_idle che è sicuro per i thread
-                    try:
-                        if not hasattr(self, 'update_scheduled') or not self.update_scheduled:
-                            self.update_scheduled = True
-                            self.root.after_idle(self.add_new_logs_to_display)
-                    except:
-                        # In caso di errore, non aggiornare l'interfaccia
-                        pass
-                
-        except Exception as e:
-            # In caso di errori nel logging, almeno prova a stampare sulla console
-            print(f"Error in logging system: {str(e)}")
-        
-        # Se siamo in modalità debug, stampa anche sulla console
-        if getattr(self, 'debug_mode', True):  # Default a True se debug_mode non è definito
-            print(f"[DEBUG] {message}")
+    def log_warning(self, message, *args):
+        self.logger.log(LOG_WARNING, message, args)
+
+    def apply_logging_settings(self):
+        """Applica l'impostazione del log di debug dettagliato al logger"""
+        self.logger.level = LOG_DEBUG if self.debug_logging.get() else LOG_INFO
 
     @error_handler
     def log_current_settings(self, context="ricerca"):
@@ -2420,29 +6505,22 @@ class FileSearchApp:
     @error_handler
     def add_new_logs_to_display(self):
         """Aggiunge solo i nuovi messaggi di log alla visualizzazione rispettando il filtro corrente"""
-        self.update_scheduled = False
-        
         if not hasattr(self, 'debug_window') or not hasattr(self, 'debug_text') or not self.debug_window.winfo_exists():
             return
-            
-        # Verifica che il debug log sia inizializzato
-        if not hasattr(self, 'debug_log'):
-            self.debug_log = []
-            self.last_displayed_log_index = 0
-            
-        if not hasattr(self, 'last_displayed_log_index'):
-            self.last_displayed_log_index = 0
         
-        # Verifica se ci sono nuovi messaggi da visualizzare
-        if self.last_displayed_log_index >= len(self.debug_log):
+        # Verifica se ci sono nuovi messaggi da visualizzare (formattati solo ora)
+        records, next_seq = self.logger.ring.since(self.last_displayed_log_seq)
+        if not records:
             return
+        self.last_displayed_log_seq = next_seq
+        new_messages = [record.format() for record in records]
         
-        # Aggiorna la lista completa di tutti i messaggi per il filtraggio
+        # Aggiorna la lista completa di tutti i messaggi per il filtraggio (stessa capacità del buffer)
         if not hasattr(self, 'all_log_messages'):
-            self.all_log_messages = self.debug_log.copy()
-        else:
-            # Aggiungi solo i nuovi messaggi all'elenco completo
-            self.all_log_messages.extend(self.debug_log[self.last_displayed_log_index:])
+            self.all_log_messages = []
+        self.all_log_messages.extend(new_messages)
+        if len(self.all_log_messages) > self.logger.ring.capacity:
+            del self.all_log_messages[:-self.logger.ring.capacity]
         
         # Verifica se è attivo un filtro
         filter_active = hasattr(self, 'current_filter') and hasattr(self, 'filter_var') and self.filter_var.get() != "Tutti"
@@ -2488,26 +6566,11 @@ class FileSearchApp:
             # Comportamento standard senza filtro
             # Aggiorna l'etichetta con il conteggio dei messaggi
             if hasattr(self, 'log_count_label'):
-                self.log_count_label.config(text=f"Registro di debug dell'applicazione: {len(self.debug_log)} messaggi")
+                self.log_count_label.config(text=f"Registro di debug dell'applicazione: {len(self.all_log_messages)} messaggi")
             
             # Inserisci solo i nuovi log
             self.debug_text.config(state=tk.NORMAL)
-            
-            # Limita la visualizzazione a 5000 messaggi
-            max_display = 5000
-            
-            # Se il log è troppo grande, mostra un messaggio informativo
-            if len(self.debug_log) > max_display and self.last_displayed_log_index == 0:
-                self.debug_text.insert(tk.END, f"[Mostrando solo gli ultimi {max_display} di {len(self.debug_log)} messaggi...]\n\n")
-                # Aggiorna l'indice iniziale per iniziare dai messaggi più recenti
-                self.last_displayed_log_index = len(self.debug_log) - max_display
-            
-            # Inserisci i nuovi log
-            for i in range(self.last_displayed_log_index, len(self.debug_log)):
-                self.debug_text.insert(tk.END, self.debug_log[i] + "\n")
-        
-        # Aggiorna l'indice dell'ultimo messaggio visualizzato
-        self.last_displayed_log_index = len(self.debug_log)
+            self.debug_text.insert(tk.END, "\n".join(new_messages) + "\n")
         
         # Evidenzia gli errori con colori appropriati
         self.highlight_errors()
@@ -2521,6 +6584,14 @@ class FileSearchApp:
         # Rendi il testo di nuovo sola lettura
         self.debug_text.config(state=tk.DISABLED)
 
+    def _poll_debug_log(self):
+        """Legge i nuovi messaggi dal buffer finché la finestra di debug è aperta
+        (i thread di ricerca non pianificano aggiornamenti dell'interfaccia)"""
+        if not hasattr(self, 'debug_window') or not self.debug_window.winfo_exists():
+            return
+        self.add_new_logs_to_display()
+        self.debug_window.after(250, self._poll_debug_log)
+
     @error_handler
     def register_interrupt_handler(self):
         """Registra il gestore degli interrupt (CTRL+C)"""
@@ -2532,21 +6603,11 @@ class FileSearchApp:
         
         signal.signal(signal.SIGINT, handle_interrupt)
 
-    @error_handler
     def log_error(self, message, exception=None, location=None, traceback=None):
-        """Registra un errore nel log di debug con dettagli aggiuntivi"""
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        """Registra un errore nel log di debug con dettagli aggiuntivi.
+        Gli errori vengono anche aggiunti in background al file logs/error_log_AAAAMMGG.txt."""
+        error_message = message
         
-        # Crea un messaggio di errore dettagliato con prefisso in italiano
-        error_message = f"[ERRORE] {timestamp} - {message}"
-        
-        print(f"LOG_ERROR: {error_message[:100]}...")
-
-        # Registra nel log di debug
-        if hasattr(self, 'debug_log'):
-            self.debug_log.append(error_message)
-            print(f"Debug log size: {len(self.debug_log)}")
-            
         # Aggiungi informazioni sulla posizione dell'errore
         if location:
             error_message += f" | Posizione: {location}"
@@ -2559,7 +6620,6 @@ class FileSearchApp:
             error_message += f" | Eccezione: [{exc_type}]: {exc_details}"
         
         # Gestisci il traceback (priorità al traceback esplicito se fornito)
-        traceback_info = ""
         if traceback:
             # Usa il traceback fornito esplicitamente
             error_message += f"\n--- Traceback ---\n{traceback}\n-----------------"
@@ -2570,42 +6630,11 @@ class FileSearchApp:
                 tb_info = tb_module.format_exc().split('\n')
                 # Prendi solo le righe più rilevanti del traceback
                 if len(tb_info) > 3:
-                    traceback_info = " | " + " > ".join(tb_info[-4:-1])
-                    error_message += traceback_info
+                    error_message += " | " + " > ".join(tb_info[-4:-1])
             except:
                 pass
         
-        # Registra nel log di debug
-        if hasattr(self, 'debug_log'):
-            self.debug_log.append(error_message)
-            
-            # Limita la dimensione del log per evitare problemi di memoria
-            if len(self.debug_log) > 1000:
-                self.debug_log = self.debug_log[-1000:]
-        
-        # Aggiungi anche al log del sistema se possibile
-        try:
-            import logging
-            logging.error(error_message)
-        except:
-            pass
-        
-        # Salva periodicamente il log su file (max una volta ogni 5 minuti)
-        try:
-            if not hasattr(self, 'last_error_log_save') or \
-            (datetime.now() - self.last_error_log_save).total_seconds() > 300:
-                self.last_error_log_save = datetime.now()
-                
-                # Salva nel file di log
-                log_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
-                os.makedirs(log_dir, exist_ok=True)
-                
-                error_log_file = os.path.join(log_dir, f"error_log_{datetime.now().strftime('%Y%m%d')}.txt")
-                with open(error_log_file, "a", encoding="utf-8") as f:
-                    f.write(error_message + "\n")
-        except:
-            # Non interrompere il flusso dell'applicazione se il salvataggio fallisce
-            pass
+        self.logger.log(LOG_ERROR, error_message)
     
     @error_handler
     def highlight_errors(self):
@@ -2674,12 +6703,8 @@ class FileSearchApp:
         """Verifica e notifica l'utente di eventuali librerie mancanti"""
         missing = []
         
-        if not file_format_support["docx"]:
-            missing.append("python-docx (per file Word)")
         if not file_format_support["pdf"]: 
             missing.append("PyPDF2 (per file PDF)")
-        if not file_format_support["pptx"]:
-            missing.append("python-pptx (per file PowerPoint)")
         if not file_format_support["excel"]:
             missing.append("openpyxl (per file Excel)")
         if not file_format_support["rtf"]:
@@ -2765,6 +6790,19 @@ class FileSearchApp:
             return original_params
         return None
     
+    def restore_system_search_params(self):
+        """Ripristina i parametri modificati da optimize_system_search al termine della
+        ricerca. Le variabili Tk si aggiornano solo qui, nel thread principale"""
+        original_params = getattr(self, 'original_system_search_params', None)
+        if not original_params:
+            return
+        try:
+            self.max_files_to_check.set(original_params["max_files"])
+            self.worker_threads.set(original_params["worker_threads"])
+        except (KeyError, tk.TclError) as e:
+            self.log_debug(f"Errore nel ripristino dei parametri di ricerca: {str(e)}")
+        self.original_system_search_params = None
+    
     @error_handler
     def is_network_path(self, path):
         """Verifica se il percorso è un percorso di rete"""
@@ -2911,48 +6949,13 @@ class FileSearchApp:
             messagebox.showerror("Errore", f"Impossibile riavviare come amministratore: {str(e)}")
             self.log_debug(f"Errore nel riavvio come admin: {str(e)}")
 
-    @error_handler
-    def optimize_disk_search_order(self, path, directories):
-        """Ottimizza l'ordine di esplorazione delle directory quando si cerca in un disco di sistema.
-        Dà priorità alle cartelle più importanti come Users, Documents, ecc.
-        """
-        if path.lower() in ["c:/", "c:\\", "d:/", "d:\\", "e:/", "e:\\"]:
-            prioritized = []
-            normal = []
-            
-            # Cartelle ad alta priorità (esplora per prime)
-            high_priority_folders = ["users", "documents", "documents and settings", "desktop", "downloads"]
-            
-            # Cartelle a bassa priorità (esplora per ultime)
-            low_priority_folders = ["windows", "program files", "program files (x86)", "programdata", "$recycle.bin", "system volume information"]
-            
-            for dir_path in directories:
-                dir_name = os.path.basename(dir_path).lower()
-                
-                if any(priority in dir_name for priority in high_priority_folders):
-                    prioritized.insert(0, dir_path)  # Aggiungi all'inizio per priorità più alta
-                elif any(low in dir_name for low in low_priority_folders):
-                    normal.append(dir_path)  # Aggiungi alla fine
-                else:
-                    prioritized.append(dir_path)  # Priorità media
-                    
-            return prioritized + normal
-        
-        # Se non è un percorso di sistema, restituisci l'elenco originale
-        return directories
-
     @error_handler
     def start_search(self):
         # Assicurati che qualsiasi ricerca precedente sia completamente terminata
         self.reset_search_state()
         
-        # Reset the total files size label at the start of a new search
-        if hasattr(self, 'total_files_size_label'):
-            self.total_files_size_label.config(text="Dimensione totale: 0 B (0 file)")
-        
-        # Pulisci risultati precedenti
-        for item in self.results_list.get_children():
-            self.results_list.delete(item)
+        # Pulisci risultati precedenti (e azzera dimensione totale e numero di file)
+        self.reset_results_view()
         
         # Ottieni i valori direttamente dai widget
         search_path = self.search_path.get().strip()
@@ -3016,6 +7019,10 @@ class FileSearchApp:
         
         # Reset per la nuova ricerca
         self.stop_search = False
+        self.deadline_scheduler.reset_stats()
+        self.extraction_pool.resize(self.extraction_processes.get())
+        # Regole di esclusione compilate una volta per questa ricerca
+        self.path_exclusions = self.build_path_exclusions()
         
         # Imposta is_searching PRIMA di disabilitare i controlli
         self.is_searching = True
@@ -3023,11 +7030,11 @@ class FileSearchApp:
         # Avvia il monitoraggio della memoria
         self.start_memory_monitoring()
         
-        # CRITICO: Crea un nuovo executor per questa ricerca
-        max_workers = max(1, min(32, self.worker_threads.get()))
-        self.search_executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
-        
         original_params = self.optimize_system_search(self.search_path.get())
+        # Salva original_params come attributo per ripristinarli dopo la ricerca
+        # (restore_system_search_params, nel thread principale)
+        if original_params:
+            self.original_system_search_params = original_params
         self.start_search_watchdog()
         
         # Aggiorna l'orario di avvio e resetta l'orario di fine
@@ -3082,6 +7089,33 @@ class FileSearchApp:
         # Ottieni le parole chiave di ricerca
         search_terms = [term.strip() for term in self.keywords.get().split(',') if term.strip()]
         
+        # Pattern compilati una volta per ricerca e condivisi con gli helper
+        self.pattern_registry = PatternRegistry()
+        self.large_file_handler.pattern_registry = self.pattern_registry
+        self.network_optimizer.pattern_registry = self.pattern_registry
+        self.extracted_text_cache.reset_stats()
+        
+        # Istantanea immutabile delle impostazioni, presa dopo optimize_system_search e
+        # l'aggiornamento della profondità: da qui in avanti i thread della ricerca non
+        # leggono più le variabili Tk
+        settings = self.build_search_settings(search_path, search_terms, self.search_content.get())
+        self.current_search_settings = settings
+        self.pdf_searcher = PdfPageSearcher(self.extraction_pool, self.extracted_text_cache,
+                                            settings.pdf_max_pages, settings.pdf_page_timeout,
+                                            logger=self.logger)
+        
+        # Decisioni per estensione compilate una volta per questa ricerca
+        self.extension_policy = self.build_extension_policy(settings)
+        
+        # CRITICO: Crea un nuovo executor per questa ricerca
+        max_workers = max(1, min(32, settings.worker_threads))
+        self.search_executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers,
+                                                                     thread_name_prefix="fs-analysis")
+        
+        # Matcher unico per la ricerca: tutti i punti di confronto lo condividono
+        self.current_search_keywords = search_terms
+        self.keyword_matcher = self.pattern_registry.matcher(settings.keywords, settings.whole_word)
+        
         # DEBUG: Verifica che la ricerca sia correttamente impostata
         self.log_debug(f"STATO RICERCA: is_searching={self.is_searching}, stop_search={self.stop_search}")
         self.log_debug(f"Stato pulsante interruzione: {self.stop_button['state']}")
@@ -3111,15 +7145,20 @@ class FileSearchApp:
             else:
                 self.log_debug(f"Il percorso {search_path} non è indicizzato. Utilizzando ricerca standard.")
         
+        # Indice locale: usato se attivato nelle opzioni e Windows Search non è in uso
+        use_local_index = (not use_windows_search and self.use_indexing.get() and
+                           self.local_index.available)
+        
         # Avvia il thread di ricerca appropriato
-        if use_windows_search:
+        if use_local_index:
+            self.log_debug("INFO: Avvio ricerca utilizzando l'indice locale")
+            search_thread = threading.Thread(target=self._indexed_search_thread, args=(settings,))
+        elif use_windows_search:
             self.log_debug("INFO: Avvio ricerca utilizzando Windows Search (windows.edb)")
-            search_thread = threading.Thread(target=self._windows_search_thread, 
-                                        args=(search_path, search_terms, self.search_content.get()))
+            search_thread = threading.Thread(target=self._windows_search_thread, args=(settings,))
         else:
             self.log_debug("INFO: Avvio ricerca standard dei file")
-            search_thread = threading.Thread(target=self._search_thread, 
-                                        args=(search_path, search_terms, self.search_content.get()))
+            search_thread = threading.Thread(target=self._search_thread, args=(settings,))
         # FINE MODIFICHE WINDOWS SEARCH
         
         search_thread.daemon = True
@@ -3134,10 +7173,6 @@ class FileSearchApp:
 
         # Avvia l'aggiornamento della progress bar
         self.update_progress()
-        
-        # Salva original_params come attributo per ripristinarli dopo la ricerca
-        if original_params:
-            self.original_system_search_params = original_params
 
         # IMPORTANTE: Doppio controllo del pulsante di interruzione dopo aver iniziato la ricerca
         if hasattr(self, 'stop_button'):
@@ -3148,18 +7183,24 @@ class FileSearchApp:
         self.log_debug("Ricerca avviata correttamente con pulsante interruzione abilitato")
 
     # Aggiungi questo metodo alla classe FileSearchApp
-    def _windows_search_thread(self, path, keywords, search_content):
+    def _windows_search_thread(self, settings):
         """Thread di ricerca che utilizza Windows Search"""
         start_time = time.time()
         results = []
+        path, keywords, search_content = settings.root, list(settings.keywords), settings.search_content
+        matcher = self.get_keyword_matcher(keywords)
+        
+        def content_matches(file_path):
+            if self.streaming_searcher.handles(file_path):
+                return self.search_text_file(file_path, matcher)
+            content = self.get_cached_file_content(file_path)
+            return isinstance(content, str) and matcher.search(content)
         
         try:
             self.log_info(f"Utilizzo Windows Search per la ricerca in {path}")
             
-            # Prepara le estensioni filtrate se necessario
-            extensions = None
-            if not self.search_all_extensions_var.get():
-                extensions = self.get_enabled_extensions()
+            # Prepara le estensioni filtrate se necessario (nessuna selezione = tutte)
+            extensions = list(settings.selected_extensions) or None
             
             # Esegui la ricerca con Windows Search
             found_files = self.windows_search_helper.search_files(
@@ -3170,7 +7211,7 @@ class FileSearchApp:
             
             # Processa i risultati
             for file_path in found_files:
-                if not self.search_running:
+                if self.stop_search:
                     break
                     
                 # Verifica che il file soddisfi i criteri
@@ -3181,11 +7222,14 @@ class FileSearchApp:
                     file_matches = True
                     
                     if search_content and self.should_search_content(file_path):
-                        # Verificare ulteriormente le corrispondenze nel contenuto
-                        # con la nostra logica personalizzata se necessario
+                        # Verificare ulteriormente le corrispondenze nel contenuto con la
+                        # nostra logica, entro la scadenza per file e interrompibile dal
+                        # pulsante di stop; se la verifica non si conclude vale Windows Search
                         try:
-                            content = self.get_file_content(file_path)
-                            file_matches = any(k.lower() in content.lower() for k in keywords)
+                            matched, timed_out = self.deadline_scheduler.run(settings.file_timeout,
+                                                                             content_matches, file_path)
+                            if not timed_out:
+                                file_matches = matched
                         except Exception as e:
                             self.log_error(f"Errore durante lettura contenuto: {file_path}", exception=e)
                     
@@ -3203,7 +7247,6 @@ class FileSearchApp:
         
         # Completa la ricerca
         self.search_results = results
-        self.search_running = False
         self.search_completed = True
         
         elapsed_time = time.time() - start_time
@@ -3212,8 +7255,166 @@ class FileSearchApp:
         self.log_info(f"Ricerca completata in {elapsed_time:.2f} secondi. "
                     f"Trovati {len(results)} risultati su {self.total_files_processed} file analizzati.")
         
-        # Aggiorna l'interfaccia
-        self.root.after(100, self.update_results_list)
+        # L'interfaccia ricostruisce la lista dei risultati in update_progress
+        self.progress_queue.put(("complete", "Ricerca completata"))
+
+    @error_handler
+    def _indexed_search_thread(self, settings):
+        """Thread di ricerca che utilizza l'indice locale (opzione use_indexing).
+        Risponde subito dall'indice, poi lo aggiorna riesaminando solo i file nuovi
+        o modificati e restituisce i risultati definitivi."""
+        start_time = time.time()
+        index = self.local_index
+        search_content = settings.search_content
+        matcher = self.get_keyword_matcher(list(settings.keywords))
+        root = LocalSearchIndex.normalize_root(settings.root)
+        
+        try:
+            quick_paths = []
+            if index.is_indexed(root):
+                # Risposta immediata dall'indice esistente: i risultati sono mostrati subito
+                # e sostituiti da quelli verificati al termine dell'aggiornamento
+                for file_info in self._index_results(root, index.query(root, matcher, search_content), settings):
+                    quick_paths.append(file_info.path)
+                    self.emit_result(file_info)
+                self.log_debug(f"Indice locale: {len(quick_paths)} corrispondenze in {(time.time() - start_time) * 1000:.0f} ms")
+                self.progress_queue.put(("status", 
+                    f"{len(quick_paths)} risultati dall'indice locale, verifica dei file modificati..."))
+            else:
+                self.progress_queue.put(("status", f"Creazione dell'indice locale per {root}..."))
+            
+            # Riesamina solo i file nuovi o modificati dall'ultimo aggiornamento
+            folder_results, report = self.refresh_local_index(root, settings, matcher)
+            
+            # Risultati definitivi, filtrati con le stesse regole della ricerca standard
+            results = list(folder_results)
+            results.extend(self._index_results(root, index.query(root, matcher, search_content), settings,
+                                               settings.max_results - len(results)))
+            if [result.path for result in results] != quick_paths:
+                # L'aggiornamento ha cambiato i risultati: la lista viene ricostruita
+                results.sort(key=lambda x: (x.kind, x.name))
+                self.search_results = results
+                self.progress_queue.put(("results_replaced", None))
+            
+            elapsed_time = time.time() - start_time
+            self.log_debug(f"Ricerca da indice locale completata in {elapsed_time:.2f} secondi: "
+                           f"{len(results)} risultati, {report.files_seen} file controllati")
+            self.progress_queue.put(("status", 
+                f"Ricerca completata! Analizzati {report.files_seen} file in {int(elapsed_time)} secondi "
+                f"(+{report.added} ~{report.changed} -{report.removed}, "
+                f"cartelle invariate {report.dirs_skipped}, risparmiati ~{int(report.time_saved)} s)."))
+        except Exception as e:
+            self.log_error("Errore durante la ricerca con l'indice locale", exception=e)
+        finally:
+            try:
+                if self.search_executor and not self.search_executor._shutdown:
+                    self.search_executor.shutdown(wait=False)
+                self.search_executor = None
+            except Exception as e:
+                self.log_debug(f"Errore nella chiusura dell'executor: {str(e)}")
+                self.search_executor = None
+            self.progress_queue.put(("complete", "Ricerca completata"))
+
+    def _index_results(self, root, matches, settings, limit=None):
+        """Risultati per le corrispondenze dell'indice (percorso, dimensione, data),
+        filtrati con le stesse regole della ricerca standard"""
+        limit = settings.max_results if limit is None else limit
+        count = 0
+        for file_path, size, mtime in matches:
+            if self.stop_search or count >= limit:
+                break
+            if (not self._within_search_depth(root, file_path, settings.max_depth)
+                    or self._index_path_pruned(root, file_path, settings) or self.should_skip_file(file_path)):
+                continue
+            file_info = self.create_file_info(file_path)
+            if file_info:
+                count += 1
+                yield file_info
+
+    def _index_path_pruned(self, root, file_path, settings):
+        """True se il file si trova in una cartella esclusa o nascosta: l'IncrementalCrawler
+        non visita queste cartelle ma ne conserva i file nell'indice"""
+        if self.path_exclusions.match(os.path.dirname(file_path)) is not None:
+            return True
+        if not settings.ignore_hidden:
+            return False
+        path = root
+        for name in os.path.relpath(file_path, root).split(os.sep):
+            path = os.path.join(path, name)
+            if name.startswith('.'):
+                return True
+            if os.name == 'nt':
+                try:
+                    attributes = os.stat(path, follow_symlinks=False).st_file_attributes
+                except OSError:
+                    continue
+                if attributes & DirectoryScanner.FILE_ATTRIBUTE_HIDDEN:
+                    return True
+        return False
+
+    def refresh_local_index(self, root, settings, matcher):
+        """Aggiorna l'indice locale per root con l'IncrementalCrawler e le impostazioni
+        della ricerca (SearchSettings).
+        Le cartelle invariate non vengono rilette, si estrae il testo solo dei file
+        nuovi o modificati, in parallelo nel pool di analisi e con la scadenza per
+        file, e si rimuovono quelli eliminati (anche dalla cache dei testi).
+        Restituisce (cartelle corrispondenti, CrawlReport)."""
+        crawler = self.incremental_crawler
+        folder_results = []
+        last_update = [time.time()]
+        path_exclusions = self.path_exclusions
+        search_content = settings.search_content
+        search_folders = settings.search_folders
+        
+        def skip_dir(dir_path):
+            return path_exclusions.prune(dir_path) is not None
+        
+        def needs_content(file_path):
+            return search_content and self.should_search_content(file_path)
+        
+        def report_progress(message):
+            if time.time() - last_update[0] >= 0.5:
+                last_update[0] = time.time()
+                self.progress_queue.put(("status", message))
+        
+        def on_folder(dir_path, name, stat_info):
+            keyword_mask = matcher.keyword_mask(name) if search_folders else 0
+            if keyword_mask and self._within_search_depth(root, dir_path, settings.max_depth):
+                folder_info = self.create_folder_info(dir_path, stat_info, keyword_mask)
+                if folder_info:
+                    folder_results.append(folder_info)
+            report_progress(f"Aggiornamento indice: {dir_path}")
+        
+        def extract(entry):
+            if not needs_content(entry.path):
+                return None
+            report_progress(f"Indicizzazione: {entry.path}")
+            content, timed_out = self.deadline_scheduler.run(settings.file_timeout, self.get_cached_file_content,
+                                                             entry.path, entry.stat_info)
+            if timed_out:
+                return None  # Solo il nome: il contenuto viene riletto al prossimo aggiornamento
+            if isinstance(content, dict):
+                return "\n".join(f"{name}\n{text}" for name, text in content.items() if isinstance(text, str))
+            return content if isinstance(content, str) else ""
+        
+        report = crawler.crawl(root, extract, needs_content=needs_content,
+                               ignore_hidden=settings.ignore_hidden,
+                               should_stop=lambda: self.stop_search,
+                               skip_dir=skip_dir, on_folder=on_folder,
+                               executor_provider=lambda: self.search_executor,
+                               max_pending=max(1, settings.worker_threads) * 4)
+        self.log_debug(report.summary())
+        return folder_results, report
+
+    @staticmethod
+    def _within_search_depth(root, item_path, max_depth):
+        """Applica la profondità massima (0 = illimitata, da SearchSettings) ai risultati
+        dell'indice, con la stessa convenzione della ricerca a blocchi (radice = profondità 0)"""
+        if not max_depth:
+            return True
+        relative_dir = os.path.relpath(os.path.dirname(item_path), root)
+        depth = 0 if relative_dir == os.curdir else relative_dir.count(os.sep) + 1
+        return depth < max_depth
 
     @error_handler
     def start_search_watchdog(self):
@@ -3240,7 +7441,7 @@ class FileSearchApp:
                 try:
                     self.search_executor.shutdown(wait=False)
                     self.search_executor = concurrent.futures.ThreadPoolExecutor(
-                        max_workers=max(1, self.worker_threads.get())
+                        max_workers=max(1, self.worker_threads.get()), thread_name_prefix="fs-analysis"
                     )
                     self.last_progress_time = time.time()  # Reset timer
                     self.status_label["text"] = "Recupero dalla ricerca bloccata..."
@@ -3270,528 +7471,6 @@ class FileSearchApp:
             
             self.total_time_label.config(text=total_time_str) 
 
-    @error_handler
-    def calculate_block_priority(self, directory):
-        """Calcola la priorità del blocco (numerica, più bassa = più alta priorità)"""
-        # Se l'opzione è disabilitata, usa priorità standard per tutti
-        if not self.prioritize_user_folders.get():
-            return 1
-            
-        # Altrimenti, applica la prioritizzazione configurata
-        # Dai priorità alle cartelle degli utenti
-        if "users" in directory.lower() or "documenti" in directory.lower() or "desktop" in directory.lower():
-            return 0  # Alta priorità
-        # Dai priorità medio-alta alle cartelle di dati
-        elif "data" in directory.lower() or "database" in directory.lower() or "downloads" in directory.lower():
-            return 1  # Priorità media-alta
-        # Dai priorità bassa a cartelle di sistema
-        elif "windows" in directory.lower() or "program files" in directory.lower():
-            return 3  # Priorità bassa
-        # Priorità standard per altre cartelle
-        return 2
-    
-    @error_handler
-    def initialize_block_queue(self, root_path, block_queue, visited_dirs, files_checked, keywords, search_content, futures):
-        """Inizializza la coda di blocchi con il percorso principale"""
-        try:
-            # Verifica se l'executor esiste, altrimenti crealo
-            if not hasattr(self, 'executor'):
-                import concurrent.futures
-                self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 4)
-                self.log_debug("Executor creato dinamicamente durante l'inizializzazione della coda blocchi")
-                
-            # Verifica se il percorso è valido
-            if not os.path.exists(root_path) or root_path in visited_dirs:
-                return
-                
-            # Aggiungi il percorso alla lista delle cartelle visitate per evitare cicli
-            try:
-                visited_dirs.add(os.path.realpath(root_path))
-            except:
-                visited_dirs.add(root_path)
-            
-            # Ottieni la profondità massima dalle impostazioni
-            max_depth = self.depth_var.get() if hasattr(self, 'depth_var') else self.max_depth
-            
-            # Log dell'inizio della ricerca con informazioni sulla profondità
-            self.log_debug(f"Inizializzata ricerca in {root_path} con profondità {'illimitata' if max_depth == 0 else max_depth}")
-            
-            # CORREZIONE: Aggiungere sempre il percorso principale alla coda con profondità 0
-            priority_root = self.calculate_block_priority(root_path)
-            block_queue.put((priority_root, root_path, 0))  # Profondità 0 per la directory principale
-            
-            # Processa i file nella directory principale
-            try:
-                items = os.listdir(root_path)
-                
-                # Prima elabora le sottodirectory
-                for item in items:
-                    item_path = os.path.join(root_path, item)
-                    try:
-                        if os.path.isdir(item_path):
-                            # Salta directory nascoste se richiesto
-                            if self.ignore_hidden.get() and (item.startswith('.') or 
-                                (os.name == 'nt' and os.path.exists(item_path) and 
-                                os.stat(item_path).st_file_attributes & 2)):
-                                continue
-                            
-                            # Salta directory escluse
-                            if hasattr(self, 'excluded_paths') and any(
-                                item_path.lower().startswith(excluded.lower()) 
-                                for excluded in self.excluded_paths):
-                                continue
-                            
-                            # Aggiungiamo sempre le sottocartelle di primo livello con profondità 1
-                            priority = self.calculate_block_priority(item_path)
-                            block_queue.put((priority, item_path, 1))  # Profondità 1 per le sottocartelle dirette
-                            
-                            try:
-                                visited_dirs.add(os.path.realpath(item_path))
-                            except:
-                                visited_dirs.add(item_path)
-                    except Exception as e:
-                        self.log_debug(f"Errore nell'aggiunta del blocco {item_path}: {str(e)}")
-                
-                # Poi elabora i file
-                for item in items:
-                    if hasattr(self, 'stop_search') and self.stop_search:
-                        return
-                        
-                    item_path = os.path.join(root_path, item)
-                    try:
-                        if not os.path.isdir(item_path):
-                            if self.search_files.get():
-                                # Verifica file nascosti
-                                if self.ignore_hidden.get() and (item.startswith('.') or 
-                                    (os.name == 'nt' and os.path.exists(item_path) and 
-                                    os.stat(item_path).st_file_attributes & 2)):
-                                    continue
-                                
-                                # Salta se il file dovrebbe essere ignorato
-                                if self.should_skip_file(item_path):
-                                    continue
-                                
-                                # Processa direttamente i file nella directory principale
-                                files_checked[0] += 1
-                                if files_checked[0] > self.max_files_to_check.get():
-                                    if hasattr(self, 'stop_search'):
-                                        self.stop_search = True
-                                    return
-                                
-                                # Usa l'executor appropriato (search_executor o executor)
-                                executor_to_use = self.search_executor if hasattr(self, 'search_executor') else self.executor
-                                future = executor_to_use.submit(self.process_file, item_path, keywords, search_content)
-                                futures.append(future)
-                    except Exception as e:
-                        self.log_debug(f"Errore nell'elaborazione del file {item_path}: {str(e)}")
-                    
-            except PermissionError:
-                self.log_debug(f"Permesso negato per la directory {root_path}")
-            except Exception as e:
-                self.log_debug(f"Errore nell'inizializzazione dei blocchi da {root_path}: {str(e)}")
-                
-            # Aggiorna la UI con i progressi
-            if hasattr(self, 'update_status_label'):
-                self.update_status_label(f"Scansione directory: {root_path}")
-                
-        except Exception as e:
-            self.log_error(f"Errore nell'inizializzazione della coda blocchi: {str(e)}")
-
-    @error_handler
-    def process_file_batch(self, file_batch, files_checked, last_update_time, 
-                      calculation_enabled, keywords, search_content, futures):
-        """Processa un batch di file in modo ottimizzato"""
-        for file_path in file_batch:
-            try:
-                # Verifica limite file
-                files_checked[0] += 1
-                
-                # Verifica ottimizzata del limite di file
-                if files_checked[0] > self.max_files_to_check.get():
-                    self.stop_search = True
-                    self.progress_queue.put(("status", 
-                        f"Limite di {self.max_files_to_check.get():,} file controllati raggiunto. "
-                        f"Aumenta il limite nelle opzioni per cercare più file."))
-                    return
-                    
-                # Calcola dimensione per statistiche se abilitato
-                if calculation_enabled:
-                    try:
-                        if os.path.isfile(file_path) and not os.path.islink(file_path):
-                            file_size = os.path.getsize(file_path)
-                            self.current_search_size += file_size
-                            
-                            # Aggiorna la dimensione mostrata periodicamente
-                            current_time = time.time()
-                            if files_checked[0] % 1000 == 0 or (current_time - last_update_time[0]) > 5:
-                                self.progress_queue.put(("update_dir_size", self.current_search_size))
-                                last_update_time[0] = current_time
-                    except:
-                        pass  # Ignora errori durante il calcolo della dimensione
-                
-                # Verifica se il processo può ancora eseguire submit (non è stato chiuso)
-                try:
-                    if self.search_executor and not self.search_executor._shutdown:
-                        # Usa la versione con timeout per evitare blocchi
-                        future = self.search_executor.submit(
-                            self.process_file_with_timeout, 
-                            file_path, keywords, search_content
-                        )
-                        futures.append(future)
-                    else:
-                        # Fallback diretto se l'executor è chiuso
-                        result = self.process_file(file_path, keywords, search_content)
-                        if result:
-                            self.search_results.append(result)
-                except Exception as e:
-                    self.log_debug(f"Errore nell'elaborazione parallela del file {file_path}: {str(e)}")
-                    # Fallback se l'executor fallisce
-                    try:
-                        result = self.process_file(file_path, keywords, search_content)
-                        if result:
-                            self.search_results.append(result)
-                    except:
-                        pass
-                    
-            except Exception as e:
-                self.log_debug(f"Errore nell'aggiunta del file {file_path} alla coda: {str(e)}")
-
-    @error_handler
-    def process_blocks(self, block_queue, visited_dirs, start_time, timeout, is_system_search, 
-                  files_checked, dirs_checked, last_update_time, path, keywords, search_content, futures):
-        """Elabora i blocchi dalla coda in base alla priorità"""
-        # Determina il numero massimo di file per blocco in base alle impostazioni
-        max_files_in_block = self.max_files_per_block.get()
-        
-        # CORREZIONE: Ottieni il valore della profondità massima in modo coerente
-        max_depth = self.depth_var.get() if hasattr(self, 'depth_var') else self.max_depth
-        
-        # CORREZIONE: Semplifica la logica di tracking - true se c'è un limite, false se è illimitato (0)
-        using_limited_depth = max_depth > 0
-        
-        # Ottimizza il calcolo della dimensione
-        calculation_enabled = self.dir_size_calculation.get() != "disabilitato"
-        
-        # Log dell'inizio dell'elaborazione dei blocchi
-        self.log_debug(f"Avvio elaborazione blocchi con profondità {'limitata a '+str(max_depth) if using_limited_depth else 'illimitata'}")
-        
-        # Adatta automaticamente la dimensione del blocco
-        if self.block_size_auto_adjust.get():
-            # Verifica se è un percorso di rete
-            is_network_path = path.startswith('\\\\') or path.startswith('//')
-            
-            # Ottimizzazione per percorsi di rete
-            if is_network_path:
-                # Blocchi più grandi per la rete per ridurre l'overhead
-                max_files_in_block = max(2000, max_files_in_block)
-                self.log_debug(f"Dimensione blocco adattata per rete: {max_files_in_block}")
-            # Ottimizzazione per ricerche di sistema
-            elif is_system_search:
-                max_files_in_block = max(1500, max_files_in_block)
-                self.log_debug(f"Dimensione blocco adattata per sistema: {max_files_in_block}")
-            # Ottimizzazione per grandi quantità di file
-            elif files_checked[0] > 50000:
-                max_files_in_block = max(3000, max_files_in_block)
-                self.log_debug(f"Dimensione blocco adattata per ricerca grande: {max_files_in_block}")
-        
-        # Ottimizza il numero di blocchi paralleli in base al carico
-        max_parallel = self.max_parallel_blocks.get()
-        
-        # Adatta il parallelismo in base al percorso
-        if path.startswith('\\\\') or path.startswith('//'):
-            # Limita il parallelismo su percorsi di rete
-            max_parallel = min(max_parallel, 3)
-            self.log_debug(f"Parallelismo limitato per percorso di rete: {max_parallel}")
-        
-        # Utilizziamo un set per tracciare i blocchi già processati
-        processed_blocks = set()
-        
-        # Aggiungi contatori per controllo delle interruzioni e gestione memoria
-        interrupt_check_counter = 0
-        memory_check_counter = 0
-        last_watchdog_update = time.time()
-        
-        # Tracciamento delle prestazioni
-        last_performance_check = time.time()
-        files_at_last_check = files_checked[0]
-        
-        while not block_queue.empty() and not self.stop_search:
-            # Verifica timeout
-            current_time = time.time()
-            if timeout and current_time - start_time > timeout:
-                self.progress_queue.put(("timeout", "Timeout raggiunto"))
-                return
-            
-            # Aggiorna il watchdog più frequentemente
-            if hasattr(self, 'last_progress_time') and current_time - last_watchdog_update > 10:
-                self.last_progress_time = current_time
-                last_watchdog_update = current_time
-                
-                # Tracciamento delle prestazioni
-                if current_time - last_performance_check >= 30:  # Ogni 30 secondi
-                    # Calcola velocità di elaborazione
-                    elapsed = current_time - last_performance_check
-                    files_processed = files_checked[0] - files_at_last_check
-                    
-                    if elapsed > 0:
-                        speed = files_processed / elapsed
-                        self.log_debug(f"Velocità di elaborazione: {speed:.1f} file/sec")
-                        
-                        # Adatta dinamicamente la dimensione del blocco
-                        if self.block_size_auto_adjust.get():
-                            if speed < 10:  # Molto lento
-                                new_size = max(max_files_in_block // 2, 100)
-                                if new_size != max_files_in_block:
-                                    max_files_in_block = new_size
-                                    self.log_debug(f"Riduzione dimensione blocco a {max_files_in_block} per bassa velocità")
-                            elif speed > 1000:  # Molto veloce
-                                new_size = min(max_files_in_block * 2, 5000)
-                                if new_size != max_files_in_block:
-                                    max_files_in_block = new_size
-                                    self.log_debug(f"Aumento dimensione blocco a {max_files_in_block} per alta velocità")
-                    
-                    # Aggiorna i contatori per il prossimo controllo
-                    last_performance_check = current_time
-                    files_at_last_check = files_checked[0]
-            
-            try:
-                # CORREZIONE: Estrai in modo sicuro dalla coda
-                try:
-                    # Controllo più robusto per la consistenza del formato della coda
-                    queue_item = block_queue.get(block=False)
-                    
-                    if len(queue_item) >= 3:  # Nuovo formato con profondità
-                        priority, current_block, current_depth = queue_item
-                    else:  # Vecchio formato senza profondità
-                        priority, current_block = queue_item
-                        # Se non stiamo tracciando la profondità (max_depth = 0), imposta a 0
-                        # altrimenti calcola la profondità basata sul percorso
-                        current_depth = 0 if not using_limited_depth else current_block.count(os.path.sep) - path.count(os.path.sep)
-                except (IndexError, queue.Empty):
-                    # In caso di coda vuota, esci dal ciclo
-                    break
-                
-                # CORREZIONE: Verifica la profondità massima in modo più chiaro
-                # Se using_limited_depth è True (max_depth > 0) e la profondità corrente supera max_depth, salta
-                if using_limited_depth and current_depth >= max_depth:
-                    # AGGIUNTA: Log per debug quando una directory viene saltata per limiti di profondità
-                    self.log_debug(f"Saltata directory {current_block} per limite di profondità (profondità: {current_depth}, max: {max_depth})")
-                    continue
-                
-                # Salta blocchi già processati
-                if current_block in processed_blocks:
-                    continue
-                    
-                processed_blocks.add(current_block)
-                
-                # Aggiorna lo stato più frequentemente
-                current_time = time.time()
-                if current_time - last_update_time[0] >= 0.3:  # Ridotto da 0.5 a 0.3 secondi
-                    elapsed_time = current_time - start_time
-                    self.progress_queue.put(("status", 
-                        f"Analisi blocco: {current_block} (Cartelle: {dirs_checked[0]}, File: {files_checked[0]}, Tempo: {int(elapsed_time)}s)"))
-                    self.progress_queue.put(("progress", 
-                        min(90, int((files_checked[0] / max(1, self.max_files_to_check.get())) * 100))))
-                    last_update_time[0] = current_time
-                
-                # Implementa la verifica dei percorsi problematici prima di elaborare
-                # Verifica se il percorso attuale è in una directory problematica o esclusa
-                skip_block = False
-                
-                # Verifica più efficiente dei percorsi esclusi
-                if hasattr(self, 'excluded_paths') and self.excluded_paths:
-                    if any(current_block.lower().startswith(excluded.lower()) for excluded in self.excluded_paths):
-                        self.log_debug(f"Salto blocco in percorso escluso: {current_block}")
-                        skip_block = True
-                
-                # Verifica per directory problematiche note
-                if not skip_block and hasattr(self, 'problematic_dirs'):
-                    if any(problematic in current_block for problematic in self.problematic_dirs):
-                        self.log_debug(f"Salto blocco in directory problematica: {current_block}")
-                        skip_block = True
-                
-                if skip_block:
-                    continue
-                
-                # Blocco attualmente in elaborazione
-                dirs_checked[0] += 1
-                
-                # Usa try-except più granulare per gestire errori di accesso
-                try:
-                    items = os.listdir(current_block)
-                except PermissionError:
-                    if self.skip_permission_errors.get():
-                        self.log_debug(f"Saltata directory con permesso negato: {current_block}")
-                        continue
-                    else:
-                        # Gestione fallback per directory inaccessibili
-                        dir_name = os.path.basename(current_block)
-                        parent_dir = os.path.dirname(current_block)
-                        is_user_folder = (parent_dir.lower() in ["c:/users", "c:\\users"] and 
-                                        dir_name.lower() != getpass.getuser().lower())
-                        if is_user_folder:
-                            self.log_debug(f"Cartella di un altro utente inaccessibile: {current_block}")
-                            self.progress_queue.put(("status", f"Saltata cartella utente protetta: {current_block}"))
-                        else:
-                            self.log_debug(f"Permesso negato per la directory {current_block}")
-                            self.progress_queue.put(("status", f"Permesso negato: {current_block}"))
-                        continue
-                except Exception as e:
-                    self.log_debug(f"Errore nell'accesso alla directory {current_block}: {str(e)}")
-                    continue
-                
-                # Prima processa le sottocartelle (aggiungi nuovi blocchi)
-                subfolders = []
-                for item in items:
-                    if self.stop_search:
-                        return
-                        
-                    item_path = os.path.join(current_block, item)
-                    
-                    # Salta file/cartelle nascoste
-                    try:
-                        if self.ignore_hidden.get() and (item.startswith('.') or 
-                            (os.name == 'nt' and os.path.exists(item_path) and 
-                            os.stat(item_path).st_file_attributes & 2)):
-                            continue
-                    except Exception as e:
-                        self.log_debug(f"Errore nel controllo hidden per {item_path}: {str(e)}")
-                        continue
-                        
-                    # Gestione sottodirectory
-                    try:
-                        if os.path.isdir(item_path):
-                            # Verifica se la cartella è già stata visitata
-                            try:
-                                real_path = os.path.realpath(item_path)
-                                if real_path in visited_dirs:
-                                    continue
-                                visited_dirs.add(real_path)
-                            except:
-                                if item_path in visited_dirs:
-                                    continue
-                                visited_dirs.add(item_path)
-                            
-                            # Ottimizzazione verifica percorsi esclusi
-                            # Verifica se il percorso deve essere escluso (più efficiente)
-                            excluded = False
-                            if hasattr(self, 'excluded_paths') and self.excluded_paths:
-                                excluded = any(item_path.lower().startswith(excluded_path.lower()) 
-                                            for excluded_path in self.excluded_paths)
-                                
-                            if excluded:
-                                continue
-                            
-                            # CORREZIONE: Aggiungi sempre la sottocartella alla lista con profondità incrementata
-                            # La verifica della profondità massima verrà fatta nel ciclo successivo
-                            subfolders.append((item_path, current_depth + 1))
-                            
-                            # Verifica corrispondenza nome cartella
-                            if self.search_folders.get():
-                                # Usa match parola intera dove appropriato
-                                matched = False
-                                for keyword in keywords:
-                                    if self.whole_word_search.get():
-                                        if self.is_whole_word_match(keyword, item):
-                                            matched = True
-                                            break
-                                    elif keyword.lower() in item.lower():
-                                        matched = True
-                                        break
-                                        
-                                if matched:
-                                    folder_info = self.create_folder_info(item_path)
-                                    self.search_results.append(folder_info)
-                                    
-                    except Exception as e:
-                        self.log_debug(f"Errore nell'analisi della directory {item_path}: {str(e)}")
-                
-                # Ottimizza l'ordine di elaborazione delle sottocartelle
-                if self.prioritize_user_folders.get():
-                    # Estrai solo i percorsi per la funzione optimize_disk_search_order
-                    subfolder_paths = [item[0] for item in subfolders]
-                    optimized_paths = self.optimize_disk_search_order(path, subfolder_paths)
-                    
-                    # Ricostruisci la lista con le profondità
-                    optimized_subfolders = []
-                    path_to_depth = {item[0]: item[1] for item in subfolders}
-                    for optimized_path in optimized_paths:
-                        optimized_subfolders.append((optimized_path, path_to_depth.get(optimized_path, current_depth + 1)))
-                    subfolders = optimized_subfolders
-                
-                # CORREZIONE: Aggiunta sottocartelle alla coda con priorità calcolata
-                # Usa sempre il formato con profondità per maggiore coerenza
-                for subfolder_info in subfolders:
-                    subfolder, folder_depth = subfolder_info
-                    
-                    priority = self.calculate_block_priority(subfolder)
-                    
-                    # Aggiungi sempre la sottocartella alla coda, la verifica della profondità
-                    # sarà fatta nel ciclo successivo
-                    block_queue.put((priority, subfolder, folder_depth))
-                    
-                    # AGGIUNTA: Log per debug quando viene aggiunta una sottocartella
-                    if folder_depth > current_depth:
-                        self.log_debug(f"{subfolder} (profondità: {folder_depth})")
-                
-                # Ottimizza la gestione della memoria per blocchi grandi
-                # Gestione della memoria più aggressiva
-                memory_check_counter += 1
-                if memory_check_counter >= 5:  # Controllo ogni 5 blocchi invece che per file
-                    self.manage_memory()
-                    memory_check_counter = 0
-                
-                # Processa i file nel blocco corrente con batch più piccoli
-                file_batch = []
-                for item in items:
-                    if self.stop_search:
-                        return
-                        
-                    item_path = os.path.join(current_block, item)
-                    
-                    # Salta i file nascosti e le directory (già processate)
-                    try:
-                        # Controllo file nascosto
-                        if self.ignore_hidden.get() and (item.startswith('.') or 
-                                    (os.name == 'nt' and os.path.exists(item_path) and 
-                                        os.stat(item_path).st_file_attributes & 2)):
-                            continue
-                            
-                        # Salta le directory (già processate)
-                        if os.path.isdir(item_path):
-                            continue
-                    except Exception as e:
-                        self.log_debug(f"Errore nel controllo del tipo per {item_path}: {str(e)}")
-                        continue
-                        
-                    # Aggiungi file al batch se cerchiamo nei file
-                    if self.search_files.get():
-                        file_batch.append(item_path)
-                        
-                        # Quando il batch raggiunge dimensione massima, processalo
-                        if len(file_batch) >= 100:  # Elabora a blocchi di 100 file
-                            self.process_file_batch(file_batch, files_checked, last_update_time, 
-                                                calculation_enabled, keywords, search_content, futures)
-                            file_batch = []
-                
-                # Processa il batch finale di file
-                if file_batch:
-                    self.process_file_batch(file_batch, files_checked, last_update_time, 
-                                        calculation_enabled, keywords, search_content, futures)
-                    
-            except queue.Empty:
-                break
-
-            # Controllo più frequente per interruzioni
-            interrupt_check_counter += 1
-            if interrupt_check_counter >= 3:  # Ridotto da 10 a 3 blocchi
-                interrupt_check_counter = 0
-                # Forza un aggiornamento dell'interfaccia più frequente
-                try:
-                    self.root.update_idletasks()
-                except:
-                    pass
-    
     @error_handler
     # Funzione per calcolare il tempo rimanente stimato
     def calculate_remaining_time(self, files_processed, max_files, elapsed_time):
@@ -3825,131 +7504,87 @@ class FileSearchApp:
             self.log_debug(f"Errore nel calcolo del tempo rimanente: {str(e)}")
             return "N/A"
         
+    def build_search_settings(self, path, keywords, search_content):
+        """Istantanea dei parametri della ricerca, letti dalle variabili dell'interfaccia.
+        Va chiamato nel thread principale (start_search)"""
+        search_level = self.search_depth.get()
+        return SearchSettings(
+            path, keywords,
+            whole_word=self.whole_word_search.get(),
+            search_files=self.search_files.get(),
+            search_folders=self.search_folders.get(),
+            search_content=search_content,
+            max_depth=getattr(self, 'max_depth', 0),
+            max_files=self.max_files_to_check.get(),
+            max_results=self.max_results.get(),
+            timeout=self.timeout_seconds.get() if self.timeout_enabled.get() else None,
+            worker_threads=self.worker_threads.get(),
+            extraction_processes=self.extraction_processes.get(),
+            pdf_max_pages=self.pdf_max_pages.get(),
+            pdf_page_timeout=self.pdf_page_timeout.get(),
+            max_parallel_blocks=self.max_parallel_blocks.get(),
+            ignore_hidden=self.ignore_hidden.get(),
+            skip_permission_errors=self.skip_permission_errors.get(),
+            calculate_size=self.dir_size_calculation.get() != "disabilitato",
+            prioritize_user_folders=self.prioritize_user_folders.get(),
+            search_level=search_level,
+            selected_extensions=self.get_extension_settings(search_level),
+            exclude_system_files=self.exclude_system_files.get(),
+            system_extensions=self.system_file_extensions,
+            excluded_paths=getattr(self, 'excluded_paths', []),
+            problematic_dirs=getattr(self, 'problematic_dirs', []))
+
     @error_handler
-    def _search_thread(self, path, keywords, search_content):
+    def _search_thread(self, settings):
         try:
-            # Inizializza i contatori di file e directory esaminati e il tempo di inizio
-            files_checked = [0]  # Uso una lista per poter modificare il valore nelle funzioni chiamate
-            dirs_checked = [0]
             start_time = time.time()
-            timeout = self.timeout_seconds.get() if self.timeout_enabled.get() else None
+            keywords, search_content = list(settings.keywords), settings.search_content
             
-            # NUOVA RIGA: Verifica all'inizio se il calcolo della dimensione è abilitato
-            calculation_enabled = self.dir_size_calculation.get() != "disabilitato"
-            
-            self.current_search_size = 0  # Dimensione totale dei file trovati
-            last_size_update_time = time.time()  # Per aggiornamenti periodici
-
-            # Determina se si tratta di una ricerca completa del sistema (C:/ o simile)
-            is_system_search = path.lower() in ["c:/", "c:\\", "d:/", "d:\\", "e:/", "e:\\"] or path in [os.path.abspath("/")]
-
-            # Per ricerche di sistema, adatta automaticamente i parametri
-            if is_system_search:
+            # Per ricerche complete del sistema (C:/ o simile) i limiti vengono alzati per questa ricerca
+            if SearchEngine.is_system_root(settings.root):
                 # Informa l'utente che la ricerca potrebbe richiedere molto tempo
                 self.progress_queue.put(("status", "Ricerca completa del sistema in corso - potrebbe richiedere molto tempo"))
-                
-                # Temporaneamente aumenta i limiti per la ricerca di sistema
-                original_max_files = self.max_files_to_check.get()
-                original_timeout = timeout
-                
-                # Imposta limiti più elevati per la ricerca completa
-                self.max_files_to_check.set(5000000)  # 5 milioni di file
-                
-                # Disabilita temporaneamente il timeout o aumentalo significativamente
+                timeout = settings.timeout
                 if timeout and timeout < 3600:
                     timeout = 3600 * 8  # 8 ore
-                
-                # Avviso all'utente
+                settings = settings.replace(max_files=5000000, timeout=timeout)
                 self.progress_queue.put(("status", "Ricerca completa avviata - parametri adattati per ricerca approfondita"))
             
-            # Variabili per gestire l'aggiornamento ogni secondo
-            last_update_time = [time.time()]
-            
-            # Crea un executor per processare i file in parallelo in modo sicuro
-            try:
-                max_workers = max(1, min(32, self.worker_threads.get()))  # Garantisce un valore valido
-                self.search_executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
-            except Exception as e:
-                self.log_debug(f"Errore nella creazione del ThreadPoolExecutor: {str(e)}")
-                # Fallback a un valore sicuro
-                self.search_executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
-            
-            futures = []
-            
-            # Insieme per tenere traccia delle cartelle visitate (evita loop infiniti con symlink)
-            visited_dirs = set()
-            
-            # Coda di priorità per i blocchi di ricerca
-            block_queue = queue.PriorityQueue()
-
-            # Aggiorna lo stato iniziale
-            self.progress_queue.put(("status", f"Inizio ricerca a blocchi in: {path} (Profondità: {'illimitata' if self.max_depth == 0 else self.max_depth})"))
-            
-            # Assicurati che la lista di esclusioni sia inizializzata
-            if not hasattr(self, 'excluded_paths'):
-                self.excluded_paths = []
-                
-            # Avvia la ricerca a blocchi
-            self.initialize_block_queue(path, block_queue, visited_dirs, files_checked, keywords, search_content, futures)
-            self.process_blocks(block_queue, visited_dirs, start_time, timeout, is_system_search, 
-                            files_checked, dirs_checked, last_update_time, path, keywords, search_content, futures)
-            
-            # Ripristina i parametri originali se erano stati modificati
-            if is_system_search and self.max_depth == 0 and 'original_max_files' in locals():
-                self.max_files_to_check.set(original_max_files)
-            
-            # Aggiorna lo stato finale di analisi
-            self.progress_queue.put(("status", f"Elaborazione risultati... (analizzati {files_checked[0]} file in {dirs_checked[0]} cartelle)"))
-            
-            # Raccolta risultati dalle future con aggiornamento temporizzato
-            completed = 0
-            total_futures = len(futures)
-            last_update_time[0] = time.time()
-            
-            # Gestione sicura delle future
-            if self.search_executor and not self.search_executor._shutdown and futures:
-                try:
-                    for future in concurrent.futures.as_completed(futures):
-                        if self.stop_search:
-                            break
-                            
-                        try:
-                            result = future.result()
-                            if result:
-                                self.search_results.append(result)
-                            
-                            completed += 1
-                            
-                            # Aggiorna il progresso e il tempo più frequentemente
-                            current_time = time.time()
-                            if completed % 20 == 0 or current_time - last_update_time[0] > 2:  # Aggiorna ogni 20 file o ogni 2 secondi
-                                progress = 90 + min(10, int((completed / max(1, len(futures))) * 10))
-                                self.progress_queue.put(("progress", progress))
-                                
-                                elapsed_time = current_time - start_time
-                                self.progress_queue.put(("status", f"Elaborati {completed}/{len(futures)} file (tempo: {int(elapsed_time)}s)"))
-                                
-                                # Aggiorna anche il tempo totale durante la ricerca
-                                if hasattr(self, 'search_start_time'):
-                                    now = datetime.now()
-                                    time_diff = now - self.search_start_time
-                                    # Converti in minuti e secondi
-                                    total_seconds = int(time_diff.total_seconds())
-                                    minutes = total_seconds // 60
-                                    seconds = total_seconds % 60
-                                    
-                                    if minutes > 0:
-                                        total_time_str = f"{minutes}min {seconds}sec"
-                                    else:
-                                        total_time_str = f"{seconds}sec"
-                                        
-                                    self.progress_queue.put(("update_total_time", total_time_str))
-                                
-                                last_update_time[0] = current_time
-                        except Exception as e:
-                            self.log_debug(f"Errore nell'elaborazione di un risultato: {str(e)}")
-                except Exception as e:
-                    self.log_debug(f"Errore nella raccolta dei risultati: {str(e)}")
+            def report(kind, value):
+                # Ogni messaggio del motore conta come progresso per il watchdog
+                self.last_progress_time = time.time()
+                if kind == "heartbeat":
+                    return
+                self.progress_queue.put((kind, value))
+                # Aggiorna anche il tempo totale durante la ricerca
+                if kind == "progress" and getattr(self, 'search_start_time', None):
+                    total_seconds = int((datetime.now() - self.search_start_time).total_seconds())
+                    minutes = total_seconds // 60
+                    seconds = total_seconds % 60
+                    total_time_str = f"{minutes}min {seconds}sec" if minutes > 0 else f"{seconds}sec"
+                    self.progress_queue.put(("update_total_time", total_time_str))
+            
+            # Il motore gestisce attraversamento, limiti e pipeline; l'interfaccia fornisce
+            # i propri filtri e l'analisi completa dei formati (process_file_with_timeout)
+            engine = SearchEngine(
+                settings, on_result=self.emit_result, on_progress=report,
+                should_stop=lambda: self.stop_search,
+                skip_file=self.should_skip_file,
+                process_file=lambda entry, matcher: self.process_file_with_timeout(
+                    entry.path, keywords, search_content, entry.stat_info),
+                housekeeping=lambda: self.manage_memory(reschedule=False),
+                executor_provider=lambda: self.search_executor,
+                extraction_pool=self.extraction_pool, logger=self.logger)
+            # Le statistiche delle esclusioni sono riportate al termine (update_progress)
+            self.path_exclusions = engine.path_exclusions
+            engine.run()
+            
+            scheduler = self.deadline_scheduler
+            restarts = engine.stats()["extraction_restarts"]
+            if scheduler.timeouts or scheduler.killed or restarts:
+                self.log_debug(f"File abbandonati per scadenza: {scheduler.timeouts}, "
+                               f"processi di estrazione terminati: {scheduler.killed}, "
+                               f"processi del pool di estrazione riavviati: {restarts}")
             
             # Completa la ricerca in modo sicuro
             try:
@@ -3960,24 +7595,20 @@ class FileSearchApp:
                 self.log_debug(f"Errore nella chiusura dell'executor: {str(e)}")
                 self.search_executor = None
             
-            # Ripristina i parametri originali se erano stati modificati per la ricerca di sistema
-            if hasattr(self, 'original_system_search_params'):
-                try:
-                    self.max_files_to_check.set(self.original_system_search_params["max_files"])
-                    self.worker_threads.set(self.original_system_search_params["worker_threads"])
-                    delattr(self, 'original_system_search_params')
-                except:
-                    pass
-
             # Riporta il risultato finale
             elapsed_time = time.time() - start_time
             self.progress_queue.put(("status", 
-                f"Ricerca completata! Analizzati {files_checked[0]} file in {dirs_checked[0]} cartelle in {int(elapsed_time)} secondi."))
+                f"Ricerca completata! Analizzati {engine.files_checked} file in {engine.dirs_checked} cartelle "
+                f"in {int(elapsed_time)} secondi."))
             
             # Ordina i risultati per tipo e nome
-            self.search_results.sort(key=lambda x: (x[0], x[1]))
+            self.search_results.sort(key=lambda x: (x.kind, x.name))
             
             self.log_debug(f"Ricerca completata. Trovati {len(self.search_results)} risultati")
+            cache_stats = self.extracted_text_cache.get_stats()
+            self.log_debug(f"Cache testo estratto: {cache_stats['hits']} hit, {cache_stats['misses']} miss "
+                           f"({cache_stats['hit_rate']:.1f}%), {cache_stats['stores']} salvati, "
+                           f"{cache_stats['evictions']} eliminati, {self._format_size(cache_stats['size_bytes'])} su disco")
             self.progress_queue.put(("complete", "Ricerca completata"))
             
         except Exception as e:
@@ -3985,40 +7616,100 @@ class FileSearchApp:
             self.log_debug(error_msg)
             self.progress_queue.put(("error", error_msg))
 
-    @error_handler
-    def is_whole_word_match(self, keyword, text):
-        """Verifica se la keyword è presente nel testo come parola intera."""
+    def get_cached_file_content(self, file_path, file_stat=None):
+        """Restituisce il testo estratto dalla cache persistente o lo estrae con
+        get_file_content e lo memorizza. file_stat: (dimensione, data modifica, ...)"""
+        cache = self.extracted_text_cache
+        if not cache.available:
+            return self.get_file_content(file_path)
+        
         try:
-            pattern = r'\b' + re.escape(keyword.lower()) + r'\b'
-            return re.search(pattern, text.lower()) is not None
-        except re.error as e:
-            self.log_debug(f"Errore regex con il termine '{keyword}': {str(e)}")
-            
-            # Fallback manuale se la regex fallisce
-            keyword_lower = keyword.lower()
-            text_lower = text.lower()
-            
-            if keyword_lower not in text_lower:
-                return False
-                
-            # Verifica manuale dei confini parola
-            index = text_lower.find(keyword_lower)
-            while index != -1:
-                # Controlla il carattere prima della keyword
-                has_char_before = index > 0 and text_lower[index-1].isalnum()
-                
-                # Controlla il carattere dopo la keyword
-                end_pos = index + len(keyword_lower)
-                has_char_after = end_pos < len(text_lower) and text_lower[end_pos].isalnum()
-                
-                # Se non ci sono caratteri alfanumerici prima e dopo, è una parola intera
-                if not has_char_before and not has_char_after:
-                    return True
-                    
-                # Cerca la prossima occorrenza
-                index = text_lower.find(keyword_lower, index + 1)
-            
+            if file_stat is None:
+                st = os.stat(file_path)
+                file_stat = (st.st_size, st.st_mtime)
+            size, mtime = file_stat[0], file_stat[1]
+        except OSError:
+            return self.get_file_content(file_path)
+        
+        content = cache.get(file_path, size, mtime)
+        if content is not None:
+            self.log_debug("Testo estratto letto dalla cache: %s", os.path.basename(file_path))
+            return content
+        
+        content = self.get_file_content(file_path)
+        # Non memorizzare estrazioni vuote o interrotte: potrebbero dipendere da errori temporanei
+        if content and not self.deadline_scheduler.should_stop():
+            cache.put(file_path, size, mtime, content)
+        return content
+
+    def search_text_file(self, file_path, matcher):
+        """Cerca nell'intero contenuto di un file di testo semplice in streaming"""
+        if self._is_likely_binary_file(file_path):
             return False
+        
+        found = self.streaming_searcher.search_file(
+            file_path, matcher, should_stop=self.deadline_scheduler.should_stop)
+        if found:
+            self.log_debug("Match in streaming per %s: %s", ', '.join(sorted(found)), os.path.basename(file_path))
+        return bool(found)
+
+    def search_streamed_file(self, file_path, matcher):
+        """Cerca con l'estrattore in streaming del formato (STREAMING_EXTRACTORS) nel pool
+        di processi, entro la scadenza del file corrente. Restituisce le keyword trovate."""
+        token = self.deadline_scheduler.current()
+        found = self.extraction_pool.search(file_path, matcher.keywords, matcher.whole_word,
+                                            token.remaining() if token else None,
+                                            self.deadline_scheduler.should_stop_search)
+        if found is None:
+            # Pool di processi non disponibile: ricerca nel thread corrente
+            should_stop = self.deadline_scheduler.should_stop
+            pieces = STREAMING_EXTRACTORS[os.path.splitext(file_path)[1].lower()](file_path, should_stop)
+            try:
+                found = self.streaming_searcher.search_chunks(pieces, matcher, should_stop=should_stop)
+            except Exception as e:
+                self.log_debug("Errore nella ricerca in streaming di %s: %s", file_path, str(e))
+                found = set()
+            finally:
+                pieces.close()
+        if found:
+            self.log_debug("Match in streaming per %s: %s", ', '.join(sorted(found)), os.path.basename(file_path))
+        return found
+
+    def search_pdf_file(self, file_path, matcher, file_stat=None):
+        """Cerca in un PDF pagina per pagina (PdfPageSearcher) entro la scadenza del file
+        corrente. Restituisce le keyword trovate."""
+        try:
+            if file_stat is None:
+                st = os.stat(file_path)
+                file_stat = (st.st_size, st.st_mtime)
+            size, mtime = file_stat[0], file_stat[1]
+        except OSError:
+            size, mtime = None, None
+        token = self.deadline_scheduler.current()
+        found = self.pdf_searcher.search(file_path, size, mtime, matcher,
+                                         token.remaining() if token else None,
+                                         self.deadline_scheduler.should_stop,
+                                         self.deadline_scheduler.should_stop_search)
+        if found:
+            self.log_debug("Match nelle pagine PDF per %s: %s", ', '.join(sorted(found)), os.path.basename(file_path))
+        return found
+
+    def get_keyword_matcher(self, keywords):
+        """Restituisce il KeywordMatcher della ricerca corrente, ricostruendolo
+        solo se le keyword o la modalità parola intera sono cambiate"""
+        settings = self.active_search_settings()
+        whole_word = settings.whole_word if settings is not None else self.whole_word_search.get()
+        matcher = getattr(self, 'keyword_matcher', None)
+        if matcher is None or not matcher.is_for(keywords, whole_word):
+            matcher = self.pattern_registry.matcher(keywords, whole_word)
+        return matcher
+
+    @error_handler
+    def is_whole_word_match(self, keyword, text):
+        """Verifica se la keyword è presente nel testo come parola intera.
+        Usa il pattern già compilato (case-insensitive) del registro della ricerca,
+        senza creare copie in minuscolo del testo."""
+        return self.pattern_registry.word_pattern(keyword).search(text) is not None
 
     @error_handler  
     def search_current_user_only(self):
@@ -4040,134 +7731,66 @@ class FileSearchApp:
             messagebox.showerror("Errore", "Impossibile trovare la tua cartella utente")
 
     @error_handler
-    def create_file_info(self, file_path, from_attachment=False):
-        """Crea le informazioni del file per la visualizzazione"""
+    def create_file_info(self, file_path, from_attachment=False, file_stat=None, keyword_mask=0):
+        """Crea il SearchResult di un file; la formattazione avviene solo alla visualizzazione.
+        file_stat: (dimensione, data modifica, data creazione) già letti dallo scanner; evita un nuovo stat"""
+        file_name = os.path.basename(file_path)
+        file_extension = os.path.splitext(file_name)[1].lower()
         try:
-            file_size = os.path.getsize(file_path)
-            modified_time = datetime.fromtimestamp(os.path.getmtime(file_path))
-            created_time = datetime.fromtimestamp(os.path.getctime(file_path))
-            file_name = os.path.basename(file_path)
-            file_extension = os.path.splitext(file_name)[1].lower()
-            
-            # Determina il tipo di file
-            file_type = "File"  # Valore predefinito
-            if os.path.isdir(file_path):
-                file_type = "Directory"
+            if file_stat is None:
+                stat_result = os.stat(file_path)
+                file_stat = (stat_result.st_size, stat_result.st_mtime, stat_result.st_ctime)
+                is_directory = os.path.isdir(file_path)
             else:
-                # Usa mimetypes per determinare il tipo
-                import mimetypes
-                mime_type, _ = mimetypes.guess_type(file_path)
-                if mime_type:
-                    file_type = mime_type.split('/')[0].capitalize()
-                    if file_type == "Application":
-                        if "pdf" in mime_type:
-                            file_type = "PDF"
-                        elif "word" in mime_type or file_extension == ".docx" or file_extension == ".doc":
-                            file_type = "Word"
-                        elif "excel" in mime_type or file_extension in [".xlsx", ".xls"]:
-                            file_type = "Excel"
-                        elif "powerpoint" in mime_type or file_extension in [".pptx", ".ppt"]:
-                            file_type = "PowerPoint"
-                        else:
-                            file_type = "Documento"
-                else:
-                    # Fallback basato sull'estensione
-                    if file_extension in ['.txt', '.md', '.rtf']:
-                        file_type = "Testo"
-                    elif file_extension in ['.jpg', '.jpeg', '.png', '.gif', '.bmp']:
-                        file_type = "Immagine"
-                    elif file_extension in ['.mp3', '.wav', '.ogg', '.flac']:
-                        file_type = "Audio"
-                    elif file_extension in ['.mp4', '.avi', '.mkv', '.mov']:
-                        file_type = "Video"
-                    elif file_extension in ['.exe', '.dll', '.bat']:
-                        file_type = "Eseguibile"
-                    elif file_extension == '.eml':
-                        file_type = "Email"
-            
-            # Formatta dimensione file
-            if file_size < 1024:
-                size_str = f"{file_size} B"
-            elif file_size < 1024 * 1024:
-                size_str = f"{file_size / 1024:.1f} KB"
-            else:
-                size_str = f"{file_size / (1024 * 1024):.1f} MB"
-            
-            # Aggiungi il flag from_attachment alla tupla dei risultati
-            return (
-                file_type,
-                file_name,
-                size_str,
-                modified_time.strftime('%d/%m/%Y %H:%M'),
-                created_time.strftime('%d/%m/%Y %H:%M'),
-                file_path,
-                from_attachment  # Nuovo campo
-            )
+                # Lo scanner fornisce metadati solo per i file
+                is_directory = False
+            
+            if is_directory:
+                return SearchResult("Directory", file_name, file_path, "", None, file_stat[1], file_stat[2],
+                                    from_attachment, keyword_mask)
+            return SearchResult(SearchEngine.file_type(file_path, file_extension), file_name, file_path, file_extension,
+                                file_stat[0], file_stat[1], file_stat[2], from_attachment, keyword_mask)
         except Exception as e:
             self.log_debug(f"Errore nel creare le informazioni del file {file_path}: {str(e)}")
-            return (
-                "File",
-                os.path.basename(file_path),
-                "N/A",
-                "N/A",
-                "N/A",
-                file_path,
-                False  # Default: non è un allegato
-            )
+            # Default: non è un allegato, metadati non disponibili
+            return SearchResult("File", file_name, file_path, file_extension)
+
     @error_handler
-    def create_folder_info(self, folder_path):
-        """Crea le informazioni della cartella per la visualizzazione"""
+    def create_folder_info(self, folder_path, folder_stat=None, keyword_mask=0):
+        """Crea il SearchResult di una cartella (stesso record dei file, senza dimensione).
+        folder_stat: (dimensione, data modifica, data creazione) già letti dallo scanner, se disponibili"""
+        folder_name = os.path.basename(folder_path)
         try:
-            modified_time = datetime.fromtimestamp(os.path.getmtime(folder_path))
-            created_time = datetime.fromtimestamp(os.path.getctime(folder_path))
-            folder_name = os.path.basename(folder_path)
-            
-            return (
-                "Directory",
-                folder_name,
-                "",  # Le cartelle non hanno dimensione
-                modified_time.strftime('%d/%m/%Y %H:%M'),
-                created_time.strftime('%d/%m/%Y %H:%M'),
-                folder_path
-            )
+            if folder_stat is None:
+                stat_result = os.stat(folder_path)
+                folder_stat = (0, stat_result.st_mtime, stat_result.st_ctime)
+            return SearchResult("Directory", folder_name, folder_path, "", None, folder_stat[1], folder_stat[2],
+                                keyword_mask=keyword_mask)
         except Exception as e:
             self.log_debug(f"Errore nel creare le informazioni della cartella {folder_path}: {str(e)}")
-            return (
-                "Directory",
-                os.path.basename(folder_path),
-                "",
-                "N/A",
-                "N/A",
-                folder_path
-            )
+            return SearchResult("Directory", folder_name, folder_path)
     
     @error_handler
     def should_search_content(self, file_path):
-        """Versione ottimizzata per determinare se analizzare il contenuto del file"""
+        """Determina se analizzare il contenuto del file secondo l'ExtensionPolicy della ricerca"""
+        policy = self.get_extension_policy()
         # Prima verifica le condizioni più veloci (principio fail-fast)
-        if not self.search_content.get():
+        if not policy.search_content:
             return False
         
-        # Ottieni le estensioni personalizzate dell'utente e il livello di ricerca
-        search_level = self.search_depth.get()
-        custom_extensions = self.get_extension_settings(search_level)
-        
         # Ottieni l'estensione del file
         ext = os.path.splitext(file_path)[1].lower()
         
         # PRIORITÀ #1: Se l'estensione è stata aggiunta manualmente, cerca sempre il contenuto
-        if ext in custom_extensions:
-            self.log_debug(f"Ricerca contenuto in file con estensione personalizzata: {ext}")
+        if ext in policy.selected:
+            self.log_debug("Ricerca contenuto in file con estensione personalizzata: %s", ext)
             return True
         
-        # Estensioni di file non testuali da ignorare SOLO se non selezionate esplicitamente dall'utente
-        binary_extensions = ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.mp3', '.mp4', 
-                            '.avi', '.mov', '.wav', '.flac', '.exe', '.dll', '.so',
-                            '.iso', '.img', '.msi', '.bin', '.dat', '.zip', '.rar', '.7z']
-        
-        # Se non è un'estensione personalizzata e appare nella lista dei binari, ignorala
-        if ext in binary_extensions and ext not in custom_extensions:
-            self.log_debug(f"File ignorato per estrazione contenuto (binario): {os.path.basename(file_path)}")
+        action = policy.content_action(ext)
+        if action == ExtensionPolicy.NAME_ONLY:
+            # Estensioni di file non testuali o non previste dal livello di ricerca
+            if ext in ExtensionPolicy.BINARY_EXTENSIONS:
+                self.log_debug("File ignorato per estrazione contenuto (binario): %s", os.path.basename(file_path))
             return False
         
         # Controlla la dimensione del file usando il nuovo sistema di categorizzazione
@@ -4175,300 +7798,150 @@ class FileSearchApp:
         
         # Verifica se il file è grande e se l'ottimizzazione per file grandi è disabilitata
         if file_category in ["large", "huge", "gigantic"] and not getattr(self, 'large_file_search_enabled', True):
-            self.log_debug(f"File {file_category} ignorato (ottimizzazione disabilitata): {os.path.basename(file_path)}")
+            self.log_debug("File %s ignorato (ottimizzazione disabilitata): %s", file_category, os.path.basename(file_path))
             return False
         
         # Aggiunge log dettagliato sulla dimensione del file per debug
         if file_category != "normal":
-            self.log_debug(f"Elaborazione file di dimensione {file_category}: {os.path.basename(file_path)}")
+            self.log_debug("Elaborazione file di dimensione %s: %s", file_category, os.path.basename(file_path))
         
         # Se il file è gigantesco, applica la logica speciale per file giganteschi
         if file_category == "gigantic":
             # Registra l'evento nei log
-            self.log_debug(f"Applicazione strategia speciale per file gigantesco: {os.path.basename(file_path)}")
+            self.log_debug("Applicazione strategia speciale per file gigantesco: %s", os.path.basename(file_path))
             
-            # Imposta un flag per indicare alle altre funzioni che questo file richiede trattamento speciale
             file_size = os.path.getsize(file_path)
             
-            # Metodo 1: Verifica se il tipo di file è supportato per analisi parziale
-            binary_types = ['.exe', '.dll', '.bin', '.iso', '.img', '.msi']
-            archive_types = ['.zip', '.rar', '.7z', '.tar', '.gz', '.bz2']
-            media_types = ['.mp4', '.avi', '.mkv', '.mov', '.mpg', '.wmv', '.mp3', '.wav', '.flac']
-            
-            # Per file binari molto grandi, probabilmente contengono dati non testuali
-            if ext in binary_types and file_size > 5 * 1024 * 1024 * 1024:  # >5GB
-                self.log_debug(f"File binario gigantesco, contenuto probabilmente non testuale: {os.path.basename(file_path)}")
-                return False
-                
-            # Per archivi enormi, è generalmente meglio estrarre prima e cercare nei file estratti
-            if ext in archive_types and file_size > 4 * 1024 * 1024 * 1024:  # >4GB
-                # Qui potresti voler mostrare un messaggio all'utente suggerendo di estrarre prima l'archivio
-                self.log_debug(f"Archivio gigantesco, si consiglia di estrarre e cercare nei file estratti: {os.path.basename(file_path)}")
-                # Si potrebbe aggiungere un popup per l'utente qui
-                return False
-            
-            # Per file multimediali enormi, la ricerca di testo è raramente utile
-            if ext in media_types and file_size > 3 * 1024 * 1024 * 1024:  # >3GB
-                self.log_debug(f"File multimediale gigantesco, contenuto probabilmente non testuale: {os.path.basename(file_path)}")
+            # Metodo 1: binari, archivi e file multimediali oltre il limite del loro tipo
+            # contengono raramente testo utile (per gli archivi conviene estrarli prima)
+            limit = ExtensionPolicy.GIGANTIC_LIMITS.get(ext)
+            if limit is not None and file_size > limit:
+                self.log_debug("File gigantesco (%s) oltre il limite per il tipo, contenuto non analizzato: %s",
+                               action, os.path.basename(file_path))
                 return False
             
             # Metodo 2: Per database e file di log giganteschi, usa metodi speciali
-            db_types = ['.db', '.sqlite', '.mdb', '.accdb', '.sql']
-            log_types = ['.log', '.csv', '.tsv', '.txt']
-            
-            if ext in db_types or ext in log_types:
+            if action == ExtensionPolicy.PARTIAL:
                 # Imposta un attributo temporaneo per indicare che questo file necessita di elaborazione speciale
                 # Questo verrà controllato dalla funzione di elaborazione
                 self._mark_file_for_partial_analysis(file_path)
-                self.log_debug(f"File dati gigantesco, verrà analizzato con metodi speciali: {os.path.basename(file_path)}")
+                self.log_debug("File dati gigantesco, verrà analizzato con metodi speciali: %s", os.path.basename(file_path))
                 return True  # Continua con l'elaborazione, ma sarà gestito diversamente
             
             # Metodo 3: Per altri tipi di file giganteschi, offri all'utente la possibilità di scegliere
-            # Questa è un'opzione più avanzata che potrebbe richiedere una UI specifica
             if file_size > 2.5 * 1024 * 1024 * 1024:  # >2.5GB
                 # Implementa una logica di conferma tramite una variabile globale temporanea
                 if not hasattr(self, '_gigantic_files_confirmed') or file_path not in self._gigantic_files_confirmed:
-                    self.log_debug(f"File gigantesco richiede conferma per l'elaborazione: {os.path.basename(file_path)}")
+                    self.log_debug("File gigantesco richiede conferma per l'elaborazione: %s", os.path.basename(file_path))
                     # Restituisci False per ora, ma imposta un flag per ulteriore elaborazione
                     self._queue_gigantic_file_for_confirmation(file_path)
                     return False
         
-        # Attiva sempre la ricerca nei file Office, indipendentemente dal livello di ricerca
-        if ext in ['.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx']:
-            self.log_debug(f"Analisi contenuto attivata per file Office: {os.path.basename(file_path)} ({ext})")
-            return True
-        
-        # PRIORITÀ #2: In modalità profonda senza estensioni personalizzate, cerca tutto
-        if search_level == "profonda" and not custom_extensions:
-            return True
-        
-        # Liste predefinite nel codice per ciascun livello
-        base_extensions = ['.txt', '.md', '.csv', '.html', '.htm', '.xml', '.log', 
-                        '.docx', '.doc', '.pdf', '.pptx', '.ppt', '.xlsx', '.xls', '.rtf', '.odt', '.ods', '.odp',
-                        '.csv','.eml', '.msg', '.emlx']
-
-        advanced_extensions = base_extensions + ['.exe', '.dll', '.sys', '.bat', '.cmd', '.ps1', 
-                                            '.vbs', '.js', '.config', '.ini', '.json', '.reg']
-                                            
-        deep_extensions = advanced_extensions + ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.mp3', '.mp4', 
-                                            '.avi', '.mov', '.mkv', '.wav', '.flac', '.zip', '.rar', 
-                                            '.7z', '.tar', '.gz', '.iso', '.psd', '.ai', '.svg']
-        
-        # Verifica il livello predefinito se non è nelle estensioni personalizzate
-        if search_level == "base" and ext in base_extensions:
-            return True
-        elif search_level == "avanzata" and ext in advanced_extensions:
-            return True
-        elif search_level == "profonda" and ext in deep_extensions:
-            return True
-        
-        return False
-
-    @error_handler
-    def _mark_file_for_partial_analysis(self, file_path):
-        """Marca un file per l'analisi parziale invece che completa"""
-        if not hasattr(self, '_partial_analysis_files'):
-            self._partial_analysis_files = set()
-        self._partial_analysis_files.add(file_path)
-
-    @error_handler
-    def _queue_gigantic_file_for_confirmation(self, file_path):
-        """Accoda un file gigantesco per la conferma dell'utente"""
-        if not hasattr(self, '_gigantic_files_queue'):
-            self._gigantic_files_queue = []
-        if not hasattr(self, '_gigantic_files_confirmed'):
-            self._gigantic_files_confirmed = set()
-        
-        if file_path not in self._gigantic_files_queue and file_path not in self._gigantic_files_confirmed:
-            self._gigantic_files_queue.append(file_path)
-            
-            # Schedula un prompt per l'utente se non già in corso
-            if not hasattr(self, '_showing_gigantic_confirmation') or not self._showing_gigantic_confirmation:
-                self._showing_gigantic_confirmation = True
-                self.root.after(100, self._process_gigantic_file_queue)
-
-    @error_handler
-    def _process_gigantic_file_queue(self):
-        """Processa la coda di file giganteschi richiedendo conferma all'utente"""
-        if not hasattr(self, '_gigantic_files_queue') or not self._gigantic_files_queue:
-            self._showing_gigantic_confirmation = False
-            return
-        
-        file_path = self._gigantic_files_queue[0]
-        file_name = os.path.basename(file_path)
-        file_size = os.path.getsize(file_path)
-        formatted_size = self._format_size(file_size)
-        
-        # Calcola il tempo stimato di elaborazione (approssimativo)
-        estimated_time = self._estimate_processing_time(file_size)
-        
-        # Mostra un dialog all'utente
-        message = (f"Il file '{file_name}' è molto grande ({formatted_size}).\n\n"
-                f"L'elaborazione potrebbe richiedere circa {estimated_time}.\n"
-                "Vuoi procedere con l'analisi?")
-        
-        result = messagebox.askyesno("File gigantesco rilevato", message)
-        
-        if result:  # L'utente ha confermato
-            self._gigantic_files_confirmed.add(file_path)
-            # Riesamina il file nella ricerca
-            if hasattr(self, 'redo_search_for_file'):
-                self.redo_search_for_file(file_path)
-        
-        # Rimuovi il file dalla coda
-        self._gigantic_files_queue.pop(0)
-        
-        # Se ci sono altri file nella coda, continua a processarli
-        if self._gigantic_files_queue:
-            self.root.after(100, self._process_gigantic_file_queue)
-        else:
-            self._showing_gigantic_confirmation = False
-
-    @error_handler
-    def _estimate_processing_time(self, file_size):
-        """Stima il tempo di elaborazione per un file di grandi dimensioni"""
-        # Valori empirici basati su test (questi andrebbero regolati in base alle prestazioni reali)
-        bytes_per_second = 25 * 1024 * 1024  # ~25 MB/s per file di testo
-        
-        # Adatta la velocità in base alla dimensione (file più grandi sono più lenti da processare)
-        if file_size > 5 * 1024 * 1024 * 1024:  # >5GB
-            bytes_per_second = 15 * 1024 * 1024  # ~15 MB/s
-        
-        seconds = file_size / bytes_per_second
-        
-        # Formatta il tempo stimato
-        if seconds < 60:
-            return f"{int(seconds)} secondi"
-        elif seconds < 3600:
-            return f"{int(seconds / 60)} minuti"
-        else:
-            hours = int(seconds / 3600)
-            minutes = int((seconds % 3600) / 60)
-            return f"{hours} ore e {minutes} minuti"
-
-    @error_handler
-    def redo_search_for_file(self, file_path):
-        """Riesamina un file specifico nella ricerca corrente"""
-        if not hasattr(self, 'current_search_keywords') or not self.current_search_keywords:
-            return
-        
-        # Esegui la ricerca solo su questo file specifico
-        try:
-            result = self.process_file(file_path, self.current_search_keywords, search_content=True)
-            if result:
-                self.search_results.append(result)
-                self.update_results_list()
-        except Exception as e:
-            self.log_error(f"Errore durante l'elaborazione del file {file_path}", e)
+        return True
+
+    def build_extension_policy(self, settings=None):
+        """Compila l'ExtensionPolicy dall'istantanea della ricerca o, se non indicata,
+        dalle impostazioni correnti dell'interfaccia (solo nel thread principale)"""
+        if settings is None:
+            settings = self.build_search_settings(self.search_path.get(), (), self.search_content.get())
+        policy = ExtensionPolicy.from_settings(settings)
+        self.log_debug("Politica estensioni (%s): %s selezionate, %s tabellate", settings.search_level,
+                       len(policy.selected), len(policy.actions))
+        return policy
+
+    def build_path_exclusions(self):
+        """Compila le PathExclusionRules da excluded_paths e problematic_dirs"""
+        return PathExclusionRules(getattr(self, 'excluded_paths', []),
+                                  getattr(self, 'problematic_dirs', []),
+                                  logger=self.logger)
+
+    def get_extension_policy(self):
+        """ExtensionPolicy della ricerca corrente; fuori da una ricerca viene compilata
+        dalle impostazioni attuali"""
+        policy = getattr(self, 'extension_policy', None)
+        if policy is None or self.active_search_settings() is None:
+            policy = self.build_extension_policy()
+        return policy
+
+    def active_search_settings(self):
+        """Istantanea SearchSettings dell'ultima ricerca avviata. Nel thread principale
+        vale solo durante la ricerca (altrimenti None: le impostazioni si leggono
+        dall'interfaccia); i thread secondari la usano sempre e non toccano mai Tk,
+        anche quando terminano dopo un'interruzione."""
+        settings = getattr(self, 'current_search_settings', None)
+        if settings is None:
+            return None
+        if self.is_searching or threading.current_thread() is not threading.main_thread():
+            return settings
+        return None
 
     @error_handler
     def should_skip_file(self, file_path):
         """Verifica se un file deve essere saltato durante l'analisi del contenuto"""
+        policy = self.get_extension_policy()
         ext = os.path.splitext(file_path)[1].lower()
-        skip_type = "File di sistema" if ext in self.system_file_extensions else "File"
-        skip_filename = os.path.basename(file_path)
-        
-        # Ottieni le estensioni selezionate per il livello di ricerca corrente
-        search_level = self.search_depth.get()
-        selected_extensions = self.get_extension_settings(search_level)
-        
-        # CORREZIONE: Se l'estensione non è tra quelle selezionate dall'utente, salta il file
-        # Ma procedi solo se l'estensione non è vuota (per includere file senza estensione)
-        if ext and ext not in selected_extensions:
-            self.log_debug(f"File saltato perché estensione deselezionata: {file_path}")
-            self.log_skipped_file(file_path, skip_type, skip_filename, "Estensione deselezionata")
-            return True
-        
-        # Salta i file di Rights Management Services
-        if "Rights Management Services" in file_path or "IRMProtectors" in file_path:
-            self.log_debug(f"Saltato file protetto: {file_path}")
-            self.log_skipped_file(file_path, skip_type, skip_filename, "Rights Management Services")
-            return True
-                    
-        # Salta file con estensioni problematiche
-        problematic_extensions = [".msoprotector.doc", ".msoprotector.ppt", ".msoprotector.xls"]
-        if any(ext in file_path for ext in problematic_extensions):
-            self.log_debug(f"Saltato file con formato problematico: {file_path}")
-            self.log_skipped_file(file_path, skip_type, skip_filename, "Formato problematico")
-            return True
-
-        # Salta file di sistema solo se non sono nelle estensioni personalizzate
-        if self.exclude_system_files.get() and ext in self.system_file_extensions:
-            # Non saltare script files in ricerca avanzata/profonda
-            script_files = ['.bat', '.cmd', '.ps1', '.vbs']
-            if ext in script_files and search_level in ["avanzata", "profonda"]:
-                return False
-            
-            self.log_debug(f"File di sistema escluso: {file_path}")
-            self.log_skipped_file(file_path, skip_type, skip_filename, "File di sistema")
-            return True
-                    
-        return False
+        # Estensione deselezionata (i file senza estensione sono inclusi; nessuna selezione
+        # significa "tutte le estensioni"), file protetti RMS, formati problematici e file
+        # di sistema (gli script restano cercabili in ricerca avanzata/profonda)
+        reason = policy.file_skip_reason(file_path, ext)
+        if reason is None:
+            return False
+        self.log_debug("File saltato (%s): %s", reason, file_path)
+        self._record_skipped_file(file_path, ext, policy, reason)
+        return True
+    
+    def _record_skipped_file(self, file_path, ext, policy, reason):
+        skip_type = "File di sistema" if ext in policy.system_extensions else "File"
+        self.log_skipped_file(file_path, skip_type, os.path.basename(file_path), reason)
     
-    @error_handler
     def log_skipped_file(self, filepath, skiptype, filename, skipreason):
-        """Registra i file saltati in un file di log"""
-        try:
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            log_entry = f"{timestamp} - {skiptype} - {filename} - {filepath} - {skipreason}\n"
-            
-            with open(self.skipped_files_log_path, 'a', encoding='utf-8') as log_file:
-                log_file.write(log_entry)
-        except Exception as e:
-            self.log_debug(f"Errore durante la scrittura del log dei file saltati: {str(e)}")
+        """Registra un file saltato nel log dei file esclusi.
+        Il record viene solo accodato: la scrittura avviene nel thread di SkippedFilesLog"""
+        self.skipped_files_sink.record(skiptype, filename, filepath, skipreason)
 
     @error_handler
     def export_skipped_files_log(self):
         """Esporta il log dei file saltati in un formato CSV"""
         try:
             
-            # Verifica se il file di log esiste
-            if not os.path.exists(self.skipped_files_log_path):
-                messagebox.showinfo("Informazione", "Non ci sono file di log da esportare.")
-                return
-                
-            # Verifica che il file non sia vuoto
-            if os.path.getsize(self.skipped_files_log_path) == 0:
-                messagebox.showinfo("Informazione", "Il file di log esiste ma è vuoto. Non ci sono file esclusi da esportare.")
+            sink = self.skipped_files_sink
+            
+            # Verifica che il log contenga dei record
+            if sink.is_empty():
+                messagebox.showinfo("Informazione", "Non ci sono file esclusi da esportare.")
                 return
 
             # Chiedi all'utente dove salvare il file esportato
             export_path = filedialog.asksaveasfilename(
                 defaultextension=".csv",
                 initialfile="file_esclusi_export.csv",
-                filetypes=[("CSV files", "*.csv"), ("Text files", "*.txt"), ("All files", "*.*")],
+                filetypes=[("CSV files", "*.csv"), ("JSON Lines", "*.jsonl"), ("All files", "*.*")],
                 title="Salva il log dei file esclusi")
             
             if not export_path:  # L'utente ha annullato
                 return
-                
-            # Leggi il file di log originale
-            with open(self.skipped_files_log_path, 'r', encoding='utf-8') as log_file:
-                log_content = log_file.readlines()
-                
-            # Crea il file CSV
-            with open(export_path, 'w', newline='', encoding='utf-8') as csv_file:
-                csv_writer = csv.writer(csv_file, delimiter=';', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-                
-                # Intestazione
-                csv_writer.writerow(["Data e Ora", "Tipo", "Nome File", "Percorso Completo", "Motivo Esclusione"])
-                
-                # Analizza e scrive ogni riga del log
-                for log_line in log_content:
-                    try:
-                        # Formato tipico: 2023-01-01 12:34:56 - File di sistema - nomefile.exe - C:/percorso/nomefile.exe - File di sistema
-                        parts = log_line.strip().split(" - ", 4)
-                        if len(parts) >= 5:
-                            csv_writer.writerow(parts)
-                    except Exception as e:
-                        self.log_debug(f"Errore nell'elaborazione della riga di log: {str(e)}")
-                        
-                # Aggiunge statistiche alla fine
-                csv_writer.writerow([])
-                csv_writer.writerow([f"Totale file esclusi: {len(log_content)}"])
-                # Utilizzo della data e utente forniti
-                csv_writer.writerow([f"Esportazione eseguita il: 2025-04-19 19:25:10"])
-                csv_writer.writerow([f"Utente: Nino19980"])
+            
+            total = 0
+            if export_path.lower().endswith(".jsonl"):
+                # Un oggetto JSON per riga con i campi di SkippedFilesLog.FIELDS
+                with open(export_path, 'w', encoding='utf-8') as jsonl_file:
+                    for record in sink.records():
+                        jsonl_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                        total += 1
+            else:
+                # Il log è già in CSV: le righe vengono copiate senza ulteriori analisi
+                with open(export_path, 'w', newline='', encoding='utf-8') as csv_file:
+                    csv_writer = csv.writer(csv_file, delimiter=';', quotechar='"', quoting=csv.QUOTE_MINIMAL)
+                    csv_writer.writerow(SkippedFilesLog.HEADER)
+                    for row in sink.rows():
+                        csv_writer.writerow(row)
+                        total += 1
+                    
+                    # Aggiunge statistiche alla fine
+                    csv_writer.writerow([])
+                    csv_writer.writerow([f"Totale file esclusi: {total}"])
+                    csv_writer.writerow([f"Esportazione eseguita il: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"])
+                    csv_writer.writerow([f"Utente: {getpass.getuser()}"])
             
             # Aggiungi un link per aprire il file esportato
             open_export = messagebox.askyesno(
@@ -4495,14 +7968,9 @@ class FileSearchApp:
             if not hasattr(self, 'search_start_time') or self.search_start_time is None:
                 messagebox.showinfo("Informazione", "Non è stata ancora effettuata una ricerca per visualizzare i file esclusi.")
                 return
-            # Verifica se il file di log esiste
-            if not os.path.exists(self.skipped_files_log_path):
-                messagebox.showinfo("Informazione", "Non ci sono file di log da visualizzare.")
-                return
-                
-            # Verifica che il file non sia vuoto
-            if os.path.getsize(self.skipped_files_log_path) == 0:
-                messagebox.showinfo("Informazione", "Il file di log esiste ma è vuoto. Non ci sono file esclusi da visualizzare.")
+            # Verifica che il log contenga dei record
+            if self.skipped_files_sink.is_empty():
+                messagebox.showinfo("Informazione", "Non ci sono file esclusi da visualizzare.")
                 return
                 
             # Crea una nuova finestra
@@ -4537,10 +8005,9 @@ class FileSearchApp:
             scrollbar_y.config(command=log_text.yview)
             scrollbar_x.config(command=log_text.xview)
             
-            # Leggi e inserisci il contenuto del log
-            with open(self.skipped_files_log_path, 'r', encoding='utf-8') as log_file:
-                log_content = log_file.read()
-                log_text.insert("1.0", log_content)
+            # Leggi e inserisci il contenuto del log (stesso formato delle versioni precedenti)
+            log_content = "\n".join(" - ".join(row) for row in self.skipped_files_sink.rows())
+            log_text.insert("1.0", log_content)
                 
             # Rendi il testo di sola lettura
             log_text.config(state="disabled")
@@ -4574,13 +8041,13 @@ class FileSearchApp:
     def clear_skipped_files_log(self):
         """Svuota il log dei file esclusi"""
         try:
-            # Verifica se il file di log esiste
-            if not os.path.exists(self.skipped_files_log_path):
+            # Verifica che il log contenga dei record
+            if self.skipped_files_sink.is_empty():
                 messagebox.showinfo("Informazione", "Non ci sono file di log da cancellare.")
                 return
                 
-            # Svuota il file di log
-            open(self.skipped_files_log_path, 'w', encoding='utf-8').close()
+            # Svuota il log (file corrente e copia ruotata)
+            self.skipped_files_sink.clear()
             
             # Reinizializza la lista dei file saltati
             self.skipped_files = []
@@ -4607,6 +8074,52 @@ class FileSearchApp:
             messagebox.showerror("Errore", f"Si è verificato un errore durante la cancellazione del log: {str(e)}")
             self.log_debug(f"Errore nella cancellazione del log: {str(e)}")
 
+    def extract_in_process(self, file_path):
+        """Estrae il testo di un PDF, documento Office/OpenDocument o MSG nel pool di
+        processi, entro la scadenza del file corrente: il processo viene terminato se il
+        parser non si ferma da solo. Restituisce None se il pool non è disponibile."""
+        token = self.deadline_scheduler.current()
+        extracted = self.extraction_pool.extract(file_path, token.remaining() if token else None,
+                                                 self.deadline_scheduler.should_stop_search,
+                                                 self.pdf_searcher.max_pages, self.pdf_searcher.page_timeout)
+        if extracted is None:
+            return None
+        text, attachments = extracted
+        if os.path.splitext(file_path)[1].lower() == '.msg':
+            return self._msg_content(text, attachments)
+        self.log_debug("Estratti %s caratteri da %s (processo di estrazione)", len(text), os.path.basename(file_path))
+        return text
+
+    def _msg_content(self, text, attachments):
+        """Unisce intestazioni e corpo di un MSG al testo estratto dai suoi allegati"""
+        content_parts = [text]
+        for attachment_count, (filename, content_type, attachment_data) in enumerate(attachments, 1):
+            if self.deadline_scheduler.should_stop():
+                break
+            content_parts.append(f"\n--- ALLEGATO {attachment_count}: {filename} ---\n")
+            if not attachment_data:
+                content_parts.append(f"[Allegato vuoto o non leggibile]")
+                continue
+            
+            self.log_debug("Allegato trovato: %s (%s bytes, tipo: %s)", filename, len(attachment_data), content_type or 'non definito')
+            try:
+                attachment_content = self.process_email_attachment(attachment_data, filename, content_type)
+            except Exception as e:
+                self.log_debug("Errore nell'elaborazione dell'allegato %s: %s", attachment_count, str(e))
+                content_parts.append(f"[Errore nell'elaborazione dell'allegato {attachment_count}: {str(e)}]")
+                continue
+            
+            if attachment_content:
+                self.log_debug("Contenuto estratto da allegato '%s': %s caratteri", filename, len(attachment_content))
+                content_parts.append(attachment_content)
+            else:
+                self.log_debug("Nessun contenuto estratto da allegato '%s'", filename)
+                content_parts.append(f"[Allegato {filename}: nessun contenuto estraibile]")
+        
+        content = "\n".join(content_parts)
+        self.log_debug("Estratti %s caratteri da MSG (inclusi %s allegati)", len(content), len(attachments))
+        return content
+
     @error_handler
     def get_file_content(self, file_path):
         """Estrae il contenuto testuale da un file con gestione degli errori migliorata"""
@@ -4625,156 +8138,75 @@ class FileSearchApp:
                                 '.tif', '.tiff', '.psd', '.ai', '.eps', '.svg', '.ico']
                                 
             if ext in binary_extensions and not self._is_explicitly_selected_extension(ext):
-                self.log_debug(f"File binario ignorato per estrazione testo: {os.path.basename(file_path)}")
+                self.log_debug("File binario ignorato per estrazione testo: %s", os.path.basename(file_path))
                 return ""
             
-            # Verifica rapida se è un file binario
-            if self._is_likely_binary_file(file_path):
-                self.log_debug(f"File rilevato come binario: {os.path.basename(file_path)}")
+            # Verifica rapida se è un file binario (non per i documenti con un parser dedicato:
+            # PDF, DOCX, XLSX e MSG contengono sempre byte nulli e sarebbero scartati)
+            if ext not in PROCESS_EXTRACTION_EXTENSIONS and self._is_likely_binary_file(file_path):
+                self.log_debug("File rilevato come binario: %s", os.path.basename(file_path))
                 return ""
             
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             
-            # Word DOCX
-            if ext == '.docx':
+            # Parser CPU-bound: estrazione nei processi dedicati, fuori dal GIL dei thread di ricerca
+            if ext in PROCESS_EXTRACTION_EXTENSIONS:
+                content = self.extract_in_process(file_path)
+                if content is not None:
+                    return content
+            
+            # Word DOCX, PowerPoint PPTX e OpenDocument (ODT, ODS, ODP): XML del pacchetto in streaming
+            if ext in ('.docx', '.pptx', '.odt', '.ods', '.odp'):
                 try:
-                    import docx
-                    self.log_debug(f"Processando file DOCX: {file_path}")
-                    doc = docx.Document(file_path)
-                    content = []
-                    for paragraph in doc.paragraphs:
-                        if paragraph.text.strip():
-                            content.append(paragraph.text)
-                    
-                    # Estrai anche il testo dalle tabelle
-                    for table in doc.tables:
-                        for row in table.rows:
-                            row_text = []
-                            for cell in row.cells:
-                                if cell.text.strip():
-                                    row_text.append(cell.text.strip())
-                            if row_text:
-                                content.append(" | ".join(row_text))
-                    
-                    result = '\n'.join(content)
-                    self.log_debug(f"Estratti {len(result)} caratteri da DOCX")
+                    self.log_debug("Processando file %s: %s", ext[1:].upper(), file_path)
+                    result = _extract_office_xml_text(file_path, self.deadline_scheduler.should_stop)
+                    self.log_debug("Estratti %s caratteri da %s", len(result), ext[1:].upper())
                     return result
-                except ImportError:
-                    self.log_debug("Libreria python-docx non disponibile")
-                    return ""
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file DOCX {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file %s %s: %s", ext[1:].upper(), file_path, str(e))
                     return ""
             
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # Word DOC (vecchio formato)
             elif ext == '.doc':
                 try:
                     # Prova prima con pywin32 (solo Windows)
                     if os.name == 'nt':
-                        self.log_debug("Tentativo di estrazione da DOC con win32com...")
-                        try:
-                            import win32com.client
-                            import pythoncom
-                            
-                            # Inizializzazione necessaria per i thread
-                            pythoncom.CoInitialize()
-                            
-                            try:
-                                word = win32com.client.Dispatch("Word.Application")
-                                word.Visible = False
-                                word.DisplayAlerts = False
-                                
-                                # Apri il documento in modalità sola lettura
-                                doc = word.Documents.Open(os.path.abspath(file_path), ReadOnly=True)
-                                text = doc.Content.Text
-                                doc.Close(SaveChanges=False)
-                                word.Quit()
-                                
-                                pythoncom.CoUninitialize()
-                                
-                                if text:
-                                    self.log_debug(f"Estratti {len(text)} caratteri da DOC")
-                                    return text
-                                else:
-                                    self.log_debug("Nessun testo estratto dal file DOC")
-                                    return ""
-                            except Exception as e:
-                                self.log_debug(f"Errore nell'apertura del DOC con win32com: {str(e)}")
-                                # Cleanup in caso di errore
-                                try:
-                                    if 'doc' in locals() and doc:
-                                        doc.Close(SaveChanges=False)
-                                    if 'word' in locals() and word:
-                                        word.Quit()
-                                except:
-                                    pass
-                                
-                                pythoncom.CoUninitialize()
-                                return ""
-                        except ImportError:
+                        if not WINDOWS_SEARCH_AVAILABLE:
                             self.log_debug("win32com non disponibile per i file DOC")
                             return ""
+                        self.log_debug("Tentativo di estrazione da DOC con win32com...")
+                        # Word non è interrompibile: estrazione in un processo terminabile alla scadenza
+                        text = self.deadline_scheduler.run_isolated(
+                            _extract_office_text_com, file_path, "Word.Application")
+                        if text:
+                            self.log_debug("Estratti %s caratteri da DOC", len(text))
+                            return text
+                        self.log_debug("Nessun testo estratto dal file DOC")
+                        return ""
                     else:
                         self.log_debug("Estrazione da DOC non supportata su questa piattaforma")
                         return ""
                 except Exception as e:
-                    self.log_debug(f"Errore generale nell'elaborazione del file DOC {file_path}: {str(e)}")
+                    self.log_debug("Errore generale nell'elaborazione del file DOC %s: %s", file_path, str(e))
                     return ""
             
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # Excel XLSX
             elif ext == '.xlsx':
                 try:
-                    import openpyxl
-                    self.log_debug(f"Processando file XLSX: {file_path}")
-                    
-                    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
-                    texts = []
-                    
-                    for sheet_name in wb.sheetnames:
-                        sheet = wb[sheet_name]
-                        sheet_texts = []
-                        
-                        # Prima verifica il range utilizzato
-                        max_row = min(sheet.max_row, 500) if sheet.max_row else 0
-                        max_col = min(sheet.max_column, 50) if sheet.max_column else 0
-                        
-                        if max_row > 0 and max_col > 0:
-                            # Utilizza openpyxl 2.6+ con la sintassi più efficiente
-                            try:
-                                # Estrazione di righe specifiche
-                                for row_idx in range(1, max_row + 1):
-                                    row_values = []
-                                    for col_idx in range(1, max_col + 1):
-                                        cell = sheet.cell(row=row_idx, column=col_idx)
-                                        if cell.value:
-                                            row_values.append(str(cell.value))
-                                    
-                                    if row_values:
-                                        sheet_texts.append(" ".join(row_values))
-                            except Exception as e:
-                                self.log_debug(f"Errore nell'iterazione del foglio {sheet_name}: {str(e)}")
-                        
-                        if sheet_texts:
-                            texts.append(f"--- Foglio: {sheet_name} ---")
-                            texts.append("\n".join(sheet_texts))
-                    
-                    result = "\n".join(texts)
-                    self.log_debug(f"Estratti {len(result)} caratteri da XLSX")
+                    self.log_debug("Processando file XLSX: %s", file_path)
+                    result = _extract_xlsx_text(file_path, self.deadline_scheduler.should_stop)
+                    self.log_debug("Estratti %s caratteri da XLSX", len(result))
                     return result
-                    
-                except ImportError:
-                    self.log_debug("Libreria openpyxl non disponibile")
-                    return ""
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file XLSX {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file XLSX %s: %s", file_path, str(e))
                     return ""
             
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # Excel XLS (vecchio formato)
             elif ext == '.xls':
@@ -4782,7 +8214,7 @@ class FileSearchApp:
                     # Prima prova con xlrd
                     try:
                         import xlrd
-                        self.log_debug(f"Processando file XLS con xlrd: {file_path}")
+                        self.log_debug("Processando file XLS con xlrd: %s", file_path)
                         
                         book = xlrd.open_workbook(file_path, on_demand=True)
                         texts = []
@@ -4804,7 +8236,7 @@ class FileSearchApp:
                         
                         book.release_resources()
                         result = "\n".join(texts)
-                        self.log_debug(f"Estratti {len(result)} caratteri da XLS")
+                        self.log_debug("Estratti %s caratteri da XLS", len(result))
                         return result
                         
                     except ImportError:
@@ -4853,11 +8285,11 @@ class FileSearchApp:
                                     pythoncom.CoUninitialize()
                                     
                                     result = "\n".join(texts)
-                                    self.log_debug(f"Estratti {len(result)} caratteri da XLS con win32com")
+                                    self.log_debug("Estratti %s caratteri da XLS con win32com", len(result))
                                     return result
                                     
                                 except Exception as e:
-                                    self.log_debug(f"Errore nell'apertura dell'XLS con win32com: {str(e)}")
+                                    self.log_debug("Errore nell'apertura dell'XLS con win32com: %s", str(e))
                                     
                                     # Cleanup in caso di errore
                                     try:
@@ -4879,229 +8311,49 @@ class FileSearchApp:
                             return ""
                             
                 except Exception as e:
-                    self.log_debug(f"Errore generale nell'elaborazione del file XLS {file_path}: {str(e)}")
-                    return ""
-            
-            if self.stop_search:
-                return ""
-            # PowerPoint PPTX
-            elif ext == '.pptx':
-                try:
-                    import pptx
-                    self.log_debug(f"Processando file PPTX: {file_path}")
-                    
-                    presentation = pptx.Presentation(file_path)
-                    texts = []
-                    
-                    for i, slide in enumerate(presentation.slides):
-                        slide_text = []
-                        texts.append(f"--- Diapositiva {i+1} ---")
-                        
-                        for shape in slide.shapes:
-                            if hasattr(shape, "text") and shape.text:
-                                slide_text.append(shape.text)
-                        
-                        if slide_text:
-                            texts.append("\n".join(slide_text))
-                    
-                    result = "\n".join(texts)
-                    self.log_debug(f"Estratti {len(result)} caratteri da PPTX")
-                    return result
-                    
-                except ImportError:
-                    self.log_debug("Libreria python-pptx non disponibile")
-                    return ""
-                except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file PPTX {file_path}: {str(e)}")
+                    self.log_debug("Errore generale nell'elaborazione del file XLS %s: %s", file_path, str(e))
                     return ""
             
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
-            # PowerPoint PPT (vecchio formato)
-            elif ext == '.ppt':
-                # Su Windows, prova con pywin32
-                if os.name == 'nt':
-                    try:
-                        import win32com.client
-                        import pythoncom
-                        
-                        # Inizializzazione necessaria per i thread
-                        pythoncom.CoInitialize()
-                        
-                        self.log_debug(f"Processando file PPT: {file_path}")
-                        
-                        try:
-                            powerpoint = win32com.client.Dispatch("PowerPoint.Application")
-                            powerpoint.Visible = False
-                            
-                            presentation = powerpoint.Presentations.Open(os.path.abspath(file_path), WithWindow=False)
-                            texts = []
-                            
-                            for slide_idx in range(1, presentation.Slides.Count + 1):
-                                slide = presentation.Slides.Item(slide_idx)
-                                texts.append(f"--- Diapositiva {slide_idx} ---")
-                                slide_text = []
-                                
-                                for shape_idx in range(1, slide.Shapes.Count + 1):
-                                    shape = slide.Shapes.Item(shape_idx)
-                                    if shape.HasTextFrame:
-                                        if shape.TextFrame.HasText:
-                                            slide_text.append(shape.TextFrame.TextRange.Text)
-                                
-                                if slide_text:
-                                    texts.append("\n".join(slide_text))
-                            
-                            presentation.Close()
-                            powerpoint.Quit()
-                            
-                            pythoncom.CoUninitialize()
-                            
-                            result = "\n".join(texts)
-                            self.log_debug(f"Estratti {len(result)} caratteri da PPT")
-                            return result
-                            
-                        except Exception as e:
-                            self.log_debug(f"Errore nell'apertura del PPT con win32com: {str(e)}")
-                            
-                            # Cleanup in caso di errore
-                            try:
-                                if 'presentation' in locals() and presentation:
-                                    presentation.Close()
-                                if 'powerpoint' in locals() and powerpoint:
-                                    powerpoint.Quit()
-                            except:
-                                pass
-                            
-                            pythoncom.CoUninitialize()
-                            return ""
-                            
-                    except ImportError:
+            # PowerPoint PPT (vecchio formato)
+            elif ext == '.ppt':
+                # Su Windows, prova con pywin32
+                if os.name == 'nt':
+                    if not WINDOWS_SEARCH_AVAILABLE:
                         self.log_debug("win32com non disponibile per i file PPT")
                         return ""
+                    self.log_debug("Processando file PPT: %s", file_path)
+                    # PowerPoint non è interrompibile: estrazione in un processo terminabile alla scadenza
+                    result = self.deadline_scheduler.run_isolated(
+                        _extract_office_text_com, file_path, "PowerPoint.Application")
+                    self.log_debug("Estratti %s caratteri da PPT", len(result))
+                    return result
                 else:
                     self.log_debug("Estrazione di testo dai file PPT non supportata su questa piattaforma")
                     return ""
             
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # Rich Text Format (RTF) - NUOVO
             elif ext == '.rtf':
                 try:
                     from striprtf.striprtf import rtf_to_text
-                    self.log_debug(f"Processando file RTF: {file_path}")
+                    self.log_debug("Processando file RTF: %s", file_path)
                     
                     with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
                         rtf_content = f.read()
                         content = rtf_to_text(rtf_content)
-                        self.log_debug(f"Estratti {len(content)} caratteri da RTF")
+                        self.log_debug("Estratti %s caratteri da RTF", len(content))
                         return content
                 except ImportError:
                     self.log_debug("Libreria striprtf non disponibile")
                     return ""
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file RTF {file_path}: {str(e)}")
-                    return ""
-
-            if self.stop_search:
-                return ""        
-            # OpenDocument Text (ODT) - NUOVO
-            elif ext == '.odt':
-                try:
-                    from odf import opendocument, text
-                    self.log_debug(f"Processando file ODT: {file_path}")
-                    
-                    doc = opendocument.load(file_path)
-                    paragraphs = []
-                    
-                    # Estrai tutto il testo dai paragrafi
-                    for element in doc.getElementsByType(text.P):
-                        paragraphs.append(element.firstChild.data if element.firstChild else "")
-                        
-                    content = "\n".join(paragraphs)
-                    self.log_debug(f"Estratti {len(content)} caratteri da ODT")
-                    return content
-                except ImportError:
-                    self.log_debug("Libreria odf non disponibile")
-                    return ""
-                except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file ODT {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file RTF %s: %s", file_path, str(e))
                     return ""
 
-            if self.stop_search:
-                return ""       
-            # OpenDocument Spreadsheet (ODS) - NUOVO
-            elif ext == '.ods':
-                try:
-                    from odf import opendocument, table, text
-                    self.log_debug(f"Processando file ODS: {file_path}")
-                    
-                    doc = opendocument.load(file_path)
-                    sheets = []
-                    
-                    # Estrai tutte le tabelle e celle
-                    for sheet in doc.getElementsByType(table.Table):
-                        sheet_rows = []
-                        sheet_name = sheet.getAttribute('table:name')
-                        sheets.append(f"--- Foglio: {sheet_name} ---")
-                        
-                        for row in sheet.getElementsByType(table.TableRow):
-                            row_cells = []
-                            for cell in row.getElementsByType(table.TableCell):
-                                cell_text = ""
-                                for p in cell.getElementsByType(text.P):
-                                    cell_text += p.firstChild.data if p.firstChild else ""
-                                row_cells.append(cell_text)
-                            if row_cells:
-                                sheet_rows.append(" | ".join(row_cells))
-                                
-                        sheets.append("\n".join(sheet_rows))
-                        
-                    content = "\n".join(sheets)
-                    self.log_debug(f"Estratti {len(content)} caratteri da ODS")
-                    return content
-                except ImportError:
-                    self.log_debug("Libreria odf non disponibile")
-                    return ""
-                except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file ODS {file_path}: {str(e)}")
-                    return ""
-
-            if self.stop_search:
-                return ""
-            # OpenDocument Presentation (ODP) - NUOVO
-            elif ext == '.odp':
-                try:
-                    from odf import opendocument, draw, text
-                    self.log_debug(f"Processando file ODP: {file_path}")
-                    
-                    doc = opendocument.load(file_path)
-                    slides = []
-                    
-                    # Estrai tutte le diapositive
-                    for page in doc.getElementsByType(draw.Page):
-                        slide_text = []
-                        slide_name = page.getAttribute('draw:name')
-                        slides.append(f"--- Diapositiva: {slide_name} ---")
-                        
-                        # Estrai il testo dai frame e forme
-                        for element in page.getElementsByType(draw.Frame):
-                            for p in element.getElementsByType(text.P):
-                                if p.firstChild:
-                                    slide_text.append(p.firstChild.data)
-                                    
-                        slides.append("\n".join(slide_text))
-                        
-                    content = "\n".join(slides)
-                    self.log_debug(f"Estratti {len(content)} caratteri da ODP")
-                    return content
-                except ImportError:
-                    self.log_debug("Libreria odf non disponibile")
-                    return ""
-                except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file ODP {file_path}: {str(e)}")
-                    return ""
-            
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""        
             # EPUB - NUOVO
             elif ext == '.epub':
@@ -5109,7 +8361,7 @@ class FileSearchApp:
                     import ebooklib
                     from ebooklib import epub
                     from bs4 import BeautifulSoup
-                    self.log_debug(f"Processando file EPUB: {file_path}")
+                    self.log_debug("Processando file EPUB: %s", file_path)
                     
                     # Funzione per estrarre testo dall'HTML
                     def chapter_to_text(content):
@@ -5134,16 +8386,16 @@ class FileSearchApp:
                             chapters.append(chapter_to_text(item.get_content()))
                             
                     content = "\n".join(chapters)
-                    self.log_debug(f"Estratti {len(content)} caratteri da EPUB")
+                    self.log_debug("Estratti %s caratteri da EPUB", len(content))
                     return content
                 except ImportError:
                     self.log_debug("Librerie ebooklib o bs4 non disponibili")
                     return ""
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file EPUB {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file EPUB %s: %s", file_path, str(e))
                     return ""
 
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # MOBI - NUOVO
             elif ext == '.mobi':
@@ -5151,7 +8403,7 @@ class FileSearchApp:
                     import mobi
                     import tempfile
                     import shutil
-                    self.log_debug(f"Processando file MOBI: {file_path}")
+                    self.log_debug("Processando file MOBI: %s", file_path)
                     
                     tempdir = tempfile.mkdtemp()
                     try:
@@ -5167,7 +8419,7 @@ class FileSearchApp:
                                     text_content.append(f.read())
                         
                         content = "\n".join(text_content)
-                        self.log_debug(f"Estratti {len(content)} caratteri da MOBI")
+                        self.log_debug("Estratti %s caratteri da MOBI", len(content))
                         return content
                     finally:
                         # Pulisci i file temporanei
@@ -5176,15 +8428,15 @@ class FileSearchApp:
                     self.log_debug("Libreria mobi non disponibile")
                     return ""
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file MOBI {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file MOBI %s: %s", file_path, str(e))
                     return ""
 
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""       
             # LaTeX - NUOVO
             elif ext == '.tex':
                 try:
-                    self.log_debug(f"Processando file LaTeX: {file_path}")
+                    self.log_debug("Processando file LaTeX: %s", file_path)
                     
                     with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
                         content = f.read()
@@ -5202,18 +8454,18 @@ class FileSearchApp:
                     # Sostituisci più spazi con uno solo
                     content = re.sub(r'\s+', ' ', content)
                     
-                    self.log_debug(f"Estratti {len(content)} caratteri da LaTeX")
+                    self.log_debug("Estratti %s caratteri da LaTeX", len(content))
                     return content
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file LaTeX {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file LaTeX %s: %s", file_path, str(e))
                     return ""
 
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # reStructuredText - NUOVO
             elif ext == '.rst':
                 try:
-                    self.log_debug(f"Processando file reStructuredText: {file_path}")
+                    self.log_debug("Processando file reStructuredText: %s", file_path)
                     
                     with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
                         content = f.read()
@@ -5227,19 +8479,19 @@ class FileSearchApp:
                     # Rimuovi i riferimenti alle direttive
                     content = re.sub(r'\.\. [a-z]+::', ' ', content)
                     
-                    self.log_debug(f"Estratti {len(content)} caratteri da RST")
+                    self.log_debug("Estratti %s caratteri da RST", len(content))
                     return content
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file RST {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file RST %s: %s", file_path, str(e))
                     return ""
 
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""        
             # SQLite database (.db, .sqlite, .sqlite3) - NUOVO
             elif ext in ['.db', '.sqlite', '.sqlite3']:
                 try:
                     import sqlite3
-                    self.log_debug(f"Processando file SQLite: {file_path}")
+                    self.log_debug("Processando file SQLite: %s", file_path)
                     
                     # Verifica che sia un file SQLite valido
                     if not os.path.getsize(file_path) > 100:
@@ -5282,7 +8534,7 @@ class FileSearchApp:
                         
                         conn.close()
                         content = "\n".join(content_parts)
-                        self.log_debug(f"Estratti {len(content)} caratteri da SQLite")
+                        self.log_debug("Estratti %s caratteri da SQLite", len(content))
                         return content
                         
                     except sqlite3.Error:
@@ -5292,16 +8544,16 @@ class FileSearchApp:
                     self.log_debug("Libreria sqlite3 non disponibile")
                     return ""
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file SQLite {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file SQLite %s: %s", file_path, str(e))
                     return ""
 
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # Microsoft Access (.mdb, .accdb)
             elif ext in ['.mdb', '.accdb']:
                 try:
                     import pyodbc
-                    self.log_debug(f"Processando file Access: {file_path}")
+                    self.log_debug("Processando file Access: %s", file_path)
                     
                     # Verifica che siamo su Windows
                     if os.name != 'nt':
@@ -5328,7 +8580,7 @@ class FileSearchApp:
                         
                         # Estrai struttura e dati da ogni tabella
                         for table in tables:
-                            if self.stop_search:
+                            if self.deadline_scheduler.should_stop():
                                 return ""
                                 
                             content_parts.append(f"\n--- Tabella: {table} ---")
@@ -5355,17 +8607,17 @@ class FileSearchApp:
                         
                         conn.close()
                         content = "\n".join(content_parts)
-                        self.log_debug(f"Estratti {len(content)} caratteri da Access")
+                        self.log_debug("Estratti %s caratteri da Access", len(content))
                         return content
                         
                     except pyodbc.Error as e:
-                        self.log_debug(f"Errore di accesso al database: {str(e)}")
+                        self.log_debug("Errore di accesso al database: %s", str(e))
                         return ""
                 except ImportError:
                     self.log_debug("Libreria pyodbc non disponibile")
                     return ""
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file Access {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file Access %s: %s", file_path, str(e))
                     return ""
 
             # OpenDocument Database (.odb)
@@ -5373,7 +8625,7 @@ class FileSearchApp:
                 try:
                     import zipfile
                     import xml.etree.ElementTree as ET
-                    self.log_debug(f"Processando file ODB: {file_path}")
+                    self.log_debug("Processando file ODB: %s", file_path)
                     
                     # ODB è essenzialmente un file ZIP con file XML all'interno
                     if zipfile.is_zipfile(file_path):
@@ -5396,7 +8648,7 @@ class FileSearchApp:
                                     content_parts.append(f"Numero di tabelle trovate: {len(tables)}")
                                     
                                     for table in tables:
-                                        if self.stop_search:
+                                        if self.deadline_scheduler.should_stop():
                                             return ""
                                             
                                         if 'db:name' in table.attrib:
@@ -5433,18 +8685,18 @@ class FileSearchApp:
                                 content_parts.append(f"Errore nell'estrazione dello schema: {str(e)}")
                             
                             content = "\n".join(content_parts)
-                            self.log_debug(f"Estratti {len(content)} caratteri da ODB")
+                            self.log_debug("Estratti %s caratteri da ODB", len(content))
                             return content
                     else:
                         return ""
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file ODB {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file ODB %s: %s", file_path, str(e))
                     return ""
             # Tab-Separated Values (.tsv) - NUOVO
             elif ext == '.tsv':
                 try:
                     import csv
-                    self.log_debug(f"Processando file TSV: {file_path}")
+                    self.log_debug("Processando file TSV: %s", file_path)
                     
                     with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
                         reader = csv.reader(f, delimiter='\t')
@@ -5458,19 +8710,19 @@ class FileSearchApp:
                             rows.append("\t".join(row))
                             
                     content = "\n".join(rows)
-                    self.log_debug(f"Estratti {len(content)} caratteri da TSV")
+                    self.log_debug("Estratti %s caratteri da TSV", len(content))
                     return content
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file TSV {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file TSV %s: %s", file_path, str(e))
                     return ""
             
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # dBase format (.dbf) - NUOVO
             elif ext == '.dbf':
                 try:
                     import dbfread
-                    self.log_debug(f"Processando file DBF: {file_path}")
+                    self.log_debug("Processando file DBF: %s", file_path)
                     
                     table = dbfread.DBF(file_path)
                     records = []
@@ -5491,21 +8743,21 @@ class FileSearchApp:
                         records.append(" | ".join(record_data))
                         
                     content = "\n".join(records)
-                    self.log_debug(f"Estratti {len(content)} caratteri da DBF")
+                    self.log_debug("Estratti %s caratteri da DBF", len(content))
                     return content
                 except ImportError:
                     self.log_debug("Libreria dbfread non disponibile")
                     return ""
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file DBF {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file DBF %s: %s", file_path, str(e))
                     return ""
 
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # Data Interchange Format (.dif) - NUOVO
             elif ext == '.dif':
                 try:
-                    self.log_debug(f"Processando file DIF: {file_path}")
+                    self.log_debug("Processando file DIF: %s", file_path)
                     
                     # I file DIF hanno una struttura specifica
                     with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
@@ -5547,20 +8799,17 @@ class FileSearchApp:
                         i += 1
                         
                     content = "\n".join(content_lines)
-                    self.log_debug(f"Estratti {len(content)} caratteri da DIF")
+                    self.log_debug("Estratti %s caratteri da DIF", len(content))
                     return content
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file DIF {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file DIF %s: %s", file_path, str(e))
                     return ""
             
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
-            # Testo semplice
-            elif ext in ['.txt', '.csv', '.log', '.ini', '.xml', '.json', '.md', '.html', '.htm',
-                        '.py', '.js', '.java', '.cpp', '.c', '.cs', '.php', '.rb', '.go', '.swift', 
-                        '.sql', '.sh', '.bat', '.ps1', '.vbs', '.pl', '.ts', '.kt', '.scala',
-                        '.h', '.hpp', '.vb', '.lua', '.rs', '.groovy', '.yml', '.yaml', '.toml',
-                        '.properties', '.conf', '.config', '.cfg', '.reg']:
+            # Testo semplice (la ricerca usa search_text_file, che legge l'intero file
+            # in streaming; qui si estrae solo il testo per gli altri utilizzi)
+            elif ext in StreamingTextSearcher.TEXT_EXTENSIONS:
                 try:
                     # Apri con diverse codifiche per essere robusto
                     encodings = ['utf-8', 'latin-1', 'windows-1252']
@@ -5574,61 +8823,42 @@ class FileSearchApp:
                         except UnicodeDecodeError:
                             continue
                         except Exception as e:
-                            self.log_debug(f"Errore con codifica {encoding}: {str(e)}")
+                            self.log_debug("Errore con codifica %s: %s", encoding, str(e))
                     
                     if content:
-                        self.log_debug(f"Estratti {len(content)} caratteri da file di testo")
+                        self.log_debug("Estratti %s caratteri da file di testo", len(content))
                         return content
                     else:
                         self.log_debug("Nessun contenuto estratto dal file di testo")
                         return ""
                 except Exception as e:
-                    self.log_debug(f"Errore nella lettura del file di testo {file_path}: {str(e)}")
+                    self.log_debug("Errore nella lettura del file di testo %s: %s", file_path, str(e))
                     return ""
             
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # PDF (aggiunto per completezza)
             elif ext == '.pdf':
                 try:
-                    import PyPDF2
-                    self.log_debug(f"Processando file PDF: {file_path}")
-                    
-                    content = []
-                    with open(file_path, 'rb') as f:
-                        try:
-                            reader = PyPDF2.PdfReader(f)
-                            num_pages = min(len(reader.pages), 50)  # Limita a 50 pagine
-                            
-                            for page_num in range(num_pages):
-                                try:
-                                    page_text = reader.pages[page_num].extract_text()
-                                    if page_text and page_text.strip():
-                                        content.append(f"--- Pagina {page_num+1} ---")
-                                        content.append(page_text)
-                                except Exception as e:
-                                    self.log_debug(f"Errore nell'estrazione testo pagina {page_num}: {str(e)}")
-                        except Exception as e:
-                            self.log_debug(f"Errore nell'apertura del PDF: {str(e)}")
-                    
-                    result = "\n".join(content)
-                    self.log_debug(f"Estratti {len(result)} caratteri da PDF")
+                    self.log_debug("Processando file PDF: %s", file_path)
+                    result = _extract_pdf_text(file_path, self.deadline_scheduler.should_stop,
+                                               self.pdf_searcher.max_pages, self.pdf_searcher.page_timeout)
+                    self.log_debug("Estratti %s caratteri da PDF", len(result))
                     return result
-                    
                 except ImportError:
                     self.log_debug("Libreria PyPDF2 non disponibile")
                     return ""
                 except Exception as e:
-                    self.log_debug(f"Errore nella lettura del file PDF: {str(e)}")
+                    self.log_debug("Errore nella lettura del file PDF: %s", str(e))
                     return ""
             
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # ===== EMAIL E CALENDARIO =====
             # File Email (.eml)
             elif ext == '.eml':
                 try:
-                    self.log_debug(f"Processando file Email: {file_path}")
+                    self.log_debug("Processando file Email: %s", file_path)
                     import email
                     import base64
                     import quopri
@@ -5640,10 +8870,10 @@ class FileSearchApp:
                         
                     # Verifica che abbiamo letto dei dati
                     if not msg_data:
-                        self.log_debug(f"File EML vuoto: {file_path}")
+                        self.log_debug("File EML vuoto: %s", file_path)
                         return ""
                         
-                    self.log_debug(f"Letti {len(msg_data)} bytes dal file EML")
+                    self.log_debug("Letti %s bytes dal file EML", len(msg_data))
                     
                     # Analizza il messaggio email
                     msg = email.message_from_bytes(msg_data)
@@ -5677,7 +8907,7 @@ class FileSearchApp:
                     # Elabora tutte le parti del messaggio
                     for part in msg.walk():
                         content_type = part.get_content_type()
-                        self.log_debug(f"Elaborazione parte email: {content_type}")
+                        self.log_debug("Elaborazione parte email: %s", content_type)
                         
                         # Estrai testo semplice dal corpo dell'email
                         if content_type == "text/plain" and not part.get_filename():
@@ -5687,9 +8917,9 @@ class FileSearchApp:
                                     charset = part.get_content_charset() or 'utf-8'
                                     text = payload.decode(charset, errors='replace')
                                     content_parts.append(text)
-                                    self.log_debug(f"Estratti {len(text)} caratteri di testo")
+                                    self.log_debug("Estratti %s caratteri di testo", len(text))
                             except Exception as e:
-                                self.log_debug(f"Errore nell'estrazione del testo: {str(e)}")
+                                self.log_debug("Errore nell'estrazione del testo: %s", str(e))
                                 try:
                                     # Fallback a utf-8
                                     content_parts.append(payload.decode('utf-8', errors='replace'))
@@ -5710,13 +8940,13 @@ class FileSearchApp:
                                         soup = BeautifulSoup(html_content, 'html.parser')
                                         text_content = soup.get_text(separator=' ', strip=True)
                                         content_parts.append(text_content)
-                                        self.log_debug(f"Estratti {len(text_content)} caratteri da HTML")
+                                        self.log_debug("Estratti %s caratteri da HTML", len(text_content))
                                     except ImportError:
                                         # Se BeautifulSoup non è disponibile, usa l'HTML grezzo
                                         content_parts.append(html_content)
-                                        self.log_debug(f"BeautifulSoup non disponibile, usato HTML grezzo ({len(html_content)} caratteri)")
+                                        self.log_debug("BeautifulSoup non disponibile, usato HTML grezzo (%s caratteri)", len(html_content))
                             except Exception as e:
-                                self.log_debug(f"Errore nell'estrazione HTML: {str(e)}")
+                                self.log_debug("Errore nell'estrazione HTML: %s", str(e))
                         
                         # Gestisci gli allegati
                         elif part.get('Content-Disposition') or part.get_filename():
@@ -5749,7 +8979,7 @@ class FileSearchApp:
                                 except:
                                     pass
                                 
-                                self.log_debug(f"Allegato trovato: {filename}")
+                                self.log_debug("Allegato trovato: %s", filename)
                                 
                                 # Aggiungi informazioni sull'allegato
                                 content_parts.append(f"\n--- ALLEGATO {attachment_count}: {filename} ---\n")
@@ -5782,7 +9012,7 @@ class FileSearchApp:
                                             self.log_debug("Errore nella conversione della stringa a bytes")
                                 
                                 if payload and len(payload) > 0:
-                                    self.log_debug(f"Analisi contenuto allegato: {filename} ({len(payload)} bytes)")
+                                    self.log_debug("Analisi contenuto allegato: %s (%s bytes)", filename, len(payload))
                                     
                                     # IMPORTANTE: CHIAMA IL METODO PER ELABORARE L'ALLEGATO
                                     attachment_content = self.process_email_attachment(
@@ -5790,19 +9020,19 @@ class FileSearchApp:
                                     
                                     if attachment_content:
                                         content_parts.append(attachment_content)
-                                        self.log_debug(f"Contenuto allegato {filename} aggiunto ({len(attachment_content)} caratteri)")
+                                        self.log_debug("Contenuto allegato %s aggiunto (%s caratteri)", filename, len(attachment_content))
                                     else:
                                         content_parts.append(f"[Allegato {filename}: nessun contenuto estraibile]")
-                                        self.log_debug(f"Nessun contenuto estraibile dall'allegato {filename}")
+                                        self.log_debug("Nessun contenuto estraibile dall'allegato %s", filename)
                                 else:
                                     content_parts.append(f"[Allegato {filename}: vuoto o non decodificabile]")
-                                    self.log_debug(f"Allegato vuoto o non decodificabile: {filename}")
+                                    self.log_debug("Allegato vuoto o non decodificabile: %s", filename)
                                     
                             except Exception as e:
-                                self.log_debug(f"Errore nell'elaborazione dell'allegato: {str(e)}")
+                                self.log_debug("Errore nell'elaborazione dell'allegato: %s", str(e))
                                 content_parts.append(f"[Errore nell'elaborazione dell'allegato: {str(e)}]")
                     
-                    self.log_debug(f"Totale allegati trovati: {attachment_count}")
+                    self.log_debug("Totale allegati trovati: %s", attachment_count)
                     
                     # Se non è stato trovato alcun contenuto, prova un metodo più semplice
                     if not content_parts:
@@ -5820,24 +9050,24 @@ class FileSearchApp:
                                 if payload:
                                     content_parts.append(payload.decode('utf-8', errors='replace'))
                         except Exception as e:
-                            self.log_debug(f"Errore nel metodo alternativo: {str(e)}")
+                            self.log_debug("Errore nel metodo alternativo: %s", str(e))
                     
                     content = "\n".join(content_parts)
-                    self.log_debug(f"Estratti in totale {len(content)} caratteri da EML (inclusi allegati)")
+                    self.log_debug("Estratti in totale %s caratteri da EML (inclusi allegati)", len(content))
                     return content
                 except ImportError as e:
-                    self.log_debug(f"Modulo necessario non disponibile: {str(e)}")
+                    self.log_debug("Modulo necessario non disponibile: %s", str(e))
                     return ""
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file EML {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file EML %s: %s", file_path, str(e))
                     return ""
 
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # File vCard (.vcf)
             elif ext == '.vcf':
                 try:
-                    self.log_debug(f"Processando file vCard: {file_path}")
+                    self.log_debug("Processando file vCard: %s", file_path)
                     with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
                         content = f.read()
                         # Estrai campi più importanti per la ricerca
@@ -5847,18 +9077,18 @@ class FileSearchApp:
                                 processed_content.append(line)
                         
                         result = "\n".join(processed_content)
-                        self.log_debug(f"Estratti {len(result)} caratteri da vCard")
+                        self.log_debug("Estratti %s caratteri da vCard", len(result))
                         return result
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file vCard {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file vCard %s: %s", file_path, str(e))
                     return ""
 
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # File iCalendar (.ics)
             elif ext == '.ics':
                 try:
-                    self.log_debug(f"Processando file iCalendar: {file_path}")
+                    self.log_debug("Processando file iCalendar: %s", file_path)
                     with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
                         content = f.read()
                         # Estrai campi più importanti per la ricerca
@@ -5881,13 +9111,13 @@ class FileSearchApp:
                                 current_event.append(line)
                         
                         result = "\n".join(processed_content)
-                        self.log_debug(f"Estratti {len(result)} caratteri da iCalendar")
+                        self.log_debug("Estratti %s caratteri da iCalendar", len(result))
                         return result
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file iCalendar {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file iCalendar %s: %s", file_path, str(e))
                     return ""
 
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # ===== PRESENTAZIONI =====
             # File PowerPoint Show (.pps)
@@ -5901,7 +9131,7 @@ class FileSearchApp:
                         # Inizializzazione necessaria per i thread
                         pythoncom.CoInitialize()
                         
-                        self.log_debug(f"Processando file PowerPoint Show: {file_path}")
+                        self.log_debug("Processando file PowerPoint Show: %s", file_path)
                         
                         try:
                             powerpoint = win32com.client.Dispatch("PowerPoint.Application")
@@ -5930,11 +9160,11 @@ class FileSearchApp:
                             pythoncom.CoUninitialize()
                             
                             result = "\n".join(texts)
-                            self.log_debug(f"Estratti {len(result)} caratteri da PPS")
+                            self.log_debug("Estratti %s caratteri da PPS", len(result))
                             return result
                             
                         except Exception as e:
-                            self.log_debug(f"Errore nell'apertura del PPS con win32com: {str(e)}")
+                            self.log_debug("Errore nell'apertura del PPS con win32com: %s", str(e))
                             
                             # Cleanup in caso di errore
                             try:
@@ -5954,18 +9184,18 @@ class FileSearchApp:
                     self.log_debug("win32com non disponibile per i file PPS")
                     return ""
                 except Exception as e:
-                    self.log_debug(f"Errore generale nell'elaborazione del file PPS {file_path}: {str(e)}")
+                    self.log_debug("Errore generale nell'elaborazione del file PPS %s: %s", file_path, str(e))
                     return ""
 
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # File Keynote (.key)
             elif ext == '.key':
                 try:
-                    self.log_debug(f"Processando file Keynote: {file_path}")
+                    self.log_debug("Processando file Keynote: %s", file_path)
                     # Keynote è essenzialmente un pacchetto compresso con file XML all'interno
                     if not zipfile.is_zipfile(file_path):
-                        self.log_debug(f"File Keynote non valido (non è un file zip): {file_path}")
+                        self.log_debug("File Keynote non valido (non è un file zip): %s", file_path)
                         return ""
                         
                     with zipfile.ZipFile(file_path, 'r') as zip_ref:
@@ -5987,61 +9217,61 @@ class FileSearchApp:
                                     continue
                                     
                         result = "\n".join(content_parts)
-                        self.log_debug(f"Estratti {len(result)} caratteri da Keynote")
+                        self.log_debug("Estratti %s caratteri da Keynote", len(result))
                         return result
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file Keynote {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file Keynote %s: %s", file_path, str(e))
                     return ""
 
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # ===== FILE DI CONFIGURAZIONE =====
             # File YAML (.yml, .yaml)
             elif ext in ['.yml', '.yaml']:
                 try:
-                    self.log_debug(f"Processando file YAML: {file_path}")
+                    self.log_debug("Processando file YAML: %s", file_path)
                     with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
                         content = f.read()
-                        self.log_debug(f"Estratti {len(content)} caratteri da YAML")
+                        self.log_debug("Estratti %s caratteri da YAML", len(content))
                         return content
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file YAML {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file YAML %s: %s", file_path, str(e))
                     return ""
 
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # File TOML (.toml)
             elif ext == '.toml':
                 try:
-                    self.log_debug(f"Processando file TOML: {file_path}")
+                    self.log_debug("Processando file TOML: %s", file_path)
                     with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
                         content = f.read()
-                        self.log_debug(f"Estratti {len(content)} caratteri da TOML")
+                        self.log_debug("Estratti %s caratteri da TOML", len(content))
                         return content
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file TOML {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file TOML %s: %s", file_path, str(e))
                     return ""
             
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # File Registry Windows (.reg)
             elif ext == '.reg':
                 try:
-                    self.log_debug(f"Processando file Registry: {file_path}")
+                    self.log_debug("Processando file Registry: %s", file_path)
                     with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
                         content = f.read()
-                        self.log_debug(f"Estratti {len(content)} caratteri da Registry")
+                        self.log_debug("Estratti %s caratteri da Registry", len(content))
                         return content
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file Registry {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file Registry %s: %s", file_path, str(e))
                     return ""
 
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # File plist (.plist)
             elif ext == '.plist':
                 try:
-                    self.log_debug(f"Processando file Property List: {file_path}")
+                    self.log_debug("Processando file Property List: %s", file_path)
                     # Prova a leggere come XML
                     with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
                         content = f.read()
@@ -6049,7 +9279,7 @@ class FileSearchApp:
                         import re
                         text_content = re.sub(r'<[^>]+>', ' ', content)
                         text_content = re.sub(r'\s+', ' ', text_content).strip()
-                        self.log_debug(f"Estratti {len(text_content)} caratteri da plist")
+                        self.log_debug("Estratti %s caratteri da plist", len(text_content))
                         return text_content
                 except UnicodeDecodeError:
                     try:
@@ -6059,164 +9289,67 @@ class FileSearchApp:
                             content = f.read().decode('latin-1', errors='replace')
                             # Estrai stringhe leggibili
                             printable = ''.join(c for c in content if c.isprintable() and len(c.strip()) > 0)
-                            self.log_debug(f"Estratti {len(printable)} caratteri da plist binario")
+                            self.log_debug("Estratti %s caratteri da plist binario", len(printable))
                             return printable
                     except Exception as inner_e:
-                        self.log_debug(f"Errore nella lettura del plist binario: {str(inner_e)}")
+                        self.log_debug("Errore nella lettura del plist binario: %s", str(inner_e))
                         return ""
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file plist {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file plist %s: %s", file_path, str(e))
                     return ""
             
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # File Properties (.properties)
             elif ext == '.properties':
                 try:
-                    self.log_debug(f"Processando file Properties: {file_path}")
+                    self.log_debug("Processando file Properties: %s", file_path)
                     with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
                         content = f.read()
-                        self.log_debug(f"Estratti {len(content)} caratteri da Properties")
+                        self.log_debug("Estratti %s caratteri da Properties", len(content))
                         return content
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file Properties {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file Properties %s: %s", file_path, str(e))
                     return ""
 
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # File htaccess (.htaccess)
             elif file_path.endswith('.htaccess'):
                 try:
-                    self.log_debug(f"Processando file htaccess: {file_path}")
+                    self.log_debug("Processando file htaccess: %s", file_path)
                     with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
                         content = f.read()
-                        self.log_debug(f"Estratti {len(content)} caratteri da htaccess")
+                        self.log_debug("Estratti %s caratteri da htaccess", len(content))
                         return content
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file htaccess {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file htaccess %s: %s", file_path, str(e))
                     return ""
 
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # ===== LINGUAGGI DI PROGRAMMAZIONE =====
             # I vari linguaggi di programmazione possono usare lo stesso parser di testo
             elif ext in ['.h', '.hpp', '.vb', '.lua', '.rs', '.groovy']:
                 try:
-                    self.log_debug(f"Processando file di codice {ext}: {file_path}")
+                    self.log_debug("Processando file di codice %s: %s", ext, file_path)
                     with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
                         content = f.read()
-                        self.log_debug(f"Estratti {len(content)} caratteri da file {ext}")
+                        self.log_debug("Estratti %s caratteri da file %s", len(content), ext)
                         return content
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file {ext} {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file %s %s: %s", ext, file_path, str(e))
                     return ""
             
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # File MSG (Outlook)
             elif ext == '.msg':
                 try:
-                    self.log_debug(f"Processando file MSG Outlook: {file_path}")
+                    self.log_debug("Processando file MSG Outlook: %s", file_path)
                     try:
-                        import extract_msg
-                        msg = extract_msg.Message(file_path)
-                        
-                        content_parts = []
-                        
-                        # Estrai intestazioni principali
-                        from_address = msg.sender if hasattr(msg, 'sender') else "N/A"
-                        to_address = msg.to if hasattr(msg, 'to') else "N/A"
-                        subject = msg.subject if hasattr(msg, 'subject') else "N/A"
-                        msg_date = msg.date if hasattr(msg, 'date') else "N/A"
-                        
-                        # Aggiungi intestazioni al contenuto
-                        content_parts.append(f"Da: {from_address}")
-                        content_parts.append(f"A: {to_address}")
-                        content_parts.append(f"Oggetto: {subject}")
-                        content_parts.append(f"Data: {msg_date}")
-                        content_parts.append("-" * 40)  # Separatore
-                        
-                        # Estrai corpo del messaggio
-                        msg_body = msg.body if hasattr(msg, 'body') else ""
-                        if msg_body:
-                            content_parts.append(msg_body)
-                        
-                        # Contatori per monitoraggio allegati
-                        attachment_count = 0
-                        
-                        # Versione migliorata per gestire gli allegati di MSG
-                        for attachment in msg.attachments:
-                            try:
-                                # Verifica se l'allegato è valido
-                                if not attachment:
-                                    continue
-                                    
-                                # Ottieni il nome del file 
-                                filename = None
-                                if hasattr(attachment, 'longFilename') and attachment.longFilename:
-                                    filename = attachment.longFilename
-                                elif hasattr(attachment, 'shortFilename') and attachment.shortFilename:
-                                    filename = attachment.shortFilename
-                                elif hasattr(attachment, 'filename') and attachment.filename:
-                                    filename = attachment.filename
-                                elif hasattr(attachment, 'name') and attachment.name:
-                                    filename = attachment.name
-                                
-                                # Se ancora non abbiamo un nome, generiamone uno
-                                if not filename:
-                                    filename = f"allegato_{attachment_count + 1}"
-                                
-                                attachment_count += 1
-                                content_parts.append(f"\n--- ALLEGATO {attachment_count}: {filename} ---\n")
-                                
-                                # Ottieni i dati binari dell'allegato - metodo migliorato
-                                attachment_data = None
-                                if hasattr(attachment, 'data'):
-                                    attachment_data = attachment.data
-                                elif hasattr(attachment, 'getBytes') and callable(attachment.getBytes):
-                                    attachment_data = attachment.getBytes()
-                                elif hasattr(attachment, 'getData') and callable(attachment.getData):
-                                    attachment_data = attachment.getData()
-                                # Per la nuova versione di extract_msg che usa 'content'
-                                elif hasattr(attachment, 'content') and attachment.content:
-                                    attachment_data = attachment.content
-                                # Per la versione più recente che potrebbe usare 'bytes'
-                                elif hasattr(attachment, 'bytes'):
-                                    attachment_data = attachment.bytes
-                                
-                                if not attachment_data:
-                                    content_parts.append(f"[Allegato vuoto o non leggibile]")
-                                    continue
-                                
-                                # Ottieni il tipo di contenuto (MIME type)
-                                content_type = ""
-                                if hasattr(attachment, 'mimetype') and attachment.mimetype:
-                                    content_type = attachment.mimetype
-                                elif hasattr(attachment, 'contentType') and attachment.contentType:
-                                    content_type = attachment.contentType
-                                
-                                # Logging dettagliato per debug
-                                self.log_debug(f"Allegato trovato: {filename} ({len(attachment_data)} bytes, tipo: {content_type or 'non definito'})")
-                                
-                                # Processa l'allegato - più log per tracciare il processo
-                                self.log_debug(f"Inizio elaborazione contenuto allegato {filename}")
-                                attachment_content = self.process_email_attachment(
-                                    attachment_data, filename, content_type)
-                                
-                                if attachment_content:
-                                    self.log_debug(f"Contenuto estratto da allegato '{filename}': {len(attachment_content)} caratteri")
-                                    content_parts.append(attachment_content)
-                                else:
-                                    self.log_debug(f"Nessun contenuto estratto da allegato '{filename}'")
-                                    content_parts.append(f"[Allegato {filename}: nessun contenuto estraibile]")
-                                    
-                            except Exception as e:
-                                self.log_debug(f"Errore nell'elaborazione dell'allegato {attachment_count}: {str(e)}")
-                                content_parts.append(f"[Errore nell'elaborazione dell'allegato {attachment_count}: {str(e)}]")
-                        
-                        content = "\n".join(content_parts)
-                        self.log_debug(f"Estratti {len(content)} caratteri da MSG (inclusi {attachment_count} allegati)")
-                        return content
+                        text, attachments = _read_msg(file_path)
+                        return self._msg_content(text, attachments)
                         
                     except ImportError:
                         self.log_debug("Libreria extract_msg non disponibile")
@@ -6234,19 +9367,19 @@ class FileSearchApp:
                                     pass
                             
                             if text_content:
-                                self.log_debug(f"Estratti {len(text_content)} caratteri da MSG (metodo fallback)")
+                                self.log_debug("Estratti %s caratteri da MSG (metodo fallback)", len(text_content))
                                 return text_content
                             return ""
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file MSG {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file MSG %s: %s", file_path, str(e))
                     return ""
 
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # File PST/OST (Outlook database) - versione semplificata senza dipendenze esterne
             elif ext in ['.pst', '.ost']:
                 try:
-                    self.log_debug(f"Processando file {ext} Outlook: {file_path}")
+                    self.log_debug("Processando file %s Outlook: %s", ext, file_path)
                     
                     # Estrai metadati di base
                     file_size = os.path.getsize(file_path)
@@ -6290,21 +9423,21 @@ class FileSearchApp:
                                 content_parts.append("\n--- Contenuto estratto ---\n")
                                 content_parts.extend(strings)
                     except Exception as e:
-                        self.log_debug(f"Errore nell'estrazione del testo: {str(e)}")
+                        self.log_debug("Errore nell'estrazione del testo: %s", str(e))
                     
                     content = "\n".join(content_parts)
-                    self.log_debug(f"Estratti {len(content)} caratteri da {ext}")
+                    self.log_debug("Estratti %s caratteri da %s", len(content), ext)
                     return content
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file {ext} {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file %s %s: %s", ext, file_path, str(e))
                     return ""
 
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # File MBOX - usa il modulo mailbox standard
             elif ext == '.mbox':
                 try:
-                    self.log_debug(f"Processando file MBOX: {file_path}")
+                    self.log_debug("Processando file MBOX: %s", file_path)
                     import mailbox
                     import email
                     
@@ -6361,25 +9494,25 @@ class FileSearchApp:
                             
                             processed += 1
                         except Exception as e:
-                            self.log_debug(f"Errore nel processare il messaggio MBOX: {str(e)}")
+                            self.log_debug("Errore nel processare il messaggio MBOX: %s", str(e))
                     
                     mbox.close()
                     content = "\n".join(content_parts)
-                    self.log_debug(f"Estratti {len(content)} caratteri da MBOX")
+                    self.log_debug("Estratti %s caratteri da MBOX", len(content))
                     return content
                 except ImportError:
                     self.log_debug("Libreria mailbox non disponibile")
                     return ""
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file MBOX {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file MBOX %s: %s", file_path, str(e))
                     return ""
             
-            if self.stop_search:
+            if self.deadline_scheduler.should_stop():
                 return ""
             # File EMLX (Apple Mail)
             elif ext == '.emlx':
                 try:
-                    self.log_debug(f"Processando file EMLX: {file_path}")
+                    self.log_debug("Processando file EMLX: %s", file_path)
                     import email
                     
                     # I file EMLX hanno un formato particolare: prima riga è un numero, poi segue il messaggio email
@@ -6428,25 +9561,23 @@ class FileSearchApp:
                                         pass
                             
                             result = "\n".join(content_parts)
-                            self.log_debug(f"Estratti {len(result)} caratteri da EMLX")
+                            self.log_debug("Estratti %s caratteri da EMLX", len(result))
                             return result
                     except Exception as e:
-                        self.log_debug(f"Errore nell'analisi del file EMLX: {str(e)}")
+                        self.log_debug("Errore nell'analisi del file EMLX: %s", str(e))
                     
                     return ""
                 except Exception as e:
-                    self.log_debug(f"Errore nell'analisi del file EMLX {file_path}: {str(e)}")
+                    self.log_debug("Errore nell'analisi del file EMLX %s: %s", file_path, str(e))
                     return ""
             
         except Exception as e:
-            self.log_debug(f"Errore generale nella lettura del file {file_path}: {str(e)}")
+            self.log_debug("Errore generale nella lettura del file %s: %s", file_path, str(e))
             return ""
     
     def _is_explicitly_selected_extension(self, ext):
         """Verifica se l'estensione è stata selezionata esplicitamente dall'utente"""
-        search_level = self.search_depth.get()
-        custom_extensions = self.get_extension_settings(search_level)
-        return ext in custom_extensions
+        return ext in self.get_extension_policy().selected
         
     def _is_likely_binary_file(self, file_path, sample_size=4096):
         """Determina se un file è probabilmente binario leggendo un campione"""
@@ -6455,19 +9586,19 @@ class FileSearchApp:
                 sample = f.read(sample_size)
                 # Criterio semplice: se contiene byte nulli, probabilmente è binario
                 if b'\x00' in sample:
-                    self.log_debug(f"File rilevato come binario: {os.path.basename(file_path)}")
+                    self.log_debug("File rilevato come binario: %s", os.path.basename(file_path))
                     return True
                     
                 # Verifica il rapporto di caratteri non ASCII
                 text_chars = bytearray({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7f})
                 non_text = sample.translate(None, text_chars)
                 if float(len(non_text)) / float(len(sample) or 1) > 0.3:
-                    self.log_debug(f"File rilevato come binario (alto rapporto non-ASCII): {os.path.basename(file_path)}")
+                    self.log_debug("File rilevato come binario (alto rapporto non-ASCII): %s", os.path.basename(file_path))
                     return True
                 return False
         except Exception:
             # In caso di dubbio, considera come binario
-            self.log_debug(f"Errore nell'analisi del file, considerato binario: {os.path.basename(file_path)}")
+            self.log_debug("Errore nell'analisi del file, considerato binario: %s", os.path.basename(file_path))
             return True
     
     @error_handler
@@ -6500,6 +9631,8 @@ class FileSearchApp:
                             file_list = file_list[:max_files]
                         
                         for file_in_zip in file_list:
+                            if self.deadline_scheduler.should_stop():
+                                break
                             try:
                                 # Verifica se il file dovrebbe essere processato in base all'estensione
                                 if self.should_search_content(file_in_zip):
@@ -6534,6 +9667,8 @@ class FileSearchApp:
                             file_list = file_list[:max_files]
                         
                         for file_in_rar in file_list:
+                            if self.deadline_scheduler.should_stop():
+                                break
                             try:
                                 if self.should_search_content(file_in_rar):
                                     with rar_ref.open(file_in_rar) as f:
@@ -6630,6 +9765,7 @@ class FileSearchApp:
                                     pass
                             
                             self.log_debug(f"Parole chiave per la ricerca nei file estratti: {current_keywords}")
+                            matcher = self.get_keyword_matcher(current_keywords)
                             
                             # Processa i file estratti (limitato a 100)
                             processed_files_count = 0
@@ -6659,11 +9795,10 @@ class FileSearchApp:
                                                     # Verifica esplicita della presenza delle parole chiave
                                                     found_match = False
                                                     if current_keywords:
-                                                        for keyword in current_keywords:
-                                                            if keyword.lower() in text_content.lower():
-                                                                self.log_debug(f"Trovata corrispondenza per '{keyword}' in {rel_path}")
-                                                                found_match = True
-                                                                break
+                                                        hits = matcher.find_matches(text_content, limit=1)
+                                                        if hits:
+                                                            self.log_debug(f"Trovata corrispondenza per '{hits[0][0]}' in {rel_path}")
+                                                            found_match = True
                                                     else:
                                                         # Se non ci sono parole chiave, includi tutti i file
                                                         found_match = True
@@ -6673,7 +9808,7 @@ class FileSearchApp:
                                                         matched_files_count += 1
                                                 except UnicodeDecodeError:
                                                     # File binario - registriamo solo se corrisponde esattamente al nome cercato
-                                                    if any(keyword.lower() in file.lower() for keyword in current_keywords):
+                                                    if matcher.search(file):
                                                         extracted_contents[rel_path] = f"[Contenuto binario: {rel_path}]"
                                                         matched_files_count += 1
                                                         self.log_debug(f"Trovata corrispondenza nel nome del file binario: {rel_path}")
@@ -6710,6 +9845,8 @@ class FileSearchApp:
                         file_members = [m for m in members if m.isfile()][:100]  # Limita a 100 file
                         
                         for member in file_members:
+                            if self.deadline_scheduler.should_stop():
+                                break
                             try:
                                 if self.should_search_content(member.name):
                                     f = tar_ref.extractfile(member)
@@ -6735,6 +9872,8 @@ class FileSearchApp:
                         file_list = [f for f in zip_ref.namelist() if not f.endswith('/')][:100]
                         
                         for file_in_jar in file_list:
+                            if self.deadline_scheduler.should_stop():
+                                break
                             try:
                                 if self.should_search_content(file_in_jar):
                                     with zip_ref.open(file_in_jar) as f:
@@ -6850,9 +9989,14 @@ class FileSearchApp:
                     
                     # Gestione specifica per tipo di file
                     content = ""
+                    # PDF, XLSX e documenti Office non controllano la scadenza a ogni passo:
+                    # estrazione nel pool di processi, terminabile alla scadenza
+                    extracted = self.extract_in_process(temp_file_path) if ext in PROCESS_EXTRACTION_EXTENSIONS else None
+                    if extracted is not None:
+                        content = extracted
                     
                     # File di testo semplice
-                    if ext in ['.txt', '.csv', '.log', '.ini', '.xml', '.json', '.md']:
+                    elif ext in ['.txt', '.csv', '.log', '.ini', '.xml', '.json', '.md']:
                         try:
                             with open(temp_file_path, 'r', encoding='utf-8', errors='replace') as f:
                                 content = f.read()
@@ -6863,65 +10007,27 @@ class FileSearchApp:
                     # PDF
                     elif ext == '.pdf':
                         try:
-                            import PyPDF2
-                            with open(temp_file_path, 'rb') as f:
-                                try:
-                                    reader = PyPDF2.PdfReader(f)
-                                    pdf_text = []
-                                    for page_num in range(len(reader.pages)):
-                                        page = reader.pages[page_num]
-                                        pdf_text.append(page.extract_text())
-                                    content = "\n".join(pdf_text)
-                                    self.log_debug(f"Estratti {len(content)} caratteri da PDF")
-                                except Exception as pdf_err:
-                                    self.log_debug(f"Errore PDF: {str(pdf_err)}")
+                            content = _extract_pdf_text(temp_file_path, self.deadline_scheduler.should_stop,
+                                                        self.pdf_searcher.max_pages, self.pdf_searcher.page_timeout)
+                            self.log_debug(f"Estratti {len(content)} caratteri da PDF")
                         except ImportError:
                             self.log_debug("PyPDF2 non disponibile")
+                        except Exception as pdf_err:
+                            self.log_debug(f"Errore PDF: {str(pdf_err)}")
                     
                     # Word DOCX
                     elif ext == '.docx':
                         try:
-                            import docx
-                            doc = docx.Document(temp_file_path)
-                            doc_text = []
-                            for para in doc.paragraphs:
-                                if para.text:
-                                    doc_text.append(para.text)
-                            content = "\n".join(doc_text)
+                            content = _extract_office_xml_text(temp_file_path, self.deadline_scheduler.should_stop)
                             self.log_debug(f"Estratti {len(content)} caratteri da DOCX")
-                        except ImportError:
-                            self.log_debug("python-docx non disponibile")
                         except Exception as docx_err:
                             self.log_debug(f"Errore DOCX: {str(docx_err)}")
                     
                     # Excel XLSX - NUOVO
                     elif ext == '.xlsx':
                         try:
-                            import openpyxl
-                            wb = openpyxl.load_workbook(temp_file_path, read_only=True, data_only=True)
-                            xlsx_texts = []
-                            
-                            for sheet_name in wb.sheetnames:
-                                sheet = wb[sheet_name]
-                                xlsx_texts.append(f"--- Foglio: {sheet_name} ---")
-                                
-                                # Max 500 righe e 50 colonne per evitare problemi con file molto grandi
-                                max_row = min(sheet.max_row, 500) if sheet.max_row else 0
-                                max_col = min(sheet.max_column, 50) if sheet.max_column else 0
-                                
-                                for row_idx in range(1, max_row + 1):
-                                    row_values = []
-                                    for col_idx in range(1, max_col + 1):
-                                        cell = sheet.cell(row=row_idx, column=col_idx)
-                                        if cell.value:
-                                            row_values.append(str(cell.value))
-                                    if row_values:
-                                        xlsx_texts.append(" ".join(row_values))
-                                        
-                            content = "\n".join(xlsx_texts)
+                            content = _extract_xlsx_text(temp_file_path, self.deadline_scheduler.should_stop)
                             self.log_debug(f"Estratti {len(content)} caratteri da XLSX")
-                        except ImportError:
-                            self.log_debug("Libreria openpyxl non disponibile")
                         except Exception as xlsx_err:
                             self.log_debug(f"Errore XLSX: {str(xlsx_err)}")
                     
@@ -6973,22 +10079,8 @@ class FileSearchApp:
                     # OpenDocument Text (ODT) - NUOVO
                     elif ext == '.odt':
                         try:
-                            from odf import opendocument, text
-                            
-                            doc = opendocument.load(temp_file_path)
-                            paragraphs = []
-                            
-                            # Estrai tutto il testo dai paragrafi
-                            for element in doc.getElementsByType(text.P):
-                                if element.firstChild:
-                                    paragraphs.append(element.firstChild.data)
-                                else:
-                                    paragraphs.append("")
-                                    
-                            content = "\n".join(paragraphs)
+                            content = _extract_office_xml_text(temp_file_path, self.deadline_scheduler.should_stop)
                             self.log_debug(f"Estratti {len(content)} caratteri da ODT")
-                        except ImportError:
-                            self.log_debug("Libreria odf non disponibile")
                         except Exception as odt_err:
                             self.log_debug(f"Errore ODT: {str(odt_err)}")
                     
@@ -7108,8 +10200,10 @@ class FileSearchApp:
             self.log_error(f"Errore nella pulizia dei file temporanei: {str(e)}")
 
     @error_handler
-    def _partial_content_search(self, file_path, keywords):
+    def _partial_content_search(self, file_path, keywords, matcher=None):
         """Esegue una ricerca parziale in un file molto grande"""
+        if matcher is None:
+            matcher = self.get_keyword_matcher(keywords)
         try:
             self.log_debug(f"Inizio analisi parziale per file gigantesco: {os.path.basename(file_path)}")
             file_size = os.path.getsize(file_path)
@@ -7119,13 +10213,9 @@ class FileSearchApp:
             tail_size = 10 * 1024 * 1024  # Ultimi 10 MB
             
             # Adatta la dimensione all'analisi in base al file
+            # (i file di testo semplice non passano di qui: vengono letti per intero in streaming)
             file_ext = os.path.splitext(file_path)[1].lower()
             
-            # Per file di log, analizza più contenuto all'inizio (eventi recenti)
-            if file_ext in ['.log', '.txt']:
-                head_size = 30 * 1024 * 1024  # 30 MB all'inizio
-                tail_size = 5 * 1024 * 1024   # 5 MB alla fine
-            
             # Per database, analizza più alla fine (record più recenti)
             if file_ext in ['.db', '.sqlite', '.mdb']:
                 head_size = 10 * 1024 * 1024  # 10 MB all'inizio
@@ -7173,17 +10263,10 @@ class FileSearchApp:
                 # Unisci i testi con un indicatore che mostra che è un'analisi parziale
                 combined_text = head_text + "\n[...CONTENUTO INTERMEDIO NON ANALIZZATO...]\n" + tail_text
             
-            # Cerca le keywords nel testo combinato
-            for keyword in keywords:
-                # Verifica corrispondenza intera parola se richiesto
-                if self.whole_word_search.get():
-                    if self.is_whole_word_match(keyword, combined_text):
-                        self.log_debug(f"Match trovato in analisi parziale di file gigantesco: {os.path.basename(file_path)}")
-                        return True
-                # Altrimenti cerca match normale
-                elif keyword.lower() in combined_text.lower():
-                    self.log_debug(f"Match trovato in analisi parziale di file gigantesco: {os.path.basename(file_path)}")
-                    return True
+            # Cerca le keywords nel testo combinato (parola intera se richiesto)
+            if matcher.search(combined_text):
+                self.log_debug(f"Match trovato in analisi parziale di file gigantesco: {os.path.basename(file_path)}")
+                return True
             
             self.log_debug(f"Nessun match trovato in analisi parziale di file gigantesco: {os.path.basename(file_path)}")
             return False
@@ -7211,12 +10294,17 @@ class FileSearchApp:
         if file_path not in self._gigantic_files_queue and file_path not in self._gigantic_files_confirmed:
             self._gigantic_files_queue.append(file_path)
             self.log_debug(f"File gigantesco accodato per conferma: {os.path.basename(file_path)}")
-            
-            # Schedula un prompt per l'utente se non già in corso
-            if not hasattr(self, '_showing_gigantic_confirmation') or not self._showing_gigantic_confirmation:
-                self._showing_gigantic_confirmation = True
-                if self.root:  # Aggiungi controllo per evitare errori
-                    self.root.after(100, self._process_gigantic_file_queue)
+            # Il prompt viene pianificato dal thread principale (schedule_gigantic_confirmations):
+            # questo metodo è chiamato anche dai thread di analisi
+
+    def schedule_gigantic_confirmations(self):
+        """Pianifica la richiesta di conferma per i file giganteschi accodati, se non già
+        in corso. Da chiamare nel thread principale (update_progress)"""
+        if not getattr(self, '_gigantic_files_queue', None):
+            return
+        if not getattr(self, '_showing_gigantic_confirmation', False):
+            self._showing_gigantic_confirmation = True
+            self.root.after(100, self._process_gigantic_file_queue)
 
     @error_handler
     def _process_gigantic_file_queue(self):
@@ -7302,11 +10390,6 @@ class FileSearchApp:
         
         # Esegui la ricerca solo su questo file specifico
         try:
-            # Rimuovi il file dai processati, se presente
-            normalized_path = os.path.normpath(os.path.abspath(file_path))
-            if hasattr(self, 'processed_files') and normalized_path in self.processed_files:
-                self.processed_files.remove(normalized_path)
-            
             # Process file può restituire None se non trova match
             result = self.process_file(file_path, self.current_search_keywords, search_content=True)
             if result:
@@ -7336,6 +10419,19 @@ class FileSearchApp:
                         # Processa tutti i messaggi nella coda
                         progress_type, value = self.progress_queue.get_nowait()
                         
+                        # Risultati in streaming: accodati qui, inseriti a blocchi dopo il ciclo
+                        if progress_type == "result":
+                            # Dopo una ricostruzione completa della lista il risultato è già in coda
+                            if self._row_stats["shown"] + len(self._result_rows) < len(self.search_results):
+                                self._result_rows.append(value)
+                            if time.time() - start_time > max_processing_time:
+                                break
+                            continue
+                        if progress_type == "results_replaced":
+                            # Risultati dell'indice locale sostituiti da quelli verificati
+                            self.update_results_list()
+                            continue
+                        
                         # CORREZIONE: Ottimizza l'elaborazione dei messaggi di stato
                         if progress_type == "update_total_time":
                             if hasattr(self, 'total_time_label') and self.total_time_label.winfo_exists():
@@ -7385,13 +10481,31 @@ class FileSearchApp:
                                 self.dir_size_var.set("Calcolo disattivato")
                         elif progress_type == "complete":
                             self.is_searching = False
+                            # Chiude l'handle del log dei file esclusi aperto per questa ricerca
+                            self.skipped_files_sink.close()
+                            # Cartelle escluse da ciascuna regola di esclusione
+                            if hasattr(self, 'path_exclusions'):
+                                self.path_exclusions.report()
+                            self.restore_system_search_params()
                             self.enable_all_controls()
                             if hasattr(self, 'stop_button') and self.stop_button.winfo_exists():
                                 self.stop_button["state"] = "disabled"
                             
-                            # CORREZIONE: Aggiungi un breve ritardo prima di aggiornare i risultati
-                            # per garantire che l'interfaccia sia reattiva
-                            self.root.after(100, self.update_results_list)
+                            # I risultati sono già arrivati in streaming: completa l'inserimento
+                            # delle righe rimaste. La lista viene ricostruita solo se la ricerca
+                            # ha prodotto i risultati tutti insieme (Windows Search, indice locale)
+                            while True:
+                                try:
+                                    pending_type, pending_value = self.progress_queue.get_nowait()
+                                except queue.Empty:
+                                    break
+                                if pending_type == "result" and (
+                                        self._row_stats["shown"] + len(self._result_rows) < len(self.search_results)):
+                                    self._result_rows.append(pending_value)
+                            if self._row_stats["shown"] + len(self._result_rows) == len(self.search_results):
+                                self._schedule_row_flush()
+                            else:
+                                self.root.after(100, self.update_results_list)
                             
                             # Aggiorna il tempo finale
                             if hasattr(self, 'search_start_time') and self.search_start_time:
@@ -7425,6 +10539,10 @@ class FileSearchApp:
                         self.log_debug(f"Errore durante l'elaborazione messaggio: {str(e)}")
                         continue
                 
+                # Inserisce un blocco di righe nel tempo rimasto
+                self._flush_result_rows(0.02)
+                self.schedule_gigantic_confirmations()
+                
                 # Force UI update after processing messages
                 try:
                     self.root.update_idletasks()
@@ -7466,8 +10584,6 @@ class FileSearchApp:
         # Ferma il monitoraggio della memoria
         self.stop_memory_monitoring()
 
-        # Resetta l'elenco dei file processati
-        self.processed_files = set()
         # Elimina flag temporanei di interruzione se presenti
         if hasattr(self, '_stopping_in_progress'):
             delattr(self, '_stopping_in_progress')
@@ -7516,6 +10632,7 @@ class FileSearchApp:
         
         # Ferma il monitoraggio della memoria
         self.stop_memory_monitoring()
+        self.skipped_files_sink.close()
 
         # 2. Aggiorna l'interfaccia
         self.status_label["text"] = "Interruzione ricerca in corso... attendere"
@@ -7572,6 +10689,8 @@ class FileSearchApp:
         try:
             # Riabilita tutti i controlli
             self.enable_all_controls()
+            self.restore_system_search_params()
+            self.schedule_gigantic_confirmations()
             
             # Reimpostazione completa dello stato
             self.reset_search_state()
@@ -7584,122 +10703,116 @@ class FileSearchApp:
         except Exception as e:
             self.log_debug(f"Errore nel completamento dell'interruzione: {str(e)}")
 
+    def emit_result(self, result):
+        """Registra un risultato trovato durante la ricerca e lo invia all'interfaccia.
+        Può essere chiamata dai thread di ricerca."""
+        self.search_results.append(result)
+        self.progress_queue.put(("result", result))
+
+    def reset_results_view(self):
+        """Svuota la lista dei risultati e i contatori incrementali"""
+        self._result_rows.clear()
+        self._row_stats = {"shown": 0, "files": 0, "size": 0, "attachments": 0, "first_item": None}
+        self.results_view.clear()
+        self.update_selected_files_size()
+        # L'ordinamento è stato annullato: rimuovi gli indicatori dalle intestazioni
+        for c in self.results_list["columns"]:
+            self.results_list.heading(c, text=self.results_list.heading(c, 'text').split(' ')[0])
+        if hasattr(self, 'total_files_size_label'):
+            self.total_files_size_label.config(text="Dimensione totale: 0 B (0 file)")
+
+    def _schedule_row_flush(self):
+        """Completa l'inserimento delle righe in attesa quando update_progress non è attivo"""
+        if self._row_flush_scheduled:
+            return
+        self._row_flush_scheduled = True
+        
+        def flush():
+            self._row_flush_scheduled = False
+            if self._flush_result_rows(0.03):
+                self._schedule_row_flush()
+        
+        self.root.after(10, flush)
+
+    def _result_display_values(self, result):
+        """Valori delle colonne della lista per un risultato"""
+        return result.display_values()
+
+    def _result_tags(self, result):
+        """Stile in base al tipo di elemento con priorità per gli allegati"""
+        if result.from_attachment:
+            return ("attachment",)  # Tag speciale per gli allegati
+        if result.is_dir:
+            return ("directory",)
+        return ("file",)
+
+    def _flush_result_rows(self, budget):
+        """Passa alla lista le righe in attesa (per al massimo budget secondi) e
+        aggiorna stato, dimensione totale e numero di file in modo incrementale.
+        Restituisce True se restano righe da inserire."""
+        rows = self._result_rows
+        if not rows:
+            return False
+        
+        stats = self._row_stats
+        deadline = time.time() + budget
+        batch = []
+        while rows:
+            result = rows.popleft()
+            if result.from_attachment:
+                stats["attachments"] += 1
+            # Il primo elemento che NON è un allegato viene selezionato a fine ricerca
+            elif stats["first_item"] is None:
+                stats["first_item"] = stats["shown"]
+            if not result.is_dir:
+                stats["files"] += 1
+                stats["size"] += result.size or 0
+            stats["shown"] += 1
+            batch.append(result)
+            
+            # Il tempo viene controllato ogni 500 righe
+            if len(batch) % 500 == 0 and time.time() >= deadline:
+                break
+        
+        # Il modello virtuale disegna solo le righe visibili
+        self.results_view.extend(batch)
+        
+        if hasattr(self, 'total_files_size_label') and self.total_files_size_label.winfo_exists():
+            self.total_files_size_label.config(
+                text=f"Dimensione totale: {self._format_size(stats['size'])} ({stats['files']} file)")
+        
+        if rows:
+            return True
+        
+        # Lista completa a ricerca terminata: stato finale e selezione del primo risultato non allegato
+        if not self.is_searching:
+            status = f"Trovati {stats['shown']} risultati"
+            if stats["attachments"] > 0:
+                status += f" (inclusi {stats['attachments']} allegati)"
+            self.status_label["text"] = status
+            if stats["first_item"] is not None and not self.results_view.selected:
+                self.results_view.select(stats["first_item"])
+        return False
+
     @error_handler
     def update_results_list(self):
-        """Aggiorna la lista dei risultati con i risultati trovati"""
+        """Ricostruisce la lista dei risultati da self.search_results.
+        Le righe vengono passate al modello a blocchi temporizzati, senza bloccare l'interfaccia."""
         # Aggiorna i colori del tema prima di aggiornare la lista (garantisce i colori corretti)
         self.update_theme_colors()
         
-        # Pulisci la lista attuale
-        for item in self.results_list.get_children():
-            self.results_list.delete(item)
-        
-        attachment_count = 0  # Counter per debug
-        non_attachment_items = []  # Lista per tenere traccia di elementi che non sono allegati
-        
-        # Aggiungi i risultati alla lista
-        for result in self.search_results:
-            # Verifica se il risultato è un dizionario o una tupla/lista
-            if isinstance(result, dict):
-                # Formato dizionario (nuovo formato)
-                item_type = result.get("type", "File")
-                author = result.get("author", "")
-                size = result.get("size", "0 B")
-                modified = result.get("modified", "")
-                created = result.get("created", "")
-                path = result.get("path", "")
-                from_attachment = result.get("is_attachment", False)
-            else:
-                # Formato tupla/lista (vecchio formato)
-                if len(result) >= 7:
-                    item_type, author, size, modified, created, path, from_attachment = result
-                else:
-                    item_type, author, size, modified, created, path = result
-                    from_attachment = False
-            
-            # Imposta l'icona della graffetta nella colonna dedicata
-            attachment_icon = "📎" if from_attachment else ""
-            
-            # Applica stile in base al tipo di elemento con priorità per gli allegati
-            if from_attachment:
-                tags = ("attachment",)  # Tag speciale per gli allegati
-                attachment_count += 1
-                self.log_debug(f"Allegato trovato ({attachment_count}): {path}")
-            elif item_type == "Directory":
-                tags = ("directory",)
-            else:
-                tags = ("file",)
-            
-            display_values = (
-                item_type,        # Tipo
-                attachment_icon,  # Icona allegato
-                size,             # Dimensione
-                modified,         # Data modifica
-                created,          # Data creazione
-                author,           # Nome/Autore
-                path              # Percorso
-            )
-                
-            # Inserisci l'elemento nella TreeView con i tag appropriati
-            item_id = self.results_list.insert("", "end", values=display_values, tags=tags)
-            
-            # Memorizza solo gli elementi che NON sono allegati
-            if not from_attachment:
-                non_attachment_items.append(item_id)
-        
-        # Aggiorna lo stato
-        self.status_label["text"] = f"Trovati {len(self.search_results)} risultati"
-        if attachment_count > 0:
-            self.status_label["text"] += f" (inclusi {attachment_count} allegati)"
-        
-        # Aggiorna la dimensione totale dei file trovati
-        self.update_total_files_size()
-        
-        # Se ci sono risultati NON allegati, seleziona il primo di questi
-        if non_attachment_items:
-            self.results_list.selection_set(non_attachment_items[0])
-            self.results_list.focus(non_attachment_items[0])
+        self.reset_results_view()
+        self._result_rows.extend(self.search_results)
+        self._schedule_row_flush()
 
-    
     @error_handler
     def update_total_files_size(self):
         """Calcola e aggiorna la dimensione totale dei file trovati"""
         try:
-            total_size = 0
-            file_count = 0
-            
-            # Output debug info
-            self.log_debug(f"Calculating total size for {len(self.search_results)} results")
-            
-            # Calcola la dimensione totale dai risultati
-            for result in self.search_results:
-                try:
-                    # Handle both 6-element and 7-element results
-                    if len(result) >= 7:  # If it includes from_attachment flag
-                        item_type, _, size_str, _, _, _, _ = result
-                    else:
-                        item_type, _, size_str, _, _, _ = result
-                    
-                    # Conta solo i file, non le directory
-                    if item_type != "Directory":
-                        file_count += 1
-                        
-                        # Estrai il valore numerico dalla stringa della dimensione
-                        if size_str and isinstance(size_str, str):
-                            if 'KB' in size_str:
-                                size_value = float(size_str.split()[0]) * 1024
-                            elif 'MB' in size_str:
-                                size_value = float(size_str.split()[0]) * 1024 * 1024
-                            elif 'GB' in size_str:
-                                size_value = float(size_str.split()[0]) * 1024 * 1024 * 1024
-                            else:
-                                # Assume B or other unit
-                                size_value = float(size_str.split()[0])
-                            
-                            total_size += size_value
-                except Exception as e:
-                    self.log_debug(f"Error processing file size: {str(e)}")
-                    continue
+            # Conta solo i file, non le directory (dimensioni già in byte)
+            files = [result for result in self.search_results if not result.is_dir]
+            total_size = sum(result.size or 0 for result in files)
+            file_count = len(files)
             
             # Formatta la dimensione totale
             formatted_size = self._format_size(total_size)
@@ -7718,37 +10831,11 @@ class FileSearchApp:
     @error_handler
     def update_selected_files_size(self, event=None):
         """Calcola e visualizza la dimensione totale dei file selezionati"""
-        # Ottieni SOLO gli elementi esplicitamente selezionati dall'utente
-        selected_items = self.results_list.selection()
-        
-        total_size = 0
-        file_count = 0
-        
-        for item in selected_items:
-            values = self.results_list.item(item)['values']
-            # Verifica che sia un file (non una directory)
-            if values and values[0] != "Directory":
-                file_count += 1
-                size_str = values[2]  # La dimensione è nella terza colonna (indice 2)
-                
-                # Estrai il valore numerico dalla stringa della dimensione
-                if size_str and isinstance(size_str, str):
-                    try:
-                        if 'TB' in size_str:
-                            size_value = float(size_str.split()[0]) * 1024 * 1024 * 1024 * 1024
-                        elif 'GB' in size_str:
-                            size_value = float(size_str.split()[0]) * 1024 * 1024 * 1024
-                        elif 'MB' in size_str:
-                            size_value = float(size_str.split()[0]) * 1024 * 1024
-                        elif 'KB' in size_str:
-                            size_value = float(size_str.split()[0]) * 1024
-                        else:
-                            # Assume B o altra unità
-                            size_value = float(size_str.split()[0])
-                        
-                        total_size += size_value
-                    except:
-                        pass  # Ignora errori di parsing
+        # Ottieni SOLO gli elementi esplicitamente selezionati dall'utente (dal modello,
+        # anche quelli fuori dalla parte visibile della lista)
+        selected_files = [result for result in self.results_view.selected_rows() if not result.is_dir]
+        total_size = sum(result.size or 0 for result in selected_files)
+        file_count = len(selected_files)
         
         # Formatta la dimensione e aggiorna l'etichetta
         if file_count > 0:
@@ -7822,7 +10909,7 @@ class FileSearchApp:
     @error_handler
     def copy_selected(self):
         """Copia i file selezionati in una directory di destinazione"""
-        selected_items = self.results_list.selection()
+        selected_items = self.results_view.selected_rows()
         if not selected_items:
             messagebox.showwarning("Attenzione", "Seleziona almeno un elemento da copiare")
             return
@@ -7839,9 +10926,8 @@ class FileSearchApp:
         skipped = 0
         
         try:
-            for item in selected_items:
-                values = self.results_list.item(item)['values']
-                item_type, _, _, _, _, source_path = values
+            for result in selected_items:
+                item_type, source_path = result.kind, result.path
                 
                 # Ottieni il nome dell'elemento senza il percorso completo
                 basename = os.path.basename(source_path)
@@ -7976,7 +11062,7 @@ class FileSearchApp:
     @error_handler
     def compress_selected(self):
         """Versione avanzata della compressione che mantiene la struttura originale delle directory"""
-        selected_items = self.results_list.selection()
+        selected_items = self.results_view.selected_rows()
         if not selected_items:
             messagebox.showwarning("Attenzione", "Seleziona almeno un elemento da comprimere")
             return
@@ -8139,9 +11225,8 @@ class FileSearchApp:
         single_files = []
 
         # Prima fase: raccogli informazioni su cartelle e file
-        for item in selected_items:
-            values = self.results_list.item(item)['values']
-            item_type, _, _, _, _, _, source_path = values
+        for result in selected_items:
+            item_type, source_path = result.kind, result.path
 
             if item_type == "Directory":
                 folder_paths.append(source_path)
@@ -8585,9 +11670,8 @@ class FileSearchApp:
         paths = []
         
         # Raccogli tutti i percorsi
-        for item in selected_items:
-            values = self.results_list.item(item)['values']
-            paths.append(values[5])  # Il percorso è nella sesta colonna
+        for result in selected_items:
+            paths.append(result.path)
         
         # Trova il percorso comune più lungo
         def common_path(paths):
@@ -9445,12 +12529,11 @@ class FileSearchApp:
     def open_file_location(self, event=None):
         """Apre il percorso del file selezionato nel file explorer"""
             
-        selected_items = self.results_list.selection()
-        if not selected_items:
+        selected_row = self.results_view.current_row()  # Elemento attivo o primo selezionato
+        if selected_row is None:
             return
             
-        selected_item = selected_items[0]  # Prendi il primo elemento selezionato
-        file_path = self.results_list.item(selected_item, "values")[6]  # Modificato da 5 a 6
+        file_path = selected_row.path
         
         try:
             if os.path.exists(file_path):
@@ -9871,7 +12954,6 @@ class FileSearchApp:
                 self.extension_settings = {}
             self.extension_settings[mode] = extensions
         
-        self.log_debug(f"Estensioni caricate per modalità {mode}: {', '.join(extensions)}")
         return extensions
         
     @error_handler
@@ -9917,9 +12999,13 @@ class FileSearchApp:
                 "max_files_to_check": self.max_files_to_check.get(),
                 "max_results": self.max_results.get(),
                 "worker_threads": self.worker_threads.get(),
+                "extraction_processes": self.extraction_processes.get(),
+                "pdf_max_pages": self.pdf_max_pages.get(),
+                "pdf_page_timeout": self.pdf_page_timeout.get(),
                 "max_file_size_mb": self.max_file_size_mb.get(),
                 "use_indexing": self.use_indexing.get(),
                 "skip_permission_errors": self.skip_permission_errors.get(),
+                "debug_logging": self.debug_logging.get(),
                 
                 # Nuove impostazioni per la gestione della RAM
                 "auto_memory_management": getattr(self, 'auto_memory_management', True),
@@ -9968,9 +13054,14 @@ class FileSearchApp:
                     self.max_files_to_check.set(settings.get("max_files_to_check", 100000))
                     self.max_results.set(settings.get("max_results", 50000))
                     self.worker_threads.set(settings.get("worker_threads", min(8, os.cpu_count() or 4)))
+                    self.extraction_processes.set(settings.get("extraction_processes", DEFAULT_EXTRACTION_PROCESSES))
+                    self.pdf_max_pages.set(settings.get("pdf_max_pages", 0))
+                    self.pdf_page_timeout.set(settings.get("pdf_page_timeout", 10))
                     self.max_file_size_mb.set(settings.get("max_file_size_mb", 100))
-                    self.use_indexing.set(settings.get("use_indexing", True))
+                    self.use_indexing.set(settings.get("use_indexing", False))
                     self.skip_permission_errors.set(settings.get("skip_permission_errors", True))
+                    self.debug_logging.set(settings.get("debug_logging", True))
+                    self.apply_logging_settings()
 
                     # Carica le impostazioni per la gestione della memoria
                     self.auto_memory_management = settings.get("auto_memory_management", True)
@@ -9998,9 +13089,14 @@ class FileSearchApp:
                 self.max_files_to_check.set(100000)
                 self.max_results.set(50000)
                 self.worker_threads.set(min(8, os.cpu_count() or 4))
+                self.extraction_processes.set(DEFAULT_EXTRACTION_PROCESSES)
+                self.pdf_max_pages.set(0)
+                self.pdf_page_timeout.set(10)
                 self.max_file_size_mb.set(100)
-                self.use_indexing.set(True)
+                self.use_indexing.set(False)
                 self.skip_permission_errors.set(True)
+                self.debug_logging.set(True)
+                self.apply_logging_settings()
                 self.auto_memory_management = True
                 self.memory_usage_percent = 75
                 
@@ -10026,9 +13122,14 @@ class FileSearchApp:
             self.max_files_to_check.set(100000)
             self.max_results.set(50000)
             self.worker_threads.set(min(8, os.cpu_count() or 4))
+            self.extraction_processes.set(DEFAULT_EXTRACTION_PROCESSES)
+            self.pdf_max_pages.set(0)
+            self.pdf_page_timeout.set(10)
             self.max_file_size_mb.set(100)
-            self.use_indexing.set(True)
+            self.use_indexing.set(False)
             self.skip_permission_errors.set(True)
+            self.debug_logging.set(True)
+            self.apply_logging_settings()
             self.auto_memory_management = True
             self.memory_usage_percent = 75
             
@@ -10339,6 +13440,14 @@ class FileSearchApp:
         deselect_all_btn.pack(side=LEFT, padx=2)
         self.create_tooltip(deselect_all_btn, "Deseleziona tutti i risultati")
 
+        # Filtro sui risultati (nome o percorso)
+        ttk.Label(selection_frame, text="🔍").pack(side=LEFT, padx=(10, 2))
+        self.results_filter_var = StringVar()
+        results_filter_entry = ttk.Entry(selection_frame, textvariable=self.results_filter_var, width=25)
+        results_filter_entry.pack(side=LEFT, padx=2)
+        self.create_tooltip(results_filter_entry, "Mostra solo i risultati il cui nome o percorso contiene il testo")
+        self.results_filter_var.trace_add("write", lambda *args: self._schedule_results_filter())
+
         # Crea frame centrale che si espande per riempire lo spazio disponibile
         center_frame = ttk.Frame(actions_frame)
         center_frame.pack(side=LEFT, fill=X, expand=YES)
@@ -10390,8 +13499,8 @@ class FileSearchApp:
         vsb = ttk.Scrollbar(treeview_container, orient="vertical", command=self.results_list.yview)
         hsb = ttk.Scrollbar(treeview_container, orient="horizontal", command=self.results_list.xview)
 
-        # Configurazione delle scrollbar nella TreeView
-        self.results_list.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        # Configurazione delle scrollbar nella TreeView (quella verticale è gestita dal modello virtuale)
+        self.results_list.configure(xscrollcommand=hsb.set)
 
         # Posizionamento con grid
         self.results_list.grid(column=0, row=0, sticky='nsew')
@@ -10434,12 +13543,16 @@ class FileSearchApp:
         self.results_list.column("author", width=400, minwidth=80, stretch=NO, anchor="w")
         self.results_list.column("path", width=600, minwidth=200, stretch=YES, anchor="w")
 
+        # Lista virtuale: nel Treeview esistono solo le righe visibili, selezione e
+        # ordinamento lavorano sul modello (aggiorna la dimensione dei selezionati)
+        self.results_view = VirtualResultsView(self.results_list, vsb,
+                                               to_values=self._result_display_values,
+                                               to_tags=self._result_tags,
+                                               on_select=self.update_selected_files_size)
+
         # Aggiungi binding per l'evento di doppio clic
         self.results_list.bind("<Double-1>", self.open_file_location)
 
-        # Aggiungi binding per l'evento di selezione
-        self.results_list.bind("<<TreeviewSelect>>", self.update_selected_files_size)
-
         # Auto-focus sull'entry del percorso all'avvio
         self.path_entry.focus_set()
 
@@ -10677,6 +13790,19 @@ class FileSearchApp:
         )
         indexing_btn.pack(anchor=W, padx=10, pady=10)
 
+        # Indice locale (non richiede Windows Search)
+        use_local_index_cb = ttk.Checkbutton(
+            windows_search_frame,
+            text="Utilizza l'indice locale dei contenuti (creato alla prima ricerca in ogni cartella)",
+            variable=self.use_indexing,
+            state="normal" if self.local_index.available else "disabled"
+        )
+        use_local_index_cb.pack(anchor=W, padx=10, pady=5)
+        self.create_tooltip(use_local_index_cb,
+                        "Salva il testo estratto in un indice full-text su disco (~/.file_search_tool).\n"
+                        "Le ricerche successive nella stessa cartella rispondono dall'indice e\n"
+                        "riesaminano solo i file nuovi o modificati. Funziona anche senza Windows Search.")
+
         # ================= Scheda 2: Filtri avanzati =================
         filters_frame = ttk.Frame(notebook, padding=15)
         notebook.add(filters_frame, text="Filtri avanzati")
@@ -11036,6 +14162,45 @@ class FileSearchApp:
                     "I file più grandi saranno considerati solo in base al nome.\n"
                     "Un valore più basso aumenta la velocità di ricerca.")
         
+        processes_label = ttk.Label(process_grid, text="Processi di estrazione:")
+        processes_label.grid(row=1, column=0, sticky=W, padx=5, pady=5)
+        processes_var = IntVar(value=self.extraction_processes.get())
+        processes = ttk.Spinbox(process_grid, from_=1, to=16, width=3, textvariable=processes_var)
+        processes.grid(row=1, column=1, padx=5, pady=5, sticky=W)
+        self.create_tooltip(processes, 
+                    "Numero di processi dedicati all'estrazione del testo da PDF, Office e MSG.\n"
+                    "Questi formati impegnano la CPU: in processi separati vengono analizzati\n"
+                    "in parallelo anche quando i thread di ricerca sono occupati.\n"
+                    "Consigliato: numero di core meno uno.")
+        
+        debug_logging_var = BooleanVar(value=self.debug_logging.get())
+        debug_logging_cb = ttk.Checkbutton(process_grid, text="Log di debug dettagliato", variable=debug_logging_var)
+        debug_logging_cb.grid(row=1, column=2, columnspan=2, sticky=W, padx=5, pady=5)
+        self.create_tooltip(debug_logging_cb, 
+                    "Registra i messaggi di debug per ogni file analizzato (finestra Debug Log).\n"
+                    "Disattivato vengono registrati solo informazioni, avvisi ed errori:\n"
+                    "la ricerca su molti file è più veloce.")
+        
+        pdf_pages_label = ttk.Label(process_grid, text="Pagine PDF (0 = tutte):")
+        pdf_pages_label.grid(row=2, column=0, sticky=W, padx=5, pady=5)
+        pdf_pages_var = IntVar(value=self.pdf_max_pages.get())
+        pdf_pages = ttk.Spinbox(process_grid, from_=0, to=100000, width=6, textvariable=pdf_pages_var)
+        pdf_pages.grid(row=2, column=1, padx=5, pady=5, sticky=W)
+        self.create_tooltip(pdf_pages, 
+                    "Numero massimo di pagine lette per ogni PDF (0 = tutte).\n"
+                    "La lettura si ferma comunque alla pagina in cui sono state trovate\n"
+                    "tutte le parole chiave; le pagine lette restano nella cache dei testi.")
+        
+        pdf_page_timeout_label = ttk.Label(process_grid, text="Secondi per pagina PDF:")
+        pdf_page_timeout_label.grid(row=2, column=2, sticky=W, padx=5, pady=5)
+        pdf_page_timeout_var = IntVar(value=self.pdf_page_timeout.get())
+        pdf_page_timeout = ttk.Spinbox(process_grid, from_=1, to=600, width=5, textvariable=pdf_page_timeout_var)
+        pdf_page_timeout.grid(row=2, column=3, padx=5, pady=5, sticky=W)
+        self.create_tooltip(pdf_page_timeout, 
+                    "Tempo massimo per l'estrazione di una singola pagina PDF.\n"
+                    "Una pagina più lenta (scansioni, grafica complessa) chiude\n"
+                    "la lettura del documento alle pagine già estratte.")
+        
         # Calcolo dimensioni
         calc_frame = ttk.LabelFrame(performance_frame, text="Calcolo dimensioni", padding=10)
         calc_frame.pack(fill=X, pady=10)
@@ -11326,6 +14491,10 @@ class FileSearchApp:
             max_files_var.set(100000)
             max_results_var.set(50000)
             threads_var.set(4)
+            processes_var.set(DEFAULT_EXTRACTION_PROCESSES)
+            pdf_pages_var.set(0)
+            pdf_page_timeout_var.set(10)
+            debug_logging_var.set(True)
             max_size_mb_var.set(50)
             dir_size_calc_var.set("disabilitato")
             
@@ -11500,6 +14669,11 @@ class FileSearchApp:
                 self.max_files_to_check.set(max_files_var.get())
                 self.max_results.set(max_results_var.get())
                 self.worker_threads.set(threads_var.get())
+                self.extraction_processes.set(processes_var.get())
+                self.pdf_max_pages.set(max(0, pdf_pages_var.get()))
+                self.pdf_page_timeout.set(max(1, pdf_page_timeout_var.get()))
+                self.debug_logging.set(debug_logging_var.get())
+                self.apply_logging_settings()
                 self.max_file_size_mb.set(max_size_mb_var.get())
                 self.dir_size_calculation.set(dir_size_calc_var.get())
                 
@@ -11525,8 +14699,10 @@ class FileSearchApp:
 
                 # Aggiorna il LargeFileHandler se è stato inizializzato
                 if hasattr(self, 'large_file_handler'):
+                    self.large_file_handler.medium_file_threshold = self.medium_file_threshold
                     self.large_file_handler.large_file_threshold = self.large_file_threshold
                     self.large_file_handler.huge_file_threshold = self.huge_file_threshold
+                    self.large_file_handler.gigantic_file_threshold = self.gigantic_file_threshold
 
                 # Aggiorna le variabili dell'update settings nel metodo di salvataggio
                 self.update_settings["auto_update"] = auto_update_var.get()
@@ -12133,71 +15309,52 @@ class FileSearchApp:
             self.log_debug(f"Impossibile avviare l'animazione fade: {e}")
 
     def select_all(self):
-        self.results_list.selection_set(self.results_list.get_children())
+        self.results_view.select_all()
         
     def deselect_all(self):
-        self.results_list.selection_remove(self.results_list.get_children())
+        self.results_view.deselect_all()
 
     @error_handler   
     def invert_selection(self):
-        all_items = self.results_list.get_children()
-        selected_items = self.results_list.selection()
-        self.results_list.selection_remove(selected_items)
-        to_select = set(all_items) - set(selected_items)
-        for item in to_select:
-            self.results_list.selection_add(item)
+        self.results_view.invert_selection()
+
+    def _schedule_results_filter(self):
+        """Applica il filtro dei risultati dopo una breve pausa nella digitazione"""
+        if getattr(self, '_results_filter_after', None):
+            self.root.after_cancel(self._results_filter_after)
+        self._results_filter_after = self.root.after(250, self.apply_results_filter)
+
+    @error_handler
+    def apply_results_filter(self):
+        """Mostra solo i risultati il cui nome o percorso contiene il testo del filtro"""
+        self._results_filter_after = None
+        text = self.results_filter_var.get().strip().lower()
+        if not text:
+            self.results_view.set_filter(None)
+            return
+        
+        def matches(result):
+            return text in result.name.lower() or text in result.path.lower()
+        
+        self.results_view.set_filter(matches)
+        self.log_debug(f"Filtro risultati '{text}': {len(self.results_view)} di {len(self.results_view.rows)}")
     
     @error_handler
     def treeview_sort_column(self, tv, col, reverse):
-        """Ordina il TreeView in base alla colonna cliccata"""
-        # Ottieni la lista di item con i loro valori
-        l = [(tv.set(k, col), k) for k in tv.get_children('')]
-        
-        # Determina il tipo di ordinamento in base alla colonna
-        try:
-            if col == "size":
-                # Gestione speciale per le dimensioni (KB, MB, GB)
-                def extract_size(size_str):
-                    if not size_str:
-                        return 0
-                    try:
-                        # Estrai il valore numerico e converti tutto in byte per confrontare correttamente
-                        value = float(size_str.split()[0])
-                        if "KB" in size_str:
-                            return value * 1024
-                        elif "MB" in size_str:
-                            return value * 1024 * 1024
-                        elif "GB" in size_str:
-                            return value * 1024 * 1024 * 1024
-                        else:
-                            return value  # Assumiamo che sia in byte
-                    except:
-                        return 0
-                        
-                l.sort(key=lambda x: extract_size(x[0]), reverse=reverse)
-            elif col in ("modified", "created"):
-                # Gestione per le date (assumendo formato DD/MM/YYYY HH:MM)
-                from datetime import datetime
-                def parse_date(date_str):
-                    try:
-                        if date_str and date_str != "N/A":
-                            return datetime.strptime(date_str, "%d/%m/%Y %H:%M")
-                        return datetime(1900, 1, 1)  # Data di default per valori vuoti
-                    except:
-                        return datetime(1900, 1, 1)
-                        
-                l.sort(key=lambda x: parse_date(x[0]), reverse=reverse)
-            else:
-                # Ordinamento standard alfanumerico
-                l.sort(reverse=reverse)
-        except Exception as e:
-            self.log_debug(f"Errore durante l'ordinamento: {str(e)}")
-            # Fallback all'ordinamento alfanumerico semplice
-            l.sort(reverse=reverse)
-            
-        # Riorganizza gli elementi nel TreeView
-        for index, (val, k) in enumerate(l):
-            tv.move(k, '', index)
+        """Ordina i risultati in base alla colonna cliccata.
+        L'ordinamento avviene sul modello della lista virtuale: la chiave viene
+        calcolata una volta per risultato e nessun elemento Tk viene spostato."""
+        # Chiavi dai valori grezzi del SearchResult (byte e timestamp, nessuna conversione di stringhe)
+        sort_keys = {
+            "type": lambda result: result.kind,
+            "attachment": lambda result: result.from_attachment,
+            "size": lambda result: result.size if result.size is not None else -1,
+            "modified": lambda result: result.mtime or 0.0,
+            "created": lambda result: result.ctime or 0.0,
+            "author": lambda result: result.name,
+            "path": lambda result: result.path,
+        }
+        self.results_view.sort(col, sort_keys[col], reverse)
 
         # Memorizza la colonna ordinata e la direzione per il prossimo click
         tv.heading(col, command=lambda _col=col: self.treeview_sort_column(tv, _col, not reverse))
@@ -12309,12 +15466,8 @@ class FileSearchApp:
             header_frame = ttk.Frame(frame)
             header_frame.pack(fill=tk.X, pady=(0, 10))
             
-            # Verifica che il debug log sia inizializzato
-            if not hasattr(self, 'debug_log'):
-                self.debug_log = []
-            
             # Etichetta informativa con conteggio (spostata a sinistra)
-            self.log_count_label = ttk.Label(header_frame, text=f"Registro di debug dell'applicazione: {len(self.debug_log)} messaggi")
+            self.log_count_label = ttk.Label(header_frame, text=f"Registro di debug dell'applicazione: {len(self.logger.ring)} messaggi")
             self.log_count_label.pack(side=tk.LEFT, padx=(0, 20))
             
             # Frame centrale per i controlli di filtraggio
@@ -12397,13 +15550,11 @@ class FileSearchApp:
             # Memorizza la configurazione di filtraggio iniziale
             self.current_filter = "Tutti"
             
-            # Memorizza tutti i messaggi originali per il filtraggio
-            self.all_log_messages = []
-            if hasattr(self, 'debug_log'):
-                self.all_log_messages = self.debug_log.copy()
-            
-            # Mostra il log corrente
+            # Mostra il log corrente (prepara anche i messaggi per il filtraggio)
             self.update_log_display()
+            
+            # I nuovi messaggi vengono letti dal buffer mentre la finestra è aperta
+            self.debug_window.after(250, self._poll_debug_log)
         else:
             # Se la finestra esiste già, portala in primo piano
             self.debug_window.lift()
@@ -12429,13 +15580,14 @@ class FileSearchApp:
         selected_filter = self.filter_var.get()
         self.current_filter = selected_filter
         
-        # Se non ci sono log o la finestra non esiste, esci
-        if not hasattr(self, 'debug_log') or not hasattr(self, 'debug_text') or not self.debug_window.winfo_exists():
+        # Se la finestra non esiste, esci
+        if not hasattr(self, 'debug_text') or not self.debug_window.winfo_exists():
             return
         
         # Salva tutti i messaggi se non l'abbiamo già fatto
         if not hasattr(self, 'all_log_messages') or not self.all_log_messages:
-            self.all_log_messages = self.debug_log.copy()
+            records, self.last_displayed_log_seq = self.logger.ring.since(0)
+            self.all_log_messages = [record.format() for record in records]
         
         # Pulisci il testo esistente
         self.debug_text.config(state=tk.NORMAL)
@@ -12500,38 +15652,30 @@ class FileSearchApp:
         if not hasattr(self, 'debug_text'):
             return
         
-        # Reset del contatore dei log visualizzati
-        self.last_displayed_log_index = 0
+        # Rilegge tutto il buffer dei log (formattato solo ora)
+        records, self.last_displayed_log_seq = self.logger.ring.since(0)
+        self.all_log_messages = [record.format() for record in records]
             
         # Cancella il contenuto attuale
         self.debug_text.config(state=tk.NORMAL)
         self.debug_text.delete(1.0, tk.END)
-        
-        # Verifica che il debug log sia inizializzato
-        if not hasattr(self, 'debug_log'):
-            self.debug_log = []
             
         # Aggiorna l'etichetta con il conteggio dei messaggi
         if hasattr(self, 'log_count_label'):
-            self.log_count_label.config(text=f"Registro di debug dell'applicazione: {len(self.debug_log)} messaggi")
+            self.log_count_label.config(text=f"Registro di debug dell'applicazione: {len(self.all_log_messages)} messaggi")
             
-        if self.debug_log:
+        if self.all_log_messages:
             # Limita la visualizzazione a 5000 messaggi per non rallentare l'interfaccia
             max_display = 5000
-            if len(self.debug_log) > max_display:
-                self.debug_text.insert(tk.END, f"[Mostrando solo gli ultimi {max_display} di {len(self.debug_log)} messaggi...]\n\n")
-                log_entries = self.debug_log[-max_display:]
-                self.last_displayed_log_index = len(self.debug_log) - max_display
+            if len(self.all_log_messages) > max_display:
+                self.debug_text.insert(tk.END, f"[Mostrando solo gli ultimi {max_display} di {len(self.all_log_messages)} messaggi...]\n\n")
+                log_entries = self.all_log_messages[-max_display:]
             else:
-                log_entries = self.debug_log
-                self.last_displayed_log_index = 0
+                log_entries = self.all_log_messages
                 
             # Inserisci i log
             log_text = "\n".join(log_entries)
-            self.debug_text.insert(tk.END, log_text)
-            
-            # Aggiorna l'indice dell'ultimo messaggio visualizzato
-            self.last_displayed_log_index = len(self.debug_log)
+            self.debug_text.insert(tk.END, log_text + "\n")
             
             # Evidenzia gli errori con colore rosso
             self.highlight_errors()
@@ -12557,24 +15701,10 @@ class FileSearchApp:
     @error_handler
     def clear_log(self):
         """Pulisce completamente i log di debug"""
-        # Pulisce l'array dei log
-        self.debug_log = []
-        
-        # Pulisce anche l'array della cronologia completa
-        if hasattr(self, 'complete_debug_log_history'):
-            self.complete_debug_log_history = []
-        
-        # Resetta il contatore dei log visualizzati
-        if hasattr(self, 'last_displayed_log_index'):
-            self.last_displayed_log_index = 0
-        
-        # Pulisce la coda dei log
-        if hasattr(self, 'debug_logs_queue'):
-            try:
-                while not self.debug_logs_queue.empty():
-                    self.debug_logs_queue.get_nowait()
-            except:
-                pass
+        # Pulisce il buffer dei log e l'elenco usato per il filtraggio; la lettura
+        # riparte dalla nuova base: i messaggi già numerati non vanno più mostrati
+        self.last_displayed_log_seq = self.logger.ring.clear()
+        self.all_log_messages = []
         
         # Pulisce il text widget se la finestra è aperta
         if hasattr(self, 'debug_window') and self.debug_window.winfo_exists() and hasattr(self, 'debug_text'):
@@ -12598,10 +15728,7 @@ class FileSearchApp:
         
         # Assicurati che all_log_messages sia popolato
         if not hasattr(self, 'all_log_messages') or not self.all_log_messages:
-            if hasattr(self, 'debug_log'):
-                self.all_log_messages = self.debug_log.copy()
-            else:
-                self.all_log_messages = []
+            self.all_log_messages = self.logger.lines()
         
         # Applica il filtro con una logica robusta
         if filtro_attuale == "Tutti":
@@ -12667,40 +15794,682 @@ class FileSearchApp:
                             f"Il file contiene {len(log_filtrati)} messaggi di log.")
             
             # Registra l'operazione di esportazione nei log dell'applicazione
-            export_log_message = f"[Info] {current_time} - Utente {username} ha esportato {len(log_filtrati)} messaggi di log di tipo '{filtro_attuale}' in: {file_path}"
-            
-            # Aggiungi il messaggio ai log
-            if hasattr(self, 'debug_log'):
-                self.debug_log.append(export_log_message)
-            
-            # Aggiorna anche all_log_messages
-            if hasattr(self, 'all_log_messages'):
-                self.all_log_messages.append(export_log_message)
-            
-            # Aggiorna la visualizzazione dei log se la finestra è aperta
-            if hasattr(self, 'debug_window') and self.debug_window.winfo_exists():
-                # Aggiungi il nuovo messaggio alla visualizzazione
-                self.debug_text.config(state=tk.NORMAL)
-                self.debug_text.insert(tk.END, export_log_message + "\n", "info")
-                
-                # Se auto-scroll è attivo, scorri alla fine
-                if hasattr(self, 'autoscroll_var') and self.autoscroll_var.get():
-                    self.debug_text.see(tk.END)
-                
-                self.debug_text.config(state=tk.DISABLED)
-                
-                # Aggiorna il contatore dei messaggi
-                if hasattr(self, 'log_count_label'):
-                    self.log_count_label.config(text=f"Registro di debug dell'applicazione: {len(self.debug_log)} messaggi")
+            # (la finestra di debug aperta la mostra al prossimo aggiornamento)
+            self.log_info("Utente %s ha esportato %d messaggi di log di tipo '%s' in: %s",
+                          username, len(log_filtrati), filtro_attuale, file_path)
                 
         except Exception as e:
             tk.messagebox.showerror("Errore esportazione", 
                             f"Si è verificato un errore durante l'esportazione:\n{str(e)}")
 
+def benchmark_logging(iterations=200000, calls_per_file=4):
+    """Misura il costo del logging di debug per file elaborato, con il log di
+    debug disattivato e attivato. Restituisce i nanosecondi per file."""
+    import types
+    results = {}
+    path = os.path.join("C:\\", "Dati", "Progetti", "documento_di_prova.pdf")
+    for label, level in (("debug disattivato", LOG_INFO), ("debug attivato", LOG_DEBUG)):
+        logger = AppLogger(level=level, capacity=10000)
+        owner = types.SimpleNamespace(logger=logger)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for _ in range(calls_per_file):
+                FileSearchApp.log_debug(owner, "File rilevato come binario: %s", path)
+        elapsed = time.perf_counter() - start
+        logger.close()
+        results[label] = elapsed * 1e9 / iterations
+    return results
+
+# Benchmark della ricerca su un corpus sintetico riproducibile
+BENCHMARK_FILE_TYPES = (('.txt', 30), ('.csv', 12), ('.json', 10), ('.xml', 8), ('.docx', 8),
+                        ('.xlsx', 8), ('.pdf', 8), ('.eml', 8), ('.zip', 4), ('.tar', 4))
+# Disposizione delle cartelle: (profondità massima, sottocartelle per cartella)
+BENCHMARK_LAYOUTS = {"deep": (12, 2), "wide": (2, 60), "mixed": (5, 4)}
+BENCHMARK_WORDS = ("relazione", "contratto", "fattura", "progetto", "cliente", "ufficio", "verbale",
+                   "bilancio", "archivio", "protocollo", "riunione", "documento", "revisione",
+                   "ordine", "consegna", "fornitore", "scadenza", "pratica", "analisi", "tecnico")
+
+def _benchmark_text(rng, size, keyword=None):
+    """Testo casuale di circa size caratteri; keyword inserita in una posizione casuale"""
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(BENCHMARK_WORDS)
+        words.append(word)
+        length += len(word) + 1
+    if keyword:
+        words.insert(rng.randrange(len(words) + 1), keyword)
+    lines = [" ".join(words[i:i + 12]) for i in range(0, len(words), 12)]
+    return "\n".join(lines)
+
+def benchmark_keywords(counts=(4, 20, 32, 64, 128), size_mb=8, seed=42):
+    """Misura KeywordMatcher.find_keywords su size_mb MB di testo sintetico con molte
+    keyword, con le ricerche separate e con l'alternanza unica, in modalità sottostringa
+    e parola intera. Le keyword non compaiono nel testo, quindi ogni strategia scandisce
+    tutto il testo (caso peggiore). Restituisce i secondi per ogni combinazione e la
+    strategia che KeywordMatcher sceglie da solo."""
+    import random
+    import string
+    rng = random.Random(seed)
+    text = _benchmark_text(rng, size_mb * 1024 * 1024)
+    pool = []
+    while len(pool) < max(counts):
+        keyword = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 10)))
+        if keyword not in pool and keyword not in text:
+            pool.append(keyword)
+    
+    results = {}
+    for whole_word in (False, True):
+        for count in counts:
+            keywords = pool[:count]
+            row = {}
+            for label, single_pass in (("separate", False), ("alternanza", True)):
+                matcher = KeywordMatcher(keywords, whole_word, single_pass)
+                start = time.perf_counter()
+                matcher.find_keywords(text)
+                row[label] = round(time.perf_counter() - start, 4)
+            automatic = KeywordMatcher(keywords, whole_word)._lowered_scan is not None
+            row["automatica"] = "alternanza" if automatic else "separate"
+            results[f"{'parola intera' if whole_word else 'sottostringa'} {count}"] = row
+    return results
+
+def benchmark_large_file(size_mb=256, seed=42, directory=None):
+    """Confronta su un file di testo sintetico di size_mb MB la ricerca sui byte mappati
+    (LargeFileHandler._mmap_search) con la lettura a blocchi (_chunk_search), per keyword
+    presenti solo in fondo, assenti, non ASCII e in parola intera con molte occorrenze
+    parziali. Restituisce i secondi di ciascuna ricerca."""
+    import random
+    rng = random.Random(seed)
+    handler = LargeFileHandler()
+    cases = ((["benchmarkneedle"], False), (["benchmarkneedle", "assente"], True),
+             (["perché"], False), (["fattur"], True))
+    fd, file_path = tempfile.mkstemp(suffix=".log", dir=directory)
+    os.close(fd)
+    try:
+        _benchmark_write_large_text(file_path, size_mb, "benchmarkneedle", rng)
+        results = {}
+        for keywords, whole_word in cases:
+            matcher = KeywordMatcher(keywords, whole_word)
+            row = {}
+            for label, search in (("mmap", lambda: handler._mmap_search(file_path, matcher)),
+                                  ("blocchi", lambda: handler._chunk_search(file_path, keywords,
+                                                                            whole_word, matcher))):
+                start = time.perf_counter()
+                search()
+                row[label] = round(time.perf_counter() - start, 4)
+            results[f"{', '.join(keywords)}{' (parola intera)' if whole_word else ''}"] = row
+        return results
+    finally:
+        os.remove(file_path)
+
+def _benchmark_write_ooxml(file_path, parts):
+    with zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in parts.items():
+            zf.writestr(name, data)
+
+def _benchmark_write_docx(file_path, text):
+    from xml.sax.saxutils import escape
+    ct = "application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"
+    paragraphs = "".join(f"<w:p><w:r><w:t>{escape(line)}</w:t></w:r></w:p>" for line in text.splitlines())
+    _benchmark_write_ooxml(file_path, {
+        "[Content_Types].xml":
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            f'<Override PartName="/word/document.xml" ContentType="{ct}"/></Types>',
+        "_rels/.rels":
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+            'relationships/officeDocument" Target="word/document.xml"/></Relationships>',
+        "word/document.xml":
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f'<w:body>{paragraphs}</w:body></w:document>',
+    })
+
+def _benchmark_write_xlsx(file_path, text):
+    from xml.sax.saxutils import escape
+    ns = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+    rel = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+    rows = []
+    for row_idx, line in enumerate(text.splitlines(), 1):
+        cells = "".join(f'<c r="{chr(65 + col)}{row_idx}" t="inlineStr"><is><t>{escape(word)}</t></is></c>'
+                        for col, word in enumerate(line.split()[:26]))
+        rows.append(f'<row r="{row_idx}">{cells}</row>')
+    _benchmark_write_ooxml(file_path, {
+        "[Content_Types].xml":
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/></Types>',
+        "_rels/.rels":
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'<Relationship Id="rId1" Type="{rel}/officeDocument" Target="xl/workbook.xml"/></Relationships>',
+        "xl/workbook.xml":
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><workbook xmlns="{ns}" xmlns:r="{rel}">'
+            '<sheets><sheet name="Foglio1" sheetId="1" r:id="rId1"/></sheets></workbook>',
+        "xl/_rels/workbook.xml.rels":
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'<Relationship Id="rId1" Type="{rel}/worksheet" Target="worksheets/sheet1.xml"/></Relationships>',
+        "xl/worksheets/sheet1.xml":
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><worksheet xmlns="{ns}">'
+            f'<sheetData>{"".join(rows)}</sheetData></worksheet>',
+    })
+
+def _benchmark_write_pdf(file_path, text):
+    """PDF di una pagina con font Helvetica standard (testo estraibile da PyPDF2)"""
+    lines = text.splitlines()[:60]
+    escaped = [line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for line in lines]
+    stream = "BT /F1 9 Tf 40 800 Td 12 TL " + " ".join(f"({line}) Tj T*" for line in escaped) + " ET"
+    stream = stream.encode("latin-1", errors="replace")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(file_path, "wb") as f:
+        f.write(out)
+
+def _benchmark_write_eml(file_path, text, rng):
+    from email.message import EmailMessage
+    msg = EmailMessage()
+    msg["From"] = "mittente@esempio.it"
+    msg["To"] = "destinatario@esempio.it"
+    msg["Subject"] = " ".join(rng.choice(BENCHMARK_WORDS) for _ in range(4))
+    msg["Date"] = "Mon, 06 Jan 2025 10:00:00 +0100"
+    body, _, attachment = text.partition("\n")
+    msg.set_content(body)
+    if attachment:
+        msg.add_attachment(attachment.encode("utf-8"), maintype="text", subtype="plain", filename="allegato.txt")
+    with open(file_path, "wb") as f:
+        f.write(msg.as_bytes())
+
+def _benchmark_write_archive(file_path, text, rng):
+    """Archivio ZIP o TAR con alcuni file di testo; il testo completo va nell'ultimo membro"""
+    members = [(f"nota_{i}.txt", _benchmark_text(rng, 2048)) for i in range(rng.randint(1, 4))]
+    members.append(("contenuto.txt", text))
+    if file_path.endswith(".zip"):
+        with zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, data in members:
+                zf.writestr(name, data)
+    else:
+        with tarfile.open(file_path, "w") as tf:
+            for name, data in members:
+                raw = data.encode("utf-8")
+                info = tarfile.TarInfo(name)
+                info.size = len(raw)
+                tf.addfile(info, io.BytesIO(raw))
+
+def _benchmark_write_large_text(file_path, size_mb, keyword, rng):
+    """File di testo di size_mb MB scritto a blocchi, con la keyword vicino alla fine"""
+    block = (_benchmark_text(rng, 1024 * 1024) + "\n").encode("utf-8")
+    total = size_mb * 1024 * 1024
+    written = 0
+    with open(file_path, "wb") as f:
+        while written + len(block) < total:
+            f.write(block)
+            written += len(block)
+        f.write(f"\nriga finale {keyword}\n".encode("utf-8"))
+
+def generate_benchmark_corpus(root, layout="mixed", files=2000, keyword="benchmarkneedle",
+                              planted_ratio=0.1, large_files=0, large_file_mb=2048, seed=42):
+    """Genera in root un albero di file sintetici: stesso seed, stesso corpus.
+    Una frazione planted_ratio dei file contiene la keyword nel contenuto (mai nel nome);
+    large_files file di testo da large_file_mb MB la contengono vicino alla fine.
+    Scrive root/corpus.json con la descrizione del corpus e la restituisce."""
+    import random
+    rng = random.Random(seed)
+    max_depth, fanout = BENCHMARK_LAYOUTS[layout]
+    
+    # Cartelle in ampiezza fino alla profondità massima, circa una ogni 5 file
+    max_dirs = max(1, files // 5)
+    directories = [("", 0)]
+    index = 0
+    while index < len(directories) and len(directories) < max_dirs:
+        parent, depth = directories[index]
+        index += 1
+        if depth >= max_depth:
+            continue
+        for child in range(fanout):
+            if len(directories) >= max_dirs:
+                break
+            directories.append((os.path.join(parent, f"cartella_{depth + 1}_{child}"), depth + 1))
+    for rel_dir, _ in directories:
+        os.makedirs(os.path.join(root, rel_dir), exist_ok=True)
+    
+    extensions = [ext for ext, _ in BENCHMARK_FILE_TYPES]
+    weights = [weight for _, weight in BENCHMARK_FILE_TYPES]
+    planted = []
+    total_bytes = 0
+    per_type = collections.Counter()
+    for number in range(files):
+        ext = rng.choices(extensions, weights)[0]
+        rel_path = os.path.join(rng.choice(directories)[0], f"file_{number:06d}{ext}")
+        file_path = os.path.join(root, rel_path)
+        plant = rng.random() < planted_ratio
+        text = _benchmark_text(rng, rng.randint(512, 64 * 1024), keyword if plant else None)
+        if ext == '.docx':
+            _benchmark_write_docx(file_path, text)
+        elif ext == '.xlsx':
+            _benchmark_write_xlsx(file_path, text)
+        elif ext == '.pdf':
+            # Una pagina: la keyword deve cadere nelle righe scritte
+            text = _benchmark_text(rng, rng.randint(512, 4096), keyword if plant else None)
+            _benchmark_write_pdf(file_path, text)
+        elif ext == '.eml':
+            _benchmark_write_eml(file_path, text, rng)
+        elif ext in ('.zip', '.tar'):
+            _benchmark_write_archive(file_path, text, rng)
+        elif ext == '.json':
+            with open(file_path, "w", encoding="utf-8") as f:
+                json.dump({"id": number, "righe": text.splitlines()}, f, ensure_ascii=False)
+        elif ext == '.xml':
+            from xml.sax.saxutils import escape
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write("<documento>" + "".join(f"<riga>{escape(line)}</riga>" for line in text.splitlines())
+                        + "</documento>")
+        elif ext == '.csv':
+            with open(file_path, "w", encoding="utf-8", newline="") as f:
+                csv.writer(f, delimiter=";").writerows(line.split() for line in text.splitlines())
+        else:
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(text)
+        if plant:
+            planted.append(rel_path)
+        per_type[ext] += 1
+        total_bytes += os.path.getsize(file_path)
+    
+    for number in range(large_files):
+        rel_path = os.path.join(directories[-1][0], f"grande_{number:02d}.txt")
+        _benchmark_write_large_text(os.path.join(root, rel_path), large_file_mb, keyword, rng)
+        planted.append(rel_path)
+        per_type['.txt'] += 1
+        total_bytes += os.path.getsize(os.path.join(root, rel_path))
+    
+    manifest = {
+        "layout": layout, "seed": seed, "keyword": keyword, "planted_ratio": planted_ratio,
+        "directories": len(directories), "max_depth": max(depth for _, depth in directories),
+        "files": files + large_files, "bytes": total_bytes, "per_type": dict(per_type),
+        "large_files": large_files, "large_file_mb": large_file_mb, "planted": sorted(planted),
+    }
+    with open(os.path.join(root, "corpus.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    return manifest
+
+class BenchmarkMonitor:
+    """Campiona periodicamente memoria (RSS del processo e dei processi di estrazione),
+    numero di processi figli e thread attivi per sottosistema, conservando i picchi"""
+    
+    # Prefisso del nome del thread -> sottosistema
+    SUBSYSTEMS = (("fs-walker", "walker"), ("fs-analysis", "analisi file"), ("LogWriter", "log"),
+                  ("SkippedFilesLogWriter", "log file esclusi"), ("ExecutorManagerThread", "pool processi"),
+                  ("QueueManagerThread", "pool processi"), ("QueueFeederThread", "pool processi"),
+                  ("fs-benchmark", "benchmark"), ("MainThread", "principale"))
+    
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak_rss = 0
+        self.peak_children_rss = 0
+        self.peak_processes = 0
+        self.peak_threads = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    @classmethod
+    def subsystem(cls, thread_name):
+        for prefix, name in cls.SUBSYSTEMS:
+            if thread_name.startswith(prefix):
+                return name
+        return "altro"
+    
+    def sample(self):
+        counts = collections.Counter(self.subsystem(t.name) for t in threading.enumerate())
+        for name, count in counts.items():
+            if count > self.peak_threads[name]:
+                self.peak_threads[name] = count
+        try:
+            process = psutil.Process()
+            self.peak_rss = max(self.peak_rss, process.memory_info().rss)
+            children = process.children(recursive=True)
+            self.peak_processes = max(self.peak_processes, len(children))
+            children_rss = 0
+            for child in children:
+                try:
+                    children_rss += child.memory_info().rss
+                except psutil.Error:
+                    pass
+            self.peak_children_rss = max(self.peak_children_rss, children_rss)
+        except Exception:
+            pass
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+    
+    def start(self):
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name="fs-benchmark-monitor", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.sample()
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+def run_benchmark(corpus_root, keywords=None, workers=None, processes=None, whole_word=False,
+                  output=None, process_file=None):
+    """Esegue la ricerca sul corpus con SearchEngine e ne misura le prestazioni:
+    file/s, MB/s, latenza per file (p50/p99), picco di memoria e thread per sottosistema.
+    process_file(entry, matcher) sostituisce l'analisi predefinita dei file.
+    Il risultato viene salvato in JSON in output (se indicato) e restituito."""
+    manifest = {}
+    manifest_path = os.path.join(corpus_root, "corpus.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    keywords = keywords or [manifest.get("keyword", "benchmarkneedle")]
+    workers = max(1, workers or min(8, os.cpu_count() or 4))
+    processes = max(1, processes or DEFAULT_EXTRACTION_PROCESSES)
+    
+    logger = AppLogger(level=LOG_INFO)
+    # Tutti i tipi del corpus vengono analizzati nel contenuto, senza esclusioni
+    settings = SearchSettings(corpus_root, keywords, whole_word=whole_word, search_folders=False,
+                              max_files=sys.maxsize, worker_threads=workers, extraction_processes=processes,
+                              ignore_hidden=False, prioritize_user_folders=False,
+                              selected_extensions=[ext for ext, _ in BENCHMARK_FILE_TYPES],
+                              exclude_system_files=False, excluded_paths=(), problematic_dirs=())
+    
+    latencies = []  # (estensione, secondi, byte) per file
+    matches = []
+    
+    def analyze(entry, matcher):
+        started = time.perf_counter()
+        try:
+            hit = (process_file or engine.analyze_file)(entry, matcher)
+        except Exception as e:
+            logger.warning("Errore nell'analisi di %s: %s", entry.path, str(e))
+            hit = False
+        latencies.append((os.path.splitext(entry.name)[1].lower(), time.perf_counter() - started,
+                          entry.size or 0))
+        return entry.path if hit else None
+    
+    manifest_file = os.path.normcase(manifest_path)
+    engine = SearchEngine(settings, on_result=matches.append, process_file=analyze,
+                          skip_file=lambda path: os.path.normcase(path) == manifest_file, logger=logger)
+    monitor = BenchmarkMonitor()
+    monitor.start()
+    try:
+        stats = engine.run()
+    finally:
+        monitor.stop()
+        logger.close()
+    elapsed = stats["elapsed_s"]
+    
+    durations = sorted(seconds for _, seconds, _ in latencies)
+    total_bytes = sum(size for _, _, size in latencies)
+    per_type = {}
+    for ext in sorted({ext for ext, _, _ in latencies}):
+        type_durations = sorted(seconds for e, seconds, _ in latencies if e == ext)
+        per_type[ext or "(nessuna)"] = {
+            "files": len(type_durations),
+            "mb": round(sum(size for e, _, size in latencies if e == ext) / (1024 * 1024), 3),
+            "p50_ms": round(_percentile(type_durations, 0.50) * 1000, 3),
+            "p99_ms": round(_percentile(type_durations, 0.99) * 1000, 3),
+        }
+    
+    planted = {os.path.normcase(os.path.join(corpus_root, p)) for p in manifest.get("planted", [])}
+    found = {os.path.normcase(p) for p in matches}
+    result = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "app_version": APP_VERSION,
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "corpus": {key: value for key, value in manifest.items() if key != "planted"},
+        "settings": {"root": corpus_root, "keywords": keywords, "whole_word": whole_word,
+                     "workers": workers, "processes": processes},
+        "results": {
+            "files": len(latencies),
+            "dirs": stats["dirs"],
+            "mb": round(total_bytes / (1024 * 1024), 3),
+            "elapsed_s": elapsed,
+            "scan_s": stats["walk_s"],
+            "files_per_s": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+            "mb_per_s": round(total_bytes / (1024 * 1024) / elapsed, 2) if elapsed else 0.0,
+            "latency_p50_ms": round(_percentile(durations, 0.50) * 1000, 3),
+            "latency_p99_ms": round(_percentile(durations, 0.99) * 1000, 3),
+            "latency_max_ms": round(durations[-1] * 1000, 3) if durations else 0.0,
+            "matches": len(matches),
+            "planted_found": len(planted & found),
+            "planted_missed": len(planted - found),
+            "peak_rss_mb": round(monitor.peak_rss / (1024 * 1024), 1),
+            "peak_extraction_rss_mb": round(monitor.peak_children_rss / (1024 * 1024), 1),
+            "peak_processes": monitor.peak_processes,
+            "peak_threads": dict(monitor.peak_threads),
+            "pipeline_peak_pending": stats["peak_pending"],
+            "pipeline_backpressure_s": stats["backpressure_s"],
+        },
+        "per_type": per_type,
+    }
+    if output:
+        directory = os.path.dirname(output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    return result
+
+def compare_benchmarks(baseline, current):
+    """Confronta due risultati di run_benchmark (dizionari o percorsi dei file JSON).
+    Restituisce [(metrica, valore di riferimento, valore attuale, variazione %)]"""
+    runs = []
+    for run in (baseline, current):
+        if isinstance(run, str):
+            with open(run, "r", encoding="utf-8") as f:
+                run = json.load(f)
+        runs.append(run["results"])
+    rows = []
+    for metric, base_value in runs[0].items():
+        value = runs[1].get(metric)
+        if isinstance(base_value, (int, float)) and isinstance(value, (int, float)):
+            change = (value - base_value) * 100.0 / base_value if base_value else 0.0
+            rows.append((metric, base_value, value, round(change, 1)))
+    return rows
+
+def benchmark_main(argv):
+    """Riga di comando del benchmark: generate, run, compare"""
+    import argparse
+    parser = argparse.ArgumentParser(prog="--benchmark", description="Benchmark della ricerca su un corpus sintetico")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    generate = commands.add_parser("generate", help="Genera il corpus sintetico")
+    generate.add_argument("root")
+    generate.add_argument("--layout", choices=sorted(BENCHMARK_LAYOUTS), default="mixed")
+    generate.add_argument("--files", type=int, default=2000)
+    generate.add_argument("--keyword", default="benchmarkneedle")
+    generate.add_argument("--planted-ratio", type=float, default=0.1)
+    generate.add_argument("--large-files", type=int, default=0, help="File di testo di grandi dimensioni")
+    generate.add_argument("--large-file-mb", type=int, default=2048)
+    generate.add_argument("--seed", type=int, default=42)
+    
+    run = commands.add_parser("run", help="Esegue la ricerca sul corpus e salva i risultati in JSON")
+    run.add_argument("root")
+    run.add_argument("--keywords", nargs="+")
+    run.add_argument("--workers", type=int)
+    run.add_argument("--processes", type=int)
+    run.add_argument("--whole-word", action="store_true")
+    run.add_argument("--output", default=os.path.join(
+        "benchmarks", f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"))
+    
+    compare = commands.add_parser("compare", help="Confronta due risultati JSON")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    
+    large_file = commands.add_parser("largefile", help="Confronta la ricerca mmap con la lettura a blocchi")
+    large_file.add_argument("--size-mb", type=int, default=256)
+    large_file.add_argument("--seed", type=int, default=42)
+    
+    keywords = commands.add_parser("keywords", help="Confronta le strategie di KeywordMatcher con molte keyword")
+    keywords.add_argument("--counts", type=int, nargs="+", default=[4, 20, 32, 64, 128])
+    keywords.add_argument("--size-mb", type=int, default=8)
+    keywords.add_argument("--seed", type=int, default=42)
+    
+    args = parser.parse_args(argv)
+    if args.command == "generate":
+        manifest = generate_benchmark_corpus(args.root, args.layout, args.files, args.keyword,
+                                             args.planted_ratio, args.large_files, args.large_file_mb,
+                                             args.seed)
+        print(f"Corpus generato in {args.root}: {manifest['files']} file, {manifest['directories']} cartelle, "
+              f"{manifest['bytes'] / (1024 * 1024):.1f} MB, {len(manifest['planted'])} con la keyword")
+    elif args.command == "run":
+        result = run_benchmark(args.root, args.keywords, args.workers, args.processes,
+                               args.whole_word, args.output)
+        print(json.dumps(result["results"], ensure_ascii=False, indent=2))
+        print(f"Risultati salvati in {args.output}")
+    elif args.command == "largefile":
+        for label, row in benchmark_large_file(args.size_mb, args.seed).items():
+            print(f"{label:40} mmap {row['mmap']:8.3f} s  blocchi {row['blocchi']:8.3f} s")
+    elif args.command == "keywords":
+        for label, row in benchmark_keywords(args.counts, args.size_mb, args.seed).items():
+            print(f"{label:20} separate {row['separate']:8.3f} s  alternanza {row['alternanza']:8.3f} s"
+                  f"  (automatica: {row['automatica']})")
+    else:
+        for metric, base_value, value, change in compare_benchmarks(args.baseline, args.current):
+            print(f"{metric:28} {base_value:>12} {value:>12} {change:+8.1f}%")
+    return 0
+
+def search_main(argv):
+    """Ricerca da riga di comando senza interfaccia grafica: un oggetto JSON per
+    risultato su stdout (JSON Lines), riepilogo finale in JSON su stderr"""
+    import argparse
+    defaults = SearchSettings.DEFAULTS
+    parser = argparse.ArgumentParser(prog="--search", description="Ricerca di file senza interfaccia (output JSON Lines)")
+    parser.add_argument("root", help="Cartella in cui cercare")
+    parser.add_argument("keywords", nargs="+", help="Parole chiave (anche separate da virgola)")
+    parser.add_argument("--whole-word", action="store_true", help="Solo parole intere")
+    parser.add_argument("--no-content", action="store_true", help="Cerca solo nei nomi")
+    parser.add_argument("--no-files", action="store_true", help="Non cercare nei file")
+    parser.add_argument("--no-folders", action="store_true", help="Non cercare nei nomi delle cartelle")
+    parser.add_argument("--level", choices=sorted(ExtensionPolicy.LEVEL_EXTENSIONS), default=defaults["search_level"])
+    parser.add_argument("--extensions", nargs="+", default=[], help="Estensioni da includere (tutte se omesso)")
+    parser.add_argument("--include-system", action="store_true", help="Non escludere i file di sistema")
+    parser.add_argument("--include-hidden", action="store_true", help="Includi file e cartelle nascosti")
+    parser.add_argument("--exclude", action="append", default=[], help="Percorso da escludere (ripetibile)")
+    parser.add_argument("--depth", type=int, default=defaults["max_depth"], help="Profondità massima (0 = illimitata)")
+    parser.add_argument("--max-files", type=int, default=defaults["max_files"])
+    parser.add_argument("--timeout", type=int, help="Durata massima della ricerca in secondi")
+    parser.add_argument("--file-timeout", type=float, default=defaults["file_timeout"])
+    parser.add_argument("--workers", type=int, default=defaults["worker_threads"])
+    parser.add_argument("--walkers", type=int, default=defaults["max_parallel_blocks"])
+    parser.add_argument("--processes", type=int, default=defaults["extraction_processes"])
+    parser.add_argument("--pdf-pages", type=int, default=defaults["pdf_max_pages"],
+                        help="Pagine lette per PDF (0 = tutte)")
+    parser.add_argument("--pdf-page-timeout", type=float, default=defaults["pdf_page_timeout"],
+                        help="Secondi per singola pagina PDF")
+    parser.add_argument("--cache", action="store_true", help="Usa la cache persistente del testo estratto")
+    parser.add_argument("--skipped-log", help="File CSV in cui registrare i file esclusi")
+    parser.add_argument("--progress", action="store_true", help="Mostra l'avanzamento su stderr")
+    args = parser.parse_args(argv)
+    
+    keywords = [keyword.strip() for arg in args.keywords for keyword in arg.split(',') if keyword.strip()]
+    extensions = ['.' + ext.lower().lstrip('.') for ext in args.extensions if ext.strip('.')]
+    settings = SearchSettings(
+        args.root, keywords,
+        whole_word=args.whole_word,
+        search_files=not args.no_files,
+        search_folders=not args.no_folders,
+        search_content=not args.no_content,
+        max_depth=max(0, args.depth),
+        max_files=args.max_files,
+        timeout=args.timeout,
+        file_timeout=args.file_timeout,
+        worker_threads=args.workers,
+        extraction_processes=max(1, args.processes),
+        pdf_max_pages=max(0, args.pdf_pages),
+        pdf_page_timeout=args.pdf_page_timeout,
+        max_parallel_blocks=args.walkers,
+        ignore_hidden=not args.include_hidden,
+        search_level=args.level,
+        selected_extensions=extensions,
+        exclude_system_files=not args.include_system,
+        excluded_paths=args.exclude)
+    
+    logger = AppLogger(level=LOG_WARNING)
+    text_cache = ExtractedTextCache(logger=logger) if args.cache else None
+    skipped_log = SkippedFilesLog(args.skipped_log, logger=logger) if args.skipped_log else None
+    
+    def report(kind, value):
+        if kind == "status":
+            print(value, file=sys.stderr, flush=True)
+    
+    engine = SearchEngine(settings, on_progress=report if args.progress else None,
+                          text_cache=text_cache, skipped_log=skipped_log, logger=logger)
+    count = 0
+    exit_code = 0
+    last_flush = time.time()
+    try:
+        for result in engine.results():
+            sys.stdout.write(json.dumps(result.to_dict(settings.keywords), ensure_ascii=False) + "\n")
+            count += 1
+            # Scrittura a blocchi: flush al massimo una volta al secondo
+            if time.time() - last_flush >= 1.0:
+                sys.stdout.flush()
+                last_flush = time.time()
+        sys.stdout.flush()
+    except KeyboardInterrupt:
+        exit_code = 130
+    except BrokenPipeError:
+        # Lettore chiuso (ad esempio "| head"): la ricerca viene interrotta
+        pass
+    finally:
+        if text_cache is not None:
+            text_cache.close()
+        if skipped_log is not None:
+            skipped_log.close(wait=True)
+        logger.close()
+    
+    summary = dict(engine.stats(), results=count)
+    print(json.dumps(summary, ensure_ascii=False), file=sys.stderr)
+    return exit_code
+
 # Funzione principale per eseguire l'applicazione
 def main():
     import sys
     
+    # L'interfaccia richiede tkinter, ttkbootstrap e psutil (facoltativi per --search)
+    missing = [name for name, available in (("tkinter/ttkbootstrap", GUI_AVAILABLE),
+                                            ("psutil", psutil is not None)) if not available]
+    if missing:
+        print(f"Librerie mancanti per l'interfaccia grafica: {', '.join(missing)}. "
+              f"Per la ricerca senza interfaccia usare --search.", file=sys.stderr)
+        return 1
+    
     # Controlla se ci sono impostazioni salvate per il tema
     settings_file = os.path.join(os.path.expanduser("~"), ".file_search_settings.json")
     initial_theme = "darkly"  # Tema predefinito
@@ -12755,6 +16524,9 @@ def main():
     root.after(500, finish_startup)
     
     root.mainloop()
+    app.extraction_pool.shutdown()
+    app.skipped_files_sink.close(wait=True)
+    app.logger.close()
 
 def create_splash_screen(parent):
     splash_win = tk.Toplevel(parent)
@@ -12785,8 +16557,19 @@ def create_splash_screen(parent):
     return splash_win
 
 if __name__ == "__main__":
+    # Necessario per i processi di estrazione isolati nell'eseguibile impacchettato
+    import multiprocessing
+    multiprocessing.freeze_support()
+    if sys.argv[1:2] == ["--benchmark"]:
+        sys.exit(benchmark_main(sys.argv[2:]))
+    if sys.argv[1:2] == ["--search"]:
+        sys.exit(search_main(sys.argv[2:]))
+    if "--benchmark-logging" in sys.argv[1:]:
+        for label, ns_per_file in benchmark_logging().items():
+            print(f"Logging {label}: {ns_per_file:.0f} ns per file")
+        sys.exit(0)
     try:
-        main()
+        sys.exit(main())
     except Exception as e:
         import traceback
         with open("error_log.txt", "w", encoding="utf-8") as f:
@@ -0,0 +1,28 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+MODULE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "File_Search_v9.3.0.1_Beta.py")
+
+
+def load_module(name="file_search"):
+    """Carica il modulo dell'applicazione (il nome del file non è importabile).
+    Il modulo viene registrato in sys.modules: le funzioni eseguite nel pool di
+    processi devono essere serializzabili per nome."""
+    spec = importlib.util.spec_from_file_location(name, MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
+
+
+@pytest.fixture(scope="session")
+def fs():
+    return load_module()
@@ -0,0 +1,31 @@
+import os
+from types import SimpleNamespace
+
+
+def _windows_lstat(attributes=0, tag=0):
+    return SimpleNamespace(st_file_attributes=attributes, st_reparse_tag=tag)
+
+
+def test_only_symlinks_and_junctions_are_links(fs):
+    scanner = fs.DirectoryScanner
+    reparse = scanner.FILE_ATTRIBUTE_REPARSE_POINT
+    assert scanner.is_link_stat(_windows_lstat(reparse, scanner.IO_REPARSE_TAG_SYMLINK))
+    assert scanner.is_link_stat(_windows_lstat(reparse, scanner.IO_REPARSE_TAG_MOUNT_POINT))
+    # Segnaposto di OneDrive (IO_REPARSE_TAG_CLOUD_6) e file deduplicati: voci normali
+    assert not scanner.is_link_stat(_windows_lstat(reparse, 0x9000601A))
+    assert not scanner.is_link_stat(_windows_lstat(reparse, 0x80000013))
+    assert not scanner.is_link_stat(_windows_lstat())
+
+
+def test_scan_reads_metadata_and_marks_symlinks(fs, tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "nota.txt").write_text("contenuto", encoding="utf-8")
+    (tmp_path / ".nascosto").write_text("x", encoding="utf-8")
+    os.symlink(tmp_path / "nota.txt", tmp_path / "collegamento.txt")
+
+    subdirs, files = fs.DirectoryScanner().scan(str(tmp_path))
+    by_name = {entry.name: entry for entry in files}
+    assert [entry.name for entry in subdirs] == ["sub"]
+    assert sorted(by_name) == ["collegamento.txt", "nota.txt"]
+    assert (by_name["nota.txt"].size, by_name["nota.txt"].is_link) == (9, False)
+    assert (by_name["collegamento.txt"].size, by_name["collegamento.txt"].is_link) == (9, True)
@@ -0,0 +1,32 @@
+import time
+
+
+def _sleep_then_echo(file_path, seconds, deadline=None):
+    """Parser che non controlla la scadenza"""
+    time.sleep(seconds)
+    return file_path
+
+
+def test_hung_worker_is_killed_and_replaced(fs):
+    pool = fs.ExtractionProcessPool(max_workers=1)
+    try:
+        start = time.time()
+        assert pool._run("lento", 0.5, "scaduto", _sleep_then_echo, 60) == "scaduto"
+        assert time.time() - start < 5
+        assert pool.restarts == 1
+        # Il posto del processo terminato è di nuovo disponibile
+        assert pool._run("veloce", 10, "scaduto", _sleep_then_echo, 0) == "veloce"
+    finally:
+        pool.shutdown()
+
+
+def test_interrupted_search_kills_busy_worker(fs):
+    pool = fs.ExtractionProcessPool(max_workers=1)
+    try:
+        stop_at = time.time() + 0.5
+        assert pool._run("lento", None, "interrotto", _sleep_then_echo, 60,
+                         interrupted=lambda: time.time() >= stop_at) == "interrotto"
+        assert pool.restarts == 1
+        assert pool._run("veloce", 10, "interrotto", _sleep_then_echo, 0) == "veloce"
+    finally:
+        pool.shutdown()
@@ -0,0 +1,21 @@
+import concurrent.futures
+import threading
+import time
+
+
+def test_drain_stops_at_deadline(fs):
+    release = threading.Event()
+    results = []
+    with concurrent.futures.ThreadPoolExecutor(2) as executor:
+        pipeline = fs.FilePipeline(lambda: executor, results.append, max_pending=4)
+        assert pipeline.submit(lambda: release.wait(10) and "lento")
+        assert pipeline.submit(lambda: "veloce")
+
+        start = time.time()
+        assert not pipeline.drain(timeout=0.05, deadline=start + 0.3)
+        assert time.time() - start < 2
+        assert pipeline.pending == 1
+
+        release.set()
+        assert pipeline.drain(timeout=0.05)
+    assert sorted(results) == ["lento", "veloce"]
@@ -0,0 +1,41 @@
+import json
+import sys
+
+from conftest import load_module
+
+# Librerie dell'interfaccia grafica e di Windows che la ricerca da riga di comando non usa
+GUI_MODULES = ("tkinter", "tkinter.filedialog", "tkinter.messagebox", "ttkbootstrap",
+               "ttkbootstrap.constants", "psutil", "pythoncom", "win32com", "win32com.client", "rarfile")
+
+
+def test_search_main_without_gui_modules(tmp_path, monkeypatch, capsys):
+    for name in GUI_MODULES:
+        monkeypatch.setitem(sys.modules, name, None)  # import bloccato: ImportError
+    monkeypatch.delitem(sys.modules, "file_search_headless", raising=False)
+    fs = load_module("file_search_headless")
+    assert not fs.GUI_AVAILABLE
+    assert fs.psutil is None
+
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "nota.txt").write_text("riga uno\ncontiene parolachiave qui\n", encoding="utf-8")
+    (tmp_path / "altro.txt").write_text("niente da trovare\n", encoding="utf-8")
+
+    exit_code = fs.search_main([str(tmp_path), "parolachiave", "--processes", "1"])
+    out, err = capsys.readouterr()
+
+    assert exit_code == 0
+    results = [json.loads(line) for line in out.splitlines()]
+    assert [result["name"] for result in results] == ["nota.txt"]
+    assert results[0]["keywords"] == ["parolachiave"]
+    summary = json.loads(err.strip().splitlines()[-1])
+    assert summary["results"] == 1
+
+
+def test_gui_entry_point_reports_missing_libraries(monkeypatch, capsys):
+    for name in GUI_MODULES:
+        monkeypatch.setitem(sys.modules, name, None)
+    monkeypatch.delitem(sys.modules, "file_search_headless", raising=False)
+    fs = load_module("file_search_headless")
+
+    assert fs.main() == 1
+    assert "--search" in capsys.readouterr().err
@@ -0,0 +1,108 @@
+import concurrent.futures
+import threading
+
+
+def _crawler(fs, tmp_path):
+    index = fs.LocalSearchIndex(str(tmp_path / "indice.db"))
+    assert index.available
+    return index, fs.IncrementalCrawler(index, fs.DirectoryScanner())
+
+
+def _read(entry):
+    with open(entry.path, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_parallel_first_crawl_indexes_every_file(fs, tmp_path):
+    root = tmp_path / "albero"
+    for i in range(40):
+        folder = root / f"cartella_{i % 5}"
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / f"nota_{i}.txt").write_text(f"documento {i} " + ("fattura" if i % 4 == 0 else "altro"),
+                                             encoding="utf-8")
+    index, crawler = _crawler(fs, tmp_path)
+    threads = set()
+
+    def extract(entry):
+        threads.add(threading.get_ident())
+        return _read(entry)
+
+    with concurrent.futures.ThreadPoolExecutor(4) as executor:
+        report = crawler.crawl(str(root), extract, executor_provider=lambda: executor, max_pending=8)
+    try:
+        assert (report.added, report.interrupted) == (40, False)
+        assert threading.get_ident() not in threads
+        matches = index.query(str(root), fs.KeywordMatcher(["fattura"]))
+        assert len(matches) == 10
+    finally:
+        index.close()
+
+
+def test_in_place_edit_is_reindexed_when_folder_is_unchanged(fs, tmp_path):
+    root = tmp_path / "albero"
+    root.mkdir()
+    note = root / "nota.txt"
+    note.write_text("prima versione", encoding="utf-8")
+    index, crawler = _crawler(fs, tmp_path)
+    try:
+        assert crawler.crawl(str(root), _read).added == 1
+
+        folder_times = (root.stat().st_atime, root.stat().st_mtime)
+        note.write_text("seconda versione con fattura", encoding="utf-8")
+        note_mtime = note.stat().st_mtime + 5
+        fs.os.utime(note, (note_mtime, note_mtime))
+        fs.os.utime(root, folder_times)  # Data della cartella invariata: snapshot riusato
+
+        report = crawler.crawl(str(root), _read)
+        assert (report.dirs_skipped, report.changed, report.unchanged) == (1, 1, 0)
+        assert len(index.query(str(root), fs.KeywordMatcher(["fattura"]))) == 1
+    finally:
+        index.close()
+
+
+def test_pruned_folders_keep_their_files(fs, tmp_path):
+    root = tmp_path / "albero"
+    for folder in ("esclusa", ".nascosta", "eliminata"):
+        (root / folder).mkdir(parents=True)
+        (root / folder / "nota.txt").write_text("fattura", encoding="utf-8")
+    index, crawler = _crawler(fs, tmp_path)
+    excluded = fs.os.path.join(index.normalize_root(str(root)), "esclusa")
+    try:
+        assert crawler.crawl(str(root), _read, ignore_hidden=False).added == 3
+
+        fs.shutil.rmtree(root / "eliminata")
+        report = crawler.crawl(str(root), _read, ignore_hidden=True,
+                               skip_dir=lambda path: path == excluded)
+        assert (report.removed, report.interrupted) == (1, False)
+        assert len(index.query(str(root), fs.KeywordMatcher(["fattura"]))) == 2
+        assert excluded in index.get_dir_snapshots(index.normalize_root(str(root)))
+    finally:
+        index.close()
+
+
+def test_extraction_starts_during_walk_and_moves_are_renamed(fs, tmp_path):
+    root = tmp_path / "albero"
+    folder = root
+    for name in ("a", "b", "c"):
+        folder = folder / name
+        folder.mkdir(parents=True)
+        (folder / f"nota_{name}.txt").write_text(f"fattura {name}", encoding="utf-8")
+    index, crawler = _crawler(fs, tmp_path)
+    events = []
+
+    def extract(entry):
+        events.append("extract")
+        return _read(entry)
+
+    try:
+        crawler.crawl(str(root), extract, on_folder=lambda path, name, stat_info: events.append("folder"))
+        # La cartella "c" viene trovata dopo l'estrazione dei file di "a"
+        assert events.index("extract") < len(events) - 1 - events[::-1].index("folder")
+
+        fs.os.rename(root / "a" / "nota_a.txt", root / "a" / "b" / "c" / "spostata.txt")
+        report = crawler.crawl(str(root), extract)
+        assert (report.moved, report.added, report.removed) == (1, 0, 0)
+        paths = {path for path, _, _ in index.query(str(root), fs.KeywordMatcher(["fattura"]))}
+        assert str(root / "a" / "b" / "c" / "spostata.txt") in paths
+    finally:
+        index.close()
@@ -0,0 +1,61 @@
+def test_substring_mode_ignores_case(fs):
+    matcher = fs.KeywordMatcher(["Contratto", "fattura"])
+    assert matcher.search("Il CONTRATTO firmato")
+    assert matcher.find_keywords("contratto e FATTURA") == {"Contratto", "fattura"}
+    assert matcher.keyword_mask("solo fattura") == 0b10
+    assert not matcher.search("nessuna corrispondenza")
+
+
+def test_whole_word_boundaries(fs):
+    matcher = fs.KeywordMatcher(["ab", ".net"], whole_word=True)
+    assert matcher.find_keywords("xab ab_ cab") == set()
+    assert matcher.find_keywords("x ab, y") == {"ab"}
+    # Come \b: ".net" richiede un carattere di parola prima del punto
+    assert matcher.find_keywords("usa .net") == set()
+    assert matcher.find_keywords("asp.net") == {".net"}
+
+
+def test_start_window_and_overlaps(fs):
+    matcher = fs.KeywordMatcher(["abc", "cde", "b"])
+    assert matcher.find_keywords("abcde") == {"abc", "cde", "b"}
+    assert matcher.find_keywords("abcde", pos=2) == {"cde"}
+    assert matcher.find_keywords("abcde", max_start=1) == {"abc"}
+    assert matcher.find_matches("abcde") == [("abc", 0, 3), ("b", 1, 2), ("cde", 2, 5)]
+    assert matcher.find_matches("abcde", limit=1) == [("abc", 0, 3)]
+
+
+def test_lowercase_changing_length_keeps_positions(fs):
+    # "İ".lower() ha due caratteri: le posizioni sono quelle del testo originale
+    matcher = fs.KeywordMatcher(["ab"])
+    text = "İİ ab"
+    assert matcher.find_matches(text) == [("ab", 3, 5)]
+    assert matcher.find_keywords(text, pos=4) == set()
+
+
+def test_single_pass_matches_separate_searches(fs):
+    for whole_word in (False, True):
+        keywords = ["new", "new york", "york", "ork", "abc", "cde", "b"]
+        single = fs.KeywordMatcher(keywords, whole_word, single_pass=True)
+        separate = fs.KeywordMatcher(keywords, whole_word, single_pass=False)
+        for text in ("New York e abcde", "newyork b", "x york, abc_ cde", ""):
+            assert single.search(text) == separate.search(text)
+            assert single.find_keywords(text) == separate.find_keywords(text)
+            assert single.find_keywords(text, pos=4, max_start=12) == \
+                separate.find_keywords(text, pos=4, max_start=12)
+            assert single.find_matches(text) == separate.find_matches(text)
+
+
+def test_single_pass_chosen_for_many_keywords(fs):
+    threshold = fs.KeywordMatcher.WORD_ALTERNATION_THRESHOLD
+    keywords = [f"parola{i}" for i in range(threshold)]
+    assert fs.KeywordMatcher(keywords, whole_word=True)._lowered_scan is not None
+    assert fs.KeywordMatcher(keywords[:-1], whole_word=True)._lowered_scan is None
+    matcher = fs.KeywordMatcher(keywords, whole_word=True)
+    assert matcher.find_keywords("la parola7 e parola70") == {"parola7"}
+
+
+def test_keyword_benchmark_reports_both_strategies(fs):
+    results = fs.benchmark_keywords(counts=(4, 40), size_mb=1)
+    assert set(results) == {"sottostringa 4", "sottostringa 40", "parola intera 4", "parola intera 40"}
+    assert results["parola intera 40"]["automatica"] == "alternanza"
+    assert results["sottostringa 4"]["automatica"] == "separate"
@@ -0,0 +1,77 @@
+import time
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def large_log(tmp_path_factory, fs):
+    """File di log sintetico sopra la soglia dei file grandi, keyword in fondo"""
+    path = tmp_path_factory.mktemp("large") / "server.log"
+    line = b"2024-01-01 12:00:00 INFO richiesta elaborata utente=mario durata=12ms stato=ok\n"
+    block = line * 20000
+    size = fs.LargeFileHandler().large_file_threshold + 16 * 1024 * 1024
+    with open(path, "wb") as f:
+        for _ in range(size // len(block) + 1):
+            f.write(block)
+        f.write(b"errore Critico: NeedleFound nel modulo\n")
+    return str(path)
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def test_mmap_search_beats_chunked_reading(fs, large_log):
+    handler = fs.LargeFileHandler()
+    assert handler.use_mmap_search(large_log)
+    for keywords, whole_word in ((["needlefound"], False), (["critico", "assente"], True)):
+        matcher = fs.KeywordMatcher(keywords, whole_word)
+        (_, found), mmap_time = min((_timed(handler._mmap_search, large_log, matcher) for _ in range(2)),
+                                    key=lambda timed: timed[1])
+        (_, chunk_found), chunk_time = min(
+            (_timed(handler._chunk_search, large_log, keywords, whole_word, matcher) for _ in range(2)),
+            key=lambda timed: timed[1])
+        assert found == chunk_found == {keywords[0]}
+        # Ricerca sui byte senza decodifica: più veloce della lettura a blocchi decodificata
+        assert mmap_time < chunk_time, (keywords, mmap_time, chunk_time)
+
+
+def test_mmap_search_stops_between_windows(fs, large_log):
+    handler = fs.LargeFileHandler()
+    matcher = fs.KeywordMatcher(["assente"])
+    calls = []
+
+    def should_stop():
+        calls.append(1)
+        return len(calls) > 2
+
+    (_, found), elapsed = _timed(handler._mmap_search, large_log, matcher, should_stop)
+    (_, _), full_time = _timed(handler._mmap_search, large_log, matcher)
+    assert found == set()
+    assert len(calls) == 3
+    assert elapsed < full_time / 2
+
+
+@pytest.mark.parametrize("encoding, prefix", [("utf-8", b""), ("latin-1", b""), ("utf-16-le", b"\xff\xfe")])
+def test_mmap_search_encodings_and_window_edges(fs, tmp_path, encoding, prefix):
+    handler = fs.LargeFileHandler()
+    handler.mmap_window_size = 7  # Keyword e caratteri spezzati tra le finestre
+    path = tmp_path / "testo.txt"
+    path.write_bytes(prefix + "Il Perché della Fattura n. 12\n".encode(encoding))
+
+    assert handler._mmap_search(str(path), fs.KeywordMatcher(["perché", "fattura"]))[1] == {"perché", "fattura"}
+    assert handler._mmap_search(str(path), fs.KeywordMatcher(["fatt"], whole_word=True))[1] == set()
+    assert handler._mmap_search(str(path), fs.KeywordMatcher(["n"], whole_word=True))[1] == {"n"}
+
+
+def test_mmap_search_confirms_dense_partial_matches(fs, tmp_path):
+    handler = fs.LargeFileHandler()
+    handler.mmap_window_size = 64
+    handler.mmap_confirm_span = 0  # Un tratto decodificato per ogni occorrenza candidata
+    path = tmp_path / "parziali.txt"
+    path.write_bytes("fatturato Fatturé ".encode("utf-8") * 500 + "FATTUR é fine".encode("utf-8"))
+
+    assert handler._mmap_search(str(path), fs.KeywordMatcher(["fattur"], whole_word=True))[1] == {"fattur"}
+    assert handler._mmap_search(str(path), fs.KeywordMatcher(["fatturé", "fin"], whole_word=True))[1] == {"fatturé"}
@@ -0,0 +1,16 @@
+def test_clear_then_read_resumes_from_new_base(fs):
+    ring = fs.LogRing(capacity=4)
+    for i in range(6):
+        ring.append(f"prima {i}")
+    records, cursor = ring.since(0)
+    assert records == ["prima 2", "prima 3", "prima 4", "prima 5"]
+
+    base = ring.clear()
+    assert len(ring) == 0
+    assert ring.since(cursor) == ([], base)
+    ring.append("dopo 0")
+    ring.append("dopo 1")
+    # Anche un lettore con un numero precedente al clear() riparte dalla nuova base
+    assert ring.since(0) == (["dopo 0", "dopo 1"], base + 2)
+    assert ring.since(cursor) == (["dopo 0", "dopo 1"], base + 2)
+    assert len(ring) == 2
@@ -0,0 +1,21 @@
+import os
+
+
+def test_links_are_followed_once_and_only_outside_the_root(fs, tmp_path):
+    root = tmp_path / "radice"
+    (root / "a" / "b").mkdir(parents=True)
+    (root / "a" / "b" / "fattura.txt").write_text("x", encoding="utf-8")
+    outside = tmp_path / "esterna"
+    outside.mkdir()
+    (outside / "fattura_esterna.txt").write_text("x", encoding="utf-8")
+    os.symlink(root, root / "a" / "b" / "ciclo")           # Torna alla radice
+    os.symlink(root / "a", root / "collegamento_a")        # Secondo percorso verso "a"
+    os.symlink(outside, root / "esterna_1")
+    os.symlink(outside, root / "a" / "esterna_2")          # Stessa cartella esterna
+    os.symlink(root, outside / "ritorno")                   # Ciclo passando dall'esterno
+
+    engine = fs.SearchEngine(fs.SearchSettings(str(root), ["fattura"], search_content=False))
+    names = sorted(result.name for result in engine.results())
+    assert names == ["fattura.txt", "fattura_esterna.txt"]
+    assert engine.stats()["dirs"] == 4  # radice, a, b e la cartella esterna una volta
+    assert engine._link_targets == {fs.DirectoryScanner.link_target_key(str(outside))}